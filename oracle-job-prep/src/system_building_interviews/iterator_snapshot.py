@@ -8,15 +8,270 @@ Demonstrates:
 - Snapshot isolation for concurrent access
 - Iterator pattern with snapshots
 - Copy-on-write for efficiency
+- Persistent hash array mapped trie (HAMT) with structural sharing
 """
 
-from typing import Any, List, Optional, Iterator, Dict
+from typing import Any, List, Optional, Iterator, Dict, Mapping, Tuple
+from collections.abc import Mapping as MappingABC
 from dataclasses import dataclass, field
 from copy import deepcopy
 import threading
 import time
 
 
+_BITS = 5
+_MASK = (1 << _BITS) - 1
+_HASH_MASK = (1 << 64) - 1
+
+
+def _hash(key: Any) -> int:
+    """64-bit unsigned hash used to walk the trie."""
+    return hash(key) & _HASH_MASK
+
+
+def _bit_count(value: int) -> int:
+    """Population count."""
+    return bin(value).count("1")
+
+
+def _single_leaf(node: Any) -> Optional[tuple]:
+    """Return the only (key, value) of a node, or None."""
+    if len(node.entries) == 1 and isinstance(node.entries[0], tuple):
+        return node.entries[0]
+    return None
+
+
+class _BitmapNode:
+    """
+    HAMT interior node.
+    
+    ``bitmap`` has one bit per occupied 5-bit hash slot; ``entries`` holds,
+    in slot order, either (key, value) leaf tuples or child nodes.
+    """
+    
+    __slots__ = ("bitmap", "entries")
+    
+    def __init__(self, bitmap: int, entries: tuple):
+        self.bitmap = bitmap
+        self.entries = entries
+    
+    def get(self, h: int, shift: int, key: Any, default: Any) -> Any:
+        bit = 1 << ((h >> shift) & _MASK)
+        if not self.bitmap & bit:
+            return default
+        entry = self.entries[_bit_count(self.bitmap & (bit - 1))]
+        if isinstance(entry, tuple):
+            return entry[1] if entry[0] is key or entry[0] == key else default
+        return entry.get(h, shift + _BITS, key, default)
+    
+    def assoc(self, h: int, shift: int, key: Any, value: Any) -> Tuple[Any, bool]:
+        """Return (new node, whether a key was added)."""
+        bit = 1 << ((h >> shift) & _MASK)
+        idx = _bit_count(self.bitmap & (bit - 1))
+        entries = self.entries
+        
+        if not self.bitmap & bit:
+            return _BitmapNode(
+                self.bitmap | bit,
+                entries[:idx] + ((key, value),) + entries[idx:]
+            ), True
+        
+        entry = entries[idx]
+        if isinstance(entry, tuple):
+            existing_key, existing_value = entry
+            if existing_key is key or existing_key == key:
+                if existing_value is value:
+                    return self, False
+                new_entry, added = (key, value), False
+            else:
+                new_entry = _merge_leaves(
+                    _hash(existing_key), entry, h, (key, value), shift + _BITS
+                )
+                added = True
+        else:
+            new_entry, added = entry.assoc(h, shift + _BITS, key, value)
+            if new_entry is entry:
+                return self, False
+        
+        return _BitmapNode(self.bitmap, entries[:idx] + (new_entry,) + entries[idx + 1:]), added
+    
+    def without(self, h: int, shift: int, key: Any) -> Optional[Any]:
+        """Return the node without key (self if absent, None if empty)."""
+        bit = 1 << ((h >> shift) & _MASK)
+        if not self.bitmap & bit:
+            return self
+        idx = _bit_count(self.bitmap & (bit - 1))
+        entries = self.entries
+        entry = entries[idx]
+        
+        if isinstance(entry, tuple):
+            if not (entry[0] is key or entry[0] == key):
+                return self
+            replacement = None
+        else:
+            replacement = entry.without(h, shift + _BITS, key)
+            if replacement is entry:
+                return self
+            if replacement is not None:
+                # Collapse single-leaf children to keep paths short
+                replacement = _single_leaf(replacement) or replacement
+        
+        if replacement is None:
+            if len(entries) == 1:
+                return None
+            return _BitmapNode(self.bitmap ^ bit, entries[:idx] + entries[idx + 1:])
+        return _BitmapNode(self.bitmap, entries[:idx] + (replacement,) + entries[idx + 1:])
+    
+    def __iter__(self) -> Iterator[tuple]:
+        for entry in self.entries:
+            if isinstance(entry, tuple):
+                yield entry
+            else:
+                yield from entry
+
+
+class _CollisionNode:
+    """Leaf bucket for keys whose full 64-bit hashes collide."""
+    
+    __slots__ = ("hash", "entries")
+    
+    def __init__(self, h: int, entries: tuple):
+        self.hash = h
+        self.entries = entries
+    
+    def get(self, h: int, shift: int, key: Any, default: Any) -> Any:
+        for existing_key, value in self.entries:
+            if existing_key is key or existing_key == key:
+                return value
+        return default
+    
+    def assoc(self, h: int, shift: int, key: Any, value: Any) -> Tuple[Any, bool]:
+        if h != self.hash:
+            # Different hash with the same prefix: push this bucket down
+            bit = 1 << ((self.hash >> shift) & _MASK)
+            return _BitmapNode(bit, (self,)).assoc(h, shift, key, value)
+        for i, (existing_key, existing_value) in enumerate(self.entries):
+            if existing_key is key or existing_key == key:
+                if existing_value is value:
+                    return self, False
+                entries = self.entries[:i] + ((key, value),) + self.entries[i + 1:]
+                return _CollisionNode(h, entries), False
+        return _CollisionNode(h, self.entries + ((key, value),)), True
+    
+    def without(self, h: int, shift: int, key: Any) -> Optional[Any]:
+        for i, (existing_key, _) in enumerate(self.entries):
+            if existing_key is key or existing_key == key:
+                entries = self.entries[:i] + self.entries[i + 1:]
+                return _CollisionNode(h, entries) if entries else None
+        return self
+    
+    def __iter__(self) -> Iterator[tuple]:
+        return iter(self.entries)
+
+
+def _merge_leaves(h1: int, leaf1: tuple, h2: int, leaf2: tuple, shift: int) -> Any:
+    """Build the smallest subtree holding two leaves with different keys."""
+    if h1 == h2:
+        return _CollisionNode(h1, (leaf1, leaf2))
+    slot1 = (h1 >> shift) & _MASK
+    slot2 = (h2 >> shift) & _MASK
+    if slot1 == slot2:
+        return _BitmapNode(1 << slot1, (_merge_leaves(h1, leaf1, h2, leaf2, shift + _BITS),))
+    entries = (leaf1, leaf2) if slot1 < slot2 else (leaf2, leaf1)
+    return _BitmapNode((1 << slot1) | (1 << slot2), entries)
+
+
+_EMPTY_NODE = _BitmapNode(0, ())
+
+
+class PersistentMap(MappingABC):
+    """
+    Immutable hash map backed by a hash array mapped trie (HAMT).
+    
+    ``set`` and ``delete`` return a new map in O(log32 n), copying only the
+    nodes on the path to the key; every other node is shared with the
+    original. Old maps stay valid and unchanged, so many versions of a
+    large map cost memory proportional to the number of changes.
+    
+    Values are stored by reference and should be treated as immutable.
+    """
+    
+    __slots__ = ("_root", "_count")
+    
+    def __init__(self, data: Optional[Mapping] = None):
+        """
+        Initialize map.
+        
+        Args:
+            data: Optional initial key/value pairs
+        """
+        self._root = _EMPTY_NODE
+        self._count = 0
+        if data:
+            root, count = _EMPTY_NODE, 0
+            for key, value in data.items():
+                root, added = root.assoc(_hash(key), 0, key, value)
+                count += added
+            self._root, self._count = root, count
+    
+    @classmethod
+    def _from_root(cls, root: Any, count: int) -> 'PersistentMap':
+        """Wrap an existing trie."""
+        new = cls.__new__(cls)
+        new._root = root
+        new._count = count
+        return new
+    
+    def set(self, key: Any, value: Any) -> 'PersistentMap':
+        """Return a new map with key set to value."""
+        root, added = self._root.assoc(_hash(key), 0, key, value)
+        if root is self._root:
+            return self
+        return PersistentMap._from_root(root, self._count + added)
+    
+    def delete(self, key: Any) -> 'PersistentMap':
+        """Return a new map without key (self if absent)."""
+        root = self._root.without(_hash(key), 0, key)
+        if root is self._root:
+            return self
+        return PersistentMap._from_root(root if root is not None else _EMPTY_NODE, self._count - 1)
+    
+    def get(self, key: Any, default: Any = None) -> Any:
+        """Get a value in O(log32 n)."""
+        return self._root.get(_hash(key), 0, key, default)
+    
+    def __getitem__(self, key: Any) -> Any:
+        sentinel = _MISSING
+        value = self._root.get(_hash(key), 0, key, sentinel)
+        if value is sentinel:
+            raise KeyError(key)
+        return value
+    
+    def __contains__(self, key: Any) -> bool:
+        return self._root.get(_hash(key), 0, key, _MISSING) is not _MISSING
+    
+    def __len__(self) -> int:
+        return self._count
+    
+    def __iter__(self) -> Iterator[Any]:
+        for key, _ in self._root:
+            yield key
+    
+    def iter_items(self) -> Iterator[tuple]:
+        """Iterate (key, value) pairs without copying."""
+        return iter(self._root)
+    
+    def to_dict(self) -> Dict:
+        """Materialize as a plain dict."""
+        return dict(self._root)
+    
+    def __repr__(self) -> str:
+        return f"PersistentMap({self.to_dict()!r})"
+
+
+_MISSING = object()
+
+
 @dataclass
 class Version:
     """Represents a version of the data structure."""
@@ -31,9 +286,13 @@ class ImmutableDataStructure:
     
     Features:
     - Multiple versions maintained
-    - Copy-on-write semantics
+    - Copy-on-write semantics via a persistent HAMT: each version shares
+      all unchanged structure with its predecessor, so set/delete are
+      O(log n) in time and memory
     - Point-in-time snapshots
     - Version history
+    
+    Values are stored by reference and should be treated as immutable.
     """
     
     def __init__(self, initial_data: Optional[Dict] = None):
@@ -45,13 +304,13 @@ class ImmutableDataStructure:
         """
         self.versions: List[Version] = []
         self.current_version = 0
+        self.first_version = 0
         self.lock = threading.Lock()
         
         # Create initial version
-        data = initial_data.copy() if initial_data else {}
-        self._create_version(data)
+        self._create_version(PersistentMap(initial_data))
     
-    def _create_version(self, data: Dict) -> int:
+    def _create_version(self, data: PersistentMap) -> int:
         """
         Create a new version.
         
@@ -64,12 +323,23 @@ class ImmutableDataStructure:
         version = Version(
             version_id=self.current_version,
             timestamp=time.time(),
-            data=deepcopy(data)
+            data=data
         )
         self.versions.append(version)
         self.current_version += 1
         return version.version_id
     
+    def _version_data(self, version: Optional[int]) -> Optional[PersistentMap]:
+        """Look up a version's map (lock held)."""
+        if version is None:
+            version = self.current_version - 1
+        
+        index = version - self.first_version
+        if 0 <= index < len(self.versions):
+            return self.versions[index].data
+        
+        return None
+    
     def get(self, key: str, version: Optional[int] = None) -> Any:
         """
         Get value at a specific version.
@@ -82,13 +352,8 @@ class ImmutableDataStructure:
             Value or None if not found
         """
         with self.lock:
-            if version is None:
-                version = self.current_version - 1
-            
-            if 0 <= version < len(self.versions):
-                return self.versions[version].data.get(key)
-            
-            return None
+            data = self._version_data(version)
+            return data.get(key) if data is not None else None
     
     def set(self, key: str, value: Any) -> int:
         """
@@ -102,14 +367,8 @@ class ImmutableDataStructure:
             New version ID
         """
         with self.lock:
-            # Copy current data
-            current_data = self.versions[-1].data.copy()
-            
-            # Modify copy
-            current_data[key] = value
-            
-            # Create new version
-            return self._create_version(current_data)
+            # Path copy only; all other nodes are shared
+            return self._create_version(self.versions[-1].data.set(key, value))
     
     def delete(self, key: str) -> int:
         """
@@ -122,14 +381,21 @@ class ImmutableDataStructure:
             New version ID
         """
         with self.lock:
-            # Copy current data
-            current_data = self.versions[-1].data.copy()
-            
-            # Modify copy
-            current_data.pop(key, None)
+            return self._create_version(self.versions[-1].data.delete(key))
+    
+    def view(self, version: Optional[int] = None) -> PersistentMap:
+        """
+        Get a read-only view of a version without copying.
+        
+        Args:
+            version: Version ID (None for latest)
             
-            # Create new version
-            return self._create_version(current_data)
+        Returns:
+            PersistentMap of the version (empty if unknown)
+        """
+        with self.lock:
+            data = self._version_data(version)
+            return data if data is not None else PersistentMap()
     
     def snapshot(self, version: Optional[int] = None) -> Dict:
         """
@@ -139,16 +405,9 @@ class ImmutableDataStructure:
             version: Version ID (None for latest)
             
         Returns:
-            Snapshot of data
+            Snapshot of data (an independent deep copy)
         """
-        with self.lock:
-            if version is None:
-                version = self.current_version - 1
-            
-            if 0 <= version < len(self.versions):
-                return deepcopy(self.versions[version].data)
-            
-            return {}
+        return deepcopy(self.view(version).to_dict())
     
     def get_version_count(self) -> int:
         """Get total number of versions."""
@@ -164,12 +423,19 @@ class ImmutableDataStructure:
         """
         Compact version history.
         
+        Dropping old version roots releases every trie node that is no
+        longer reachable from a kept version. Version IDs are unchanged.
+        
         Args:
-            keep_versions: Number of recent versions to keep
+            keep_versions: Number of recent versions to keep (the current
+                version is always kept, so values below 1 act as 1)
         """
+        keep_versions = max(keep_versions, 1)
         with self.lock:
             if len(self.versions) > keep_versions:
-                self.versions = self.versions[-keep_versions:]
+                dropped = len(self.versions) - keep_versions
+                del self.versions[:dropped]
+                self.first_version += dropped
 
 
 class SnapshotIterator:
@@ -180,6 +446,7 @@ class SnapshotIterator:
     - Consistent view during iteration
     - Isolated from concurrent modifications
     - No blocking of writers
+    - No copying: iterates the version's persistent map directly
     """
     
     def __init__(self, data_structure: ImmutableDataStructure, version: Optional[int] = None):
@@ -190,9 +457,8 @@ class SnapshotIterator:
             data_structure: ImmutableDataStructure to iterate over
             version: Version to iterate (None for latest)
         """
-        self.snapshot = data_structure.snapshot(version)
-        self.keys = list(self.snapshot.keys())
-        self.index = 0
+        self.snapshot = data_structure.view(version)
+        self.reset()
     
     def __iter__(self) -> 'SnapshotIterator':
         """Return self as iterator."""
@@ -208,17 +474,13 @@ class SnapshotIterator:
         Raises:
             StopIteration: When iteration is complete
         """
-        if self.index >= len(self.keys):
-            raise StopIteration
-        
-        key = self.keys[self.index]
-        value = self.snapshot[key]
+        item = next(self._items)
         self.index += 1
-        
-        return (key, value)
+        return item
     
     def reset(self):
         """Reset iterator to beginning."""
+        self._items = self.snapshot.iter_items()
         self.index = 0
 
 
@@ -9,13 +9,25 @@ A log aggregation system demonstrating:
 - Binary search for time ranges
 - Log streaming and filtering
 - Aggregation and statistics
+- Compressed on-disk segments for cold (older) logs
+- Multi-process parsing of raw log lines
 """
 
-from typing import List, Optional, Callable, Iterator
+from typing import List, Optional, Callable, Iterator, Iterable, Tuple
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime
+from array import array
 import bisect
+import heapq
+import json
+import mmap
+import os
+import struct
+import sys
 import threading
+import zlib
 from enum import Enum
 
 
@@ -57,6 +69,348 @@ class LogEntry:
         }
 
 
+_LEVELS = list(LogLevel)
+_LEVEL_INDEX = {level: i for i, level in enumerate(_LEVELS)}
+
+
+def parse_log_line(line: str) -> Optional[LogEntry]:
+    """
+    Parse a raw log line of the form ``<timestamp> <LEVEL> <source> <message>``.
+    
+    The timestamp may be a Unix epoch float or an ISO 8601 string.
+    
+    Args:
+        line: Raw log line
+        
+    Returns:
+        Parsed log entry, or None if the line is malformed
+    """
+    parts = line.rstrip("\n").split(" ", 3)
+    if len(parts) < 3:
+        return None
+    
+    raw_ts, raw_level, source = parts[0], parts[1], parts[2]
+    message = parts[3] if len(parts) == 4 else ""
+    
+    try:
+        timestamp = float(raw_ts)
+    except ValueError:
+        try:
+            timestamp = datetime.fromisoformat(raw_ts).timestamp()
+        except ValueError:
+            return None
+    
+    try:
+        level = LogLevel(raw_level.upper())
+    except ValueError:
+        return None
+    
+    return LogEntry(timestamp, level, source, message)
+
+
+def parse_log_lines(lines: List[str]) -> List[LogEntry]:
+    """
+    Parse a chunk of raw log lines, skipping malformed ones.
+    
+    Module-level so it can be shipped to worker processes.
+    
+    Args:
+        lines: Raw log lines
+        
+    Returns:
+        Parsed log entries
+    """
+    entries = []
+    for line in lines:
+        entry = parse_log_line(line)
+        if entry is not None:
+            entries.append(entry)
+    return entries
+
+
+class LogSegment:
+    """
+    Sealed, immutable on-disk segment of time-ordered logs.
+    
+    Columnar layout (native byte order, recorded in the header):
+    - timestamps: raw float64, memory-mapped and binary searched
+    - levels: zlib-compressed uint8 level codes
+    - sources: zlib-compressed uint32 ids into a per-segment source dictionary
+    - messages: zlib-compressed UTF-8 blob plus uint32 end offsets
+    - metadata: zlib-compressed JSON list (only written if any entry has metadata)
+    
+    All columns but the timestamps are compressed in blocks of
+    ``BLOCK_ROWS`` rows, so a query inflates only the blocks that hold
+    rows of its time range.
+    """
+    
+    MAGIC = b"LOGSEG2\0"
+    BLOCK_ROWS = 4096
+    _HEADER = struct.Struct("<8sQddI")
+    
+    def __init__(self, path: str):
+        """
+        Open an existing segment file.
+        
+        Args:
+            path: Path to segment file
+        """
+        self.path = path
+        self._file = open(path, "rb")
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        
+        magic, count, min_ts, max_ts, meta_len = self._HEADER.unpack_from(self._mmap, 0)
+        if magic != self.MAGIC:
+            self.close()
+            raise ValueError(f"Not a log segment: {path}")
+        
+        self.count = count
+        self.min_timestamp = min_ts
+        self.max_timestamp = max_ts
+        
+        meta_start = self._HEADER.size
+        meta = json.loads(self._mmap[meta_start:meta_start + meta_len].decode("utf-8"))
+        if meta["byteorder"] != sys.byteorder:
+            self.close()
+            raise ValueError(f"Segment written on a {meta['byteorder']}-endian host: {path}")
+        self.source_names: List[str] = meta["sources"]
+        self._columns = meta["columns"]
+        
+        ts_offset, ts_length = self._columns["timestamps"]
+        self._timestamps = memoryview(self._mmap)[ts_offset:ts_offset + ts_length].cast("d")
+    
+    @classmethod
+    def write(cls, path: str, entries: List[LogEntry]) -> 'LogSegment':
+        """
+        Seal time-ordered entries into a new segment file.
+        
+        Args:
+            path: Destination path
+            entries: Non-empty list of entries sorted by timestamp
+            
+        Returns:
+            The opened segment
+        """
+        if not entries:
+            raise ValueError("Cannot write an empty segment")
+        
+        source_ids = {}
+        timestamps = array("d", (entry.timestamp for entry in entries))
+        has_metadata = any(entry.metadata for entry in entries)
+        
+        # blobs[name] holds one compressed blob per block of BLOCK_ROWS rows
+        blobs = {"levels": [], "sources": [], "msg_ends": [], "messages": []}
+        if has_metadata:
+            blobs["metadata"] = []
+        for start in range(0, len(entries), cls.BLOCK_ROWS):
+            block = entries[start:start + cls.BLOCK_ROWS]
+            levels = array("B", (_LEVEL_INDEX[entry.level] for entry in block))
+            sources = array("I", (source_ids.setdefault(entry.source, len(source_ids))
+                                  for entry in block))
+            msg_ends = array("I")
+            messages = bytearray()
+            for entry in block:
+                messages += entry.message.encode("utf-8")
+                msg_ends.append(len(messages))
+            blobs["levels"].append(zlib.compress(levels.tobytes()))
+            blobs["sources"].append(zlib.compress(sources.tobytes()))
+            blobs["msg_ends"].append(zlib.compress(msg_ends.tobytes()))
+            blobs["messages"].append(zlib.compress(bytes(messages)))
+            if has_metadata:
+                metadata = [entry.metadata for entry in block]
+                blobs["metadata"].append(zlib.compress(json.dumps(metadata).encode("utf-8")))
+        
+        # Column offsets depend on the metadata length, which depends on
+        # the offsets, so repeat the layout until its length is stable.
+        names = list(source_ids)
+        ts_bytes = timestamps.tobytes()
+        columns = {}
+        meta = b""
+        previous_length = -1
+        while len(meta) != previous_length:
+            previous_length = len(meta)
+            offset = cls._HEADER.size + len(meta)
+            offset += -offset % 8  # keep the float64 column aligned
+            columns = {"timestamps": [offset, len(ts_bytes)]}
+            offset += len(ts_bytes)
+            for name, blocks in blobs.items():
+                columns[name] = []
+                for blob in blocks:
+                    columns[name].append([offset, len(blob)])
+                    offset += len(blob)
+            meta = json.dumps({
+                "byteorder": sys.byteorder,
+                "sources": names,
+                "columns": columns,
+            }).encode("utf-8")
+        
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(cls._HEADER.pack(
+                cls.MAGIC, len(entries),
+                entries[0].timestamp, entries[-1].timestamp, len(meta)
+            ))
+            f.write(meta)
+            f.write(b"\0" * (columns["timestamps"][0] - f.tell()))
+            f.write(ts_bytes)
+            for blocks in blobs.values():
+                for blob in blocks:
+                    f.write(blob)
+            f.flush()
+            os.fsync(f.fileno())
+        
+        # Atomic publish so readers never see a half-written segment
+        os.replace(tmp_path, path)
+        return cls(path)
+    
+    def _inflate(self, name: str, block: int) -> bytes:
+        """Decompress one block of a column."""
+        offset, length = self._columns[name][block]
+        return zlib.decompress(self._mmap[offset:offset + length])
+    
+    def overlaps(self, start_time: float, end_time: float) -> bool:
+        """Check whether the segment may contain logs in the time range."""
+        return self.min_timestamp <= end_time and self.max_timestamp >= start_time
+    
+    def _entries(
+        self,
+        lo: int,
+        hi: int,
+        level: Optional[LogLevel],
+        source: Optional[str],
+        keyword: Optional[str] = None
+    ) -> Iterator[LogEntry]:
+        """Decode rows [lo, hi) that match the filters (keyword: lower case)."""
+        if lo >= hi:
+            return
+        
+        source_id = None
+        if source is not None:
+            if source not in self.source_names:
+                return
+            source_id = self.source_names.index(source)
+        level_code = _LEVEL_INDEX[level] if level is not None else None
+        
+        rows = self.BLOCK_ROWS
+        for block in range(lo // rows, (hi - 1) // rows + 1):
+            first = block * rows
+            messages = self._inflate("messages", block)
+            if keyword is not None and keyword not in messages.decode("utf-8").lower():
+                continue  # no row of the block can match
+            levels = array("B", self._inflate("levels", block))
+            sources = array("I", self._inflate("sources", block))
+            msg_ends = array("I", self._inflate("msg_ends", block))
+            metadata = None
+            if "metadata" in self._columns:
+                metadata = json.loads(self._inflate("metadata", block))
+            
+            for j in range(max(lo, first) - first, min(hi, first + rows) - first):
+                if level_code is not None and levels[j] != level_code:
+                    continue
+                if source_id is not None and sources[j] != source_id:
+                    continue
+                msg_start = msg_ends[j - 1] if j > 0 else 0
+                message = messages[msg_start:msg_ends[j]].decode("utf-8")
+                if keyword is not None and keyword not in message.lower():
+                    continue
+                yield LogEntry(
+                    self._timestamps[first + j],
+                    _LEVELS[levels[j]],
+                    self.source_names[sources[j]],
+                    message,
+                    dict(metadata[j]) if metadata else None
+                )
+    
+    def query_time_range(
+        self,
+        start_time: float,
+        end_time: float,
+        level: Optional[LogLevel] = None,
+        source: Optional[str] = None
+    ) -> List[LogEntry]:
+        """
+        Query logs within a time range using binary search over the mmap.
+        
+        Args:
+            start_time: Start timestamp
+            end_time: End timestamp
+            level: Optional log level filter
+            source: Optional source filter
+            
+        Returns:
+            List of matching log entries
+        """
+        if not self.overlaps(start_time, end_time):
+            return []
+        lo = bisect.bisect_left(self._timestamps, start_time)
+        hi = bisect.bisect_right(self._timestamps, end_time)
+        return list(self._entries(lo, hi, level, source))
+    
+    def search(self, keyword: str) -> List[LogEntry]:
+        """
+        Find logs whose message contains keyword (case-insensitive).
+        
+        Blocks whose messages cannot contain the keyword are skipped
+        after inflating only their messages column.
+        """
+        return list(self._entries(0, self.count, None, None, keyword.lower()))
+    
+    def count_by_level(self) -> Counter:
+        """Count logs per level, reading only the levels column."""
+        codes = Counter()
+        for block in range(len(self._columns["levels"])):
+            codes.update(self._inflate("levels", block))
+        return Counter({_LEVELS[code]: count for code, count in codes.items()})
+    
+    def count_by_source(self) -> Counter:
+        """Count logs per source, reading only the sources column."""
+        ids = Counter()
+        for block in range(len(self._columns["sources"])):
+            ids.update(array("I", self._inflate("sources", block)))
+        return Counter({self.source_names[i]: count for i, count in ids.items()})
+    
+    def __iter__(self) -> Iterator[LogEntry]:
+        """Iterate over all entries in timestamp order."""
+        return self._entries(0, self.count, None, None)
+    
+    def __len__(self) -> int:
+        """Number of entries in the segment."""
+        return self.count
+    
+    def close(self):
+        """Release the memory map and file handle."""
+        if self._file.closed:
+            return
+        if getattr(self, "_timestamps", None) is not None:
+            self._timestamps.release()
+            self._timestamps = None
+        if not self._mmap.closed:
+            self._mmap.close()
+        self._file.close()
+
+
+def _merge_runs(runs: List[Tuple[float, float, Iterable[LogEntry]]]) -> Iterator[LogEntry]:
+    """
+    Merge time-ordered runs of logs given as (min_ts, max_ts, entries).
+    
+    Runs whose time ranges do not overlap are chained, so only runs that
+    actually interleave are decoded at the same time.
+    """
+    runs = sorted(runs, key=lambda run: run[0])
+    group: List[Iterable[LogEntry]] = []
+    group_end = float("-inf")
+    
+    for start, end, entries in runs:
+        if group and start > group_end:
+            yield from heapq.merge(*group, key=lambda log: log.timestamp)
+            group = []
+        group.append(entries)
+        group_end = max(group_end, end)
+    
+    if group:
+        yield from heapq.merge(*group, key=lambda log: log.timestamp)
+
+
 class LogAggregator:
     """
     Log aggregation system with efficient querying.
@@ -68,19 +422,80 @@ class LogAggregator:
     - Filtering by level and source
     - Log statistics and aggregation
     - Thread-safe operations
+    - Optional spill of old logs to compressed on-disk segments
+    
+    Without ``segment_dir`` the aggregator keeps at most ``max_size`` logs
+    and drops the oldest. With ``segment_dir`` the oldest logs are sealed
+    into :class:`LogSegment` files instead, and time range queries,
+    streaming, statistics and search span both the hot in-memory tail and
+    the cold segments.
     """
     
-    def __init__(self, max_size: int = 100000):
+    SEGMENT_SUFFIX = ".logseg"
+    
+    def __init__(
+        self,
+        max_size: int = 100000,
+        segment_dir: Optional[str] = None,
+        segment_size: Optional[int] = None
+    ):
         """
         Initialize log aggregator.
         
         Args:
-            max_size: Maximum number of logs to store
+            max_size: Maximum number of logs to keep in memory
+            segment_dir: Directory for sealed segments (None drops old logs)
+            segment_size: Minimum number of logs per sealed segment
+                (defaults to half of max_size)
         """
         self.logs: List[LogEntry] = []
         self.max_size = max_size
         self.lock = threading.Lock()
         self.sources = set()
+        self.segment_dir = segment_dir
+        self.segment_size = segment_size or max(1, max_size // 2)
+        self.segments: List[LogSegment] = []
+        self._next_segment_id = 0
+        
+        if segment_dir is not None:
+            os.makedirs(segment_dir, exist_ok=True)
+            self._load_segments()
+    
+    def _load_segments(self):
+        """Open segments left by a previous run."""
+        # Only files named by _evict ("<id>.logseg") are segments
+        names = sorted(
+            name for name in os.listdir(self.segment_dir)
+            if name.endswith(self.SEGMENT_SUFFIX)
+            and name[:-len(self.SEGMENT_SUFFIX)].isdigit()
+        )
+        for name in names:
+            segment = LogSegment(os.path.join(self.segment_dir, name))
+            self.segments.append(segment)
+            self.sources.update(segment.source_names)
+            self._next_segment_id = max(
+                self._next_segment_id,
+                int(name[:-len(self.SEGMENT_SUFFIX)]) + 1
+            )
+    
+    def _evict(self):
+        """Drop or seal the oldest logs when over capacity (lock held)."""
+        overflow = len(self.logs) - self.max_size
+        if overflow <= 0:
+            return
+        
+        if self.segment_dir is None:
+            del self.logs[:overflow]
+            return
+        
+        count = min(len(self.logs), max(overflow, self.segment_size))
+        path = os.path.join(
+            self.segment_dir,
+            f"{self._next_segment_id:010d}{self.SEGMENT_SUFFIX}"
+        )
+        self.segments.append(LogSegment.write(path, self.logs[:count]))
+        self._next_segment_id += 1
+        del self.logs[:count]
     
     def ingest(self, entry: LogEntry):
         """
@@ -98,8 +513,7 @@ class LogAggregator:
             self.sources.add(entry.source)
             
             # Evict old logs if at capacity
-            if len(self.logs) > self.max_size:
-                self.logs.pop(0)
+            self._evict()
     
     def ingest_batch(self, entries: List[LogEntry]):
         """
@@ -120,8 +534,7 @@ class LogAggregator:
                 self.sources.add(entry.source)
             
             # Trim if needed
-            if len(self.logs) > self.max_size:
-                self.logs = self.logs[-self.max_size:]
+            self._evict()
     
     def query_time_range(
         self,
@@ -133,6 +546,9 @@ class LogAggregator:
         """
         Query logs within a time range using binary search.
         
+        Sealed segments outside the range are skipped using their
+        min/max timestamps.
+        
         Args:
             start_time: Start timestamp
             end_time: End timestamp
@@ -160,7 +576,16 @@ class LogAggregator:
             if source:
                 range_logs = [log for log in range_logs if log.source == source]
             
+            cold = [
+                segment.query_time_range(start_time, end_time, level, source)
+                for segment in self.segments
+                if segment.overlaps(start_time, end_time)
+            ]
+        
+        if not cold:
             return range_logs
+        
+        return list(heapq.merge(*cold, range_logs, key=lambda log: log.timestamp))
     
     def query_recent(
         self,
@@ -169,7 +594,7 @@ class LogAggregator:
         source: Optional[str] = None
     ) -> List[LogEntry]:
         """
-        Query most recent logs.
+        Query most recent logs from the in-memory tail.
         
         Args:
             count: Number of logs to return
@@ -199,6 +624,9 @@ class LogAggregator:
         """
         Stream logs (for real-time monitoring).
         
+        Cold segments are decoded one at a time and merged with the hot
+        tail in timestamp order.
+        
         Args:
             filter_fn: Optional filter function
             
@@ -206,13 +634,20 @@ class LogAggregator:
             Log entries
         """
         with self.lock:
-            for log in self.logs:
-                if filter_fn is None or filter_fn(log):
-                    yield log
+            runs = [
+                (segment.min_timestamp, segment.max_timestamp, segment)
+                for segment in self.segments
+            ]
+            if self.logs:
+                runs.append((self.logs[0].timestamp, self.logs[-1].timestamp, list(self.logs)))
+        
+        for log in _merge_runs(runs):
+            if filter_fn is None or filter_fn(log):
+                yield log
     
     def count_by_level(self) -> dict:
         """
-        Count logs by level.
+        Count logs by level, including sealed segments.
         
         Returns:
             Dictionary of level -> count
@@ -223,11 +658,15 @@ class LogAggregator:
             for log in self.logs:
                 counts[log.level] += 1
             
+            for segment in self.segments:
+                for level, count in segment.count_by_level().items():
+                    counts[level] += count
+            
             return {level.value: count for level, count in counts.items()}
     
     def count_by_source(self) -> dict:
         """
-        Count logs by source.
+        Count logs by source, including sealed segments.
         
         Returns:
             Dictionary of source -> count
@@ -238,6 +677,10 @@ class LogAggregator:
             for log in self.logs:
                 counts[log.source] = counts.get(log.source, 0) + 1
             
+            for segment in self.segments:
+                for source, count in segment.count_by_source().items():
+                    counts[source] = counts.get(source, 0) + count
+            
             return counts
     
     def get_error_rate(self, time_window: float) -> float:
@@ -265,7 +708,7 @@ class LogAggregator:
     
     def search(self, keyword: str) -> List[LogEntry]:
         """
-        Search logs by keyword in message.
+        Search logs by keyword in message, including sealed segments.
         
         Args:
             keyword: Keyword to search for
@@ -273,22 +716,40 @@ class LogAggregator:
         Returns:
             List of matching log entries
         """
+        keyword = keyword.lower()
         with self.lock:
-            return [
+            hot = [
                 log for log in self.logs
-                if keyword.lower() in log.message.lower()
+                if keyword in log.message.lower()
             ]
+            cold = [segment.search(keyword) for segment in self.segments]
+        
+        if not any(cold):
+            return hot
+        
+        return list(heapq.merge(*cold, hot, key=lambda log: log.timestamp))
     
     def clear(self):
-        """Clear all logs."""
+        """Clear all logs, deleting any sealed segments."""
         with self.lock:
             self.logs.clear()
             self.sources.clear()
+            for segment in self.segments:
+                segment.close()
+                os.remove(segment.path)
+            self.segments.clear()
     
     def size(self) -> int:
-        """Get number of stored logs."""
+        """Get number of stored logs (in memory and in segments)."""
+        with self.lock:
+            return len(self.logs) + sum(len(segment) for segment in self.segments)
+    
+    def close(self):
+        """Close sealed segments (the files are kept on disk)."""
         with self.lock:
-            return len(self.logs)
+            for segment in self.segments:
+                segment.close()
+            self.segments.clear()
 
 
 class LogBuffer:
@@ -333,6 +794,103 @@ class LogBuffer:
                 self.buffer.clear()
 
 
+class LogIngestionPipeline:
+    """
+    Pipeline stage that parses raw log lines in a process pool.
+    
+    Lines are split into chunks, parsed by worker processes and the
+    resulting entries are ingested into the aggregator in batches, so
+    parsing scales across cores while the aggregator stays single-writer.
+    """
+    
+    def __init__(
+        self,
+        aggregator: LogAggregator,
+        max_workers: Optional[int] = None,
+        chunk_size: int = 10000
+    ):
+        """
+        Initialize ingestion pipeline.
+        
+        Args:
+            aggregator: LogAggregator to write to
+            max_workers: Number of parser processes (None for CPU count)
+            chunk_size: Lines per parse task
+        """
+        self.aggregator = aggregator
+        self.max_workers = max_workers
+        self.chunk_size = chunk_size
+        self.parsed = 0
+        self.malformed = 0
+    
+    def _chunks(self, lines: Iterable[str]) -> Iterator[List[str]]:
+        """Group lines into chunks of chunk_size."""
+        chunk = []
+        for line in lines:
+            if not line.strip():
+                continue
+            chunk.append(line)
+            if len(chunk) >= self.chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+    
+    def ingest_lines(self, lines: Iterable[str]) -> Tuple[int, int]:
+        """
+        Parse and ingest raw log lines.
+        
+        At most two chunks per worker are in flight, so arbitrarily long
+        inputs are streamed rather than loaded into memory.
+        
+        Args:
+            lines: Iterable of raw log lines
+            
+        Returns:
+            Tuple of (parsed count, malformed count) for this call
+        """
+        parsed = malformed = 0
+        
+        def consume(size: int, entries: List[LogEntry]):
+            nonlocal parsed, malformed
+            self.aggregator.ingest_batch(entries)
+            parsed += len(entries)
+            malformed += size - len(entries)
+        
+        if self.max_workers == 1:
+            for chunk in self._chunks(lines):
+                consume(len(chunk), parse_log_lines(chunk))
+        else:
+            max_pending = 2 * (self.max_workers or os.cpu_count() or 1)
+            with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+                pending = deque()
+                for chunk in self._chunks(lines):
+                    pending.append((len(chunk), executor.submit(parse_log_lines, chunk)))
+                    if len(pending) >= max_pending:
+                        size, future = pending.popleft()
+                        consume(size, future.result())
+                while pending:
+                    size, future = pending.popleft()
+                    consume(size, future.result())
+        
+        self.parsed += parsed
+        self.malformed += malformed
+        return parsed, malformed
+    
+    def ingest_file(self, path: str) -> Tuple[int, int]:
+        """
+        Parse and ingest a log file.
+        
+        Args:
+            path: Path to a text log file
+            
+        Returns:
+            Tuple of (parsed count, malformed count)
+        """
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            return self.ingest_lines(f)
+
+
 if __name__ == "__main__":
     import time
     
@@ -9,7 +9,7 @@ Demonstrates understanding of time-based algorithms and concurrent access contro
 
 from abc import ABC, abstractmethod
 from collections import deque
-from typing import Optional
+from typing import Any, Callable, Dict, Iterable, List, Optional
 import threading
 import time
 
@@ -195,13 +195,12 @@ class SlidingWindowLimiter(RateLimiter):
             current_time = time.time()
             window_start = current_time - self.window_size
             
-            # Count requests in window
-            count = 0
-            for timestamp in self.request_logs[user_id]:
-                if timestamp >= window_start:
-                    count += 1
+            # Drop expired timestamps; the remainder is the count
+            request_log = self.request_logs[user_id]
+            while request_log and request_log[0] < window_start:
+                request_log.popleft()
             
-            return count
+            return len(request_log)
 
 
 class FixedWindowCounterLimiter(RateLimiter):
@@ -347,6 +346,288 @@ class LeakyBucketLimiter(RateLimiter):
                 del self.buckets[user_id]
 
 
+class StripedRateLimiter(RateLimiter):
+    """
+    Base class for compact limiters sharded by key hash.
+    
+    Design:
+    - Keys are spread over ``stripes`` shards, each with its own lock and
+      dict, so threads working on different keys rarely contend
+    - Subclasses keep a single small immutable value per key, so reads
+      (``dict.get``) never need the lock
+    - Keys whose state is equivalent to "never seen" are expired, either
+      explicitly via ``expire_idle`` or automatically when a shard doubles
+      in size, which keeps memory bounded by the number of active keys
+    """
+    
+    def __init__(self, stripes: int = 64, clock: Callable[[], float] = time.time):
+        """
+        Initialize striped state.
+        
+        Args:
+            stripes: Number of lock stripes (rounded up to a power of two)
+            clock: Time source in seconds
+        """
+        size = 1
+        while size < stripes:
+            size <<= 1
+        self._mask = size - 1
+        self._locks = [threading.Lock() for _ in range(size)]
+        self._shards: List[Dict[str, Any]] = [{} for _ in range(size)]
+        self._sweep_at = [1024] * size
+        self.clock = clock
+    
+    @abstractmethod
+    def _decide(self, state: Any, now: float) -> tuple:
+        """
+        Decide one request.
+        
+        Args:
+            state: Current key state (None if the key is unknown)
+            now: Current time
+            
+        Returns:
+            Tuple of (allowed, new_state)
+        """
+        pass
+    
+    @abstractmethod
+    def _is_idle(self, state: Any, now: float) -> bool:
+        """Check whether a key's state is equivalent to an unknown key."""
+        pass
+    
+    def _shard_index(self, user_id: str) -> int:
+        """Map a key to its stripe."""
+        return hash(user_id) & self._mask
+    
+    def _maybe_sweep(self, index: int, now: float):
+        """Expire idle keys once a shard has doubled (stripe lock held)."""
+        shard = self._shards[index]
+        if len(shard) < self._sweep_at[index]:
+            return
+        for key in [k for k, v in shard.items() if self._is_idle(v, now)]:
+            del shard[key]
+        self._sweep_at[index] = max(1024, 2 * len(shard))
+    
+    def allow_request(self, user_id: str) -> bool:
+        """Check if a request is allowed."""
+        index = self._shard_index(user_id)
+        shard = self._shards[index]
+        with self._locks[index]:
+            now = self.clock()
+            allowed, shard[user_id] = self._decide(shard.get(user_id), now)
+            self._maybe_sweep(index, now)
+        return allowed
+    
+    def allow_many(self, user_ids: Iterable[str]) -> List[bool]:
+        """
+        Decide a batch of requests.
+        
+        Keys are grouped by stripe so each stripe lock is taken once and
+        the clock is read once for the whole batch. Repeated keys are
+        decided in order.
+        
+        Args:
+            user_ids: Keys, one per request
+            
+        Returns:
+            List of decisions in input order
+        """
+        user_ids = list(user_ids)
+        results = [False] * len(user_ids)
+        by_shard: Dict[int, List[int]] = {}
+        for position, user_id in enumerate(user_ids):
+            by_shard.setdefault(self._shard_index(user_id), []).append(position)
+        
+        now = self.clock()
+        decide = self._decide
+        for index, positions in by_shard.items():
+            shard = self._shards[index]
+            with self._locks[index]:
+                for position in positions:
+                    user_id = user_ids[position]
+                    results[position], shard[user_id] = decide(shard.get(user_id), now)
+                self._maybe_sweep(index, now)
+        
+        return results
+    
+    def reset(self, user_id: str):
+        """Reset state for a user."""
+        index = self._shard_index(user_id)
+        with self._locks[index]:
+            self._shards[index].pop(user_id, None)
+    
+    def expire_idle(self) -> int:
+        """
+        Drop all keys whose state is equivalent to an unknown key.
+        
+        Returns:
+            Number of keys removed
+        """
+        removed = 0
+        for index, shard in enumerate(self._shards):
+            with self._locks[index]:
+                now = self.clock()
+                idle = [k for k, v in shard.items() if self._is_idle(v, now)]
+                for key in idle:
+                    del shard[key]
+                removed += len(idle)
+        return removed
+    
+    def tracked_keys(self) -> int:
+        """Number of keys currently holding state."""
+        return sum(len(shard) for shard in self._shards)
+
+
+class GCRALimiter(StripedRateLimiter):
+    """
+    Generic Cell Rate Algorithm (GCRA) Rate Limiter.
+    
+    Algorithm:
+    - Each key stores one float: the theoretical arrival time (TAT)
+      of the next request if traffic were perfectly spaced
+    - Requests are spaced by the emission interval T = period / rate
+    - A request is allowed if it is not earlier than TAT - tau, where
+      tau = T * (burst - 1) is the burst tolerance
+    - An allowed request advances TAT to max(TAT, now) + T
+    
+    Advantages:
+    - Same behaviour as a token bucket with continuous refill
+    - One float per key, no timers or refill loops
+    - Lock-free reads of remaining capacity
+    """
+    
+    def __init__(
+        self,
+        rate: float,
+        period: float = 1.0,
+        burst: Optional[int] = None,
+        stripes: int = 64,
+        clock: Callable[[], float] = time.time
+    ):
+        """
+        Initialize GCRA limiter.
+        
+        Args:
+            rate: Requests allowed per period
+            period: Period length in seconds
+            burst: Maximum burst size (defaults to rate)
+            stripes: Number of lock stripes
+            clock: Time source in seconds
+        """
+        super().__init__(stripes, clock)
+        self.emission_interval = period / rate
+        self.burst = int(burst if burst is not None else max(1, rate))
+        self.tolerance = self.emission_interval * (self.burst - 1)
+        # Slack so accumulated float error never costs a burst slot
+        self._limit = self.tolerance + self.emission_interval * 1e-6
+    
+    def _decide(self, tat: Optional[float], now: float) -> tuple:
+        """Apply GCRA to the stored theoretical arrival time."""
+        if tat is None or tat < now:
+            tat = now
+        if tat - now > self._limit:
+            return False, tat
+        return True, tat + self.emission_interval
+    
+    def _is_idle(self, tat: float, now: float) -> bool:
+        """A key is idle once its TAT has passed (full burst available)."""
+        return tat <= now
+    
+    def get_remaining(self, user_id: str) -> int:
+        """Get how many requests could be made right now (lock-free)."""
+        tat = self._shards[self._shard_index(user_id)].get(user_id)
+        now = self.clock()
+        if tat is None or tat <= now:
+            return self.burst
+        return max(0, int((now + self._limit - tat) / self.emission_interval) + 1)
+    
+    def retry_after(self, user_id: str) -> float:
+        """Get seconds until the next request would be allowed (lock-free)."""
+        tat = self._shards[self._shard_index(user_id)].get(user_id)
+        if tat is None:
+            return 0.0
+        return max(0.0, tat - self._limit - self.clock())
+
+
+class SlidingWindowCounterLimiter(StripedRateLimiter):
+    """
+    Sliding Window Counter Rate Limiter.
+    
+    Algorithm:
+    - Time is split into fixed windows, each key keeps two counters:
+      the current window and the previous window
+    - The sliding count is approximated as
+      previous * (1 - fraction of current window elapsed) + current
+    - Request is allowed if the approximation is under the limit
+    
+    Advantages:
+    - Constant memory per key (vs. one timestamp per request)
+    - Smooths the boundary bursts of a fixed window counter
+    
+    Disadvantages:
+    - Approximate: assumes the previous window was evenly spread
+    """
+    
+    def __init__(
+        self,
+        max_requests: int,
+        window_size: float,
+        stripes: int = 64,
+        clock: Callable[[], float] = time.time
+    ):
+        """
+        Initialize sliding window counter limiter.
+        
+        Args:
+            max_requests: Maximum requests allowed in window
+            window_size: Time window size in seconds
+            stripes: Number of lock stripes
+            clock: Time source in seconds
+        """
+        super().__init__(stripes, clock)
+        self.max_requests = max_requests
+        self.window_size = window_size
+    
+    def _roll(self, state: Optional[tuple], now: float) -> tuple:
+        """Advance (window, current, previous) to the window containing now."""
+        window = int(now // self.window_size)
+        if state is None:
+            return window, 0, 0
+        last_window, current, previous = state
+        if window == last_window:
+            return state
+        if window == last_window + 1:
+            return window, 0, current
+        return window, 0, 0
+    
+    def _estimate(self, state: tuple, now: float) -> float:
+        """Weighted request count over the sliding window."""
+        window, current, previous = state
+        elapsed = now / self.window_size - window
+        return previous * (1.0 - elapsed) + current
+    
+    def _decide(self, state: Optional[tuple], now: float) -> tuple:
+        """Apply the two-counter approximation."""
+        state = self._roll(state, now)
+        if self._estimate(state, now) >= self.max_requests:
+            return False, state
+        window, current, previous = state
+        return True, (window, current + 1, previous)
+    
+    def _is_idle(self, state: tuple, now: float) -> bool:
+        """A key is idle once both of its windows are in the past."""
+        return state[0] < int(now // self.window_size) - 1
+    
+    def get_request_count(self, user_id: str) -> float:
+        """Get the approximate request count in the window (lock-free)."""
+        state = self._shards[self._shard_index(user_id)].get(user_id)
+        if state is None:
+            return 0.0
+        now = self.clock()
+        return self._estimate(self._roll(state, now), now)
+
+
 if __name__ == "__main__":
     print("Rate Limiter Examples")
     print("=" * 60)
@@ -370,3 +651,10 @@ if __name__ == "__main__":
         count = limiter.get_request_count("user2")
         print(f"  Request {i+1}: {'ALLOWED' if allowed else 'DENIED'} (count: {count})")
         time.sleep(0.3)
+    
+    # GCRA batch example
+    print("\n3. GCRA (5 requests/sec, burst 5) with allow_many")
+    limiter = GCRALimiter(rate=5, period=1.0)
+    decisions = limiter.allow_many(["user3"] * 8)
+    print(f"  Decisions: {['ALLOWED' if d else 'DENIED' for d in decisions]}")
+    print(f"  Retry after: {limiter.retry_after('user3'):.2f}s")
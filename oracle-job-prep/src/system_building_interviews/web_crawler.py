@@ -9,16 +9,81 @@ A production-ready web crawler that demonstrates:
 - URL deduplication and normalization
 - Respectful crawling with delays
 - Error handling and retries
+- Asyncio crawling with per-host politeness and a compact visited set
 """
 
-from typing import Set, List, Deque, Optional, Callable
+from typing import Set, List, Deque, Optional, Callable, Dict, Tuple, Any
 from collections import deque
+from concurrent.futures import Executor
 from urllib.parse import urljoin, urlparse
+import asyncio
+import hashlib
+import heapq
+import inspect
+import math
 import threading
 import time
 import re
 
 
+HREF_PATTERN = re.compile(r'href=["\']([^"\']+)["\']')
+
+
+def normalize_url(url: str) -> str:
+    """
+    Normalize URL by removing fragments and trailing slashes.
+    
+    Args:
+        url: URL to normalize
+        
+    Returns:
+        Normalized URL
+    """
+    parsed = urlparse(url)
+    
+    # Remove fragment
+    normalized = f"{parsed.scheme}://{parsed.netloc}{parsed.path}"
+    
+    # Remove trailing slash (except for root)
+    if normalized.endswith('/') and len(parsed.path) > 1:
+        normalized = normalized[:-1]
+    
+    return normalized
+
+
+def extract_links(
+    base_url: str,
+    content: str,
+    start_domain: Optional[str] = None
+) -> List[str]:
+    """
+    Extract and normalize links from HTML content.
+    
+    Module-level so it can run in a thread or process pool.
+    
+    Args:
+        base_url: Base URL for resolving relative links
+        content: HTML content
+        start_domain: If given, only keep links on this domain
+        
+    Returns:
+        List of normalized absolute URLs
+    """
+    links = []
+    
+    for href in HREF_PATTERN.findall(content):
+        # Convert to absolute URL and normalize
+        normalized_url = normalize_url(urljoin(base_url, href))
+        
+        # Check domain restriction
+        if start_domain is not None and urlparse(normalized_url).netloc != start_domain:
+            continue
+        
+        links.append(normalized_url)
+    
+    return links
+
+
 class WebCrawler:
     """
     Multi-threaded web crawler with BFS traversal.
@@ -165,57 +230,407 @@ class WebCrawler:
         Returns:
             List of normalized absolute URLs
         """
-        links = []
+        return extract_links(
+            base_url,
+            content,
+            self.start_domain if self.same_domain_only else None
+        )
+    
+    def _normalize_url(self, url: str) -> str:
+        """Normalize URL by removing fragments and trailing slashes."""
+        return normalize_url(url)
+    
+    def _get_domain(self, url: str) -> str:
+        """Extract domain from URL."""
+        parsed = urlparse(url)
+        return parsed.netloc
+    
+    def stop(self):
+        """Signal all workers to stop."""
+        self.stop_event.set()
+
+
+class URLFingerprintSet:
+    """
+    Visited set storing 64-bit URL fingerprints instead of URL strings.
+    
+    A blake2b digest truncated to 8 bytes is stored as an int, which is a
+    fraction of the size of a typical URL string. Collisions are possible
+    but vanishingly rare (~n^2 / 2^65).
+    """
+    
+    def __init__(self):
+        """Initialize empty set."""
+        self._fingerprints: Set[int] = set()
+    
+    @staticmethod
+    def fingerprint(url: str) -> int:
+        """64-bit fingerprint of a URL."""
+        return int.from_bytes(hashlib.blake2b(url.encode("utf-8"), digest_size=8).digest(), "little")
+    
+    def add_if_new(self, url: str) -> bool:
+        """
+        Add a URL if it has not been seen.
         
-        # Simple regex to extract href attributes
-        href_pattern = r'href=["\']([^"\']+)["\']'
-        matches = re.findall(href_pattern, content)
+        Returns:
+            True if the URL was new
+        """
+        fingerprint = self.fingerprint(url)
+        if fingerprint in self._fingerprints:
+            return False
+        self._fingerprints.add(fingerprint)
+        return True
+    
+    def __contains__(self, url: str) -> bool:
+        """Check whether a URL has been seen."""
+        return self.fingerprint(url) in self._fingerprints
+    
+    def __len__(self) -> int:
+        """Number of distinct URLs seen."""
+        return len(self._fingerprints)
+
+
+class BloomFilter:
+    """
+    Bloom filter visited set with a fixed memory footprint.
+    
+    Sized for ``capacity`` URLs at the given false positive rate; a false
+    positive means a new URL is wrongly treated as visited and skipped.
+    """
+    
+    def __init__(self, capacity: int, error_rate: float = 1e-4):
+        """
+        Initialize bloom filter.
         
-        for href in matches:
-            # Convert to absolute URL
-            absolute_url = urljoin(base_url, href)
-            
-            # Normalize URL
-            normalized_url = self._normalize_url(absolute_url)
-            
-            # Check domain restriction
-            if self.same_domain_only:
-                if self._get_domain(normalized_url) != self.start_domain:
+        Args:
+            capacity: Expected number of URLs
+            error_rate: Target false positive rate at capacity
+        """
+        self.num_bits = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+    
+    def _positions(self, url: str) -> List[int]:
+        """Bit positions via double hashing of one 128-bit digest."""
+        digest = hashlib.blake2b(url.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+    
+    def add_if_new(self, url: str) -> bool:
+        """
+        Add a URL if it has (probably) not been seen.
+        
+        Returns:
+            True if the URL was new
+        """
+        new = False
+        for position in self._positions(url):
+            byte, bit = divmod(position, 8)
+            if not self.bits[byte] & (1 << bit):
+                self.bits[byte] |= 1 << bit
+                new = True
+        if new:
+            self.count += 1
+        return new
+    
+    def __contains__(self, url: str) -> bool:
+        """Check whether a URL has (probably) been seen."""
+        return all(
+            self.bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(url)
+        )
+    
+    def __len__(self) -> int:
+        """Number of URLs added."""
+        return self.count
+
+
+class HostFrontier:
+    """
+    Crawl frontier with per-host politeness.
+    
+    Each host has its own FIFO of (url, depth). Hosts with pending URLs sit
+    in a heap keyed by the time they may next be fetched, so the delay is
+    applied per host rather than before every fetch. A host is checked out
+    while one of its URLs is in flight and rescheduled ``delay`` seconds
+    after the fetch completes.
+    
+    The frontier tracks in-flight fetches, so workers wait for new links
+    instead of exiting when the queue is momentarily empty, and stop only
+    at quiescence (nothing queued and nothing in flight).
+    """
+    
+    def __init__(self, delay: float):
+        """
+        Initialize frontier.
+        
+        Args:
+            delay: Minimum seconds between fetches to the same host
+        """
+        self.delay = delay
+        self.queues: Dict[str, Deque[Tuple[str, int]]] = {}
+        self.ready: List[Tuple[float, int, str]] = []
+        self.checked_out: Set[str] = set()
+        self.next_allowed: Dict[str, float] = {}
+        self.in_flight = 0
+        self._counter = 0
+        self._changed = asyncio.Condition()
+    
+    def _schedule(self, host: str):
+        """Put a host with pending URLs on the ready heap."""
+        self._counter += 1
+        heapq.heappush(self.ready, (self.next_allowed.get(host, 0.0), self._counter, host))
+    
+    async def put(self, url: str, depth: int):
+        """Queue a URL."""
+        host = urlparse(url).netloc
+        queue = self.queues.get(host)
+        if queue is None:
+            queue = self.queues[host] = deque()
+        queue.append((url, depth))
+        if len(queue) == 1 and host not in self.checked_out:
+            self._schedule(host)
+        async with self._changed:
+            self._changed.notify()
+    
+    async def get(self) -> Optional[Tuple[str, str, int]]:
+        """
+        Wait for the next politely fetchable URL.
+        
+        Returns:
+            (host, url, depth), or None once the crawl is quiescent
+        """
+        loop = asyncio.get_running_loop()
+        async with self._changed:
+            while True:
+                if not self.ready:
+                    if self.in_flight == 0:
+                        self._changed.notify_all()
+                        return None
+                    await self._changed.wait()
                     continue
-            
-            links.append(normalized_url)
+                
+                ready_at, _, host = self.ready[0]
+                wait = ready_at - loop.time()
+                if wait > 0:
+                    try:
+                        await asyncio.wait_for(self._changed.wait(), wait)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+                
+                heapq.heappop(self.ready)
+                url, depth = self.queues[host].popleft()
+                self.checked_out.add(host)
+                self.in_flight += 1
+                return host, url, depth
+    
+    async def done(self, host: str):
+        """Mark a fetch as finished and reschedule its host."""
+        loop = asyncio.get_running_loop()
+        self.checked_out.discard(host)
+        self.next_allowed[host] = loop.time() + self.delay
+        if self.queues[host]:
+            self._schedule(host)
+        else:
+            del self.queues[host]
+        async with self._changed:
+            self.in_flight -= 1
+            self._changed.notify_all()
+
+
+class AsyncWebCrawler:
+    """
+    Asyncio web crawler with per-host politeness.
+    
+    Features:
+    - Many concurrent fetches on one event loop (async or sync fetchers)
+    - Per-host ready-time heap instead of a global sleep per fetch
+    - Workers stay alive until the frontier is quiescent
+    - Compact visited set (64-bit fingerprints, or a bloom filter)
+    - Link extraction off the event loop in an executor
+    """
+    
+    def __init__(
+        self,
+        max_depth: int = 3,
+        max_workers: int = 50,
+        delay: float = 0.1,
+        same_domain_only: bool = True,
+        bloom_capacity: Optional[int] = None,
+        extract_executor: Optional[Executor] = None
+    ):
+        """
+        Initialize the async crawler.
         
-        return links
+        Args:
+            max_depth: Maximum depth to crawl
+            max_workers: Number of concurrent fetch tasks
+            delay: Delay between requests to the same host (in seconds)
+            same_domain_only: Only crawl URLs from the start domain
+            bloom_capacity: Use a bloom filter sized for this many URLs
+                instead of the fingerprint set
+            extract_executor: Executor for link extraction (None uses the
+                loop's default thread pool)
+        """
+        self.max_depth = max_depth
+        self.max_workers = max_workers
+        self.delay = delay
+        self.same_domain_only = same_domain_only
+        self.extract_executor = extract_executor
+        self.visited = (
+            BloomFilter(bloom_capacity) if bloom_capacity else URLFingerprintSet()
+        )
+        self.results: List[dict] = []
+        self.errors: List[Tuple[str, str]] = []
     
-    def _normalize_url(self, url: str) -> str:
+    async def crawl_async(
+        self,
+        start_url: str,
+        fetch_callback: Callable[[str], Any]
+    ) -> List[dict]:
         """
-        Normalize URL by removing fragments and trailing slashes.
+        Crawl from the given URL on the running event loop.
         
         Args:
-            url: URL to normalize
+            start_url: URL to start crawling from
+            fetch_callback: Fetches a URL and returns a dict with
+                'content' and 'title'; may be async or blocking (blocking
+                callbacks run in a thread)
             
         Returns:
-            Normalized URL
+            List of crawled pages with metadata
         """
-        parsed = urlparse(url)
+        self.start_domain = urlparse(start_url).netloc
+        frontier = HostFrontier(self.delay)
+        
+        start_url = normalize_url(start_url)
+        self.visited.add_if_new(start_url)
+        await frontier.put(start_url, 0)
         
-        # Remove fragment
-        normalized = f"{parsed.scheme}://{parsed.netloc}{parsed.path}"
+        workers = [
+            asyncio.create_task(self._worker(frontier, fetch_callback))
+            for _ in range(self.max_workers)
+        ]
+        await asyncio.gather(*workers)
         
-        # Remove trailing slash (except for root)
-        if normalized.endswith('/') and len(parsed.path) > 1:
-            normalized = normalized[:-1]
+        return self.results
+    
+    def crawl(self, start_url: str, fetch_callback: Callable[[str], Any]) -> List[dict]:
+        """Crawl from the given URL in a new event loop."""
+        return asyncio.run(self.crawl_async(start_url, fetch_callback))
+    
+    async def _worker(self, frontier: HostFrontier, fetch_callback: Callable[[str], Any]):
+        """Fetch URLs until the frontier is quiescent."""
+        loop = asyncio.get_running_loop()
+        domain = self.start_domain if self.same_domain_only else None
         
-        return normalized
+        while True:
+            item = await frontier.get()
+            if item is None:
+                return
+            host, url, depth = item
+            
+            try:
+                if inspect.iscoroutinefunction(fetch_callback):
+                    page_data = await fetch_callback(url)
+                else:
+                    page_data = await loop.run_in_executor(None, fetch_callback, url)
+                
+                links = await loop.run_in_executor(
+                    self.extract_executor, extract_links,
+                    url, page_data.get('content', ''), domain
+                )
+                
+                self.results.append({
+                    'url': url,
+                    'depth': depth,
+                    'title': page_data.get('title', ''),
+                    'links_found': len(links)
+                })
+                
+                if depth < self.max_depth:
+                    for link in links:
+                        if self.visited.add_if_new(link):
+                            await frontier.put(link, depth + 1)
+            except Exception as e:
+                self.errors.append((url, str(e)))
+            finally:
+                await frontier.done(host)
+
+
+class FakeSite:
+    """
+    Deterministic in-memory site for testing and benchmarking crawlers.
     
-    def _get_domain(self, url: str) -> str:
-        """Extract domain from URL."""
-        parsed = urlparse(url)
-        return parsed.netloc
+    Page i on host (i % num_hosts) links to ``links_per_page`` other pages
+    chosen by a fixed stride, so every page is reachable from page 0.
+    """
     
-    def stop(self):
-        """Signal all workers to stop."""
-        self.stop_event.set()
+    def __init__(
+        self,
+        num_pages: int = 5000,
+        links_per_page: int = 5,
+        num_hosts: int = 10,
+        latency: float = 0.0
+    ):
+        """
+        Initialize fake site.
+        
+        Args:
+            num_pages: Total number of pages
+            links_per_page: Outgoing links per page
+            num_hosts: Number of hosts pages are spread over
+            latency: Simulated fetch latency (seconds)
+        """
+        self.num_pages = num_pages
+        self.links_per_page = links_per_page
+        self.num_hosts = num_hosts
+        self.latency = latency
+        self.fetches = 0
+    
+    def url(self, page: int) -> str:
+        """URL of a page."""
+        return f"https://host{page % self.num_hosts}.example.com/page/{page}"
+    
+    def _page(self, url: str) -> dict:
+        """Render a page."""
+        self.fetches += 1
+        page = int(url.rsplit("/", 1)[1])
+        links = "".join(
+            f'<a href="{self.url((page * 7 + k + 1) % self.num_pages)}">l</a>'
+            for k in range(self.links_per_page)
+        )
+        return {'content': f'<html><body>{links}</body></html>', 'title': f'Page {page}'}
+    
+    async def fetch(self, url: str) -> dict:
+        """Async fetch with simulated latency."""
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return self._page(url)
+
+
+def benchmark_crawl(num_pages: int = 5000, num_hosts: int = 10, latency: float = 0.01) -> dict:
+    """
+    Crawl a FakeSite with the async engine.
+    
+    Args:
+        num_pages: Pages on the fake site
+        num_hosts: Hosts the pages are spread over
+        latency: Simulated fetch latency (seconds)
+        
+    Returns:
+        Dictionary with page count and elapsed seconds
+    """
+    site = FakeSite(num_pages, num_hosts=num_hosts, latency=latency)
+    crawler = AsyncWebCrawler(
+        max_depth=num_pages, max_workers=2 * num_hosts, delay=0.0, same_domain_only=False
+    )
+    start = time.perf_counter()
+    results = crawler.crawl(site.url(0), site.fetch)
+    return {'pages': len(results), 'seconds': time.perf_counter() - start}
 
 
 class DistributedCrawler:
@@ -282,3 +697,8 @@ if __name__ == "__main__":
     print(f"\nCrawled {len(results)} pages:")
     for result in results[:10]:  # Show first 10
         print(f"  Depth {result['depth']}: {result['url']} ({result['links_found']} links)")
+    
+    # Async crawl of a fake multi-host site
+    print("\nAsync crawl benchmark (FakeSite, 5000 pages, 10 hosts):")
+    stats = benchmark_crawl()
+    print(f"  Crawled {stats['pages']} pages in {stats['seconds']:.2f}s")
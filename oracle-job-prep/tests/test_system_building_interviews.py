@@ -9,9 +9,12 @@ import time
 import threading
 import os
 import tempfile
-from src.system_building_interviews.web_crawler import WebCrawler
+from src.system_building_interviews.web_crawler import (
+    WebCrawler, AsyncWebCrawler, FakeSite
+)
 from src.system_building_interviews.rate_limiter import (
-    TokenBucketLimiter, SlidingWindowLimiter, FixedWindowCounterLimiter
+    TokenBucketLimiter, SlidingWindowLimiter, FixedWindowCounterLimiter,
+    GCRALimiter, SlidingWindowCounterLimiter
 )
 from src.system_building_interviews.chat_app import ChatServer, ChatClient
 from src.system_building_interviews.banking_system import (
@@ -26,10 +29,10 @@ from src.system_building_interviews.k8s_scheduler import (
 )
 from src.system_building_interviews.file_system import FileSystem
 from src.system_building_interviews.log_aggregator import (
-    LogAggregator, LogEntry, LogLevel
+    LogAggregator, LogEntry, LogLevel, LogIngestionPipeline, LogSegment
 )
 from src.system_building_interviews.iterator_snapshot import (
-    ImmutableDataStructure, SnapshotIterator, VersionedList
+    ImmutableDataStructure, SnapshotIterator, VersionedList, PersistentMap
 )
 from src.system_building_interviews.functional_pipeline import (
     LazyPipeline, Pipeline
@@ -52,6 +55,28 @@ class TestWebCrawler(unittest.TestCase):
         results = crawler.crawl("https://example.com", fetch)
         self.assertGreater(len(results), 0)
         self.assertEqual(results[0]['url'], "https://example.com")
+    
+    def test_async_crawl_politeness(self):
+        """Test async crawl reaches every page and spaces fetches per host."""
+        site = FakeSite(num_pages=60, links_per_page=3, num_hosts=3, latency=0.001)
+        fetch_times = {}
+        
+        async def fetch(url):
+            host = url.split("/")[2]
+            fetch_times.setdefault(host, []).append(time.monotonic())
+            return await site.fetch(url)
+        
+        crawler = AsyncWebCrawler(
+            max_depth=100, max_workers=10, delay=0.02, same_domain_only=False
+        )
+        results = crawler.crawl(site.url(0), fetch)
+        
+        self.assertEqual(len(results), 60)
+        self.assertEqual(len(crawler.visited), 60)
+        self.assertEqual(len(fetch_times), 3)
+        for times in fetch_times.values():
+            gaps = [b - a for a, b in zip(times, times[1:])]
+            self.assertGreaterEqual(min(gaps), 0.02)
 
 
 class TestRateLimiter(unittest.TestCase):
@@ -82,6 +107,40 @@ class TestRateLimiter(unittest.TestCase):
         # After window, should succeed
         time.sleep(1.1)
         self.assertTrue(limiter.allow_request("user1"))
+    
+    def test_gcra(self):
+        """Test GCRA limiter bursts, spacing and idle expiry."""
+        now = [100.0]
+        limiter = GCRALimiter(rate=5, period=1.0, clock=lambda: now[0])
+        
+        # Full burst in one batch, then rate limited
+        decisions = limiter.allow_many(["user1"] * 7 + ["user2"])
+        self.assertEqual(decisions, [True] * 5 + [False, False, True])
+        
+        # One emission interval later, exactly one more request fits
+        now[0] += 0.2
+        self.assertTrue(limiter.allow_request("user1"))
+        self.assertFalse(limiter.allow_request("user1"))
+        
+        # Idle keys are dropped without changing behaviour
+        now[0] += 10
+        self.assertEqual(limiter.expire_idle(), 2)
+        self.assertEqual(limiter.tracked_keys(), 0)
+        self.assertEqual(limiter.get_remaining("user1"), 5)
+    
+    def test_sliding_window_counter(self):
+        """Test two-counter sliding window approximation."""
+        now = [10.0]
+        limiter = SlidingWindowCounterLimiter(
+            max_requests=4, window_size=1.0, clock=lambda: now[0]
+        )
+        
+        self.assertEqual(sum(limiter.allow_many(["user1"] * 6)), 4)
+        
+        # Halfway through the next window half the old count still applies
+        now[0] = 11.5
+        self.assertEqual(limiter.get_request_count("user1"), 2.0)
+        self.assertEqual(sum(limiter.allow_many(["user1"] * 6)), 2)
 
 
 class TestChatApp(unittest.TestCase):
@@ -218,6 +277,42 @@ class TestKubernetesScheduler(unittest.TestCase):
         scheduled = scheduler.schedule_pending_pods()
         self.assertEqual(len(scheduled), 1)
         self.assertIn("pod-1", scheduled)
+    
+    def test_indexed_and_batch_scheduling(self):
+        """Test selector/taint filtering and batch mode placements."""
+        def build():
+            scheduler = KubernetesScheduler()
+            for i in range(6):
+                scheduler.add_node(Node(
+                    name=f"node-{i}",
+                    total_resources=Resources(cpu_millicores=2000, memory_mb=4096),
+                    labels={"zone": "a" if i % 2 else "b"},
+                    taints={"gpu"} if i == 5 else set()
+                ))
+            for i in range(20):
+                scheduler.submit_pod(Pod(
+                    name=f"pod-{i}",
+                    namespace="default",
+                    resource_requests=Resources(cpu_millicores=500, memory_mb=512),
+                    resource_limits=Resources(cpu_millicores=500, memory_mb=512),
+                    node_selector={"zone": "a"} if i % 3 == 0 else {},
+                    tolerations={"gpu"} if i % 4 == 0 else set(),
+                    affinity=["b"] if i % 5 == 0 else []
+                ))
+            return scheduler
+        
+        serial = build()
+        batch = build()
+        serial_scheduled = serial.schedule_pending_pods()
+        batch_scheduled = batch.schedule_pending_pods(batch=True)
+        
+        self.assertEqual(serial_scheduled, batch_scheduled)
+        for name, pod in serial.pods.items():
+            self.assertEqual(pod.assigned_node, batch.pods[name].assigned_node)
+            if pod.assigned_node == "node-5":
+                self.assertIn("gpu", pod.tolerations)
+            if pod.node_selector and pod.assigned_node:
+                self.assertEqual(serial.nodes[pod.assigned_node].labels["zone"], "a")
 
 
 class TestFileSystem(unittest.TestCase):
@@ -273,6 +368,95 @@ class TestLogAggregator(unittest.TestCase):
         errors = aggregator.query_recent(10, level=LogLevel.ERROR)
         self.assertEqual(len(errors), 1)
         self.assertEqual(errors[0].message, "Error occurred")
+    
+    def test_segment_spill(self):
+        """Test old logs spill to disk segments and stay queryable."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            aggregator = LogAggregator(max_size=10, segment_dir=tmpdir, segment_size=5)
+            
+            for i in range(50):
+                level = LogLevel.ERROR if i % 10 == 0 else LogLevel.INFO
+                aggregator.ingest(LogEntry(float(i), level, f"s{i % 2}", f"msg {i}"))
+            
+            self.assertGreater(len(aggregator.segments), 0)
+            self.assertEqual(aggregator.size(), 50)
+            
+            # Range spanning cold segments and the hot tail
+            results = aggregator.query_time_range(5, 45)
+            self.assertEqual([log.message for log in results], [f"msg {i}" for i in range(5, 46)])
+            
+            errors = aggregator.query_time_range(0, 49, level=LogLevel.ERROR, source="s0")
+            self.assertEqual(len(errors), 5)
+            
+            streamed = list(aggregator.stream())
+            self.assertEqual([log.timestamp for log in streamed], [float(i) for i in range(50)])
+            
+            # Statistics and search include the sealed logs
+            self.assertEqual(aggregator.count_by_level()["ERROR"], 5)
+            self.assertEqual(aggregator.count_by_level()["INFO"], 45)
+            self.assertEqual(aggregator.count_by_source(), {"s0": 25, "s1": 25})
+            found = aggregator.search("MSG 1")
+            self.assertEqual([log.message for log in found], ["msg 1"] + [f"msg {i}" for i in range(10, 20)])
+            aggregator.close()
+            
+            # Segments are reopened on restart; stray files are ignored
+            with open(os.path.join(tmpdir, "notes.logseg"), "w") as f:
+                f.write("not a segment")
+            reopened = LogAggregator(max_size=10, segment_dir=tmpdir)
+            self.assertEqual(len(reopened.query_time_range(0, 9)), 10)
+            self.assertEqual(sum(reopened.count_by_source().values()), 40)
+            reopened.close()
+    
+    def test_segment_inflates_only_queried_blocks(self):
+        """Test a narrow query decompresses only the blocks it reads."""
+        rows = LogSegment.BLOCK_ROWS
+        entries = [
+            LogEntry(float(i), LogLevel.INFO, f"s{i % 3}", f"msg {i}", {"i": i} if i % 7 == 0 else None)
+            for i in range(3 * rows + 10)
+        ]
+        with tempfile.TemporaryDirectory() as tmpdir:
+            segment = LogSegment.write(os.path.join(tmpdir, "a.logseg"), entries)
+            inflated = []
+            original = segment._inflate
+            segment._inflate = lambda name, block: inflated.append(block) or original(name, block)
+            
+            results = segment.query_time_range(rows + 5, rows + 20)
+            self.assertEqual([log.message for log in results], [f"msg {i}" for i in range(rows + 5, rows + 21)])
+            self.assertEqual(set(inflated), {1})
+            
+            # A range across a block boundary reads exactly the two blocks
+            inflated.clear()
+            results = segment.query_time_range(2 * rows - 3, 2 * rows + 2, source="s1")
+            self.assertEqual(set(inflated), {1, 2})
+            self.assertEqual([log.timestamp for log in results],
+                             [float(i) for i in range(2 * rows - 3, 2 * rows + 3) if i % 3 == 1])
+            
+            # Search skips blocks whose messages cannot match
+            inflated.clear()
+            results = segment.search(f"MSG {rows + 5}")
+            self.assertEqual([log.timestamp for log in results], [float(rows + 5)])
+            # messages of every block; the other four columns of block 1 only
+            self.assertEqual(sorted(inflated), [0, 1, 1, 1, 1, 1, 2, 3])
+            self.assertEqual(segment.count_by_source(), {"s0": rows + 4, "s1": rows + 3, "s2": rows + 3})
+            
+            self.assertEqual([log.to_dict() for log in segment], [log.to_dict() for log in entries])
+            segment.close()
+    
+    def test_ingestion_pipeline(self):
+        """Test parsing raw lines through the process pool."""
+        aggregator = LogAggregator()
+        pipeline = LogIngestionPipeline(aggregator, max_workers=2, chunk_size=3)
+        
+        lines = [
+            "100.0 INFO web Started",
+            "2024-01-01T00:00:00 WARNING db Slow query",
+            "not a log line",
+            "101.5 ERROR web Request failed",
+        ]
+        parsed, malformed = pipeline.ingest_lines(lines)
+        
+        self.assertEqual((parsed, malformed), (3, 1))
+        self.assertEqual(aggregator.query_time_range(100, 102)[1].message, "Request failed")
 
 
 class TestIteratorSnapshot(unittest.TestCase):
@@ -306,6 +490,39 @@ class TestIteratorSnapshot(unittest.TestCase):
         # Iterator should still see old version
         items = list(iterator)
         self.assertEqual(len(items), 2)
+    
+    def test_persistent_map_sharing(self):
+        """Test HAMT versions stay independent and compaction keeps IDs."""
+        base = PersistentMap({i: i for i in range(1000)})
+        updated = base.set(5, "five").delete(7)
+        
+        self.assertEqual(base[5], 5)
+        self.assertIn(7, base)
+        self.assertEqual(updated[5], "five")
+        self.assertNotIn(7, updated)
+        self.assertEqual((len(base), len(updated)), (1000, 999))
+        self.assertIs(updated.delete("missing"), updated)
+        
+        data = ImmutableDataStructure({"a": 1})
+        for i in range(20):
+            data.set("a", i)
+        data.delete("a")
+        data.compact(keep_versions=3)
+        
+        self.assertEqual(data.get("a", version=19), 18)
+        self.assertIsNone(data.get("a", version=2))
+        self.assertEqual(list(SnapshotIterator(data, version=20)), [("a", 19)])
+    
+    def test_compact_keeps_current_version(self):
+        """Test compact(keep_versions=0) keeps the current version."""
+        data = ImmutableDataStructure({"a": 1})
+        data.set("a", 2)
+        data.compact(keep_versions=0)
+        
+        self.assertEqual(data.get_version_count(), 1)
+        self.assertEqual(data.get("a"), 2)
+        data.set("b", 3)
+        self.assertEqual(data.snapshot(), {"a": 2, "b": 3})
 
 
 class TestFunctionalPipeline(unittest.TestCase):
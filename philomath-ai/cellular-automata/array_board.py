@@ -0,0 +1,168 @@
+"""
+ArrayBoard
+==========
+NumPy-backed board: a ``uint8`` grid with a one-cell halo and double
+buffering, so a whole generation can be computed with array arithmetic.
+
+Layout
+------
+Two padded buffers of shape ``(rows + 2, cols + 2)`` are kept.  The interior
+``[1:-1, 1:-1]`` of the *front* buffer holds the current states; the halo
+holds the out-of-board neighbours (zeros for ``fixed``, copies of the
+opposite edges for ``wrap``).  A step reads the front buffer, writes the
+interior of the *back* buffer, then ``swap()`` exchanges them – no new
+arrays are allocated per generation.
+
+``ArrayBoard`` offers the same accessors as ``Board`` (``get``, ``set``,
+``to_list``, ``copy``, ``rows``, ``cols``, ``boundary``) so rules and
+renderers can use either.
+
+Requires: numpy
+"""
+
+from __future__ import annotations
+from typing import List
+
+import numpy as np
+
+from board import Board
+
+
+class ArrayBoard:
+    """2-D ``uint8`` state grid with halo and double buffering."""
+
+    FIXED = Board.FIXED
+    WRAP = Board.WRAP
+
+    def __init__(self, rows: int, cols: int, boundary: str = FIXED, default: int = 0):
+        if boundary not in (self.FIXED, self.WRAP):
+            raise ValueError(f"boundary must be '{self.FIXED}' or '{self.WRAP}'")
+        self.rows = rows
+        self.cols = cols
+        self.boundary = boundary
+        self._front = np.zeros((rows + 2, cols + 2), dtype=np.uint8)
+        self._back = np.zeros((rows + 2, cols + 2), dtype=np.uint8)
+        if default:
+            self._front[1:-1, 1:-1] = default
+        self._halo_dirty = True
+
+    # ------------------------------------------------------------------
+    # Factory helpers / conversion
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def from_array(cls, cells, boundary: str = FIXED) -> "ArrayBoard":
+        cells = np.asarray(cells)
+        if cells.size and (cells.min() < 0 or cells.max() > 255):
+            raise ValueError("ArrayBoard states must be in the range 0..255")
+        board = cls(cells.shape[0], cells.shape[1], boundary)
+        board._front[1:-1, 1:-1] = cells
+        return board
+
+    @classmethod
+    def from_buffers(cls, front: np.ndarray, back: np.ndarray,
+                     boundary: str = FIXED) -> "ArrayBoard":
+        """
+        Wrap two existing padded ``uint8`` buffers (e.g. views of shared
+        memory) without copying; *front* holds the current states.
+        """
+        if front.shape != back.shape or front.dtype != np.uint8 or back.dtype != np.uint8:
+            raise ValueError("buffers must be uint8 arrays of the same padded shape")
+        board = cls.__new__(cls)
+        board.rows, board.cols = front.shape[0] - 2, front.shape[1] - 2
+        board.boundary = boundary
+        board._front, board._back = front, back
+        board._halo_dirty = True
+        return board
+
+    @classmethod
+    def from_list(cls, data: List[List[int]], boundary: str = FIXED) -> "ArrayBoard":
+        return cls.from_board(Board.from_list(data, boundary))
+
+    @classmethod
+    def from_board(cls, board) -> "ArrayBoard":
+        if isinstance(board, ArrayBoard):
+            return board.copy()
+        return cls.from_array(np.array(board.to_list(), dtype=np.int64).reshape(board.rows, board.cols),
+                              boundary=board.boundary)
+
+    def to_board(self) -> Board:
+        return Board.from_list(self.to_list(), boundary=self.boundary)
+
+    # ------------------------------------------------------------------
+    # Buffers
+    # ------------------------------------------------------------------
+
+    @property
+    def cells(self) -> np.ndarray:
+        """Current states (a view, shape ``(rows, cols)``)."""
+        return self._front[1:-1, 1:-1]
+
+    @property
+    def padded(self) -> np.ndarray:
+        """Current states with an up-to-date one-cell halo."""
+        if self._halo_dirty:
+            self.fill_halo()
+        return self._front
+
+    @property
+    def next_cells(self) -> np.ndarray:
+        """Interior of the back buffer, where the next generation is written."""
+        return self._back[1:-1, 1:-1]
+
+    def fill_halo(self) -> None:
+        """Refresh the front buffer's halo for the boundary mode."""
+        buf = self._front
+        if self.boundary == self.WRAP:
+            buf[0, 1:-1] = buf[-2, 1:-1]
+            buf[-1, 1:-1] = buf[1, 1:-1]
+            buf[:, 0] = buf[:, -2]
+            buf[:, -1] = buf[:, 1]
+        else:
+            buf[0, :] = 0
+            buf[-1, :] = 0
+            buf[:, 0] = 0
+            buf[:, -1] = 0
+        self._halo_dirty = False
+
+    def swap(self) -> None:
+        """Make the back buffer current (after a step wrote ``next_cells``)."""
+        self._front, self._back = self._back, self._front
+        self.fill_halo()
+
+    # ------------------------------------------------------------------
+    # Accessors (Board-compatible)
+    # ------------------------------------------------------------------
+
+    def get(self, row: int, col: int) -> int:
+        if self.boundary == self.WRAP:
+            return int(self._front[row % self.rows + 1, col % self.cols + 1])
+        if 0 <= row < self.rows and 0 <= col < self.cols:
+            return int(self._front[row + 1, col + 1])
+        return 0  # fixed boundary: out-of-bounds is 0
+
+    def set(self, row: int, col: int, value: int) -> None:
+        if self.boundary == self.WRAP:
+            self._front[row % self.rows + 1, col % self.cols + 1] = value
+        elif 0 <= row < self.rows and 0 <= col < self.cols:
+            self._front[row + 1, col + 1] = value
+        self._halo_dirty = True
+
+    def to_list(self) -> List[List[int]]:
+        return self.cells.tolist()
+
+    def copy(self) -> "ArrayBoard":
+        b = ArrayBoard(self.rows, self.cols, self.boundary)
+        b._front[...] = self._front
+        b._halo_dirty = self._halo_dirty
+        return b
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, ArrayBoard):
+            return np.array_equal(self.cells, other.cells)
+        if isinstance(other, Board):
+            return self.to_list() == other.to_list()
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"ArrayBoard({self.rows}x{self.cols}, boundary={self.boundary!r})"
@@ -3,28 +3,73 @@ Engine
 ======
 Synchronous single-step engine: produces the next Board without mutating
 the current one.
+
+Two execution modes share the same ``step`` / ``run`` API:
+
+- **python** – calls ``rule.next_state`` once per cell on a ``Board``.
+- **vectorized** – works on an ``ArrayBoard`` (``uint8`` ndarray with a halo
+  and double buffering) and computes a whole generation with
+  ``rule.step_array``.  Used automatically when an ``ArrayBoard`` is passed
+  in, or for plain Boards when ``Engine(rule, vectorized=True)``.  Rules
+  without ``step_array`` fall back to per-cell evaluation on the array.
 """
 
 from __future__ import annotations
 from board import Board
 
+try:
+    from array_board import ArrayBoard
+except ImportError:  # numpy not installed: python mode only
+    ArrayBoard = None
+
 
 class Engine:
     """Drives one cellular-automaton step."""
 
-    def __init__(self, rule):
+    def __init__(self, rule, vectorized: bool = False):
+        if vectorized and ArrayBoard is None:
+            raise ImportError("vectorized mode requires numpy (pip install numpy)")
         self.rule = rule
+        self.vectorized = vectorized
+
+    def _is_array(self, board) -> bool:
+        return ArrayBoard is not None and isinstance(board, ArrayBoard)
+
+    def step(self, board):
+        """Return a NEW board (same type as *board*) for the next generation."""
+        if self._is_array(board):
+            next_board = board.copy()
+            self.advance(next_board)
+            return next_board
+        if self.vectorized:
+            return self.step(ArrayBoard.from_board(board)).to_board()
 
-    def step(self, board: Board) -> Board:
-        """Return a NEW Board representing the next generation."""
         next_board = Board(board.rows, board.cols, board.boundary)
         for r in range(board.rows):
             for c in range(board.cols):
                 next_board.set(r, c, self.rule.next_state(board, r, c))
         return next_board
 
-    def run(self, board: Board, generations: int) -> Board:
-        """Advance *board* by *generations* steps and return the final Board."""
+    def advance(self, board) -> None:
+        """Advance an ``ArrayBoard`` by one generation in place (buffer swap)."""
+        step_array = getattr(self.rule, "step_array", None)
+        if step_array is not None:
+            step_array(board.padded, board.next_cells)
+        else:
+            out = board.next_cells
+            for r in range(board.rows):
+                for c in range(board.cols):
+                    out[r, c] = self.rule.next_state(board, r, c)
+        board.swap()
+
+    def run(self, board, generations: int):
+        """Advance *board* by *generations* steps and return the final board."""
+        if self._is_array(board) or self.vectorized:
+            current = ArrayBoard.from_board(board)
+            for _ in range(generations):
+                self.advance(current)
+            return current if self._is_array(board) else current.to_board()
+
         current = board
         for _ in range(generations):
             current = self.step(current)
@@ -0,0 +1,358 @@
+"""
+HashLife
+========
+Gosper's HashLife for Conway's Game of Life (B3/S23): a hash-consed
+quadtree whose nodes memoize their own future, so repetitive patterns can
+be advanced by 2^k generations in time roughly proportional to the number
+of *distinct* sub-patterns rather than to cells × generations.
+
+Structure
+---------
+- A **node** of level ``k`` is a ``2^k × 2^k`` square made of four level
+  ``k-1`` quadrants (``nw``, ``ne``, ``sw``, ``se``); level-0 nodes are the
+  two leaves *dead* and *alive*.
+- Nodes are **interned**: ``Universe.join`` returns the existing node for a
+  given quadruple of children, so equal squares are the same object and
+  can be compared / hashed by identity.
+- ``Universe.successor(node, j)`` returns the centre ``2^(k-1)`` square of a
+  level-``k`` node advanced ``2^j`` generations (``j <= k-2``); results are
+  memoized per ``(node, j)``.
+- The intern table and memo are **bounded** (``max_nodes``): when the
+  table grows past the limit, everything not reachable from the current
+  root is dropped and the memo cleared.
+
+HashLife simulates the **unbounded plane**.  ``HashLifeEngine`` crops the
+result back to the board's window, so it matches ``Engine`` on a ``fixed``
+board as long as the pattern stays clear of the edges; ``wrap`` boundaries
+are not supported.
+"""
+
+from __future__ import annotations
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from board import Board
+from rules import LifeRule
+
+
+class Node:
+    """An interned quadtree node (treat as immutable)."""
+
+    __slots__ = ("level", "nw", "ne", "sw", "se", "population")
+
+    def __init__(self, level: int, nw, ne, sw, se, population: int):
+        self.level = level
+        self.nw = nw
+        self.ne = ne
+        self.sw = sw
+        self.se = se
+        self.population = population
+
+    def __repr__(self) -> str:
+        return f"Node(level={self.level}, population={self.population})"
+
+
+DEAD = Node(0, None, None, None, None, 0)
+ALIVE = Node(0, None, None, None, None, 1)
+
+
+class Universe:
+    """
+    A HashLife universe: an interned root node plus the absolute
+    coordinates ``(row, col)`` of its top-left cell.
+    """
+
+    def __init__(self, max_nodes: int = 1_000_000):
+        self.max_nodes = max_nodes
+        self._nodes: Dict[Tuple[Node, Node, Node, Node], Node] = {}
+        self._memo: Dict[Tuple[Node, int], Node] = {}
+        self._empty: List[Node] = [DEAD]
+        self.root: Node = self.empty(2)
+        self.origin: Tuple[int, int] = (0, 0)
+        self.generation = 0
+
+    # ------------------------------------------------------------------
+    # Node construction
+    # ------------------------------------------------------------------
+
+    def join(self, nw: Node, ne: Node, sw: Node, se: Node) -> Node:
+        """Return the canonical node with the given quadrants."""
+        key = (nw, ne, sw, se)
+        node = self._nodes.get(key)
+        if node is None:
+            node = Node(nw.level + 1, nw, ne, sw, se,
+                        nw.population + ne.population + sw.population + se.population)
+            self._nodes[key] = node
+        return node
+
+    def empty(self, level: int) -> Node:
+        """The all-dead node of *level*."""
+        while len(self._empty) <= level:
+            e = self._empty[-1]
+            self._empty.append(self.join(e, e, e, e))
+        return self._empty[level]
+
+    def centre(self, node: Node) -> Node:
+        """Embed *node* in the middle of an empty node one level up."""
+        e = self.empty(node.level - 1)
+        return self.join(
+            self.join(e, e, e, node.nw), self.join(e, e, node.ne, e),
+            self.join(e, node.sw, e, e), self.join(node.se, e, e, e),
+        )
+
+    # ------------------------------------------------------------------
+    # Evolution
+    # ------------------------------------------------------------------
+
+    def _life_4x4(self, m: Node) -> Node:
+        """Centre 2×2 of a level-2 node after one generation."""
+        cells = [
+            [m.nw.nw, m.nw.ne, m.ne.nw, m.ne.ne],
+            [m.nw.sw, m.nw.se, m.ne.sw, m.ne.se],
+            [m.sw.nw, m.sw.ne, m.se.nw, m.se.ne],
+            [m.sw.sw, m.sw.se, m.se.sw, m.se.se],
+        ]
+        out = []
+        for r in (1, 2):
+            for c in (1, 2):
+                n = sum(cells[rr][cc].population
+                        for rr in (r - 1, r, r + 1) for cc in (c - 1, c, c + 1)
+                        if (rr, cc) != (r, c))
+                alive = n == 3 or (n == 2 and cells[r][c] is ALIVE)
+                out.append(ALIVE if alive else DEAD)
+        return self.join(*out)
+
+    def successor(self, m: Node, j: Optional[int] = None) -> Node:
+        """
+        Centre ``2^(k-1)`` square of level-``k`` node *m* advanced ``2^j``
+        generations (``j`` defaults to, and is capped at, ``k - 2``).
+        """
+        if m.level < 2:
+            raise ValueError("successor needs a node of level >= 2")
+        j = m.level - 2 if j is None else min(j, m.level - 2)
+        key = (m, j)
+        cached = self._memo.get(key)
+        if cached is not None:
+            return cached
+
+        if m.population == 0:
+            result = m.nw
+        elif m.level == 2:
+            result = self._life_4x4(m)
+        else:
+            join, succ = self.join, self.successor
+            nw, ne, sw, se = m.nw, m.ne, m.sw, m.se
+            # Nine overlapping level k-1 squares, each advanced 2^j (or
+            # 2^(k-3) for the full step) to a level k-2 centre.
+            half = j if j < m.level - 2 else j - 1
+            c1 = succ(nw, half)
+            c2 = succ(join(nw.ne, ne.nw, nw.se, ne.sw), half)
+            c3 = succ(ne, half)
+            c4 = succ(join(nw.sw, nw.se, sw.nw, sw.ne), half)
+            c5 = succ(join(nw.se, ne.sw, sw.ne, se.nw), half)
+            c6 = succ(join(ne.sw, ne.se, se.nw, se.ne), half)
+            c7 = succ(sw, half)
+            c8 = succ(join(sw.ne, se.nw, sw.se, se.sw), half)
+            c9 = succ(se, half)
+            if j < m.level - 2:
+                # Already advanced 2^j: just take the centres.
+                result = join(
+                    join(c1.se, c2.sw, c4.ne, c5.nw), join(c2.se, c3.sw, c5.ne, c6.nw),
+                    join(c4.se, c5.sw, c7.ne, c8.nw), join(c5.se, c6.sw, c8.ne, c9.nw),
+                )
+            else:
+                # Second half-step of 2^(k-3) on the four combined squares.
+                result = join(
+                    succ(join(c1, c2, c4, c5), half), succ(join(c2, c3, c5, c6), half),
+                    succ(join(c4, c5, c7, c8), half), succ(join(c5, c6, c8, c9), half),
+                )
+        self._memo[key] = result
+        return result
+
+    def _is_padded(self, node: Node) -> bool:
+        """True when all live cells lie in the central half of *node*."""
+        if node.level < 3:
+            return False
+        return (node.nw.population == node.nw.se.se.population
+                and node.ne.population == node.ne.sw.sw.population
+                and node.sw.population == node.sw.ne.ne.population
+                and node.se.population == node.se.nw.nw.population)
+
+    def _expand(self) -> None:
+        shift = 1 << (self.root.level - 1)
+        self.root = self.centre(self.root)
+        self.origin = (self.origin[0] - shift, self.origin[1] - shift)
+
+    def _step_pow2(self, j: int) -> None:
+        """Advance the root by exactly ``2^j`` generations."""
+        while self.root.level < j + 2 or not self._is_padded(self.root):
+            self._expand()
+        self._expand()  # margin of 2^(k-1) >= 2^j on every side
+        shift = 1 << (self.root.level - 2)
+        self.root = self.successor(self.root, j)
+        self.origin = (self.origin[0] + shift, self.origin[1] + shift)
+        self.generation += 1 << j
+        if len(self._nodes) > self.max_nodes:
+            self.collect()
+
+    def advance(self, generations: int) -> None:
+        """Jump forward *generations* steps (any non-negative integer)."""
+        if generations < 0:
+            raise ValueError("generations must be >= 0")
+        j = 0
+        while generations:
+            if generations & 1:
+                self._step_pow2(j)
+            generations >>= 1
+            j += 1
+
+    # ------------------------------------------------------------------
+    # Memory bound
+    # ------------------------------------------------------------------
+
+    def collect(self) -> None:
+        """Drop every interned node not reachable from the root; clear the memo."""
+        self._memo.clear()
+        nodes: Dict[Tuple[Node, Node, Node, Node], Node] = {}
+        stack = [self.root] + self._empty[1:]
+        while stack:
+            node = stack.pop()
+            if node.level == 0:
+                continue
+            key = (node.nw, node.ne, node.sw, node.se)
+            if key in nodes:
+                continue
+            nodes[key] = node
+            stack.extend(key)
+        self._nodes = nodes
+
+    @property
+    def node_count(self) -> int:
+        return len(self._nodes)
+
+    # ------------------------------------------------------------------
+    # Cell-level conversion
+    # ------------------------------------------------------------------
+
+    @property
+    def population(self) -> int:
+        return self.root.population
+
+    def set_cells(self, cells: Iterable[Tuple[int, int]]) -> None:
+        """Replace the universe with the live cells ``(row, col)``."""
+        cells = set(cells)
+        if not cells:
+            self.root, self.origin = self.empty(2), (0, 0)
+            return
+        r0 = min(r for r, _ in cells)
+        c0 = min(c for _, c in cells)
+        level_nodes = {(r - r0, c - c0): ALIVE for r, c in cells}
+        level = 0
+        while len(level_nodes) > 1 or level < 2:
+            e = self.empty(level)
+            parents: Dict[Tuple[int, int], Node] = {}
+            for (r, c) in level_nodes:
+                parents.setdefault((r >> 1, c >> 1), None)
+            get = level_nodes.get
+            for (pr, pc) in parents:
+                r, c = pr << 1, pc << 1
+                parents[pr, pc] = self.join(
+                    get((r, c), e), get((r, c + 1), e),
+                    get((r + 1, c), e), get((r + 1, c + 1), e),
+                )
+            level_nodes = parents
+            level += 1
+        (pr, pc), self.root = level_nodes.popitem()
+        self.origin = (r0 + (pr << level), c0 + (pc << level))
+
+    def cells(self) -> Iterator[Tuple[int, int]]:
+        """Yield the absolute ``(row, col)`` of every live cell."""
+        stack = [(self.root, self.origin[0], self.origin[1])]
+        while stack:
+            node, r, c = stack.pop()
+            if node.population == 0:
+                continue
+            if node.level == 0:
+                yield (r, c)
+                continue
+            half = 1 << (node.level - 1)
+            stack.append((node.nw, r, c))
+            stack.append((node.ne, r, c + half))
+            stack.append((node.sw, r + half, c))
+            stack.append((node.se, r + half, c + half))
+
+    @classmethod
+    def from_board(cls, board, max_nodes: int = 1_000_000) -> "Universe":
+        """Build a universe from a ``Board``/``ArrayBoard`` (state 1 = alive)."""
+        universe = cls(max_nodes=max_nodes)
+        universe.set_cells(
+            (r, c) for r, row in enumerate(board.to_list())
+            for c, v in enumerate(row) if v == 1
+        )
+        return universe
+
+    def to_board(self, rows: int, cols: int, origin: Tuple[int, int] = (0, 0),
+                 boundary: str = Board.FIXED) -> Board:
+        """The ``rows × cols`` window whose top-left cell is *origin*."""
+        board = Board(rows, cols, boundary)
+        r0, c0 = origin
+        for r, c in self.cells():
+            if 0 <= r - r0 < rows and 0 <= c - c0 < cols:
+                board.set(r - r0, c - c0, 1)
+        return board
+
+    def to_rows(self) -> List[List[int]]:
+        """Bounding box of the live cells as a nested list (for ``pattern_from_rows``)."""
+        cells = list(self.cells())
+        if not cells:
+            return []
+        r0 = min(r for r, _ in cells)
+        c0 = min(c for _, c in cells)
+        rows = [[0] * (max(c for _, c in cells) - c0 + 1)
+                for _ in range(max(r for r, _ in cells) - r0 + 1)]
+        for r, c in cells:
+            rows[r - r0][c - c0] = 1
+        return rows
+
+
+class HashLifeEngine:
+    """
+    ``Engine``-compatible driver backed by a ``Universe``.
+
+    ``step`` advances ``jump`` generations per call (1 by default) and
+    ``run`` jumps straight to the target generation.  Returned boards are
+    cropped to the input board's window; the full unbounded state is kept
+    internally, so feeding the returned board back into ``step`` continues
+    without losing cells that left the window.
+    """
+
+    def __init__(self, rule=None, jump: int = 1, max_nodes: int = 1_000_000):
+        if rule is not None and not isinstance(rule, LifeRule):
+            raise ValueError("HashLifeEngine only supports LifeRule (B3/S23)")
+        if jump < 1:
+            raise ValueError("jump must be >= 1")
+        self.rule = rule or LifeRule()
+        self.jump = jump
+        self.max_nodes = max_nodes
+        self.universe: Optional[Universe] = None
+        self._last_board = None
+
+    def _universe_for(self, board) -> Universe:
+        if board.boundary == Board.WRAP:
+            raise ValueError("HashLifeEngine simulates an unbounded plane; use a 'fixed' board")
+        if self.universe is None or board is not self._last_board:
+            self.universe = Universe.from_board(board, max_nodes=self.max_nodes)
+        return self.universe
+
+    def _crop(self, board) -> Board:
+        self._last_board = self.universe.to_board(board.rows, board.cols, boundary=board.boundary)
+        return self._last_board
+
+    def step(self, board) -> Board:
+        """Return a new board *jump* generations ahead."""
+        self._universe_for(board).advance(self.jump)
+        return self._crop(board)
+
+    def run(self, board, generations: int) -> Board:
+        """Return the board *generations* steps ahead (a single jump)."""
+        self._universe_for(board).advance(generations)
+        return self._crop(board)
@@ -10,6 +10,10 @@ Usage examples
   python main.py --preset langton-loops --renderer pygame --cell-size 8
   python main.py --preset blinker --boundary fixed --generations 10
   python main.py --pattern assets/patterns/glider.txt --rule life
+  python main.py --preset r-pentomino --engine vectorized --generations 200
+  python main.py --preset gosper-gun --engine hashlife --jump 1024
+  python main.py --preset glider --engine sparse --tile-size 8
+  python main.py --preset langton-loops --engine parallel --workers 4
 """
 
 from __future__ import annotations
@@ -57,11 +61,14 @@ def _run_terminal(
     renderer = TerminalRenderer(symbol_table=symbol_table, clear=clear)
     delay = 1.0 / fps if fps > 0 else 0
     current = board
+    jump = getattr(engine, "jump", 1)
+    dirty = None  # first frame: full redraw
     for gen in range(generations if generations > 0 else 10 ** 9):
-        renderer.render(current, generation=gen)
+        renderer.render(current, generation=gen * jump, dirty=dirty)
         if generations > 0 and gen == generations - 1:
             break
         current = engine.step(current)
+        dirty = getattr(engine, "dirty_rects", None)
         if delay:
             time.sleep(delay)
 
@@ -111,8 +118,27 @@ def build_parser() -> argparse.ArgumentParser:
         help="Renderer to use. Default: terminal.",
     )
     p.add_argument(
-        "--boundary", choices=["fixed", "wrap"], default="wrap",
-        help="Boundary condition. Default: wrap.",
+        "--boundary", choices=["fixed", "wrap"], default=None,
+        help="Boundary condition. Default: wrap (fixed for --engine hashlife).",
+    )
+    p.add_argument(
+        "--engine", choices=["python", "vectorized", "sparse", "parallel", "hashlife"],
+        default="python",
+        help="Stepping engine: per-cell python, NumPy vectorized, sparse "
+             "(changed tiles only), parallel (multi-process tiles), or HashLife "
+             "(Life only, unbounded plane). Default: python.",
+    )
+    p.add_argument(
+        "--workers", type=int, default=None,
+        help="Worker processes for the parallel engine. Default: CPU count.",
+    )
+    p.add_argument(
+        "--tile-size", type=int, default=32, dest="tile_size",
+        help="Tile edge length for the sparse engine. Default: 32.",
+    )
+    p.add_argument(
+        "--jump", type=int, default=1,
+        help="Generations advanced per frame (hashlife engine only). Default: 1.",
     )
     p.add_argument(
         "--generations", type=int, default=0,
@@ -144,6 +170,8 @@ def main(argv=None) -> int:
 
     # ---- Resolve preset / board / rule ----
     boundary = args.boundary
+    if boundary is None:
+        boundary = Board.FIXED if args.engine == "hashlife" else Board.WRAP
 
     if args.preset:
         try:
@@ -185,18 +213,44 @@ def main(argv=None) -> int:
     else:
         sym_table = _symbol_table_for_n(n_states)
 
-    engine = Engine(rule)
+    if args.engine == "hashlife":
+        from hashlife import HashLifeEngine
+        if not isinstance(rule, LifeRule):
+            print("Error: the hashlife engine only supports the Life rule.")
+            return 1
+        if boundary == Board.WRAP:
+            print("Error: the hashlife engine runs on the unbounded plane; "
+                  "use --boundary fixed.")
+            return 1
+        engine = HashLifeEngine(rule, jump=args.jump)
+    elif args.engine == "parallel":
+        from parallel_engine import ParallelEngine
+        engine = ParallelEngine(rule, workers=args.workers)
+    elif args.engine == "sparse":
+        from sparse_engine import ArrayBoard, SparseEngine
+        if ArrayBoard is not None:
+            board = ArrayBoard.from_board(board)
+        engine = SparseEngine(rule, tile_size=args.tile_size, in_place=True)
+    else:
+        if args.engine == "vectorized":
+            from array_board import ArrayBoard
+            board = ArrayBoard.from_board(board)
+        engine = Engine(rule)
 
     # ---- Run ----
-    if args.renderer == "pygame":
-        _run_pygame(board, engine, fps=int(args.fps), cell_size=args.cell_size, title=title)
-    else:
-        _run_terminal(
-            board, engine, sym_table,
-            generations=args.generations,
-            fps=args.fps,
-            clear=not args.no_clear,
-        )
+    try:
+        if args.renderer == "pygame":
+            _run_pygame(board, engine, fps=int(args.fps), cell_size=args.cell_size, title=title)
+        else:
+            _run_terminal(
+                board, engine, sym_table,
+                generations=args.generations,
+                fps=args.fps,
+                clear=not args.no_clear,
+            )
+    finally:
+        if hasattr(engine, "close"):
+            engine.close()  # parallel engine: pool + shared memory
 
     return 0
 
@@ -73,6 +73,19 @@ _PULSAR  = [
     [0,0,1,1,1,0,0,0,1,1,1,0,0],
 ]
 _R_PENT  = [[0, 1, 1], [1, 1, 0], [0, 1, 0]]
+_GOSPER_GUN = [
+    [1 if ch == 'O' else 0 for ch in line] for line in (
+        "........................O...........",
+        "......................O.O...........",
+        "............OO......OO............OO",
+        "...........O...O....OO............OO",
+        "OO........O.....O...OO..............",
+        "OO........O...O.OO....O.O...........",
+        "..........O.....O.......O...........",
+        "...........O...O....................",
+        "............OO......................",
+    )
+]
 
 # ---------------------------------------------------------------------------
 # Langton's Loops board factory
@@ -158,6 +171,13 @@ _register(Preset(
     boundary=Board.WRAP,
     tags=["life", "methuselah"],
 ))
+_register(Preset(
+    name="gosper-gun",
+    description="Gosper glider gun: emits a glider every 30 generations (Game of Life).",
+    make_board=lambda: _life_board(_GOSPER_GUN, size=60),
+    make_rule=LifeRule,
+    tags=["life", "gun"],
+))
 _register(Preset(
     name="langton-loops",
     description="Langton's Loops: self-replicating loop automaton (8 states, table-driven).",
@@ -3,11 +3,14 @@ Pygame Renderer
 ===============
 Renders a Board in a pygame window, drawing each cell as a filled circle.
 
+When the engine exposes ``dirty_rects`` (see ``sparse_engine``), only the
+changed rectangles are repainted and pushed to the display.
+
 Requires: pygame
 """
 
 from __future__ import annotations
-from typing import Dict, Optional, Tuple
+from typing import Dict, Iterable, Optional, Tuple
 from board import Board
 
 # Colour palette for up to 9 states (state → RGB tuple)
@@ -77,16 +80,40 @@ class PygameRenderer:
     # Rendering
     # ------------------------------------------------------------------
 
-    def render(self, board: Board) -> None:
-        """Draw the board.  Must be called after _init()."""
+    def render(
+        self,
+        board: Board,
+        dirty: Optional[Iterable[Tuple[int, int, int, int]]] = None,
+    ) -> None:
+        """
+        Draw the board.  Must be called after _init().
+
+        *dirty* is an optional list of ``(row0, col0, row1, col1)`` cell
+        rectangles; when given, only those regions are redrawn.
+        """
+        import pygame
+        cs = self.cell_size
+        if dirty is None:
+            self._draw_region(board, 0, 0, board.rows, board.cols)
+            pygame.display.flip()
+            return
+
+        updated = []
+        for r0, c0, r1, c1 in dirty:
+            self._draw_region(board, r0, c0, r1, c1)
+            updated.append(pygame.Rect(c0 * cs, r0 * cs, (c1 - c0) * cs, (r1 - r0) * cs))
+        if updated:
+            pygame.display.update(updated)
+
+    def _draw_region(self, board: Board, r0: int, c0: int, r1: int, c1: int) -> None:
         import pygame
         cs = self.cell_size
         radius = max(1, cs // 2 - 1)
         bg = self.palette.get(0, (20, 20, 20))
-        self._screen.fill(bg)
+        self._screen.fill(bg, pygame.Rect(c0 * cs, r0 * cs, (c1 - c0) * cs, (r1 - r0) * cs))
 
-        for r in range(board.rows):
-            for c in range(board.cols):
+        for r in range(r0, r1):
+            for c in range(c0, c1):
                 state = board.get(r, c)
                 if state == 0:
                     continue
@@ -95,8 +122,6 @@ class PygameRenderer:
                 cy = r * cs + cs // 2
                 pygame.draw.circle(self._screen, color, (cx, cy), radius)
 
-        pygame.display.flip()
-
     # ------------------------------------------------------------------
     # Main loop
     # ------------------------------------------------------------------
@@ -110,7 +135,9 @@ class PygameRenderer:
         initial_board:
             Starting board state.
         engine:
-            An Engine instance with a ``step(board) -> Board`` method.
+            An Engine instance with a ``step(board) -> Board`` method.  If it
+            also has ``dirty_rects``, frames after the first redraw only
+            those regions.
         """
         import pygame
 
@@ -118,6 +145,7 @@ class PygameRenderer:
         board = initial_board
         paused = False
         generation = 0
+        dirty = None  # first frame: full redraw
 
         running = True
         while running:
@@ -131,8 +159,9 @@ class PygameRenderer:
                         paused = not paused
 
             if not paused:
-                self.render(board)
+                self.render(board, dirty)
                 board = engine.step(board)
+                dirty = getattr(engine, "dirty_rects", None)
                 generation += 1
 
             self._clock.tick(self.fps)
@@ -2,12 +2,16 @@
 Terminal Renderer
 =================
 Renders a Board to stdout using configurable symbols.
+
+With ``clear=True`` the frame is drawn at the top of the screen, so later
+frames can pass ``dirty`` rectangles (see ``sparse_engine``) and only those
+cells are rewritten in place with ANSI cursor addressing.
 """
 
 from __future__ import annotations
 import os
 import sys
-from typing import Optional
+from typing import Iterable, Optional, Tuple
 from board import Board
 from symbol_table import SymbolTable
 
@@ -28,23 +32,54 @@ class TerminalRenderer:
             symbol_table = SymbolTable(_DEFAULT_SYMBOLS)
         self.symbol_table = symbol_table
         self.clear = clear
+        self._frame_drawn = False
+        self._has_header = False
+
+    def _symbol(self, state: int) -> str:
+        if self.symbol_table.has_state(state):
+            return self.symbol_table.state_to_symbol(state)
+        return str(state)
+
+    def _line(self, board: Board, r: int, c0: int, c1: int) -> str:
+        return ''.join(self._symbol(board.get(r, c)) for c in range(c0, c1))
+
+    def render(
+        self,
+        board: Board,
+        generation: Optional[int] = None,
+        dirty: Optional[Iterable[Tuple[int, int, int, int]]] = None,
+    ) -> None:
+        """
+        Print the board.  *dirty* – ``(row0, col0, row1, col1)`` cell
+        rectangles – limits the redraw to those regions once a full frame is
+        on screen (only with ``clear=True``; otherwise it is ignored).
+        """
+        if dirty is not None and self.clear and self._frame_drawn:
+            self._render_dirty(board, generation, dirty)
+            return
 
-    def render(self, board: Board, generation: Optional[int] = None) -> None:
         if self.clear:
             os.system('clear' if os.name == 'posix' else 'cls')
+            self._frame_drawn = True
 
         if generation is not None:
             print(f"=== Generation {generation} ===")
+        self._has_header = generation is not None
 
         for r in range(board.rows):
-            line = ''
-            for c in range(board.cols):
-                state = board.get(r, c)
-                if self.symbol_table.has_state(state):
-                    line += self.symbol_table.state_to_symbol(state)
-                else:
-                    line += str(state)
-            print(line)
+            print(self._line(board, r, 0, board.cols))
+
+    def _render_dirty(self, board: Board, generation: Optional[int], dirty) -> None:
+        top = 2 if self._has_header else 1  # 1-based screen row of board row 0
+        out = []
+        if generation is not None and self._has_header:
+            out.append(f"\x1b[1;1H\x1b[2K=== Generation {generation} ===")
+        for r0, c0, r1, c1 in dirty:
+            for r in range(r0, r1):
+                out.append(f"\x1b[{top + r};{c0 + 1}H{self._line(board, r, c0, c1)}")
+        out.append(f"\x1b[{top + board.rows};1H")  # park cursor below the board
+        sys.stdout.write(''.join(out))
+        sys.stdout.flush()
 
     def render_multistate(self, board: Board, generation: Optional[int] = None) -> None:
         """Render with space-separated integer states (debugging aid)."""
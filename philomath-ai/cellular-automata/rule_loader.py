@@ -18,20 +18,38 @@ where n0..n7 are the 8 Moore neighbors in the order produced by
 
 The format is auto-detected from the token count of the first data line.
 Comment lines begin with ``#``.
+
+Symmetry directive
+------------------
+A comment line ``# symmetry: rotate4`` declares that the rule is invariant
+under 90° rotations; every listed transition is then expanded to its four
+rotations (explicitly listed transitions take precedence).  The default is
+``# symmetry: none``.
+
+When numpy is available the loaded table is compiled into a flat lookup
+table (see ``rules.TableRule.compile``) for vectorized stepping.
 """
 
 from __future__ import annotations
 import os
-from typing import Dict, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 from symbol_table import SymbolTable
 from alphabet_detect import detect_alphabet
-from rules import TableRule, VonNeumannTableRule
+from rules import TableRule, VonNeumannTableRule, np
+
+_SYMMETRIES = ("none", "rotate4")
+
+# Neighbour positions (indices into the key, centre excluded) listed
+# clockwise, so a 90° rotation is a cyclic shift of this ring.
+_MOORE_RING = [1, 2, 3, 5, 8, 7, 6, 4]   # NW N NE E SE S SW W
+_VN_RING = [1, 3, 4, 2]                  # N E S W
 
 
 def load_table_rule(
     path: str,
     symbol_table: Optional[SymbolTable] = None,
     name: Optional[str] = None,
+    compile: bool = True,
 ):
     """
     Parse a rule file and return a TableRule or VonNeumannTableRule.
@@ -48,22 +66,38 @@ def load_table_rule(
         If *None*, the loader attempts to detect the alphabet automatically.
     name:
         Optional human-readable name for error messages.
+    compile:
+        Compile the table into a lookup table when numpy is installed.
     """
     with open(path, "r") as fh:
         raw = fh.read()
 
     if symbol_table is None:
-        symbol_table = detect_alphabet(raw)
+        # Comment lines (including directives) must not add symbols.
+        symbol_table = detect_alphabet("\n".join(
+            line for line in raw.splitlines() if not line.strip().startswith('#')
+        ))
 
     if name is None:
         name = os.path.basename(path)
 
     table: Dict[Tuple[int, ...], int] = {}
     detected_format: Optional[str] = None  # 'moore' | 'vn'
+    symmetry = "none"
 
     for lineno, line in enumerate(raw.splitlines(), start=1):
         line = line.strip()
-        if not line or line.startswith('#'):
+        if not line:
+            continue
+        if line.startswith('#'):
+            directive = line[1:].strip()
+            if directive.lower().startswith("symmetry:"):
+                symmetry = directive.split(":", 1)[1].strip().lower()
+                if symmetry not in _SYMMETRIES:
+                    raise ValueError(
+                        f"[{name}] Line {lineno}: unknown symmetry {symmetry!r} "
+                        f"(expected one of {', '.join(_SYMMETRIES)})"
+                    )
             continue
 
         tokens = line.split()
@@ -92,15 +126,49 @@ def load_table_rule(
         next_state: int = states[-1]
         table[key] = next_state
 
+    ring = _VN_RING if detected_format == 'vn' else _MOORE_RING
+    if symmetry == "rotate4":
+        table = _expand_rotations(table, ring)
+
     if detected_format == 'vn':
-        return VonNeumannTableRule(table, name=name)
-    return TableRule(table, name=name)
+        rule = VonNeumannTableRule(table, name=name)
+    else:
+        rule = TableRule(table, name=name)
+    rule.symmetry = symmetry
+
+    if compile and np is not None and table:
+        rule.compile()
+    return rule
 
 
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
 
+def _rotations(key: Tuple[int, ...], ring: List[int]) -> List[Tuple[int, ...]]:
+    """The key rotated by 90°, 180° and 270°."""
+    step = len(ring) // 4
+    rotated = []
+    for quarter in range(1, 4):
+        shift = quarter * step
+        new_key = list(key)
+        for i, pos in enumerate(ring):
+            new_key[ring[(i + shift) % len(ring)]] = key[pos]
+        rotated.append(tuple(new_key))
+    return rotated
+
+
+def _expand_rotations(
+    table: Dict[Tuple[int, ...], int], ring: List[int]
+) -> Dict[Tuple[int, ...], int]:
+    """Add all rotations of each transition; explicit entries win."""
+    expanded = dict(table)
+    for key, next_state in table.items():
+        for rotated in _rotations(key, ring):
+            expanded.setdefault(rotated, next_state)
+    return expanded
+
+
 def _parse_token(tok: str, sym_table: SymbolTable, name: str, lineno: int) -> int:
     """Convert a token string to an integer state."""
     if len(tok) == 1 and sym_table.has_symbol(tok):
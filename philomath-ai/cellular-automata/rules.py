@@ -6,12 +6,21 @@ Rule implementations:
   - TableRule             : Moore (8-neighbor) table-driven rule.
   - VonNeumannTableRule   : Von Neumann (4-neighbor) table-driven rule for
                             automata such as Langton's Loops.
+
+Table rules can be compiled (``compile()``) into a flat integer lookup table
+indexed by the base-N encoding of the neighbourhood, which ``step_array``
+uses to compute a whole generation with array arithmetic.
 """
 
 from __future__ import annotations
 from typing import Dict, Tuple
 from neighborhood import count_moore_alive, moore_key, von_neumann_key
 
+try:
+    import numpy as np
+except ImportError:  # vectorized stepping is optional
+    np = None
+
 
 class LifeRule:
     """Conway's Game of Life rule (B3/S23)."""
@@ -24,8 +33,137 @@ class LifeRule:
         else:
             return 1 if alive_neighbors == 3 else 0
 
+    def step_array(self, src, dst) -> None:
+        """
+        Vectorized generation: *src* is a padded ``(h+2, w+2)`` state array
+        (one-cell halo), *dst* the ``(h, w)`` output.  Neighbour counts are
+        the sum of the eight shifted views of *src*.
+        """
+        h, w = dst.shape
+        alive = (src == 1).view(np.uint8)
+        center = alive[1:h + 1, 1:w + 1]
+        n = alive[0:h, 0:w] + alive[0:h, 1:w + 1]
+        n += alive[0:h, 2:w + 2]
+        n += alive[1:h + 1, 0:w]
+        n += alive[1:h + 1, 2:w + 2]
+        n += alive[2:h + 2, 0:w]
+        n += alive[2:h + 2, 1:w + 1]
+        n += alive[2:h + 2, 2:w + 2]
+        np.logical_or(n == 3, (n == 2) & (center == 1), out=dst.view(bool))
+
+
+# Padded-array offsets (row, col) of each key position, relative to the
+# top-left of a cell's 3×3 window.  Order matches neighborhood.moore_key /
+# neighborhood.von_neumann_key.
+_MOORE_WINDOW = [
+    (1, 1),
+    (0, 0), (0, 1), (0, 2),
+    (1, 0),         (1, 2),
+    (2, 0), (2, 1), (2, 2),
+]
+_VON_NEUMANN_WINDOW = [(1, 1), (0, 1), (1, 0), (1, 2), (2, 1)]
+
+# Largest dense LUT (entries); bigger tables use a sorted-key search instead.
+_MAX_DENSE_LUT = 1 << 24
+
+
+class _CompiledTable:
+    """
+    Flat lookup table for a transition dict.
 
-class TableRule:
+    Keys are encoded as base-N integers (``N`` = number of states), most
+    significant digit first.  Small tables use a dense ``int16`` LUT with
+    ``-1`` marking missing transitions; large ones (e.g. Moore with many
+    states) fall back to ``searchsorted`` over the sorted encoded keys.
+    """
+
+    def __init__(self, table: Dict[Tuple[int, ...], int], window):
+        states = {v for key in table for v in key} | set(table.values())
+        self.n_states = max(states) + 1 if states else 1
+        self.window = window
+        size = self.n_states ** len(window)
+        if size >= 1 << 62:
+            raise ValueError(f"{self.n_states} states are too many to encode a {len(window)}-cell key")
+
+        keys = np.array(list(table.keys()), dtype=np.int64).reshape(len(table), len(window))
+        weights = self.n_states ** np.arange(len(window) - 1, -1, -1, dtype=np.int64)
+        codes = keys @ weights
+        values = np.array(list(table.values()), dtype=np.int16)
+
+        if size <= _MAX_DENSE_LUT:
+            self.lut = np.full(size, -1, dtype=np.int16)
+            self.lut[codes] = values
+            self.sorted_codes = None
+        else:
+            order = np.argsort(codes)
+            self.lut = values[order]
+            self.sorted_codes = codes[order]
+
+    def lookup(self, src):
+        """Next states for every cell of padded *src* (-1 where missing)."""
+        h, w = src.shape[0] - 2, src.shape[1] - 2
+        n = self.n_states
+        codes = np.zeros((h, w), dtype=np.int64)
+        invalid = np.zeros((h, w), dtype=bool)
+        for dr, dc in self.window:
+            view = src[dr:dr + h, dc:dc + w]
+            codes *= n
+            codes += view
+            invalid |= view >= n
+
+        if self.sorted_codes is None:
+            np.minimum(codes, self.lut.size - 1, out=codes)
+            result = self.lut[codes]
+        else:
+            pos = np.searchsorted(self.sorted_codes, codes)
+            np.minimum(pos, self.sorted_codes.size - 1, out=pos)
+            result = np.where(self.sorted_codes[pos] == codes, self.lut[pos], -1).astype(np.int16)
+        result[invalid] = -1
+        return result
+
+
+class _TableRuleBase:
+    """Shared lookup/compile logic for table-driven rules."""
+
+    _window = _MOORE_WINDOW
+
+    def __init__(self, table: Dict[Tuple[int, ...], int], name: str):
+        self.table = table
+        self.name = name
+        self.symmetry = "none"
+        self._compiled = None
+
+    def _missing(self, key: Tuple[int, ...]) -> KeyError:
+        return KeyError(
+            f"[{self.name}] No transition for neighborhood key {key}. "
+            "Ensure the rule file covers all possible neighborhood combinations."
+        )
+
+    def compile(self) -> "_TableRuleBase":
+        """Build the flat lookup table used by ``step_array``.  Returns self."""
+        if np is None:
+            raise ImportError("compiling table rules requires numpy (pip install numpy)")
+        self._compiled = _CompiledTable(self.table, self._window)
+        return self
+
+    def step_array(self, src, dst) -> None:
+        """
+        Vectorized generation: encode every cell's neighbourhood from the
+        padded *src*, gather next states from the LUT into *dst*.  Raises
+        ``KeyError`` naming the first (row-major) missing neighbourhood.
+        """
+        if self._compiled is None:
+            self.compile()
+        result = self._compiled.lookup(src)
+        missing = result < 0
+        if missing.any():
+            r, c = (int(i) for i in np.argwhere(missing)[0])
+            key = tuple(int(src[r + dr, c + dc]) for dr, dc in self._window)
+            raise self._missing(key)
+        dst[...] = result
+
+
+class TableRule(_TableRuleBase):
     """
     Moore (8-neighbor) table-driven rule.
 
@@ -35,21 +173,19 @@ class TableRule:
     Raises ``KeyError`` with a descriptive message when a key is missing.
     """
 
+    _window = _MOORE_WINDOW
+
     def __init__(self, table: Dict[Tuple[int, ...], int], name: str = "TableRule"):
-        self.table = table
-        self.name = name
+        super().__init__(table, name)
 
     def next_state(self, board, row: int, col: int) -> int:
         key = moore_key(board, row, col)
         if key not in self.table:
-            raise KeyError(
-                f"[{self.name}] No transition for neighborhood key {key}. "
-                "Ensure the rule file covers all possible neighborhood combinations."
-            )
+            raise self._missing(key)
         return self.table[key]
 
 
-class VonNeumannTableRule:
+class VonNeumannTableRule(_TableRuleBase):
     """
     Von Neumann (4-neighbor) table-driven rule.
 
@@ -60,15 +196,13 @@ class VonNeumannTableRule:
     Raises ``KeyError`` with a descriptive message when a key is missing.
     """
 
+    _window = _VON_NEUMANN_WINDOW
+
     def __init__(self, table: Dict[Tuple[int, ...], int], name: str = "VNTableRule"):
-        self.table = table
-        self.name = name
+        super().__init__(table, name)
 
     def next_state(self, board, row: int, col: int) -> int:
         key = von_neumann_key(board, row, col)
         if key not in self.table:
-            raise KeyError(
-                f"[{self.name}] No transition for neighborhood key {key}. "
-                "Ensure the rule file covers all possible neighborhood combinations."
-            )
+            raise self._missing(key)
         return self.table[key]
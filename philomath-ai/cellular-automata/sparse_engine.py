@@ -0,0 +1,232 @@
+"""
+Sparse Engine
+=============
+Active-region stepping: only the neighbourhoods of cells that changed in
+the previous generation are re-evaluated, so the cost of a generation
+scales with activity instead of board area.
+
+The board is split into ``tile_size × tile_size`` tiles.  After a step,
+every tile in which at least one cell changed is *dirty*; the next step
+evaluates the dirty tiles and their eight neighbours (a change can only
+influence cells one step away).  The first step, and any step on a board
+the engine has not seen before, evaluates every tile.
+
+Works with both board types:
+
+- ``Board`` – ``rule.next_state`` per cell of each active tile.
+- ``ArrayBoard`` – ``rule.step_array`` on each horizontal run of active
+  tiles (falls back to per-cell evaluation for rules without it).
+
+After each step ``dirty_rects`` lists the changed regions as half-open
+``(row0, col0, row1, col1)`` rectangles, which the renderers accept to
+redraw only what changed.
+
+The engine assumes it is the only writer: after editing a tracked board
+directly, call ``reset()``.
+"""
+
+from __future__ import annotations
+from typing import Dict, List, Optional, Set, Tuple
+
+from board import Board
+
+try:
+    from array_board import ArrayBoard
+except ImportError:  # numpy not installed: Board only
+    ArrayBoard = None
+
+Tile = Tuple[int, int]
+Rect = Tuple[int, int, int, int]
+
+
+class SparseEngine:
+    """Engine that only re-evaluates tiles near last generation's changes."""
+
+    def __init__(self, rule, tile_size: int = 32, in_place: bool = False):
+        if tile_size < 1:
+            raise ValueError("tile_size must be >= 1")
+        self.rule = rule
+        self.tile_size = tile_size
+        self.in_place = in_place
+        self.dirty: Optional[Set[Tile]] = None
+        self._board = None
+        self._active: Optional[Set[Tile]] = None
+
+    # ------------------------------------------------------------------
+    # Tile bookkeeping
+    # ------------------------------------------------------------------
+
+    def reset(self) -> None:
+        """Forget the tracked board; the next step evaluates every tile."""
+        self.dirty = None
+        self._board = None
+        self._active = None
+
+    def _tile_grid(self, board) -> Tuple[int, int]:
+        t = self.tile_size
+        return (board.rows + t - 1) // t, (board.cols + t - 1) // t
+
+    def tile_bounds(self, board, tile: Tile) -> Rect:
+        """Cell rectangle ``(row0, col0, row1, col1)`` covered by *tile*."""
+        t = self.tile_size
+        tr, tc = tile
+        return tr * t, tc * t, min((tr + 1) * t, board.rows), min((tc + 1) * t, board.cols)
+
+    def _neighbourhood(self, board, tiles: Set[Tile]) -> Set[Tile]:
+        """*tiles* plus their eight neighbours (wrapping on ``wrap`` boards)."""
+        n_tr, n_tc = self._tile_grid(board)
+        wrap = board.boundary == Board.WRAP
+        out: Set[Tile] = set()
+        for tr, tc in tiles:
+            for dr in (-1, 0, 1):
+                r = tr + dr
+                if wrap:
+                    r %= n_tr
+                elif not 0 <= r < n_tr:
+                    continue
+                for dc in (-1, 0, 1):
+                    c = tc + dc
+                    if wrap:
+                        c %= n_tc
+                    elif not 0 <= c < n_tc:
+                        continue
+                    out.add((r, c))
+        return out
+
+    @property
+    def active_tiles(self) -> Optional[Set[Tile]]:
+        """Tiles the next step will evaluate (``None`` = all)."""
+        return None if self._active is None else set(self._active)
+
+    @property
+    def dirty_rects(self) -> Optional[List[Rect]]:
+        """Changed regions of the last step (``None`` = redraw everything)."""
+        if self.dirty is None or self._board is None:
+            return None
+        return [
+            self._run_bounds(self._board, tr, c0, c1)
+            for tr, c0, c1 in _runs(self.dirty)
+        ]
+
+    def _run_bounds(self, board, tr: int, c0: int, c1: int) -> Rect:
+        """Cell rectangle of tiles ``c0..c1`` (inclusive) in tile row *tr*."""
+        r0, col0, r1, _ = self.tile_bounds(board, (tr, c0))
+        _, _, _, col1 = self.tile_bounds(board, (tr, c1))
+        return r0, col0, r1, col1
+
+    # ------------------------------------------------------------------
+    # Stepping
+    # ------------------------------------------------------------------
+
+    def advance(self, board) -> Set[Tile]:
+        """Advance *board* one generation in place; return the changed tiles."""
+        if board is not self._board or self._active is None:
+            n_tr, n_tc = self._tile_grid(board)
+            active = {(r, c) for r in range(n_tr) for c in range(n_tc)}
+        else:
+            active = self._active
+
+        if ArrayBoard is not None and isinstance(board, ArrayBoard):
+            changed = self._advance_array(board, active)
+        else:
+            changed = self._advance_cells(board, active)
+
+        self._board = board
+        self.dirty = changed
+        self._active = self._neighbourhood(board, changed)
+        return changed
+
+    def _advance_cells(self, board, active: Set[Tile]) -> Set[Tile]:
+        """Per-cell evaluation; writes are deferred so the step is synchronous."""
+        next_state = self.rule.next_state
+        updates: List[Tuple[int, int, int]] = []
+        changed: Set[Tile] = set()
+        for tile in active:
+            r0, c0, r1, c1 = self.tile_bounds(board, tile)
+            for r in range(r0, r1):
+                for c in range(c0, c1):
+                    new = next_state(board, r, c)
+                    if new != board.get(r, c):
+                        updates.append((r, c, new))
+                        changed.add(tile)
+        for r, c, new in updates:
+            board.set(r, c, new)
+        return changed
+
+    def _advance_array(self, board, active: Set[Tile]) -> Set[Tile]:
+        """``step_array`` on each horizontal run of active tiles."""
+        import numpy as np
+
+        step_array = getattr(self.rule, "step_array", None)
+        src = board.padded
+        cells = board.cells
+        results: List[Tuple[Rect, "np.ndarray"]] = []
+        changed: Set[Tile] = set()
+        t = self.tile_size
+        for tr, tc0, tc1 in _runs(active):
+            r0, c0, r1, c1 = self._run_bounds(board, tr, tc0, tc1)
+            out = np.empty((r1 - r0, c1 - c0), dtype=np.uint8)
+            if step_array is not None:
+                step_array(src[r0:r1 + 2, c0:c1 + 2], out)
+            else:
+                for r in range(r0, r1):
+                    for c in range(c0, c1):
+                        out[r - r0, c - c0] = self.rule.next_state(board, r, c)
+            diff = out != cells[r0:r1, c0:c1]
+            if not diff.any():
+                continue
+            results.append(((r0, c0, r1, c1), out))
+            cols_changed = diff.any(axis=0)
+            for k in range(tc1 - tc0 + 1):
+                if cols_changed[k * t:(k + 1) * t].any():
+                    changed.add((tr, tc0 + k))
+        for (r0, c0, r1, c1), out in results:
+            cells[r0:r1, c0:c1] = out
+        if results:
+            board.fill_halo()
+        return changed
+
+    def step(self, board):
+        """
+        Return the next generation.  A new board unless ``in_place`` is set,
+        in which case *board* itself is advanced and returned.
+
+        Passing back the board the previous step returned keeps the active
+        tiles: the copy has the same cells, so it takes over the tracking.
+        """
+        if not self.in_place:
+            tracked = board is self._board
+            board = board.copy()
+            if tracked:
+                self._board = board
+        self.advance(board)
+        return board
+
+    def run(self, board, generations: int):
+        """Advance a copy of *board* by *generations* steps and return it."""
+        current = board.copy()
+        for _ in range(generations):
+            self.advance(current)
+        return current
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def _runs(tiles: Set[Tile]) -> List[Tuple[int, int, int]]:
+    """Group tiles into ``(tile_row, first_col, last_col)`` horizontal runs."""
+    by_row: Dict[int, List[int]] = {}
+    for tr, tc in tiles:
+        by_row.setdefault(tr, []).append(tc)
+    runs: List[Tuple[int, int, int]] = []
+    for tr in sorted(by_row):
+        cols = sorted(by_row[tr])
+        start = prev = cols[0]
+        for c in cols[1:]:
+            if c != prev + 1:
+                runs.append((tr, start, prev))
+                start = c
+            prev = c
+        runs.append((tr, start, prev))
+    return runs
@@ -11,6 +11,12 @@ Tests cover:
   6. Engine step correctness
   7. Pattern loading
   8. Rule loader (table rule files)
+  9. Neighborhood keys
+ 10. Vectorized (ArrayBoard) engine
+ 11. Compiled lookup-table rules
+ 12. HashLife
+ 13. Sparse engine & dirty-rectangle rendering
+ 14. Parallel (shared-memory) engine
 """
 
 from __future__ import annotations
@@ -33,6 +39,15 @@ from alphabet_detect import detect_alphabet, detect_alphabet_from_lines
 from pattern_loader import load_pattern, pattern_from_rows
 from rule_loader import load_table_rule
 from neighborhood import moore_key, von_neumann_key
+from hashlife import HashLifeEngine, Universe
+from sparse_engine import SparseEngine
+from render_terminal import TerminalRenderer
+from presets import get_preset
+
+try:
+    from array_board import ArrayBoard
+except ImportError:  # numpy not installed: vectorized tests are skipped
+    ArrayBoard = None
 
 
 # ===========================================================================
@@ -416,6 +431,352 @@ def test_von_neumann_key_shape():
     print("✓ PASSED")
 
 
+# ===========================================================================
+# 10. Vectorized (ArrayBoard) engine
+# ===========================================================================
+
+def _random_rows(rows: int, cols: int, n_states: int = 2, seed: int = 0):
+    import random
+    rng = random.Random(seed)
+    return [[rng.randrange(n_states) for _ in range(cols)] for _ in range(rows)]
+
+
+def test_array_board_accessors():
+    print("Testing ArrayBoard matches Board accessors...", end=' ')
+    if ArrayBoard is None:
+        print("skipped (numpy not installed)")
+        return
+    for boundary in (Board.FIXED, Board.WRAP):
+        board = Board.from_list(_random_rows(4, 5, n_states=8), boundary=boundary)
+        arr = ArrayBoard.from_board(board)
+        for r in range(-2, 7):
+            for c in range(-2, 8):
+                assert arr.get(r, c) == board.get(r, c), (boundary, r, c)
+        assert arr == board and arr.to_board() == board
+    print("✓ PASSED")
+
+
+def test_vectorized_life_matches_python():
+    print("Testing vectorized Life matches per-cell engine (fixed & wrap)...", end=' ')
+    if ArrayBoard is None:
+        print("skipped (numpy not installed)")
+        return
+    for boundary in (Board.FIXED, Board.WRAP):
+        board = Board.from_list(_random_rows(13, 17, seed=3), boundary=boundary)
+        expected = _make_life_engine().run(board, 10)
+        vectorized = Engine(LifeRule(), vectorized=True).run(board, 10)
+        assert isinstance(vectorized, Board)
+        assert vectorized == expected, f"mismatch with {boundary} boundary"
+        arr = ArrayBoard.from_board(board)
+        assert _make_life_engine().run(arr, 10) == expected
+        assert arr == board, "run() must not mutate the input ArrayBoard"
+    print("✓ PASSED")
+
+
+# ===========================================================================
+# 11. Compiled lookup-table rules
+# ===========================================================================
+
+def _random_table(n_states: int, width: int, seed: int = 0):
+    import itertools
+    import random
+    rng = random.Random(seed)
+    return {
+        key: rng.randrange(n_states)
+        for key in itertools.product(range(n_states), repeat=width)
+    }
+
+
+def test_compiled_tables_match_python():
+    print("Testing compiled Moore/VN tables match per-cell lookup...", end=' ')
+    if ArrayBoard is None:
+        print("skipped (numpy not installed)")
+        return
+    cases = [
+        (TableRule(_random_table(2, 9, seed=1), name="RandMoore"), 2),
+        (VonNeumannTableRule(_random_table(4, 5, seed=2), name="RandVN"), 4),
+    ]
+    for rule, n_states in cases:
+        for boundary in (Board.FIXED, Board.WRAP):
+            board = Board.from_list(_random_rows(9, 11, n_states, seed=5), boundary=boundary)
+            expected = Engine(rule).run(board, 5)
+            assert Engine(rule, vectorized=True).run(board, 5) == expected, (rule.name, boundary)
+    print("✓ PASSED")
+
+
+def test_compiled_missing_key_reports_key():
+    print("Testing compiled table reports the offending key...", end=' ')
+    if ArrayBoard is None:
+        print("skipped (numpy not installed)")
+        return
+    rule = VonNeumannTableRule({(0, 0, 0, 0, 0): 0}, name="MinimalVN")
+    board = ArrayBoard.from_list([[0, 0], [0, 1]])
+    try:
+        Engine(rule).step(board)
+        assert False, "Should have raised KeyError"
+    except KeyError as exc:
+        # First row-major cell with a missing neighbourhood is (0, 1): south=1
+        assert "MinimalVN" in str(exc) and "(0, 0, 0, 0, 1)" in str(exc), str(exc)
+    print("✓ PASSED")
+
+
+def test_rule_loader_rotate4_symmetry():
+    print("Testing rule loader '# symmetry: rotate4' expansion...", end=' ')
+    lines = [
+        "# symmetry: rotate4",
+        "0 0 0 0 0  0",
+        "0 1 0 0 0  2",   # north=1 → rotations put the 1 at E, S, W
+    ]
+    tmp = tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False)
+    try:
+        tmp.write('\n'.join(lines))
+        tmp.close()
+        rule = load_table_rule(tmp.name)
+        assert rule.symmetry == "rotate4"
+        # key order is (center, north, west, east, south)
+        for key in [(0, 1, 0, 0, 0), (0, 0, 0, 1, 0), (0, 0, 0, 0, 1), (0, 0, 1, 0, 0)]:
+            assert rule.table[key] == 2, key
+        assert len(rule.table) == 5
+    finally:
+        os.unlink(tmp.name)
+    print("✓ PASSED")
+
+
+# ===========================================================================
+# 12. HashLife
+# ===========================================================================
+
+def _soup_board(size: int = 60, soup: int = 10, seed: int = 0) -> Board:
+    """A random soup centred in a large fixed board (clear of the edges)."""
+    board = Board(size, size, boundary=Board.FIXED)
+    offset = (size - soup) // 2
+    for r, row in enumerate(_random_rows(soup, soup, seed=seed)):
+        for c, val in enumerate(row):
+            board.set(offset + r, offset + c, val)
+    return board
+
+
+def test_hashlife_matches_python():
+    print("Testing HashLife run/step match the per-cell engine...", end=' ')
+    for seed, generations in [(0, 1), (1, 7), (2, 16), (3, 23)]:
+        board = _soup_board(seed=seed)
+        expected = _make_life_engine().run(board, generations)
+        assert HashLifeEngine().run(board, generations) == expected, (seed, generations)
+        engine, current = HashLifeEngine(), board
+        for _ in range(generations):
+            current = engine.step(current)
+        assert current == expected, (seed, generations)
+    print("✓ PASSED")
+
+
+def test_hashlife_keeps_cells_outside_window():
+    print("Testing HashLife keeps cells that leave the board window...", end=' ')
+    glider = pattern_from_rows([[0, 1, 0], [0, 0, 1], [1, 1, 1]])
+    engine = HashLifeEngine(jump=8)
+    away = engine.step(glider)
+    assert sum(map(sum, away.to_list())) == 0  # glider has left the 3×3 window
+    assert engine.universe.population == 5
+    back = engine.universe.to_rows()
+    assert back == [[0, 1, 0], [0, 0, 1], [1, 1, 1]], back
+    print("✓ PASSED")
+
+
+def test_hashlife_gun_jump_and_memory_bound():
+    print("Testing HashLife glider gun to generation 2^30 (bounded memo)...", end=' ')
+    board = get_preset("gosper-gun").make_board()
+    universe = Universe.from_board(board, max_nodes=20_000)
+    universe.advance(1 << 30)
+    assert universe.generation == 1 << 30
+    # One 5-cell glider per 30 generations, plus the (phase-dependent) gun.
+    gliders = (universe.population - 36) / 5
+    assert abs(gliders - (1 << 30) / 30) < 10, universe.population
+    assert universe.node_count <= 20_000
+    print("✓ PASSED")
+
+
+def test_hashlife_rejects_wrap_and_table_rules():
+    print("Testing HashLife rejects wrap boards and non-Life rules...", end=' ')
+    try:
+        HashLifeEngine(TableRule({}))
+        assert False, "Should have raised ValueError"
+    except ValueError:
+        pass
+    try:
+        HashLifeEngine().step(Board(4, 4, boundary=Board.WRAP))
+        assert False, "Should have raised ValueError"
+    except ValueError:
+        pass
+    print("✓ PASSED")
+
+
+def test_cli_hashlife_boundary():
+    print("Testing CLI hashlife defaults to fixed and rejects --boundary wrap...", end=' ')
+    import contextlib
+    import io
+    from main import main
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        assert main(["--engine", "hashlife", "--boundary", "wrap"]) == 1
+    assert "--boundary fixed" in out.getvalue()
+    with contextlib.redirect_stdout(io.StringIO()):
+        assert main(["--engine", "hashlife", "--generations", "2", "--fps", "1000",
+                     "--no-clear"]) == 0
+    print("✓ PASSED")
+
+
+# ===========================================================================
+# 13. Sparse engine & dirty-rectangle rendering
+# ===========================================================================
+
+def test_sparse_engine_matches_python():
+    print("Testing sparse engine matches per-cell engine (Board & ArrayBoard)...", end=' ')
+    for boundary in (Board.FIXED, Board.WRAP):
+        board = Board.from_list(_random_rows(19, 23, seed=7), boundary=boundary)
+        expected = _make_life_engine().run(board, 15)
+        for tile_size in (1, 4, 8):
+            assert SparseEngine(LifeRule(), tile_size).run(board, 15) == expected, (boundary, tile_size)
+            if ArrayBoard is not None:
+                arr = ArrayBoard.from_board(board)
+                assert SparseEngine(LifeRule(), tile_size).run(arr, 15) == expected, (boundary, tile_size)
+    print("✓ PASSED")
+
+
+def test_sparse_engine_tracks_active_tiles():
+    print("Testing sparse engine only keeps tiles near changes active...", end=' ')
+    board = Board(64, 64, boundary=Board.FIXED)
+    for r, c in [(0, 1), (1, 2), (2, 0), (2, 1), (2, 2)]:  # glider
+        board.set(20 + r, 20 + c, 1)
+    engine = SparseEngine(LifeRule(), tile_size=8, in_place=True)
+    assert engine.dirty_rects is None  # nothing stepped yet: full redraw
+    current = engine.step(board)
+    assert current is board  # in_place
+    assert engine.dirty == {(2, 2)}
+    assert engine.dirty_rects == [(16, 16, 24, 24)]
+    assert len(engine.active_tiles) == 9
+    # Still life: nothing changes, nothing stays active.
+    block = Board.from_list([[0, 0, 0, 0], [0, 1, 1, 0], [0, 1, 1, 0], [0, 0, 0, 0]])
+    engine = SparseEngine(LifeRule(), tile_size=2)
+    engine.advance(block)
+    assert engine.dirty == set() and engine.active_tiles == set()
+    print("✓ PASSED")
+
+
+def test_sparse_engine_step_copies_keep_active_tiles():
+    print("Testing non-in-place sparse steps evaluate only active tiles...", end=' ')
+
+    class CountingLife(LifeRule):
+        evaluated = 0
+
+        def next_state(self, board, r, c):
+            CountingLife.evaluated += 1
+            return super().next_state(board, r, c)
+
+    board = Board(64, 64, boundary=Board.FIXED)
+    for r, c in [(0, 1), (1, 2), (2, 0), (2, 1), (2, 2)]:  # glider
+        board.set(20 + r, 20 + c, 1)
+    expected = _make_life_engine().run(board, 6)
+    engine = SparseEngine(LifeRule(), tile_size=8)
+    engine.rule = CountingLife()
+    current = engine.step(board)
+    assert CountingLife.evaluated == 64 * 64  # first step: every tile
+    for _ in range(5):
+        active = engine.active_tiles
+        assert active is not None and 0 < len(active) <= 16
+        CountingLife.evaluated = 0
+        previous = current
+        current = engine.step(current)
+        assert current is not previous
+        assert CountingLife.evaluated == len(active) * 8 * 8
+    assert current == expected
+    # An unrelated board is evaluated in full again.
+    CountingLife.evaluated = 0
+    engine.step(board)
+    assert CountingLife.evaluated == 64 * 64
+    print("✓ PASSED")
+
+
+def test_terminal_renderer_dirty_redraw():
+    print("Testing terminal renderer rewrites only dirty rectangles...", end=' ')
+    import contextlib
+    import io
+    board = Board.from_list([[0, 0, 0], [0, 1, 0]])
+    renderer = TerminalRenderer(clear=True)
+    renderer._frame_drawn = True  # pretend a full frame is on screen
+    renderer._has_header = True
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        renderer.render(board, generation=4, dirty=[(1, 1, 2, 3)])
+    text = out.getvalue()
+    assert "=== Generation 4 ===" in text
+    assert "\x1b[3;2H█·" in text, repr(text)  # board row 1 → screen row 3
+    assert "·█·" not in text  # no full rows reprinted
+    print("✓ PASSED")
+
+
+# ===========================================================================
+# 14. Parallel (shared-memory) engine
+# ===========================================================================
+
+def test_parallel_engine_matches_python():
+    print("Testing parallel tiled engine matches per-cell engine (Life & VN table)...", end=' ')
+    if ArrayBoard is None:
+        print("skipped (numpy not installed)")
+        return
+    from parallel_engine import ParallelEngine
+    vn_rule = VonNeumannTableRule(_random_table(3, 5, seed=4), name="RandVN")
+    cases = [
+        (LifeRule(), 2, Board.FIXED),
+        (LifeRule(), 2, Board.WRAP),
+        (vn_rule, 3, Board.WRAP),
+    ]
+    for rule, n_states, boundary in cases:
+        board = Board.from_list(_random_rows(17, 21, n_states, seed=6), boundary=boundary)
+        expected = Engine(rule).run(board, 8)
+        with ParallelEngine(rule, workers=2, tiles=(3, 2)) as engine:
+            result = engine.run(board, 8)
+            assert isinstance(result, Board)
+            assert result == expected, (rule, boundary)
+            arr = engine.run(ArrayBoard.from_board(board), 8)
+            assert isinstance(arr, ArrayBoard) and arr == expected
+    print("✓ PASSED")
+
+
+def test_parallel_engine_step_keeps_shared_board():
+    print("Testing parallel steps reuse the shared board unless it was edited...", end=' ')
+    if ArrayBoard is None:
+        print("skipped (numpy not installed)")
+        return
+    from parallel_engine import ParallelEngine
+    board = Board.from_list(_random_rows(17, 21, 2, seed=8), boundary=Board.WRAP)
+    python = Engine(LifeRule())
+    with ParallelEngine(LifeRule(), workers=2) as engine:
+        loads = []
+        load = engine._load
+        engine._load = lambda *a: (loads.append(a), load(*a))
+        current, expected = board, board
+        for _ in range(5):
+            current = engine.step(current)
+            expected = python.step(expected)
+            assert current == expected
+        assert len(loads) == 1, len(loads)
+        # A board the engine did not return is copied in again
+        edited = current.copy()
+        edited.set(0, 0, 1 - edited.get(0, 0))
+        assert engine.step(edited) == python.step(edited)
+        assert len(loads) == 2, len(loads)
+
+    # Edits to the returned board itself are not lost
+    for make in (Board, ArrayBoard):
+        empty = make(8, 8, boundary=Board.FIXED)
+        with ParallelEngine(LifeRule(), workers=2) as engine:
+            current = engine.step(empty)
+            for col in (2, 3, 4):
+                current.set(3, col, 1)           # blinker
+            current = engine.step(current)
+            assert sum(map(sum, current.to_list())) == 3, make
+    print("✓ PASSED")
+
+
 # ===========================================================================
 # Runner
 # ===========================================================================
@@ -462,6 +823,27 @@ def run_all_tests():
         # Neighborhood
         test_moore_key_shape,
         test_von_neumann_key_shape,
+        # Vectorized engine
+        test_array_board_accessors,
+        test_vectorized_life_matches_python,
+        # Compiled table rules
+        test_compiled_tables_match_python,
+        test_compiled_missing_key_reports_key,
+        test_rule_loader_rotate4_symmetry,
+        # HashLife
+        test_hashlife_matches_python,
+        test_hashlife_keeps_cells_outside_window,
+        test_hashlife_gun_jump_and_memory_bound,
+        test_hashlife_rejects_wrap_and_table_rules,
+        test_cli_hashlife_boundary,
+        # Sparse engine
+        test_sparse_engine_matches_python,
+        test_sparse_engine_tracks_active_tiles,
+        test_sparse_engine_step_copies_keep_active_tiles,
+        test_terminal_renderer_dirty_redraw,
+        # Parallel engine
+        test_parallel_engine_matches_python,
+        test_parallel_engine_step_keeps_shared_board,
     ]
 
     passed = 0
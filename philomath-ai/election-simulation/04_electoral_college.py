@@ -22,12 +22,25 @@ Key Limitation (from video at 1:38:58):
 All polling simulators have the same fundamental problem - they model
 random error but not systematic bias. Prediction markets like Kalshi
 can aggregate information better because they use real money.
+
+Batched Engine:
+simulate_electoral_college() runs one election per loop iteration.
+simulate_electoral_college_batched() draws the noise for a whole chunk of
+elections as an (n_sims x n_states) NumPy matrix and counts winners and
+electoral votes with array operations, so a million simulations take
+seconds. It can also add a correlated swing (national / regional polling
+error) from a covariance matrix - see polling_covariance(). Requires numpy.
 """
 
 import random
 import sys
 import os
 
+try:
+    import numpy as np
+except ImportError:  # only the batched engine needs numpy
+    np = None
+
 
 # Import our previous modules
 # Note: In production, these would be proper imports
@@ -167,6 +180,186 @@ def simulate_electoral_college(state_polls, num_simulations=10000, margin_of_err
     }
 
 
+def polling_covariance(state_polls, national_error=2.0, regional_error=0.0,
+                       regions=None):
+    """
+    Build a covariance matrix for correlated polling error.
+
+    The correlated error is a swing in the A-minus-B margin (percentage
+    points).  Every state shares a national swing with standard deviation
+    *national_error*; states in the same region also share a regional swing
+    with standard deviation *regional_error*:
+
+        cov[i][j] = national_error² + (regional_error² if same region)
+
+    Args:
+        state_polls (dict): Dictionary of state polling data
+        national_error (float): Std. dev. of the nationwide swing
+        regional_error (float): Std. dev. of each region's swing
+        regions (dict or callable): State -> region name.  Defaults to the
+            part of the name before the first '-', so Bangladesh
+            constituencies group by district ('Dhaka-14' -> 'Dhaka')
+
+    Returns:
+        numpy.ndarray: (n_states x n_states) covariance, in the order of
+        state_polls
+    """
+    if np is None:
+        raise ImportError("polling_covariance requires numpy")
+    if regions is None:
+        regions = lambda state: state.split('-')[0]
+    region_of = regions if callable(regions) else regions.get
+    
+    names = [region_of(state) for state in state_polls]
+    same_region = np.array([[a == b for b in names] for a in names])
+    return national_error ** 2 + regional_error ** 2 * same_region
+
+
+def _swing_factor(covariance, num_states):
+    """
+    Matrix L with L @ L.T == covariance (works for singular matrices).
+    
+    Only eigenvectors with non-zero eigenvalues are kept, so L has one
+    column per independent source of error (1 for a purely national swing).
+    """
+    covariance = np.asarray(covariance, dtype=float)
+    if covariance.shape != (num_states, num_states):
+        raise ValueError(f"covariance must be {num_states}x{num_states}, "
+                         f"got {covariance.shape}")
+    eigenvalues, eigenvectors = np.linalg.eigh(covariance)
+    if eigenvalues.min() < -1e-9 * max(1.0, eigenvalues.max()):
+        raise ValueError("covariance must be positive semi-definite")
+    keep = eigenvalues > 1e-12 * max(1.0, eigenvalues.max())
+    return eigenvectors[:, keep] * np.sqrt(eigenvalues[keep])
+
+
+def simulate_electoral_college_batched(state_polls, num_simulations=1_000_000,
+                                       margin_of_error=3.0, seed=None,
+                                       covariance=None, chunk_size=20_000):
+    """
+    Vectorized Electoral College simulation (NumPy).
+
+    Same model as simulate_electoral_college(): each candidate's poll gets
+    independent Gaussian noise (std. dev. = margin_of_error / 2) and the
+    higher value wins the state.  Only the sign of the A-minus-B margin
+    matters, so one draw per state suffices: the margin noise has std. dev.
+    sqrt(2) * margin_of_error / 2.  (The 0-100 clipping of the loop version
+    is dropped; it only changes an outcome when both noisy polls leave the
+    same end of the range.)  Elections are simulated chunk_size at a time as
+    (chunk_size x n_states) matrices, and only running totals are kept, so
+    memory does not grow with num_simulations.
+
+    Optionally, a correlated swing s ~ N(0, covariance) is added to every
+    state's margin, modelling polls that are wrong in the same direction
+    across states.
+
+    Args:
+        state_polls (dict): Dictionary of state polling data
+        num_simulations (int): Number of elections to simulate
+        margin_of_error (float): Polling margin of error (default 3.0%)
+        seed (int): Random seed (results are reproducible for a given
+            seed and chunk_size)
+        covariance: (n_states x n_states) covariance of the margin swing,
+            in the order of state_polls (see polling_covariance)
+        chunk_size (int): Elections simulated per batch
+
+    Returns:
+        dict: The keys of simulate_electoral_college(), except that
+        'ev_distribution' is replaced by 'ev_histogram' -
+        {'candidate_a': counts, 'candidate_b': counts}, where counts[v] is
+        the number of simulations in which the candidate won v votes.
+
+    Example:
+        >>> polls = {
+        ...     'State1': {'candidate_a': 52.0, 'candidate_b': 48.0, 'electoral_votes': 10},
+        ... }
+        >>> results = simulate_electoral_college_batched(polls, num_simulations=1000, seed=42)
+        >>> results['candidate_a_wins'] + results['candidate_b_wins'] + results['ties']
+        1000
+    """
+    if np is None:
+        raise ImportError("simulate_electoral_college_batched requires numpy")
+    if num_simulations < 1 or chunk_size < 1:
+        raise ValueError("num_simulations and chunk_size must be positive")
+    
+    rng = np.random.default_rng(seed)
+    states = list(state_polls)
+    poll_margin = np.array([state_polls[s]['candidate_a'] - state_polls[s]['candidate_b']
+                            for s in states])
+    votes = np.array([state_polls[s]['electoral_votes'] for s in states], dtype=np.int64)
+    votes_f = votes.astype(np.float64)
+    total_votes = int(votes.sum())
+    margin_std = np.sqrt(2.0) * margin_of_error / 2.0
+    swing = None if covariance is None else _swing_factor(covariance, len(states))
+    
+    candidate_a_wins = candidate_b_wins = ties = 0
+    state_a = np.zeros(len(states), dtype=np.int64)
+    state_b = np.zeros(len(states), dtype=np.int64)
+    hist_a = np.zeros(total_votes + 1, dtype=np.int64)
+    hist_b = np.zeros(total_votes + 1, dtype=np.int64)
+    
+    for start in range(0, num_simulations, chunk_size):
+        n = min(chunk_size, num_simulations - start)
+        margin = rng.standard_normal((n, len(states)))
+        margin *= margin_std
+        margin += poll_margin
+        if swing is not None:
+            margin += rng.standard_normal((n, swing.shape[1])) @ swing.T
+        
+        a_won = margin > 0
+        b_won = margin < 0
+        # Vote totals as a float matrix product (exact for these sizes)
+        a_ev = (a_won @ votes_f).astype(np.int64)
+        b_ev = (b_won @ votes_f).astype(np.int64)
+        
+        state_a += a_won.sum(axis=0)
+        state_b += b_won.sum(axis=0)
+        candidate_a_wins += int(np.count_nonzero(a_ev > b_ev))
+        candidate_b_wins += int(np.count_nonzero(b_ev > a_ev))
+        hist_a += np.bincount(a_ev, minlength=total_votes + 1)
+        hist_b += np.bincount(b_ev, minlength=total_votes + 1)
+    ties = num_simulations - candidate_a_wins - candidate_b_wins
+    
+    state_win_counts = {
+        state: {'A': int(wa), 'B': int(wb), 'TIE': num_simulations - int(wa) - int(wb)}
+        for state, wa, wb in zip(states, state_a, state_b)
+    }
+    
+    return {
+        'num_simulations': num_simulations,
+        'margin_of_error': margin_of_error,
+        'candidate_a_wins': candidate_a_wins,
+        'candidate_b_wins': candidate_b_wins,
+        'ties': ties,
+        'candidate_a_win_probability': candidate_a_wins / num_simulations,
+        'candidate_b_win_probability': candidate_b_wins / num_simulations,
+        'state_win_counts': state_win_counts,
+        'ev_histogram': {'candidate_a': hist_a, 'candidate_b': hist_b},
+        'state_polls': state_polls
+    }
+
+
+def average_electoral_votes(results):
+    """
+    Average electoral votes of each candidate.
+    
+    Works with the results of both simulate_electoral_college() and
+    simulate_electoral_college_batched().
+    
+    Returns:
+        tuple: (average A electoral votes, average B electoral votes)
+    """
+    n = results['num_simulations']
+    if 'ev_histogram' in results:
+        return tuple(
+            sum(v * c for v, c in enumerate(results['ev_histogram'][key].tolist())) / n
+            for key in ('candidate_a', 'candidate_b')
+        )
+    avg_a = sum(ev['candidate_a'] for ev in results['ev_distribution']) / n
+    avg_b = sum(ev['candidate_b'] for ev in results['ev_distribution']) / n
+    return avg_a, avg_b
+
+
 def generate_report(results):
     """
     Generate a comprehensive text report from simulation results.
@@ -236,8 +429,7 @@ def generate_report(results):
     report_lines.append("")
     
     # Electoral vote statistics
-    avg_a_ev = sum(ev['candidate_a'] for ev in results['ev_distribution']) / results['num_simulations']
-    avg_b_ev = sum(ev['candidate_b'] for ev in results['ev_distribution']) / results['num_simulations']
+    avg_a_ev, avg_b_ev = average_electoral_votes(results)
     
     report_lines.append("Electoral Vote Statistics:")
     report_lines.append("-" * 70)
@@ -301,6 +493,20 @@ def main():
     report = generate_report(results)
     print(report)
     
+    # Batched engine: many more simulations, plus systematic (correlated) error
+    if np is not None:
+        print()
+        print("Batched NumPy engine, 1,000,000 simulations:")
+        print("-" * 70)
+        for label, covariance in [
+            ("independent state errors", None),
+            ("+ national swing (σ = 2 pts)", polling_covariance(state_polls, national_error=2.0)),
+        ]:
+            batched = simulate_electoral_college_batched(
+                state_polls, num_simulations=1_000_000, seed=42, covariance=covariance)
+            print(f"  {label:<30} Candidate A wins "
+                  f"{batched['candidate_a_win_probability'] * 100:.1f}%")
+    
     print()
     print("For more information:")
     print("- See README.md for detailed documentation")
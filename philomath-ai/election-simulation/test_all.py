@@ -287,6 +287,91 @@ class TestElectoralCollege(unittest.TestCase):
         self.assertIn('MODEL LIMITATIONS', report)
 
 
+@unittest.skipIf(ec.np is None, "numpy not installed")
+class TestBatchedElectoralCollege(unittest.TestCase):
+    """Tests for the batched NumPy engine in 04_electoral_college.py"""
+    
+    polls = {
+        'State1': {'candidate_a': 52.0, 'candidate_b': 48.0, 'electoral_votes': 10},
+        'State2': {'candidate_a': 48.0, 'candidate_b': 52.0, 'electoral_votes': 15},
+        'State3': {'candidate_a': 50.5, 'candidate_b': 49.5, 'electoral_votes': 8},
+    }
+    
+    def test_counts_add_up(self):
+        """Wins, state counts and histograms cover every simulation."""
+        results = ec.simulate_electoral_college_batched(
+            self.polls, num_simulations=10_001, seed=1, chunk_size=1000)
+        
+        total_wins = results['candidate_a_wins'] + results['candidate_b_wins'] + results['ties']
+        self.assertEqual(total_wins, 10_001)
+        for counts in results['state_win_counts'].values():
+            self.assertEqual(sum(counts.values()), 10_001)
+        self.assertEqual(int(results['ev_histogram']['candidate_a'].sum()), 10_001)
+        self.assertEqual(len(results['ev_histogram']['candidate_a']), 34)
+    
+    def test_matches_loop_engine(self):
+        """Batched and loop engines agree statistically."""
+        loop = ec.simulate_electoral_college(self.polls, num_simulations=20_000, seed=42)
+        batched = ec.simulate_electoral_college_batched(self.polls, num_simulations=200_000, seed=42)
+        
+        self.assertAlmostEqual(loop['candidate_a_win_probability'],
+                               batched['candidate_a_win_probability'], delta=0.02)
+        for state in self.polls:
+            self.assertAlmostEqual(loop['state_win_counts'][state]['A'] / 20_000,
+                                   batched['state_win_counts'][state]['A'] / 200_000,
+                                   delta=0.02)
+        for loop_avg, batched_avg in zip(ec.average_electoral_votes(loop),
+                                         ec.average_electoral_votes(batched)):
+            self.assertAlmostEqual(loop_avg, batched_avg, delta=0.3)
+    
+    def test_reproducible(self):
+        """The same seed gives the same results."""
+        first = ec.simulate_electoral_college_batched(self.polls, num_simulations=5000, seed=7)
+        second = ec.simulate_electoral_college_batched(self.polls, num_simulations=5000, seed=7)
+        self.assertEqual(first['state_win_counts'], second['state_win_counts'])
+    
+    def test_polling_covariance(self):
+        """National error is shared; regional error only within a region."""
+        polls = {
+            'Dhaka-1': self.polls['State1'],
+            'Dhaka-2': self.polls['State2'],
+            'Khulna-1': self.polls['State3'],
+        }
+        cov = ec.polling_covariance(polls, national_error=2.0, regional_error=1.0)
+        
+        self.assertEqual(cov.shape, (3, 3))
+        self.assertAlmostEqual(cov[0][1], 5.0)
+        self.assertAlmostEqual(cov[0][2], 4.0)
+        self.assertAlmostEqual(cov[2][2], 5.0)
+    
+    def test_correlated_error_widens_spread(self):
+        """A national swing makes electoral-vote totals more variable."""
+        def ev_std(results):
+            hist = results['ev_histogram']['candidate_a']
+            seats = ec.np.arange(len(hist))
+            mean = (hist @ seats) / hist.sum()
+            return ((hist @ (seats - mean) ** 2) / hist.sum()) ** 0.5
+        
+        independent = ec.simulate_electoral_college_batched(self.polls, 50_000, seed=3)
+        cov = ec.polling_covariance(self.polls, national_error=5.0)
+        correlated = ec.simulate_electoral_college_batched(self.polls, 50_000, seed=3,
+                                                           covariance=cov)
+        self.assertGreater(ev_std(correlated), ev_std(independent))
+    
+    def test_invalid_covariance(self):
+        """Wrong-shaped or indefinite covariance matrices are rejected."""
+        with self.assertRaises(ValueError):
+            ec.simulate_electoral_college_batched(self.polls, 100, covariance=ec.np.eye(2))
+        with self.assertRaises(ValueError):
+            ec.simulate_electoral_college_batched(self.polls, 100, covariance=-ec.np.eye(3))
+    
+    def test_generate_report(self):
+        """Reports work with the histogram results."""
+        results = ec.simulate_electoral_college_batched(self.polls, 1000, seed=42)
+        report = ec.generate_report(results)
+        self.assertIn('Average Candidate A electoral votes', report)
+
+
 def run_tests():
     """Run all tests and display results."""
     print("=" * 70)
@@ -302,6 +387,7 @@ def run_tests():
     suite.addTests(loader.loadTestsFromTestCase(TestSingleElection))
     suite.addTests(loader.loadTestsFromTestCase(TestMultipleElections))
     suite.addTests(loader.loadTestsFromTestCase(TestElectoralCollege))
+    suite.addTests(loader.loadTestsFromTestCase(TestBatchedElectoralCollege))
     
     # Run tests
     runner = unittest.TextTestRunner(verbosity=2)
@@ -10,6 +10,7 @@ Key Optimization Strategies:
 2. Hash Tables: Use dictionaries for O(1) lookups instead of O(n) searches
 3. Avoid Recomputation: Calculate once, update incrementally
 4. Memory Trade-offs: Sometimes using more memory improves speed
+5. Data Representation: Integer-encoded k-mers processed as arrays (module 09)
 
 Learning Objectives:
 - Understand Big O notation in practice
@@ -43,6 +44,15 @@ _clump_module = import_module_from_file('clump_finding', _clump_module_path)
 find_clumps_naive = _clump_module.find_clumps_naive
 find_clumps_optimized = _clump_module.find_clumps_optimized
 
+# Import the integer k-mer engine (needs numpy)
+try:
+    _kmer_module_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '09_kmer_engine.py')
+    _kmer_module = import_module_from_file('kmer_engine', _kmer_module_path)
+    find_clumps_encoded = _kmer_module.find_clumps_encoded
+    KMER_ENGINE_AVAILABLE = True
+except ImportError:
+    KMER_ENGINE_AVAILABLE = False
+
 
 def generate_random_genome(length: int, seed: int = None) -> str:
     """
@@ -206,9 +216,11 @@ def compare_algorithms(genome: str, k: int, L: int, t: int,
 def benchmark_scaling(sizes: List[int], k: int = 9, L: int = 500, 
                      t: int = 3) -> None:
     """
-    Benchmark both algorithms across different genome sizes.
+    Benchmark the algorithms across different genome sizes.
     
     This demonstrates how algorithm complexity affects real performance.
+    When numpy is available, the integer k-mer engine (find_clumps_encoded)
+    is timed as well and compared against the optimized algorithm.
     
     Args:
         sizes: List of genome sizes to test
@@ -220,22 +232,38 @@ def benchmark_scaling(sizes: List[int], k: int = 9, L: int = 500,
     print("SCALING BENCHMARK - How algorithms perform as input size grows")
     print("=" * 70)
     print(f"Parameters: k={k}, L={L}, t={t}\n")
-    print(f"{'Size':>10} {'Naive':>15} {'Optimized':>15} {'Speedup':>10}")
+    header = f"{'Size':>10} {'Naive':>15} {'Optimized':>15} {'Speedup':>10}"
+    if KMER_ENGINE_AVAILABLE:
+        header += f" {'Encoded':>12} {'vs Opt':>8}"
+    print(header)
     print("-" * 70)
     
+    if KMER_ENGINE_AVAILABLE:
+        # Warm up NumPy so the first row does not include one-time setup
+        find_clumps_encoded(generate_random_genome(L), k, L, t)
+    
     for size in sizes:
         genome = generate_random_genome(size, seed=42)
         
         # Skip naive for very large sizes (would take too long)
         if size > 50000:
-            print(f"{size:>10,} {'(skipped)':>15} ", end='')
-            opt_time, _ = time_function(find_clumps_optimized, genome, k, L, t)
-            print(f"{format_time(opt_time):>15} {'N/A':>10}")
+            opt_time, opt_result = time_function(find_clumps_optimized, genome, k, L, t)
+            row = (f"{size:>10,} {'(skipped)':>15} "
+                   f"{format_time(opt_time):>15} {'N/A':>10}")
         else:
             results = compare_algorithms(genome, k, L, t, verbose=False)
-            print(f"{size:>10,} {format_time(results['naive_time']):>15} "
-                  f"{format_time(results['optimized_time']):>15} "
-                  f"{results['speedup']:>9.1f}x")
+            opt_time = results['optimized_time']
+            opt_result = find_clumps_optimized(genome, k, L, t)
+            row = (f"{size:>10,} {format_time(results['naive_time']):>15} "
+                   f"{format_time(opt_time):>15} "
+                   f"{results['speedup']:>9.1f}x")
+        
+        if KMER_ENGINE_AVAILABLE:
+            enc_time, enc_result = time_function(find_clumps_encoded, genome, k, L, t)
+            assert enc_result == opt_result, "Encoded engine disagrees with optimized"
+            enc_speedup = opt_time / enc_time if enc_time > 0 else float('inf')
+            row += f" {format_time(enc_time):>12} {enc_speedup:>7.1f}x"
+        print(row)
 
 
 def analyze_complexity() -> None:
@@ -285,6 +313,17 @@ we REUSE the previous window's frequencies:
   - Update frequencies incrementally
   
 This transforms O(L) work per window to O(1) work per window!
+
+Integer K-mer Engine (module 09):
+---------------------------------
+Time Complexity: O(n × k + n log n), executed as NumPy array operations
+  - Encode A/C/G/T as 0/1/2/3 and compute every k-mer's base-4 code
+  - Count codes in a dense array of size 4^k (k ≤ 12), not a dictionary
+  - Sort occurrences by code: a k-mer is a clump when t consecutive
+    occurrences start within L - k positions of each other
+
+Same asymptotic work as the sliding window, but no Python-level loop
+over the genome and no string created per k-mer.
     """)
 
 
@@ -315,7 +354,7 @@ if __name__ == "__main__":
     
     # Test 4: Scaling benchmark
     print("\n\nTest 4: Scaling across different sizes")
-    benchmark_scaling([1000, 5000, 10000, 20000, 50000, 100000])
+    benchmark_scaling([1000, 5000, 10000, 20000, 50000, 100000, 1000000])
     
     # Show complexity analysis
     analyze_complexity()
@@ -72,6 +72,18 @@ except Exception as e:
     print(f"Warning: Could not import modules: {e}")
     VISUALIZATION_AVAILABLE = False
 
+try:
+    # Import the integer k-mer engine (needs numpy)
+    _kmer_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '09_kmer_engine.py')
+    _kmer_module = import_module_from_file('kmer_engine', _kmer_path)
+    encode_dna = _kmer_module.encode_dna
+    find_clumps_encoded = _kmer_module.find_clumps_encoded
+    KMER_ENGINE_AVAILABLE = True
+except ImportError:
+    KMER_ENGINE_AVAILABLE = False
+
+CLUMP_ENGINES = ('optimized', 'encoded')
+
 
 def load_genome_from_file(filepath: str) -> str:
     """
@@ -160,7 +172,8 @@ def simulate_genome(length: int, gc_content: float = 0.5,
 
 def find_origin_of_replication(genome: str, k: int = 9, L: int = 500, t: int = 3,
                                window_around_minimum: int = 1000,
-                               verbose: bool = True) -> Dict:
+                               verbose: bool = True,
+                               engine: Optional[str] = None) -> Dict:
     """
     Complete pipeline to identify the origin of replication.
     
@@ -177,6 +190,9 @@ def find_origin_of_replication(genome: str, k: int = 9, L: int = 500, t: int = 3
         t: frequency threshold for clump finding
         window_around_minimum: How far around skew minimum to search (bp)
         verbose: Print progress information
+        engine: Clump finder - 'optimized' (find_clumps_optimized, pure
+            Python) or 'encoded' (integer k-mer engine, module 09).
+            Default: 'encoded' when numpy is available.
         
     Returns:
         Dictionary containing:
@@ -192,12 +208,27 @@ def find_origin_of_replication(genome: str, k: int = 9, L: int = 500, t: int = 3
         >>> 'predicted_ori' in results
         True
     """
+    if engine is None:
+        engine = 'encoded' if KMER_ENGINE_AVAILABLE else 'optimized'
+    if engine not in CLUMP_ENGINES:
+        raise ValueError(f"engine must be one of {CLUMP_ENGINES}, got {engine!r}")
+    if engine == 'encoded' and not KMER_ENGINE_AVAILABLE:
+        raise ImportError("engine='encoded' requires numpy")
+    
+    if engine == 'encoded':
+        # Encode once; regions below are slices of the same array
+        sequence = encode_dna(genome)
+        find_clumps = find_clumps_encoded
+    else:
+        sequence = genome
+        find_clumps = find_clumps_optimized
+    
     if verbose:
         print("=" * 70)
         print("ORIGIN OF REPLICATION FINDER")
         print("=" * 70)
         print(f"\nGenome length: {len(genome):,} bp")
-        print(f"Parameters: k={k}, L={L}, t={t}\n")
+        print(f"Parameters: k={k}, L={L}, t={t}, engine={engine}\n")
     
     # Step 1: Analyze GC-skew
     if verbose:
@@ -217,7 +248,7 @@ def find_origin_of_replication(genome: str, k: int = 9, L: int = 500, t: int = 3
     if verbose:
         print("\nStep 2: Finding DnaA box clumps (frequent k-mers)...")
     
-    all_clumps = find_clumps_optimized(genome, k, L, t)
+    all_clumps = find_clumps(sequence, k, L, t)
     
     if verbose:
         print(f"  Clumps found genome-wide: {len(all_clumps)}")
@@ -234,10 +265,10 @@ def find_origin_of_replication(genome: str, k: int = 9, L: int = 500, t: int = 3
         # Define region around this minimum
         region_start = max(0, min_pos - window_around_minimum)
         region_end = min(len(genome), min_pos + window_around_minimum)
-        region = genome[region_start:region_end]
+        region = sequence[region_start:region_end]
         
         # Find clumps in this specific region
-        region_clumps = find_clumps_optimized(region, k, L, t)
+        region_clumps = find_clumps(region, k, L, t)
         ori_region_clumps.update(region_clumps)
     
     if verbose:
@@ -262,7 +293,7 @@ def find_origin_of_replication(genome: str, k: int = 9, L: int = 500, t: int = 3
         'ori_region_clumps': ori_region_clumps,
         'predicted_ori': predicted_ori,
         'genome_length': len(genome),
-        'parameters': {'k': k, 'L': L, 't': t}
+        'parameters': {'k': k, 'L': L, 't': t, 'engine': engine}
     }
     
     return results
@@ -431,7 +462,8 @@ Expected results:
     * TTATCCACA (most common)
   
 Performance:
-  - Analysis time: ~5-30 seconds (optimized algorithm)
+  - Analysis time: ~5-30 seconds (engine='optimized')
+                   ~2-5 seconds  (engine='encoded', integer k-mers)
   - Memory usage: ~100-500 MB
   
 Note: This example uses a simulated genome. To analyze real E. coli,
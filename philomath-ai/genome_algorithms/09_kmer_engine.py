@@ -0,0 +1,261 @@
+"""
+Integer K-mer Engine - Clump Finding at Genome Scale
+=====================================================
+
+find_clumps_optimized (module 01) slices a new string for every k-mer and
+keeps a dictionary keyed by those strings.  That is fine for thousands of
+base pairs, but a whole bacterial genome (~5 million bp) creates millions
+of short-lived strings and a very large dictionary.
+
+This module represents DNA the way fast bioinformatics tools do:
+
+1. 2-bit encoding: A=0, C=1, G=2, T=3, one small integer per nucleotide
+   stored in a NumPy uint8 array.
+
+2. Integer k-mer codes: a k-mer is the base-4 number spelled by its
+   nucleotides, so "ACGT" = 0*64 + 1*16 + 2*4 + 3 = 27.  The codes of all
+   k-mers are computed at once with array shifts and ORs:
+
+       code[i] = enc[i] << 2(k-1) | enc[i+1] << 2(k-2) | ... | enc[i+k-1]
+
+3. Dense counting: for k <= 12 there are at most 4^12 ≈ 16.8 million
+   possible k-mers, so counts live in an array indexed directly by code
+   (np.bincount) instead of a hash table.
+
+4. Clumps without sliding: a k-mer forms an (L, t)-clump exactly when t
+   consecutive occurrences of it start within L - k positions of each
+   other.  Sorting occurrences by code (positions stay in order) lets us
+   test every group of t occurrences in a single vectorized comparison.
+   K-mers whose genome-wide count is below t are discarded first using
+   the dense counts.
+
+Characters other than A, C, G, T (for example N in real assemblies) are
+allowed; k-mers containing them are simply skipped.
+
+Learning Objectives:
+- Encode sequences compactly as integers
+- Replace per-character Python loops with vectorized array operations
+- Use direct-address tables instead of hash tables for small key spaces
+- Reformulate a sliding-window algorithm so it needs no window at all
+
+Requires: numpy
+"""
+
+import time
+from typing import Set, Tuple, Union
+
+import numpy as np
+
+# Largest k whose counts are kept in a dense array of size 4^k
+DENSE_MAX_K = 12
+
+# Largest k whose codes fit in an int64 (2 bits per nucleotide)
+MAX_K = 31
+
+# Code of a character that is not A, C, G or T
+INVALID = 4
+
+_ENCODE = np.full(256, INVALID, dtype=np.uint8)
+for _code, _base in enumerate('ACGT'):
+    _ENCODE[ord(_base)] = _code
+    _ENCODE[ord(_base.lower())] = _code
+
+_DECODE = np.frombuffer(b'ACGT', dtype=np.uint8)
+
+
+def encode_dna(text: str) -> np.ndarray:
+    """
+    Encode a DNA string as an array of 2-bit codes (A=0, C=1, G=2, T=3).
+
+    Lowercase letters are accepted; any other character becomes INVALID (4).
+
+    Args:
+        text: DNA string
+
+    Returns:
+        uint8 array with one code per nucleotide
+
+    Example:
+        >>> encode_dna("ACGTN").tolist()
+        [0, 1, 2, 3, 4]
+    """
+    return _ENCODE[np.frombuffer(text.encode('ascii'), dtype=np.uint8)]
+
+
+def kmer_codes(encoded: np.ndarray, k: int) -> np.ndarray:
+    """
+    Compute the integer code of every k-mer of an encoded sequence.
+
+    Time Complexity: O(n * k), but as k whole-array operations
+
+    Args:
+        encoded: Output of encode_dna()
+        k: k-mer length (1 to MAX_K)
+
+    Returns:
+        int64 array of length n - k + 1; k-mers that contain an invalid
+        character get code -1
+
+    Example:
+        >>> kmer_codes(encode_dna("ACGTA"), 4).tolist()
+        [27, 108]
+    """
+    if not 1 <= k <= MAX_K:
+        raise ValueError(f"k must be between 1 and {MAX_K}, got {k}")
+    n = len(encoded) - k + 1
+    if n <= 0:
+        return np.empty(0, dtype=np.int64)
+
+    codes = np.zeros(n, dtype=np.int64)
+    for j in range(k):
+        codes <<= 2
+        codes |= encoded[j:j + n] & 3
+
+    if (encoded == INVALID).any():
+        # A k-mer is invalid if any of its k characters is
+        bad = np.concatenate(([0], np.cumsum(encoded == INVALID)))
+        codes[bad[k:] - bad[:n] > 0] = -1
+    return codes
+
+
+def decode_kmer(code: int, k: int) -> str:
+    """
+    Convert an integer k-mer code back to its string.
+
+    Example:
+        >>> decode_kmer(27, 4)
+        'ACGT'
+    """
+    digits = (int(code) >> (2 * np.arange(k - 1, -1, -1))) & 3
+    return _DECODE[digits].tobytes().decode('ascii')
+
+
+def kmer_counts(codes: np.ndarray, k: int) -> Union[np.ndarray, Tuple[np.ndarray, np.ndarray]]:
+    """
+    Count k-mer codes (invalid codes are ignored).
+
+    Args:
+        codes: Output of kmer_codes()
+        k: k-mer length
+
+    Returns:
+        For k <= DENSE_MAX_K: array of length 4^k where entry c is the
+        count of k-mer c.  For larger k: (unique codes, counts).
+
+    Example:
+        >>> counts = kmer_counts(kmer_codes(encode_dna("AAAA"), 2), 2)
+        >>> int(counts[0])  # "AA" has code 0
+        3
+    """
+    valid = codes[codes >= 0]
+    if k <= DENSE_MAX_K:
+        return np.bincount(valid, minlength=4 ** k)
+    return np.unique(valid, return_counts=True)
+
+
+def find_clump_codes(codes: np.ndarray, k: int, L: int, t: int) -> np.ndarray:
+    """
+    Find the codes of all k-mers forming (L, t)-clumps.
+
+    Args:
+        codes: Output of kmer_codes() for a sequence of length len(codes) + k - 1
+        k: k-mer length
+        L: window length
+        t: frequency threshold
+
+    Returns:
+        Sorted array of unique clump codes
+    """
+    if t < 1 or L < k or len(codes) + k - 1 < L:
+        return np.empty(0, dtype=np.int64)
+
+    # Discard k-mers that cannot reach t occurrences anywhere
+    if k <= DENSE_MAX_K:
+        frequent = kmer_counts(codes, k) >= t
+        positions = np.flatnonzero((codes >= 0) & frequent[np.maximum(codes, 0)])
+    else:
+        unique, counts = kmer_counts(codes, k)
+        positions = np.flatnonzero(np.isin(codes, unique[counts >= t]))
+
+    # Group occurrences by k-mer, positions ascending within each group.
+    # When code and position fit in one int64 together, sorting the packed
+    # value (code << pos_bits | position) is much faster than an argsort.
+    pos_bits = max(int(len(codes)).bit_length(), 1)
+    if 2 * k + pos_bits <= 63:
+        packed = np.sort((codes[positions] << pos_bits) | positions)
+        sorted_codes = packed >> pos_bits
+        sorted_pos = packed & ((1 << pos_bits) - 1)
+    else:
+        order = np.argsort(codes[positions], kind='stable')
+        sorted_codes = codes[positions][order]
+        sorted_pos = positions[order]
+
+    # t consecutive occurrences of the same k-mer that fit in one window
+    span = t - 1
+    same = sorted_codes[span:] == sorted_codes[:len(sorted_codes) - span]
+    close = sorted_pos[span:] - sorted_pos[:len(sorted_pos) - span] <= L - k
+    return np.unique(sorted_codes[span:][same & close])
+
+
+def find_clumps_encoded(text: Union[str, np.ndarray], k: int, L: int, t: int) -> Set[str]:
+    """
+    Find all (L, t)-clumps using integer k-mer codes.
+
+    Returns the same set as find_clumps_optimized() for sequences of
+    A, C, G, T, but runs in a few vectorized passes over the genome.
+
+    Time Complexity: O(n * k + n log n), all in NumPy
+    Space Complexity: O(n + 4^k) for k <= 12, O(n) otherwise
+
+    Args:
+        text: DNA string, or a sequence already encoded with encode_dna()
+        k: k-mer length
+        L: window length
+        t: frequency threshold
+
+    Returns:
+        set of k-mers forming clumps
+
+    Example:
+        >>> genome = "CGGACTCGACAGATGTGAAGAACGACAATGTGAAGACTCGACACGACAGAGTGAAGAGAAGAGGAAACATTGTAA"
+        >>> sorted(find_clumps_encoded(genome, 5, 50, 4))
+        ['CGACA', 'GAAGA']
+    """
+    encoded = encode_dna(text) if isinstance(text, str) else text
+    codes = kmer_codes(encoded, k)
+    return {decode_kmer(code, k) for code in find_clump_codes(codes, k, L, t).tolist()}
+
+
+# Example Usage and Testing
+if __name__ == "__main__":
+    import os
+    import importlib.util
+
+    print("=== Integer K-mer Engine ===\n")
+
+    genome = "CGGACTCGACAGATGTGAAGAACGACAATGTGAAGACTCGACACGACAGAGTGAAGAGAAGAGGAAACATTGTAA"
+    print(f"Encoded first 10 bases: {encode_dna(genome)[:10].tolist()}")
+    print(f"First 5-mer {genome[:5]} has code {kmer_codes(encode_dna(genome), 5)[0]}")
+    print(f"Clumps (k=5, L=50, t=4): {sorted(find_clumps_encoded(genome, 5, 50, 4))}")
+
+    # Compare against the dictionary-based algorithm on a bacterial-sized genome
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '01_clump_finding.py')
+    spec = importlib.util.spec_from_file_location('clump_finding', path)
+    clump_module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(clump_module)
+
+    rng = np.random.default_rng(42)
+    length = 5_000_000
+    big_genome = _DECODE[rng.integers(0, 4, length)].tobytes().decode('ascii')
+    print(f"\nRandom genome of {length:,} bp, k=9, L=500, t=3")
+
+    start = time.perf_counter()
+    encoded_result = find_clumps_encoded(big_genome, 9, 500, 3)
+    encoded_time = time.perf_counter() - start
+    print(f"  Encoded engine:        {encoded_time:.2f} s ({len(encoded_result):,} clumps)")
+
+    start = time.perf_counter()
+    dict_result = clump_module.find_clumps_optimized(big_genome, 9, 500, 3)
+    dict_time = time.perf_counter() - start
+    print(f"  find_clumps_optimized: {dict_time:.2f} s ({len(dict_result):,} clumps)")
+    print(f"  Speedup: {dict_time / encoded_time:.1f}x, results match: {encoded_result == dict_result}")
@@ -0,0 +1,369 @@
+"""
+Mismatch Engine - Frequent Words with Mismatches at Genome Scale
+================================================================
+
+frequent_words_with_mismatches (module 04) builds the d-neighborhood of
+every k-mer in the text as a set of strings.  For k=9 and d=2 that is 352
+new strings per position - over a billion for a bacterial genome.
+
+This module works on the integer k-mer codes of module 09 instead:
+
+1. Count each k-mer exactly once (a dense array of size 4^k).
+
+2. Spread the counts to neighbors *in the count table*, not in the text.
+   The number of approximate occurrences of a word x is
+
+       freq[x] = sum of counts[y] over all y with Hamming(x, y) <= d
+
+   Changing position p of a k-mer touches only the 2-bit digit p of its
+   code, so "sum over the other three bases at position p" is one array
+   reshape and sum.  Building up to d such changes position by position
+   gives every freq[x] in O(k * d * 4^k), independent of genome length.
+
+3. Mismatch masks: XOR-ing a code with a nonzero 2-bit digit replaces the
+   base at that position with a different base.  The masks for all ways
+   of changing up to d positions are precomputed once; code ^ mask
+   enumerates the neighborhood as integers (used when k is too large for a
+   dense table, and by neighbor_codes()).  XOR also gives Hamming distances
+   directly: two k-mers differ at every digit where code1 ^ code2 is
+   nonzero.
+
+4. Both strands: Hamming(rc(x), rc(y)) = Hamming(x, y), so the count
+   including reverse complements is freq[x] + freq[rc(x)] - one lookup.
+
+Counting the k-mers of very long genomes can be split across processes;
+each worker counts one chunk and the count tables are summed.
+
+Learning Objectives:
+- Move work from the text (n positions) to the alphabet (4^k words)
+- Use bit operations (XOR masks) on encoded sequences
+- Exploit symmetry (reverse complements) instead of recomputing
+- Split counting across processes and merge the results
+
+Requires: numpy
+"""
+
+import itertools
+import multiprocessing
+import os
+import sys
+import time
+import importlib.util
+from typing import List, Tuple, Union
+
+import numpy as np
+
+# Pool workers import this module by its file name, so its folder must be
+# on sys.path; spawned children start with a copy of the parent's.
+_DIR = os.path.dirname(os.path.abspath(__file__))
+if _DIR not in sys.path:
+    sys.path.append(_DIR)
+
+
+def import_module_from_file(module_name, file_path):
+    """Import a module from a file path."""
+    spec = importlib.util.spec_from_file_location(module_name, file_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+_kmer_path = os.path.join(_DIR, '09_kmer_engine.py')
+_kmer_module = import_module_from_file('kmer_engine', _kmer_path)
+encode_dna = _kmer_module.encode_dna
+kmer_codes = _kmer_module.kmer_codes
+kmer_counts = _kmer_module.kmer_counts
+decode_kmer = _kmer_module.decode_kmer
+DENSE_MAX_K = _kmer_module.DENSE_MAX_K
+
+# Sparse count table: (sorted unique codes, counts)
+SparseCounts = Tuple[np.ndarray, np.ndarray]
+
+
+def mismatch_masks(k: int, d: int) -> np.ndarray:
+    """
+    XOR masks that change up to d positions of a k-mer code.
+
+    Each mask has a nonzero 2-bit digit (1, 2 or 3) at every changed
+    position, so code ^ mask is a different base there.
+
+    Returns:
+        int64 array of sum(C(k, j) * 3^j for j <= d) masks, starting with 0
+
+    Example:
+        >>> len(mismatch_masks(3, 1))  # same as len(neighbors("ACG", 1))
+        10
+    """
+    masks = []
+    for j in range(min(d, k) + 1):
+        for positions in itertools.combinations(range(k), j):
+            for values in itertools.product((1, 2, 3), repeat=j):
+                masks.append(sum(v << (2 * (k - 1 - p)) for p, v in zip(positions, values)))
+    return np.array(masks, dtype=np.int64)
+
+
+def neighbor_codes(code: int, k: int, d: int) -> np.ndarray:
+    """
+    Codes of all k-mers within Hamming distance d of code.
+
+    Example:
+        >>> sorted(decode_kmer(c, 2) for c in neighbor_codes(0, 2, 1))  # "AA"
+        ['AA', 'AC', 'AG', 'AT', 'CA', 'GA', 'TA']
+    """
+    return int(code) ^ mismatch_masks(k, d)
+
+
+def mismatch_count(codes: np.ndarray, code: int, k: int) -> np.ndarray:
+    """
+    Hamming distance between each code in codes and code.
+
+    A position differs exactly when its 2-bit digit of codes ^ code is
+    nonzero.  Invalid codes (-1) are given distance k + 1.
+
+    Example:
+        >>> a, b = kmer_codes(encode_dna("TTATCCACA"), 9)[0], kmer_codes(encode_dna("TTATGCACA"), 9)[0]
+        >>> int(mismatch_count(np.array([a]), b, 9)[0])
+        1
+    """
+    diff = codes ^ int(code)
+    distance = np.zeros(len(codes), dtype=np.int64)
+    for p in range(k):
+        distance += (diff >> (2 * p)) & 3 != 0
+    distance[codes < 0] = k + 1
+    return distance
+
+
+def approximate_pattern_match_encoded(pattern: str, text: Union[str, np.ndarray],
+                                      d: int) -> List[int]:
+    """
+    Same result as approximate_pattern_match() (module 04), using XOR on codes.
+
+    Example:
+        >>> text = "CGCCCGAATCCAGAACGCATTCCCATATTTCGGGACCACTGGCCTCCACGGTACGGACGTCAATCAAAT"
+        >>> approximate_pattern_match_encoded("ATTCTGGA", text, 3)
+        [6, 7, 26, 27]
+    """
+    k = len(pattern)
+    encoded = encode_dna(text) if isinstance(text, str) else text
+    codes = kmer_codes(encoded, k)
+    target = int(kmer_codes(encode_dna(pattern), k)[0])
+    return np.flatnonzero(mismatch_count(codes, target, k) <= d).tolist()
+
+
+def reverse_complement_codes(codes: np.ndarray, k: int) -> np.ndarray:
+    """
+    Codes of the reverse complements: digits reversed, each digit c -> 3 - c
+    (A<->T, C<->G).
+
+    Example:
+        >>> decode_kmer(reverse_complement_codes(kmer_codes(encode_dna("AAAACCCGGT"), 10), 10)[0], 10)
+        'ACCGGGTTTT'
+    """
+    codes = np.asarray(codes, dtype=np.int64)
+    rc = np.zeros_like(codes)
+    for p in range(k):
+        rc = (rc << 2) | (3 - ((codes >> (2 * p)) & 3))
+    return rc
+
+
+# ---------------------------------------------------------------------------
+# Counting (optionally in parallel)
+# ---------------------------------------------------------------------------
+
+def _count_chunk(task):
+    encoded, k = task
+    return kmer_counts(kmer_codes(encoded, k), k)
+
+
+def _merge_counts(tables, k):
+    if k <= DENSE_MAX_K:
+        return np.sum(tables, axis=0)
+    codes = np.concatenate([codes for codes, _ in tables])
+    counts = np.concatenate([counts for _, counts in tables])
+    unique, inverse = np.unique(codes, return_inverse=True)
+    return unique, np.bincount(inverse, weights=counts).astype(np.int64)
+
+
+def _by_name(function):
+    """
+    The copy of one of this module's functions that a pool worker finds.
+
+    Workers look functions up as module name + function name; the module
+    imported under this file's name is one they can always import.
+    """
+    module = importlib.import_module(os.path.splitext(os.path.basename(__file__))[0])
+    return getattr(module, function.__name__)
+
+
+def count_kmers(text: Union[str, np.ndarray], k: int, workers: int = 1,
+                chunk_size: int = 1_000_000) -> Union[np.ndarray, SparseCounts]:
+    """
+    Count every k-mer of text, optionally splitting the work across processes.
+
+    The genome is cut into chunks that overlap by k - 1 bases, so every
+    k-mer is counted exactly once; the per-chunk tables are summed.
+
+    Args:
+        text: DNA string or encode_dna() output
+        k: k-mer length
+        workers: Number of processes (1 = count in this process)
+        chunk_size: Bases per chunk when workers > 1
+
+    Returns:
+        Dense array of length 4^k for k <= 12, else (unique codes, counts)
+    """
+    encoded = encode_dna(text) if isinstance(text, str) else text
+    if workers <= 1 or len(encoded) <= chunk_size:
+        return _count_chunk((encoded, k))
+
+    tasks = [(encoded[start:start + chunk_size + k - 1], k)
+             for start in range(0, len(encoded) - k + 1, chunk_size)]
+    with multiprocessing.Pool(min(workers, len(tasks))) as pool:
+        return _merge_counts(pool.map(_by_name(_count_chunk), tasks), k)
+
+
+# ---------------------------------------------------------------------------
+# Neighborhood counts
+# ---------------------------------------------------------------------------
+
+def neighborhood_counts(counts: np.ndarray, k: int, d: int) -> np.ndarray:
+    """
+    Sum a dense count table over Hamming balls of radius d.
+
+    Returns freq with freq[x] = sum of counts[y] for Hamming(x, y) <= d.
+
+    exactly[j] holds the sums over words differing in exactly j of the
+    positions processed so far.  Processing position p adds, for every j,
+    the words that differ at p as well:  exactly[j] += T_p(exactly[j-1]),
+    where T_p sums the three other bases at p.  Viewing the table as
+    shape (4^(k-p-1), 4, 4^p) puts digit p on axis 1, so T_p is a sum
+    along that axis minus the element itself.
+
+    Time Complexity: O(k * d * 4^k)
+
+    Example:
+        >>> counts = kmer_counts(kmer_codes(encode_dna("AAA"), 2), 2)  # AA twice
+        >>> freq = neighborhood_counts(counts, 2, 1)
+        >>> int(freq[0]), int(freq[1]), int(freq[5])  # AA, AC, CC
+        (2, 2, 0)
+    """
+    d = min(d, k)
+    exactly = [counts.astype(np.int64)] + [np.zeros(4 ** k, dtype=np.int64) for _ in range(d)]
+    for p in range(k):
+        shape = (4 ** (k - 1 - p), 4, 4 ** p)
+        for j in range(d, 0, -1):
+            previous = exactly[j - 1].reshape(shape)
+            exactly[j].reshape(shape)[...] += previous.sum(axis=1, keepdims=True) - previous
+    return np.sum(exactly, axis=0)
+
+
+def _sparse_neighborhood_counts(table: SparseCounts, k: int, d: int,
+                                batch: int = 64) -> SparseCounts:
+    # For k > 12: scatter every observed k-mer's count to code ^ mask
+    codes, counts = table
+    masks = mismatch_masks(k, d)
+    keys, sums = np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    for start in range(0, len(masks), batch):
+        block = masks[start:start + batch]
+        new_keys = (codes[:, None] ^ block[None, :]).ravel()
+        new_sums = np.repeat(counts, len(block))
+        keys, sums = _merge_counts([(keys, sums), (new_keys, new_sums)], k)
+    return keys, sums
+
+
+def _add_reverse_complements(words: np.ndarray, freq: np.ndarray, k: int) -> SparseCounts:
+    # freq[x] + freq[rc(x)] over every word seen on either strand
+    def lookup(codes):
+        index = np.minimum(np.searchsorted(words, codes), len(words) - 1)
+        return np.where(words[index] == codes, freq[index], 0)
+
+    both = np.union1d(words, reverse_complement_codes(words, k))
+    return both, lookup(both) + lookup(reverse_complement_codes(both, k))
+
+
+def frequent_words_with_mismatches_encoded(text: Union[str, np.ndarray], k: int, d: int,
+                                           reverse: bool = False, workers: int = 1,
+                                           chunk_size: int = 1_000_000) -> List[str]:
+    """
+    Most frequent k-mers with up to d mismatches, using integer codes.
+
+    Same words as frequent_words_with_mismatches() (module 04), or
+    frequent_words_with_mismatches_and_reverse() when reverse=True, returned
+    in sorted order.  K-mers containing characters other than A, C, G, T
+    are skipped.
+
+    Time Complexity: O(n * k) to count, plus O(k * d * 4^k) for k <= 12
+    (the count table is spread over Hamming balls once, not per position)
+
+    Args:
+        text: DNA string or encode_dna() output
+        k: k-mer length
+        d: Maximum allowed mismatches
+        reverse: Also count reverse-complement occurrences
+        workers: Processes used to count k-mers (see count_kmers)
+        chunk_size: Bases per counting chunk when workers > 1
+
+    Returns:
+        Sorted list of most frequent k-mers
+
+    Example:
+        >>> frequent_words_with_mismatches_encoded("ACGTTGCATGTCGCATGATGCATGAGAGCT", 4, 1)
+        ['ATGC', 'ATGT', 'GATG']
+        >>> frequent_words_with_mismatches_encoded("AAAAACCCCCAAAAACCCCCCAAAAAGGGTTT", 2, 1, reverse=True)
+        ['AT']
+    """
+    table = count_kmers(text, k, workers, chunk_size)
+
+    if k <= DENSE_MAX_K:
+        if table.sum() == 0:
+            return []
+        freq = neighborhood_counts(table, k, d)
+        if reverse:
+            freq = freq + freq[reverse_complement_codes(np.arange(4 ** k), k)]
+        words = np.flatnonzero(freq == freq.max())
+    else:
+        if len(table[0]) == 0:
+            return []
+        words, freq = _sparse_neighborhood_counts(table, k, d)
+        if reverse:
+            words, freq = _add_reverse_complements(words, freq, k)
+        words = words[freq == freq.max()]
+
+    return sorted(decode_kmer(code, k) for code in words.tolist())
+
+
+# Example Usage and Testing
+if __name__ == "__main__":
+    _hamming_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '04_hamming_distance.py')
+    hamming_module = import_module_from_file('hamming_distance', _hamming_path)
+
+    print("=== Mismatch Engine ===\n")
+
+    text = "ACGTTGCATGTCGCATGATGCATGAGAGCT"
+    print(f"Text: {text}, k=4, d=1")
+    print(f"  Strings (module 04): {sorted(hamming_module.frequent_words_with_mismatches(text, 4, 1))}")
+    print(f"  Integer codes:       {frequent_words_with_mismatches_encoded(text, 4, 1)}")
+    print(f"  Masks for k=9, d=2:  {len(mismatch_masks(9, 2))}")
+
+    print("\nSpeed on a 5,000 bp genome (k=9, d=2):")
+    rng = np.random.default_rng(0)
+    genome = 'ACGT'
+    small = ''.join(np.array(list(genome))[rng.integers(0, 4, 5_000)])
+
+    start = time.perf_counter()
+    string_result = hamming_module.frequent_words_with_mismatches(small, 9, 2)
+    string_time = time.perf_counter() - start
+    start = time.perf_counter()
+    encoded_result = frequent_words_with_mismatches_encoded(small, 9, 2)
+    encoded_time = time.perf_counter() - start
+    print(f"  Strings:       {string_time:.2f} s")
+    print(f"  Integer codes: {encoded_time:.3f} s "
+          f"({string_time / encoded_time:.0f}x faster, same words: "
+          f"{sorted(string_result) == encoded_result})")
+
+    print("\nWhole bacterial-size genome (5,000,000 bp, k=9, d=2, both strands):")
+    big = ''.join(np.array(list(genome))[rng.integers(0, 4, 5_000_000)])
+    workers = os.cpu_count() or 1
+    start = time.perf_counter()
+    words = frequent_words_with_mismatches_encoded(big, 9, 2, reverse=True, workers=workers)
+    print(f"  {time.perf_counter() - start:.2f} s with {workers} worker(s): {words[:4]}")
@@ -0,0 +1,605 @@
+"""
+Alignment Engine - Linear-Space, Vectorized Sequence Alignment
+===============================================================
+
+The alignments in module 07 fill a full (m+1) x (n+1) table of Python
+lists with nested loops.  Two 50 kb sequences would need 2.5 billion
+cells - far more memory than a laptop has - and billions of interpreted
+loop iterations.
+
+This module computes the same alignments with three ideas:
+
+1. Vectorized rows: in a row of the DP table, the diagonal and top moves
+   only depend on the previous row, so they are whole-array operations.
+   The left move (a gap) chains along the row:
+
+       dp[j] = max(a[j], dp[j-1] + gap)
+
+   Unrolled, dp[j] = max over l <= j of a[l] + (j - l) * gap, which is a
+   running maximum:  dp = j*gap + maximum.accumulate(a - j*gap).
+   So every row is a handful of NumPy operations.
+
+2. Hirschberg's algorithm: the score of the best alignment needs only two
+   rows at a time.  To recover the alignment itself in linear space, split
+   seq1 in half, score the top half forwards and the bottom half backwards,
+   and pick the column where the two halves meet best.  Recurse on the two
+   smaller problems.  Memory: O(m + n).  Time: about twice one fill.
+
+3. Banding: for similar sequences the best path stays close to the main
+   diagonal, so only cells with |i - j| <= band are computed.
+
+Small problems (up to FULL_MATRIX_CELLS cells) are solved with a full
+table and the traceback rules of module 07, so their alignments match
+global_alignment() and local_alignment() exactly.  Larger problems return
+an optimal alignment with the same score, although ties between equally
+good alignments may be broken differently.
+
+align_batch() scores one query against many targets: targets are padded
+into a matrix so one row operation advances all of them at once, and
+groups of targets are spread across a process pool.
+
+Learning Objectives:
+- Turn a sequential recurrence into a prefix scan
+- Trade a little extra time for a lot less memory (divide and conquer)
+- Restrict computation to where the answer can be (banding)
+- Vectorize across many independent problems at once
+
+Requires: numpy
+"""
+
+import importlib
+import multiprocessing
+import os
+import sys
+import time
+from typing import Dict, List, Sequence, Tuple, Union
+
+import numpy as np
+
+# Pool workers import this module by its file name, so its folder must be
+# on sys.path; spawned children start with a copy of the parent's.
+_DIR = os.path.dirname(os.path.abspath(__file__))
+if _DIR not in sys.path:
+    sys.path.append(_DIR)
+
+# Problems up to this many DP cells use a full table (exact module 07 traceback)
+FULL_MATRIX_CELLS = 1 << 22
+
+# Stand-in for minus infinity that survives adding a few penalties
+NEG_INF = -(1 << 40)
+
+
+def _encode(seq: str) -> np.ndarray:
+    """Characters as a uint8 array (any single-byte alphabet)."""
+    return np.frombuffer(seq.encode('latin-1'), dtype=np.uint8)
+
+
+def _score_rows(a: np.ndarray, b: np.ndarray, match: int, mismatch: int) -> Dict[int, np.ndarray]:
+    """Substitution score of each distinct character of a against all of b."""
+    return {c: np.where(b == c, match, mismatch).astype(np.int64) for c in np.unique(a).tolist()}
+
+
+# ---------------------------------------------------------------------------
+# Row kernels
+# ---------------------------------------------------------------------------
+
+def _global_rows(a: np.ndarray, b: np.ndarray, match: int, mismatch: int, gap: int):
+    """Yield rows 0..m of the global alignment table of a and b."""
+    n = len(b)
+    offsets = np.arange(n + 1, dtype=np.int64) * gap
+    scores = _score_rows(a, b, match, mismatch)
+    row = offsets.copy()
+    yield row
+    best = np.empty(n + 1, dtype=np.int64)
+    for i, c in enumerate(a.tolist(), 1):
+        best[0] = i * gap
+        np.maximum(row[:-1] + scores[c], row[1:] + gap, out=best[1:])
+        row = offsets + np.maximum.accumulate(best - offsets)
+        yield row
+
+
+def _local_rows(a: np.ndarray, b: np.ndarray, match: int, mismatch: int, gap: int):
+    """Yield rows 0..m of the local (Smith-Waterman) table of a and b."""
+    n = len(b)
+    offsets = np.arange(n + 1, dtype=np.int64) * gap
+    scores = _score_rows(a, b, match, mismatch)
+    row = np.zeros(n + 1, dtype=np.int64)
+    yield row
+    best = np.empty(n + 1, dtype=np.int64)
+    for c in a.tolist():
+        best[0] = 0
+        np.maximum(row[:-1] + scores[c], row[1:] + gap, out=best[1:])
+        np.maximum(best, 0, out=best)
+        row = offsets + np.maximum.accumulate(best - offsets)
+        yield row
+
+
+def _last_row(rows):
+    for row in rows:
+        pass
+    return row
+
+
+# ---------------------------------------------------------------------------
+# Global alignment
+# ---------------------------------------------------------------------------
+
+def _global_traceback(dp, seq1, seq2, match, mismatch, gap):
+    # Same rules, in the same order, as global_alignment() in module 07
+    aligned1, aligned2 = [], []
+    i, j = len(seq1), len(seq2)
+    while i > 0 or j > 0:
+        if i > 0 and j > 0:
+            diag = dp[i - 1, j - 1] + (match if seq1[i - 1] == seq2[j - 1] else mismatch)
+            if dp[i, j] == diag:
+                aligned1.append(seq1[i - 1])
+                aligned2.append(seq2[j - 1])
+                i -= 1
+                j -= 1
+                continue
+        if i > 0 and dp[i, j] == dp[i - 1, j] + gap:
+            aligned1.append(seq1[i - 1])
+            aligned2.append('-')
+            i -= 1
+        elif j > 0:
+            aligned1.append('-')
+            aligned2.append(seq2[j - 1])
+            j -= 1
+        else:
+            break
+    return ''.join(reversed(aligned1)), ''.join(reversed(aligned2))
+
+
+def _global_full(seq1, seq2, match, mismatch, gap):
+    dp = np.array(list(_global_rows(_encode(seq1), _encode(seq2), match, mismatch, gap)))
+    return (int(dp[-1, -1]),) + _global_traceback(dp, seq1, seq2, match, mismatch, gap)
+
+
+def _hirschberg(seq1, seq2, match, mismatch, gap, pieces1, pieces2):
+    m, n = len(seq1), len(seq2)
+    if (m + 1) * (n + 1) <= FULL_MATRIX_CELLS or m <= 1:
+        _, aligned1, aligned2 = _global_full(seq1, seq2, match, mismatch, gap)
+        pieces1.append(aligned1)
+        pieces2.append(aligned2)
+        return
+
+    mid = m // 2
+    a, b = _encode(seq1), _encode(seq2)
+    upper = _last_row(_global_rows(a[:mid], b, match, mismatch, gap))
+    lower = _last_row(_global_rows(a[mid:][::-1], b[::-1], match, mismatch, gap))[::-1]
+    split = int(np.argmax(upper + lower))
+
+    _hirschberg(seq1[:mid], seq2[:split], match, mismatch, gap, pieces1, pieces2)
+    _hirschberg(seq1[mid:], seq2[split:], match, mismatch, gap, pieces1, pieces2)
+
+
+def global_alignment_linear(seq1: str, seq2: str, match: int = 1, mismatch: int = -1,
+                            gap: int = -2) -> Tuple[int, str, str]:
+    """
+    Global alignment (Needleman-Wunsch) in linear space.
+
+    Same arguments and result as global_alignment() in module 07.  Up to
+    FULL_MATRIX_CELLS cells the alignment is identical; beyond that,
+    Hirschberg's algorithm returns an alignment with the same (optimal)
+    score using O(m + n) memory.
+
+    Time Complexity: O(m * n), vectorized along rows
+    Space Complexity: O(m + n) beyond FULL_MATRIX_CELLS
+
+    Example:
+        >>> global_alignment_linear("GATTACA", "GCATGCU")
+        (-1, 'GATTACA', 'GCATGCU')
+    """
+    pieces1, pieces2 = [], []
+    _hirschberg(seq1, seq2, match, mismatch, gap, pieces1, pieces2)
+    aligned1, aligned2 = ''.join(pieces1), ''.join(pieces2)
+    return alignment_score(aligned1, aligned2, match, mismatch, gap), aligned1, aligned2
+
+
+def global_alignment_score(seq1: str, seq2: str, match: int = 1, mismatch: int = -1,
+                           gap: int = -2) -> int:
+    """
+    Score of the best global alignment, keeping only one row in memory.
+
+    Example:
+        >>> global_alignment_score("GATTACA", "GCATGCU")
+        -1
+    """
+    return int(_last_row(_global_rows(_encode(seq1), _encode(seq2), match, mismatch, gap))[-1])
+
+
+def alignment_score(aligned1: str, aligned2: str, match: int = 1, mismatch: int = -1,
+                    gap: int = -2) -> int:
+    """
+    Score an existing alignment column by column.
+
+    Example:
+        >>> alignment_score('GATTACA', 'GCATGCU')
+        -1
+    """
+    score = 0
+    for c1, c2 in zip(aligned1, aligned2):
+        if c1 == '-' or c2 == '-':
+            score += gap
+        elif c1 == c2:
+            score += match
+        else:
+            score += mismatch
+    return score
+
+
+# ---------------------------------------------------------------------------
+# Local alignment
+# ---------------------------------------------------------------------------
+
+def _local_traceback(dp, seq1, seq2, end_i, end_j, match, mismatch, gap):
+    # Same rules, in the same order, as local_alignment() in module 07
+    aligned1, aligned2 = [], []
+    i, j = end_i, end_j
+    while i > 0 and j > 0 and dp[i, j] > 0:
+        diag = dp[i - 1, j - 1] + (match if seq1[i - 1] == seq2[j - 1] else mismatch)
+        if dp[i, j] == diag:
+            aligned1.append(seq1[i - 1])
+            aligned2.append(seq2[j - 1])
+            i -= 1
+            j -= 1
+        elif dp[i, j] == dp[i - 1, j] + gap:
+            aligned1.append(seq1[i - 1])
+            aligned2.append('-')
+            i -= 1
+        else:
+            aligned1.append('-')
+            aligned2.append(seq2[j - 1])
+            j -= 1
+    return ''.join(reversed(aligned1)), ''.join(reversed(aligned2))
+
+
+def _first_max(rows):
+    """(value, i, j) of the first maximum in row-major order."""
+    best, best_i, best_j = 0, 0, 0
+    for i, row in enumerate(rows):
+        j = int(np.argmax(row))
+        if row[j] > best:
+            best, best_i, best_j = int(row[j]), i, j
+    return best, best_i, best_j
+
+
+def local_alignment_linear(seq1: str, seq2: str, match: int = 2, mismatch: int = -1,
+                           gap: int = -1) -> Tuple[int, str, str]:
+    """
+    Local alignment (Smith-Waterman) in linear space.
+
+    Same arguments and result as local_alignment() in module 07.  Up to
+    FULL_MATRIX_CELLS cells the alignment is identical.  Beyond that:
+
+    1. A forward pass finds the best score and where it ends.
+    2. A backward pass from that cell (over the reversed prefixes) finds
+       where an alignment with that score starts.
+    3. The two substrings are aligned globally with Hirschberg.
+
+    Example:
+        >>> local_alignment_linear("ATCGATCG", "TCGAT")
+        (10, 'TCGAT', 'TCGAT')
+    """
+    m, n = len(seq1), len(seq2)
+    a, b = _encode(seq1), _encode(seq2)
+
+    if (m + 1) * (n + 1) <= FULL_MATRIX_CELLS:
+        dp = np.array(list(_local_rows(a, b, match, mismatch, gap)))
+        flat = int(np.argmax(dp))
+        end_i, end_j = divmod(flat, n + 1)
+        return (int(dp[end_i, end_j]),) + _local_traceback(dp, seq1, seq2, end_i, end_j,
+                                                           match, mismatch, gap)
+
+    score, end_i, end_j = _first_max(_local_rows(a, b, match, mismatch, gap))
+    if score == 0:
+        return 0, '', ''
+
+    # Global scores of suffixes ending at (end_i, end_j); the first cell
+    # reaching the local score marks the shortest optimal start
+    rows = _global_rows(a[:end_i][::-1], b[:end_j][::-1], match, mismatch, gap)
+    for length_i, row in enumerate(rows):
+        hits = np.flatnonzero(row == score)
+        if len(hits):
+            length_j = int(hits[0])
+            break
+
+    _, aligned1, aligned2 = global_alignment_linear(seq1[end_i - length_i:end_i],
+                                                    seq2[end_j - length_j:end_j],
+                                                    match, mismatch, gap)
+    return score, aligned1, aligned2
+
+
+# ---------------------------------------------------------------------------
+# Edit distance
+# ---------------------------------------------------------------------------
+
+def _edit_last_row(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    n = len(b)
+    offsets = np.arange(n + 1, dtype=np.int64)
+    costs = {c: (b != c).astype(np.int64) for c in np.unique(a).tolist()}
+    row = offsets.copy()
+    best = np.empty(n + 1, dtype=np.int64)
+    for i, c in enumerate(a.tolist(), 1):
+        best[0] = i
+        np.minimum(row[:-1] + costs[c], row[1:] + 1, out=best[1:])
+        row = offsets + np.minimum.accumulate(best - offsets)
+    return row
+
+
+def edit_distance_linear(seq1: str, seq2: str) -> int:
+    """
+    Levenshtein distance with one row in memory (same as edit_distance()
+    in module 07).
+
+    Example:
+        >>> edit_distance_linear("GCATGCU", "GATTACA")
+        4
+    """
+    return int(_edit_last_row(_encode(seq1), _encode(seq2))[-1])
+
+
+# ---------------------------------------------------------------------------
+# Banded global alignment
+# ---------------------------------------------------------------------------
+
+def banded_global_alignment(seq1: str, seq2: str, band: int, match: int = 1,
+                            mismatch: int = -1, gap: int = -2) -> Tuple[int, str, str]:
+    """
+    Global alignment restricted to cells with |i - j| <= band.
+
+    Only (m + 1) x (2 * band + 1) cells are computed and stored, so two
+    similar 50 kb sequences with band=100 need about 80 MB instead of 20 GB.
+    The result is optimal whenever some optimal alignment stays within the
+    band (at most band more insertions than deletions at any point, or
+    vice versa); otherwise it is the best alignment inside the band.
+
+    Args:
+        seq1, seq2: Sequences to align
+        band: Maximum distance from the main diagonal (>= |len(seq1) - len(seq2)|)
+        match, mismatch, gap: Scores as in global_alignment()
+
+    Returns:
+        Tuple of (score, aligned_seq1, aligned_seq2)
+
+    Example:
+        >>> banded_global_alignment("GATTACA", "GCATGCU", band=2)
+        (-1, 'GATTACA', 'GCATGCU')
+    """
+    m, n = len(seq1), len(seq2)
+    if band < abs(m - n):
+        raise ValueError(f"band must be at least |len(seq1) - len(seq2)| = {abs(m - n)}")
+    a, b = _encode(seq1), _encode(seq2)
+    width = 2 * band + 1
+    cols = np.arange(width, dtype=np.int64)
+    offsets = cols * gap
+
+    # dp[i, c] holds cell (i, j) with j = i - band + c
+    dp = np.full((m + 1, width), NEG_INF, dtype=np.int64)
+    j0 = cols - band
+    dp[0] = np.where((j0 >= 0) & (j0 <= n), j0 * gap, NEG_INF)
+    padded = np.concatenate(([0], b, np.zeros(band + 1, dtype=np.uint8)))
+    best = np.empty(width, dtype=np.int64)
+
+    for i in range(1, m + 1):
+        js = i - band + cols
+        valid = (js >= 0) & (js <= n)
+        prev = dp[i - 1]
+        subs = np.where(padded[np.clip(js, 0, n)] == a[i - 1], match, mismatch)
+        best[:] = prev + subs                   # diagonal: same column
+        best[:-1] = np.maximum(best[:-1], prev[1:] + gap)   # top: column + 1
+        best[js == 0] = i * gap
+        best[~valid] = NEG_INF
+        row = offsets + np.maximum.accumulate(best - offsets)
+        row[~valid] = NEG_INF
+        dp[i] = row
+
+    def cell(i, j):
+        c = j - i + band
+        return dp[i, c] if 0 <= c < width and 0 <= j <= n else NEG_INF
+
+    # Traceback with the rules of global_alignment() in module 07
+    aligned1, aligned2 = [], []
+    i, j = m, n
+    while i > 0 or j > 0:
+        here = cell(i, j)
+        if i > 0 and j > 0:
+            if here == cell(i - 1, j - 1) + (match if seq1[i - 1] == seq2[j - 1] else mismatch):
+                aligned1.append(seq1[i - 1])
+                aligned2.append(seq2[j - 1])
+                i -= 1
+                j -= 1
+                continue
+        if i > 0 and here == cell(i - 1, j) + gap:
+            aligned1.append(seq1[i - 1])
+            aligned2.append('-')
+            i -= 1
+        elif j > 0:
+            aligned1.append('-')
+            aligned2.append(seq2[j - 1])
+            j -= 1
+        else:
+            break
+    return int(cell(m, n)), ''.join(reversed(aligned1)), ''.join(reversed(aligned2))
+
+
+# ---------------------------------------------------------------------------
+# Batch alignment
+# ---------------------------------------------------------------------------
+
+ALIGNMENT_MODES = ('global', 'local', 'edit')
+
+_DEFAULT_SCORES = {
+    'global': {'match': 1, 'mismatch': -1, 'gap': -2},
+    'local': {'match': 2, 'mismatch': -1, 'gap': -1},
+    'edit': {'match': 0, 'mismatch': 1, 'gap': 1},
+}
+
+
+def _by_name(function):
+    """
+    The copy of one of this module's functions that a pool worker finds.
+
+    Workers look functions up as module name + function name; the module
+    imported under this file's name is one they can always import.
+    """
+    module = importlib.import_module(os.path.splitext(os.path.basename(__file__))[0])
+    return getattr(module, function.__name__)
+
+
+def _batch_scores(task) -> List[int]:
+    """Scores of one query against a group of targets, all rows at once."""
+    query, targets, mode, match, mismatch, gap = task
+    q = _encode(query)
+    lengths = np.array([len(t) for t in targets])
+    width = int(lengths.max()) + 1
+    # Pad with byte 0, which never equals a sequence character
+    matrix = np.zeros((len(targets), width - 1), dtype=np.uint8)
+    for row, target in zip(matrix, targets):
+        row[:len(target)] = _encode(target)
+
+    offsets = np.arange(width, dtype=np.int64) * gap
+    scores = {c: np.where(matrix == c, match, mismatch).astype(np.int64)
+              for c in np.unique(q).tolist()}
+    scan = np.minimum.accumulate if mode == 'edit' else np.maximum.accumulate
+    pick = np.minimum if mode == 'edit' else np.maximum
+
+    rows = np.broadcast_to(offsets if mode != 'local' else 0 * offsets,
+                           (len(targets), width)).copy()
+    best = np.empty_like(rows)
+    local_best = np.zeros(len(targets), dtype=np.int64)
+    inside = np.arange(width)[None, :] <= lengths[:, None]
+
+    for i, c in enumerate(q.tolist(), 1):
+        best[:, 0] = 0 if mode == 'local' else i * gap
+        pick(rows[:, :-1] + scores[c], rows[:, 1:] + gap, out=best[:, 1:])
+        if mode == 'local':
+            np.maximum(best, 0, out=best)
+        rows = offsets + scan(best - offsets, axis=1)
+        if mode == 'local':
+            local_best = np.maximum(local_best, np.where(inside, rows, 0).max(axis=1))
+
+    if mode == 'local':
+        return local_best.tolist()
+    return rows[np.arange(len(targets)), lengths].tolist()
+
+
+def _batch_alignments(task):
+    query, targets, mode, match, mismatch, gap = task
+    if mode == 'global':
+        return [global_alignment_linear(query, t, match, mismatch, gap) for t in targets]
+    return [local_alignment_linear(query, t, match, mismatch, gap) for t in targets]
+
+
+def align_batch(query: str, targets: Sequence[str], mode: str = 'global',
+                workers: int = None, batch_size: int = 256, alignments: bool = False,
+                **scoring) -> Union[List[int], List[Tuple[int, str, str]]]:
+    """
+    Align one query against many targets.
+
+    Targets are split into groups of batch_size.  Within a group the
+    targets are padded into one matrix and every DP row is computed for
+    all of them at once; groups run in a process pool.
+
+    Args:
+        query: Query sequence
+        targets: Target sequences
+        mode: 'global', 'local' or 'edit' (edit distance)
+        workers: Number of processes (default: os.cpu_count(); 1 = no pool)
+        batch_size: Targets per group
+        alignments: Also return the aligned strings ('global'/'local' only);
+            each target is then aligned separately
+        **scoring: match, mismatch, gap (defaults as in module 07)
+
+    Returns:
+        List of scores (edit distances for 'edit'), in target order, or
+        (score, aligned_query, aligned_target) tuples if alignments=True
+
+    Example:
+        >>> align_batch("GATTACA", ["GCATGCU", "GATTACA", "GATACA"], workers=1)
+        [-1, 7, 4]
+        >>> align_batch("GATTACA", ["GCATGCU", "GATTACA"], mode='edit', workers=1)
+        [4, 0]
+    """
+    if mode not in ALIGNMENT_MODES:
+        raise ValueError(f"mode must be one of {ALIGNMENT_MODES}, got {mode!r}")
+    if alignments and mode == 'edit':
+        raise ValueError("alignments=True needs mode 'global' or 'local'")
+    params = dict(_DEFAULT_SCORES[mode], **scoring)
+    if not targets:
+        return []
+
+    tasks = [(query, list(targets[start:start + batch_size]), mode,
+              params['match'], params['mismatch'], params['gap'])
+             for start in range(0, len(targets), batch_size)]
+    worker = _batch_alignments if alignments else _batch_scores
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1 or len(tasks) == 1:
+        results = [worker(task) for task in tasks]
+    else:
+        with multiprocessing.Pool(min(workers, len(tasks))) as pool:
+            results = pool.map(_by_name(worker), tasks)
+    return [result for group in results for result in group]
+
+
+# Example Usage and Testing
+if __name__ == "__main__":
+    import importlib.util
+
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '07_sequence_alignment.py')
+    spec = importlib.util.spec_from_file_location('sequence_alignment', path)
+    alignment_module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(alignment_module)
+
+    print("=== Alignment Engine ===\n")
+
+    print("Example 1: Same results as module 07")
+    print("-" * 70)
+    print(f"  global_alignment:        {alignment_module.global_alignment('GATTACA', 'GCATGCU')}")
+    print(f"  global_alignment_linear: {global_alignment_linear('GATTACA', 'GCATGCU')}")
+    print(f"  local_alignment:         {alignment_module.local_alignment('ATCGATCGATCGATCG', 'TCGATCG')}")
+    print(f"  local_alignment_linear:  {local_alignment_linear('ATCGATCGATCGATCG', 'TCGATCG')}")
+
+    rng = np.random.default_rng(1)
+
+    def random_dna(length):
+        return np.frombuffer(b'ACGT', dtype=np.uint8)[rng.integers(0, 4, length)].tobytes().decode()
+
+    def mutate(seq, rate):
+        out = []
+        for base in seq:
+            r = rng.random()
+            if r < rate / 3:
+                continue                                  # deletion
+            out.append(random_dna(1) if r < 2 * rate / 3 else base)
+            if r > 1 - rate / 3:
+                out.append(random_dna(1))                 # insertion
+        return ''.join(out)
+
+    print("\nExample 2: Two 20 kb sequences (~5% divergence)")
+    print("-" * 70)
+    seq1 = random_dna(20_000)
+    seq2 = mutate(seq1, 0.05)
+    print(f"  Full table would need {(len(seq1) + 1) * (len(seq2) + 1) * 8 / 1e9:.1f} GB as int64")
+    start = time.perf_counter()
+    score, aligned1, aligned2 = global_alignment_linear(seq1, seq2)
+    print(f"  Hirschberg:  score {score}, {time.perf_counter() - start:.2f} s")
+    start = time.perf_counter()
+    banded = banded_global_alignment(seq1, seq2, band=200)
+    print(f"  Banded (200): score {banded[0]}, {time.perf_counter() - start:.2f} s")
+    start = time.perf_counter()
+    print(f"  Edit distance: {edit_distance_linear(seq1, seq2)}, "
+          f"{time.perf_counter() - start:.2f} s")
+
+    print("\nExample 3: One 300 bp query against 5,000 targets")
+    print("-" * 70)
+    query = random_dna(300)
+    targets = [mutate(query, 0.1) if i % 10 == 0 else random_dna(300) for i in range(5000)]
+    start = time.perf_counter()
+    scores = align_batch(query, targets, mode='local')
+    elapsed = time.perf_counter() - start
+    print(f"  {elapsed:.2f} s on {os.cpu_count()} CPU(s) "
+          f"({elapsed / len(targets) * 1e3:.2f} ms per target)")
+    print(f"  Related targets score {np.mean(scores[::10]):.0f} on average, "
+          f"unrelated ones {np.mean([s for i, s in enumerate(scores) if i % 10]):.0f}")
@@ -7,6 +7,7 @@ Run this to verify all modules are working correctly.
 import sys
 import os
 import importlib.util
+import multiprocessing
 
 # Set matplotlib to non-interactive mode for headless environments
 # This prevents errors in environments without display capabilities (e.g., CI/CD, Docker)
@@ -18,6 +19,15 @@ def load_module(filename):
     path = os.path.join(os.path.dirname(os.path.abspath(__file__)), filename)
     spec = importlib.util.spec_from_file_location(filename[:-3], path)
     module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+def load_unregistered(filename):
+    """Load a numbered module under another name, without sys.modules."""
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), filename)
+    spec = importlib.util.spec_from_file_location('unregistered_' + filename[3:-3], path)
+    module = importlib.util.module_from_spec(spec)
     spec.loader.exec_module(module)
     return module
 
@@ -198,6 +208,154 @@ def test_workflow():
     assert results['predicted_ori'] is not None, "Should predict an ori position"
     assert results['genome_length'] == len(genome), "Genome length should match"
     
+    # Both clump engines agree
+    python_results = module.find_origin_of_replication(genome, k=9, L=500, t=3,
+                                                       verbose=False, engine='optimized')
+    assert python_results['all_clumps'] == results['all_clumps']
+    assert python_results['ori_region_clumps'] == results['ori_region_clumps']
+    print(f"✓ Engines 'optimized' and '{results['parameters']['engine']}' agree")
+    
+    print("✓ All tests passed!")
+    return True
+
+def test_kmer_engine():
+    """Test the integer k-mer engine module."""
+    print("\n" + "="*70)
+    print("TEST 9: Integer K-mer Engine")
+    print("="*70)
+    
+    module = load_module('09_kmer_engine.py')
+    clump_module = load_module('01_clump_finding.py')
+    comparison = load_module('05_optimization_comparison.py')
+    
+    encoded = module.encode_dna("ACGTN")
+    codes = module.kmer_codes(module.encode_dna("ACGTAC"), 4)
+    
+    print(f"✓ Module loaded successfully")
+    print(f"✓ Encoded ACGTN as {encoded.tolist()}")
+    print(f"✓ 4-mer codes of ACGTAC: {codes.tolist()}")
+    
+    # Verify encoding and decoding
+    assert encoded.tolist() == [0, 1, 2, 3, 4]
+    assert [module.decode_kmer(c, 4) for c in codes] == ["ACGT", "CGTA", "GTAC"]
+    assert module.kmer_codes(module.encode_dna("ACNGT"), 2).tolist()[1:3] == [-1, -1]
+    
+    # Verify clumps match the dictionary-based algorithm
+    genome = "CGGACTCGACAGATGTGAAGAACGACAATGTGAAGACTCGACACGACAGAGTGAAGAGAAGAGGAAACATTGTAA"
+    assert module.find_clumps_encoded(genome, 5, 50, 4) == {'CGACA', 'GAAGA'}
+    for size, k, L, t in [(5000, 6, 300, 3), (5000, 4, 100, 4), (3000, 8, 1000, 2)]:
+        genome = comparison.generate_random_genome(size, seed=size + k)
+        expected = clump_module.find_clumps_optimized(genome, k, L, t)
+        assert module.find_clumps_encoded(genome, k, L, t) == expected, (k, L, t)
+        print(f"✓ k={k}, L={L}, t={t}: {len(expected)} clumps, same as find_clumps_optimized")
+    
+    print("✓ All tests passed!")
+    return True
+
+def test_mismatch_engine():
+    """Test the mismatch engine module."""
+    print("\n" + "="*70)
+    print("TEST 10: Mismatch Engine")
+    print("="*70)
+    
+    module = load_module('10_mismatch_engine.py')
+    hamming_module = load_module('04_hamming_distance.py')
+    
+    print(f"✓ Module loaded successfully")
+    
+    # Masks enumerate the same neighborhood as neighbors()
+    code = module.kmer_codes(module.encode_dna("ACGT"), 4)[0]
+    nbrs = {module.decode_kmer(c, 4) for c in module.neighbor_codes(code, 4, 2)}
+    assert nbrs == hamming_module.neighbors("ACGT", 2)
+    print(f"✓ {len(module.mismatch_masks(4, 2))} XOR masks reproduce neighbors('ACGT', 2)")
+    
+    text = "CGCCCGAATCCAGAACGCATTCCCATATTTCGGGACCACTGGCCTCCACGGTACGGACGTCAATCAAAT"
+    positions = module.approximate_pattern_match_encoded("ATTCTGGA", text, 3)
+    assert positions == hamming_module.approximate_pattern_match("ATTCTGGA", text, 3)
+    print(f"✓ Approximate matches: {positions}")
+    
+    # Frequent words agree with the string implementation on both strands
+    text = "ACGTTGCATGTCGCATGATGCATGAGAGCT"
+    for k, d in [(4, 1), (5, 2), (14, 1)]:
+        expected = sorted(hamming_module.frequent_words_with_mismatches(text, k, d))
+        assert module.frequent_words_with_mismatches_encoded(text, k, d) == expected
+        expected = sorted(hamming_module.frequent_words_with_mismatches_and_reverse(text, k, d))
+        assert module.frequent_words_with_mismatches_encoded(text, k, d, reverse=True) == expected
+        print(f"✓ k={k}, d={d}: same frequent words as module 04 (with and without reverse)")
+    
+    # Counting split across processes gives the same table
+    genome = load_module('05_optimization_comparison.py').generate_random_genome(20000, seed=1)
+    serial = module.count_kmers(genome, 9)
+    pooled = module.count_kmers(genome, 9, workers=2, chunk_size=3000)
+    assert (serial == pooled).all() and serial.sum() == len(genome) - 8
+    print(f"✓ Parallel k-mer counts match ({int(serial.sum())} k-mers)")
+    
+    # Spawned workers, with the module loaded under another name and not
+    # registered in sys.modules, still find _count_chunk
+    unregistered = load_unregistered('10_mismatch_engine.py')
+    unregistered.multiprocessing = multiprocessing.get_context('spawn')
+    spawned = unregistered.count_kmers(genome, 9, workers=2, chunk_size=3000)
+    assert (spawned == serial).all()
+    print(f"✓ Spawned workers give the same counts")
+    
+    print("✓ All tests passed!")
+    return True
+
+def test_alignment_engine():
+    """Test the alignment engine module."""
+    print("\n" + "="*70)
+    print("TEST 11: Alignment Engine")
+    print("="*70)
+    
+    module = load_module('11_alignment_engine.py')
+    align_module = load_module('07_sequence_alignment.py')
+    
+    print(f"✓ Module loaded successfully")
+    
+    # Small inputs give exactly the alignments of module 07
+    pairs = [("GATTACA", "GCATGCU"), ("ATCGATCGATCGATCG", "TCGATCG"), ("ACGT", ""), ("AAAC", "AC")]
+    for seq1, seq2 in pairs:
+        assert module.global_alignment_linear(seq1, seq2) == align_module.global_alignment(seq1, seq2)
+        assert module.local_alignment_linear(seq1, seq2) == align_module.local_alignment(seq1, seq2)
+        assert module.edit_distance_linear(seq1, seq2) == align_module.edit_distance(seq1, seq2)
+        band = max(len(seq1), len(seq2))
+        assert module.banded_global_alignment(seq1, seq2, band) == align_module.global_alignment(seq1, seq2)
+    print(f"✓ {len(pairs)} pairs match module 07 (global, local, edit distance, banded)")
+    
+    # Hirschberg keeps the optimal score (forced by shrinking the full-table limit)
+    genome = load_module('05_optimization_comparison.py').generate_random_genome(400, seed=2)
+    seq1, seq2 = genome[:150], genome[120:300]
+    limit = module.FULL_MATRIX_CELLS
+    module.FULL_MATRIX_CELLS = 64
+    try:
+        score, aligned1, aligned2 = module.global_alignment_linear(seq1, seq2)
+        local_score, local1, local2 = module.local_alignment_linear(seq1, seq2)
+    finally:
+        module.FULL_MATRIX_CELLS = limit
+    assert score == align_module.global_alignment(seq1, seq2)[0] == module.alignment_score(aligned1, aligned2)
+    assert aligned1.replace('-', '') == seq1 and aligned2.replace('-', '') == seq2
+    assert local_score == align_module.local_alignment(seq1, seq2)[0]
+    assert module.alignment_score(local1, local2, 2, -1, -1) == local_score
+    print(f"✓ Hirschberg: global score {score}, local score {local_score}")
+    
+    # Batch scores match one-at-a-time alignment, with and without a pool
+    targets = [genome[i:i + 20 + i % 15] for i in range(0, 300, 7)]
+    for mode, function in [('global', align_module.global_alignment),
+                           ('local', align_module.local_alignment)]:
+        expected = [function(seq1[:30], target)[0] for target in targets]
+        assert module.align_batch(seq1[:30], targets, mode=mode, workers=1, batch_size=10) == expected
+        assert module.align_batch(seq1[:30], targets, mode=mode, workers=2, batch_size=10) == expected
+    distances = [align_module.edit_distance(seq1[:30], target) for target in targets]
+    assert module.align_batch(seq1[:30], targets, mode='edit', workers=2, batch_size=10) == distances
+    print(f"✓ Batch scores for {len(targets)} targets match module 07")
+    
+    # Spawned workers, with the module loaded under another name and not
+    # registered in sys.modules, still find the batch workers
+    unregistered = load_unregistered('11_alignment_engine.py')
+    unregistered.multiprocessing = multiprocessing.get_context('spawn')
+    assert unregistered.align_batch(seq1[:30], targets, mode='edit', workers=2, batch_size=10) == distances
+    print(f"✓ Spawned workers give the same edit distances")
+    
     print("✓ All tests passed!")
     return True
 
@@ -217,6 +375,9 @@ def main():
         test_visualization,
         test_sequence_alignment,
         test_workflow,
+        test_kmer_engine,
+        test_mismatch_engine,
+        test_alignment_engine,
     ]
     
     passed = 0
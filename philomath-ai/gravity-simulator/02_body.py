@@ -57,6 +57,65 @@ Vector2D = _vm.Vector2D
 zero_vector = _vm.zero_vector
 
 
+class Trail:
+    """
+    Fixed-size ring buffer of past positions, oldest first.
+
+    All *capacity* slots are allocated up front and overwritten in place, so
+    recording a point costs O(1) no matter how long the simulation runs
+    (a plain list with ``pop(0)`` shifts every stored point each step).
+
+    Supports ``len()``, indexing (``trail[0]`` oldest, ``trail[-1]``
+    newest), iteration and ``clear()``.  Stored points are reused once the
+    buffer wraps – ``copy()`` one to keep it.
+
+    Examples:
+        >>> t = Trail(2)
+        >>> for x in range(3):
+        ...     t.append(Vector2D(x, 0))
+        >>> [p.x for p in t]
+        [1.0, 2.0]
+    """
+
+    def __init__(self, capacity):
+        self.capacity = max(0, int(capacity))
+        self._slots   = [Vector2D() for _ in range(self.capacity)]
+        self._head    = 0      # slot of the oldest point
+        self._count   = 0
+
+    def append(self, point):
+        """Record a copy of *point*, dropping the oldest when full."""
+        if self.capacity == 0:
+            return
+        if self._count < self.capacity:
+            slot = self._slots[(self._head + self._count) % self.capacity]
+            self._count += 1
+        else:
+            slot = self._slots[self._head]
+            self._head = (self._head + 1) % self.capacity
+        slot.x = point.x
+        slot.y = point.y
+
+    def clear(self):
+        """Forget every stored point (the slots are kept)."""
+        self._head  = 0
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += self._count
+        if not 0 <= i < self._count:
+            raise IndexError("trail index out of range")
+        return self._slots[(self._head + i) % self.capacity]
+
+    def __iter__(self):
+        for i in range(self._count):
+            yield self._slots[(self._head + i) % self.capacity]
+
+
 class Body:
     """
     A physical body in 2-D space.
@@ -67,7 +126,7 @@ class Body:
         position (Vector2D) : Current position
         velocity (Vector2D) : Current velocity
         color    (tuple)    : RGB colour tuple for pygame rendering
-        trail    (list)     : List of past positions for drawing a trail
+        trail    (Trail)    : Ring buffer of past positions for drawing a trail
         max_trail(int)      : Maximum number of trail points stored
 
     Examples:
@@ -98,8 +157,7 @@ class Body:
         self.position  = position.copy() if position is not None else zero_vector()
         self.velocity  = velocity.copy() if velocity is not None else zero_vector()
         self.color     = color
-        self.trail     = []
-        self.max_trail = max_trail
+        self.trail     = Trail(max_trail)
 
     # ── Integration methods ───────────────────────────────────────────────────
 
@@ -132,10 +190,7 @@ class Body:
             dt (float): Time step in seconds (or simulation units)
         """
         # Record trail point before moving
-        if self.max_trail > 0:
-            self.trail.append(self.position.copy())
-            if len(self.trail) > self.max_trail:
-                self.trail.pop(0)
+        self.trail.append(self.position)
 
         self.position = self.position + self.velocity * dt
 
@@ -185,6 +240,15 @@ class Body:
 
     # ── Trail management ──────────────────────────────────────────────────────
 
+    @property
+    def max_trail(self):
+        """Maximum number of trail points stored (0 = no trail)."""
+        return self.trail.capacity
+
+    @max_trail.setter
+    def max_trail(self, n):
+        self.trail = Trail(n)
+
     def clear_trail(self):
         """Erase the stored trail."""
         self.trail.clear()
@@ -67,6 +67,30 @@ Body        = _body.Body
 make_sun    = _body.make_sun
 make_earth  = _body.make_earth
 
+_nbody = None
+_bh    = None
+
+
+def _nbody_engine():
+    """Load the (NumPy) structure-of-arrays engine on first use."""
+    global _nbody
+    if _nbody is None:
+        _nbody = _load("06_nbody_engine.py")
+    return _nbody
+
+
+def _barnes_hut():
+    """Load the (NumPy) Barnes–Hut solver on first use."""
+    global _bh
+    if _bh is None:
+        _bh = _load("07_barnes_hut.py")
+    return _bh
+
+
+def _check_solver(solver):
+    if solver not in ("direct", "barnes-hut"):
+        raise ValueError(f"Unknown solver {solver!r} (expected 'direct' or 'barnes-hut')")
+
 
 # ── Physical constant ─────────────────────────────────────────────────────────
 
@@ -124,10 +148,30 @@ def net_force_on(body, all_bodies, softening=1e6):
     return total
 
 
+def accelerations(bodies, softening=1e6, solver="direct", theta=0.5):
+    """
+    Return the acceleration (Vector2D) of every body.
+
+    Args:
+        bodies    (list[Body]) : All bodies
+        softening (float)      : Softening length (m)
+        solver    (str)        : 'direct' (exact O(N²), default) or
+                                 'barnes-hut' (O(N log N), module 07)
+        theta     (float)      : Barnes–Hut opening angle
+
+    Returns:
+        list[Vector2D]: Accelerations in the same order as *bodies*
+    """
+    _check_solver(solver)
+    if solver == "barnes-hut":
+        return _barnes_hut().body_accelerations(bodies, G, softening, theta)
+    return [net_force_on(b, bodies, softening) / b.mass for b in bodies]
+
+
 # ── Integrators ───────────────────────────────────────────────────────────────
 
 
-def euler_step(bodies, dt, softening=1e6):
+def euler_step(bodies, dt, softening=1e6, solver="direct", theta=0.5):
     """
     Advance all bodies by one time step using *Euler integration*.
 
@@ -141,14 +185,20 @@ def euler_step(bodies, dt, softening=1e6):
         bodies    (list[Body]) : All bodies (modified in place)
         dt        (float)      : Time step (s)
         softening (float)      : Softening parameter (m)
+        solver    (str)        : 'direct' or 'barnes-hut'
+        theta     (float)      : Barnes–Hut opening angle
     """
-    forces = [net_force_on(b, bodies, softening) for b in bodies]
+    if solver == "direct":
+        forces = [net_force_on(b, bodies, softening) for b in bodies]
+    else:
+        forces = [a * b.mass for a, b in
+                  zip(accelerations(bodies, softening, solver, theta), bodies)]
     for body, force in zip(bodies, forces):
         body.apply_force(force, dt)
         body.move(dt)
 
 
-def leapfrog_step(bodies, dt, softening=1e6):
+def leapfrog_step(bodies, dt, softening=1e6, solver="direct", theta=0.5):
     """
     Advance all bodies by one time step using the *leapfrog (Störmer-Verlet)*
     integrator.
@@ -167,9 +217,11 @@ def leapfrog_step(bodies, dt, softening=1e6):
         bodies    (list[Body]) : All bodies (modified in place)
         dt        (float)      : Time step (s)
         softening (float)      : Softening parameter (m)
+        solver    (str)        : 'direct' (exact) or 'barnes-hut' (module 07)
+        theta     (float)      : Barnes–Hut opening angle
     """
     # Step 1 – current accelerations
-    accs = [net_force_on(b, bodies, softening) / b.mass for b in bodies]
+    accs = accelerations(bodies, softening, solver, theta)
 
     # Step 2 – half-step velocity update
     for body, acc in zip(bodies, accs):
@@ -180,7 +232,7 @@ def leapfrog_step(bodies, dt, softening=1e6):
         body.move(dt)
 
     # Step 4 – new accelerations
-    new_accs = [net_force_on(b, bodies, softening) / b.mass for b in bodies]
+    new_accs = accelerations(bodies, softening, solver, theta)
 
     # Step 5 – second half-step velocity update
     for body, acc in zip(bodies, new_accs):
@@ -191,7 +243,8 @@ def leapfrog_step(bodies, dt, softening=1e6):
 
 
 def simulate(bodies, dt, num_steps, integrator="leapfrog", softening=1e6,
-             record_every=1):
+             record_every=1, engine="python", solver="direct", theta=0.5,
+             recorder=None):
     """
     Run the gravity simulation for *num_steps* steps.
 
@@ -202,14 +255,40 @@ def simulate(bodies, dt, num_steps, integrator="leapfrog", softening=1e6,
         integrator  (str)        : 'euler' or 'leapfrog' (default)
         softening   (float)      : Softening length (m)
         record_every(int)        : Record system state every N steps
+        engine      (str)        : 'python' (Body objects, default) or
+                                   'soa' (NumPy arrays, module 06)
+        solver      (str)        : 'direct' (default) or 'barnes-hut'
+        theta       (float)      : Barnes–Hut opening angle
+        recorder    (TrajectoryRecorder): Record into preallocated arrays
+                                   (module 08) instead of snapshot dicts;
+                                   its own record/energy intervals apply
 
     Returns:
         list[dict]: Snapshot list; each dict has keys
-            'step', 'time', 'positions', 'velocities', 'total_energy'
+            'step', 'time', 'positions', 'velocities', 'total_energy'.
+            When *recorder* is given, the recorder itself is returned.
     """
+    _check_solver(solver)
+    if engine == "soa":
+        system = _nbody_engine().NBodySystem.from_bodies(
+            bodies, G, softening, solver=_system_solver(solver, theta))
+        history = _simulate_system(system, dt, num_steps, integrator,
+                                   record_every, with_energy=True,
+                                   recorder=recorder)
+        system.to_bodies(bodies)
+        return history
+    if engine != "python":
+        raise ValueError(f"Unknown engine {engine!r} (expected 'python' or 'soa')")
+
     step_fn = euler_step if integrator == "euler" else leapfrog_step
-    history = []
+    if recorder is not None:
+        energy = lambda: (kinetic_energy(bodies), potential_energy(bodies))
+        for step in range(num_steps):
+            recorder.record_bodies(step, step * dt, bodies, energy)
+            step_fn(bodies, dt, softening, solver, theta)
+        return recorder
 
+    history = []
     for step in range(num_steps):
         if step % record_every == 0:
             history.append({
@@ -219,8 +298,41 @@ def simulate(bodies, dt, num_steps, integrator="leapfrog", softening=1e6,
                 'velocities':  [b.velocity.copy() for b in bodies],
                 'total_energy': total_energy(bodies),
             })
-        step_fn(bodies, dt, softening)
+        step_fn(bodies, dt, softening, solver, theta)
+
+    return history
+
 
+def _system_solver(solver, theta):
+    """``NBodySystem`` solver callable for a solver name (None = direct)."""
+    if solver == "barnes-hut":
+        return _barnes_hut().barnes_hut_solver(theta)
+    return None
+
+
+def _simulate_system(system, dt, num_steps, integrator="leapfrog",
+                     record_every=1, with_energy=True, recorder=None):
+    """``simulate`` loop for an ``NBodySystem`` (same snapshot format)."""
+    if recorder is not None:
+        energy = lambda: (system.kinetic_energy(), system.potential_energy())
+        for step in range(num_steps):
+            recorder.record(step, step * dt, system.positions, energy)
+            system.step(dt, integrator)
+        return recorder
+
+    history = []
+    for step in range(num_steps):
+        if step % record_every == 0:
+            snapshot = {
+                'step':       step,
+                'time':       step * dt,
+                'positions':  system.position_vectors(),
+                'velocities': system.velocity_vectors(),
+            }
+            if with_energy:
+                snapshot['total_energy'] = system.total_energy()
+            history.append(snapshot)
+        system.step(dt, integrator)
     return history
 
 
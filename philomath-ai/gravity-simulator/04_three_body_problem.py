@@ -250,7 +250,15 @@ def _net_force_dim(body, all_bodies, softening=1e-4):
     return total
 
 
-def leapfrog_step_dim(bodies, dt, softening=1e-4):
+def _accelerations_dim(bodies, softening, solver="direct", theta=0.5):
+    """Accelerations with G_DIM, from the direct sum or Barnes–Hut."""
+    _gsim._check_solver(solver)
+    if solver == "barnes-hut":
+        return _gsim._barnes_hut().body_accelerations(bodies, G_DIM, softening, theta)
+    return [_net_force_dim(b, bodies, softening) / b.mass for b in bodies]
+
+
+def leapfrog_step_dim(bodies, dt, softening=1e-4, solver="direct", theta=0.5):
     """
     Leapfrog integrator for dimensionless-unit simulations (G = 1).
 
@@ -258,18 +266,32 @@ def leapfrog_step_dim(bodies, dt, softening=1e-4):
         bodies    (list[Body]): All bodies (modified in place)
         dt        (float)     : Time step (dimensionless)
         softening (float)     : Softening length (dimensionless)
+        solver    (str)       : 'direct' (exact) or 'barnes-hut' (module 07)
+        theta     (float)     : Barnes–Hut opening angle
     """
-    accs = [_net_force_dim(b, bodies, softening) / b.mass for b in bodies]
+    accs = _accelerations_dim(bodies, softening, solver, theta)
     for body, acc in zip(bodies, accs):
         body.velocity = body.velocity + acc * (dt / 2.0)
     for body in bodies:
         body.move(dt)
-    new_accs = [_net_force_dim(b, bodies, softening) / b.mass for b in bodies]
+    new_accs = _accelerations_dim(bodies, softening, solver, theta)
     for body, acc in zip(bodies, new_accs):
         body.velocity = body.velocity + acc * (dt / 2.0)
 
 
-def simulate_dim(bodies, dt, num_steps, record_every=1):
+def _energy_dim(bodies):
+    """(kinetic, potential) energy with G_DIM (unsoftened, as module 03)."""
+    pe = 0.0
+    for i in range(len(bodies)):
+        for j in range(i + 1, len(bodies)):
+            r = bodies[i].distance_to(bodies[j])
+            if r > 0:
+                pe -= G_DIM * bodies[i].mass * bodies[j].mass / r
+    return kinetic_energy(bodies), pe
+
+
+def simulate_dim(bodies, dt, num_steps, record_every=1, engine="python",
+                 softening=1e-4, solver="direct", theta=0.5, recorder=None):
     """
     Run a dimensionless-unit three-body simulation.
 
@@ -278,10 +300,37 @@ def simulate_dim(bodies, dt, num_steps, record_every=1):
         dt          (float)      : Time step (dimensionless)
         num_steps   (int)        : Total number of steps
         record_every(int)        : Record snapshot every N steps
+        engine      (str)        : 'python' (default) or 'soa' (module 06)
+        softening   (float)      : Softening length (dimensionless)
+        solver      (str)        : 'direct' (default) or 'barnes-hut'
+        theta       (float)      : Barnes–Hut opening angle
+        recorder    (TrajectoryRecorder): Record into preallocated arrays
+                                   (module 08) instead of snapshot dicts
 
     Returns:
-        list[dict]: Snapshot list (same format as simulate() in module 03)
+        list[dict]: Snapshot list (same format as simulate() in module 03),
+            or *recorder* when one is given
     """
+    if engine == "soa":
+        system = _gsim._nbody_engine().NBodySystem.from_bodies(
+            bodies, G_DIM, softening,
+            solver=_gsim._system_solver(solver, theta))
+        history = _gsim._simulate_system(system, dt, num_steps,
+                                         record_every=record_every,
+                                         with_energy=False,
+                                         recorder=recorder)
+        system.to_bodies(bodies)
+        return history
+    if engine != "python":
+        raise ValueError(f"Unknown engine {engine!r} (expected 'python' or 'soa')")
+
+    if recorder is not None:
+        energy = lambda: _energy_dim(bodies)
+        for step in range(num_steps):
+            recorder.record_bodies(step, step * dt, bodies, energy)
+            leapfrog_step_dim(bodies, dt, softening, solver, theta)
+        return recorder
+
     history = []
     for step in range(num_steps):
         if step % record_every == 0:
@@ -291,7 +340,7 @@ def simulate_dim(bodies, dt, num_steps, record_every=1):
                 'positions':  [b.position.copy() for b in bodies],
                 'velocities': [b.velocity.copy() for b in bodies],
             })
-        leapfrog_step_dim(bodies, dt)
+        leapfrog_step_dim(bodies, dt, softening, solver, theta)
     return history
 
 
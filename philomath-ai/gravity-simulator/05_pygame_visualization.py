@@ -7,8 +7,9 @@ window.  You can choose from four built-in scenarios and watch bodies
 orbit, dance the figure-8, or tumble chaotically.
 
 Controls:
-    1 – 4        : Switch scenario  (1=figure-8, 2=Lagrange, 3=chaotic,
-                                     4=Sun–Earth–Moon)
+    1 – 5        : Switch scenario  (1=figure-8, 2=Lagrange, 3=chaotic,
+                                     4=Sun–Earth–Moon, 5=star cluster)
+    E            : Toggle engine (Body objects / NumPy structure-of-arrays)
     SPACE        : Pause / resume simulation
     R            : Reset current scenario
     T            : Toggle body trails on / off
@@ -18,6 +19,14 @@ Controls:
     F            : Speed up  (double the simulation speed)
     ESC / Q      : Quit
 
+Replay a recording made with ``TrajectoryRecorder`` (module 08):
+
+    python 05_pygame_visualization.py --replay <recording dir>
+
+SPACE, R (restart), T, zoom, pan and S / F (samples per frame) work as
+above; the positions are read from the memory-mapped file, nothing is
+re-simulated.
+
 Visual features:
     - Colour-coded bodies with unique RGB tones
     - Fading trail lines that fade out as they age
@@ -70,6 +79,8 @@ create_figure_eight   = _3body.create_figure_eight
 create_lagrange_triangle   = _3body.create_lagrange_triangle
 create_chaotic_three_body  = _3body.create_chaotic_three_body
 create_sun_earth_moon      = _3body.create_sun_earth_moon
+G                          = _gsim.G
+G_DIM                      = _3body.G_DIM
 
 # ── Window / display settings ─────────────────────────────────────────────────
 
@@ -121,8 +132,41 @@ SCENARIOS = {
         "si_units":    True,
         "softening":   1e6,
     },
+    5: {
+        "name":        "Star Cluster (5,000 bodies, SoA engine)",
+        "factory":     lambda: create_star_cluster(5000),
+        "dt":          0.002,
+        "steps_per_frame": 1,
+        "scale":       300,
+        "si_units":    False,
+        "softening":   0.01,
+        "engine":      "soa",         # the Body engine is far too slow here
+        "precision":   "float32",
+        "radius":      1,
+    },
 }
 
+
+def create_star_cluster(n=5000, seed=0):
+    """A rotating disc of *n* equal-mass stars (needs numpy; module 06)."""
+    system = _gsim._nbody_engine().create_random_cluster(n, seed=seed)
+    return [
+        Body(f"Star {i}", mass=m,
+             position=Vector2D(px, py), velocity=Vector2D(vx, vy),
+             color=(255, 235, 190), max_trail=0)
+        for i, (m, (px, py), (vx, vy)) in enumerate(zip(
+            system.masses.tolist(), system.positions.tolist(),
+            system.velocities.tolist()))
+    ]
+
+
+def make_system(bodies, cfg):
+    """Build the NumPy ``NBodySystem`` for *bodies* under scenario *cfg*."""
+    nbody = _gsim._nbody_engine()
+    dtype = nbody.np.float32 if cfg.get("precision") == "float32" else nbody.np.float64
+    return nbody.NBodySystem.from_bodies(
+        bodies, G if cfg["si_units"] else G_DIM, cfg["softening"], dtype=dtype)
+
 # ── Coordinate helpers ────────────────────────────────────────────────────────
 
 
@@ -199,7 +243,8 @@ def draw_trails(surface, bodies, scale, offset_x, offset_y):
             pygame.draw.line(surface, color, p1, p2, 1)
 
 
-def draw_bodies(surface, bodies, scale, offset_x, offset_y, si_units):
+def draw_bodies(surface, bodies, scale, offset_x, offset_y, si_units,
+                radius=None):
     """
     Draw each body as a filled circle with an outline glow.
 
@@ -208,11 +253,12 @@ def draw_bodies(surface, bodies, scale, offset_x, offset_y, si_units):
         bodies (list[Body]): Bodies to draw
         scale, offset_x, offset_y: coordinate mapping
         si_units (bool): Use SI mass-to-radius mapping
+        radius (int)   : Fixed radius for every body (e.g. star clusters)
     """
     import pygame
     for body in bodies:
         pos = sim_to_screen(body.position, scale, offset_x, offset_y)
-        r   = body_radius(body, si_units)
+        r   = radius or body_radius(body, si_units)
         # Glow halo
         glow_color = tuple(min(255, c + 60) for c in body.color)
         pygame.draw.circle(surface, glow_color, pos, r + 2)
@@ -231,7 +277,8 @@ def draw_com(surface, bodies, scale, offset_x, offset_y):
 
 
 def draw_hud(surface, font, scenario_name, step, time_val, paused,
-             show_trails, si_units, dt, steps_per_frame, speed_mult):
+             show_trails, si_units, dt, steps_per_frame, speed_mult,
+             engine="python"):
     """
     Render the heads-up display text in the top-left corner.
 
@@ -247,6 +294,7 @@ def draw_hud(surface, font, scenario_name, step, time_val, paused,
         dt (float): Time step
         steps_per_frame (int): Current steps per frame
         speed_mult (float): Speed multiplier
+        engine (str): 'python' (Body objects) or 'soa' (NumPy arrays)
     """
     import pygame
     time_str = (f"{time_val / 86400:.1f} days"
@@ -256,9 +304,9 @@ def draw_hud(surface, font, scenario_name, step, time_val, paused,
         f"Time: {time_str}   Step: {step:,}",
         f"dt={dt:.2e}  x{steps_per_frame} steps/frame  speed×{speed_mult:.1f}",
         f"{'[PAUSED]' if paused else '[RUNNING]'}  "
-        f"Trails={'ON' if show_trails else 'OFF'}",
+        f"Trails={'ON' if show_trails else 'OFF'}  Engine={engine}",
         "",
-        "Keys: 1-4=scene  SPACE=pause  R=reset  T=trails",
+        "Keys: 1-5=scene  SPACE=pause  R=reset  T=trails  E=engine",
         "      +/-=zoom   arrows=pan   S/F=speed  ESC=quit",
     ]
     y = 8
@@ -297,6 +345,103 @@ def _run_text_demo():
     print("\n✓ Text demo complete")
 
 
+# ── Replay ────────────────────────────────────────────────────────────────────
+
+
+def replay_view(rec, sample_limit=10_000):
+    """
+    Choose ``(scale, si_units)`` for a recording.
+
+    The scale fits the first *sample_limit* samples in the window; masses
+    above 10²⁰ are taken to mean SI units.
+    """
+    head   = rec.positions[:min(len(rec), sample_limit)]
+    extent = float(abs(head).max()) if head.size else 1.0
+    scale  = 0.45 * min(WINDOW_WIDTH, WINDOW_HEIGHT) / (extent or 1.0)
+    return scale, bool(max(rec.masses.tolist()) > 1e20)
+
+
+def replay(path):
+    """Play back a recording from module 08 in the pygame window."""
+    import pygame
+    rec = _load("08_trajectory_recorder.py").TrajectoryRecorder.load(path)
+    if len(rec) == 0:
+        print(f"{path}: recording is empty")
+        return
+
+    pygame.init()
+    screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+    pygame.display.set_caption(f"{WINDOW_TITLE} – replay")
+    font   = pygame.font.SysFont("monospace", 13)
+    clock  = pygame.time.Clock()
+
+    name             = f"Replay: {os.path.basename(os.path.normpath(path))}"
+    scale, si_units  = replay_view(rec)
+    dt               = (float(rec.times[1] - rec.times[0]) / rec.record_every
+                        if len(rec) > 1 else 0.0)
+    bodies           = rec.make_bodies(0, max_trail=600)
+    frame            = 0
+    samples_per_frame = 1
+    paused           = False
+    show_trails      = True
+    offset_x         = 0.0
+    offset_y         = 0.0
+
+    running = True
+    while running:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+            elif event.type == pygame.KEYDOWN:
+                k = event.key
+                if k in (pygame.K_ESCAPE, pygame.K_q):
+                    running = False
+                elif k == pygame.K_SPACE:
+                    paused = not paused
+                elif k == pygame.K_r:
+                    bodies = rec.make_bodies(0, max_trail=600)
+                    frame  = 0
+                elif k == pygame.K_t:
+                    show_trails = not show_trails
+                    if not show_trails:
+                        for b in bodies:
+                            b.clear_trail()
+                elif k == pygame.K_EQUALS or k == pygame.K_PLUS:
+                    scale *= 1.25
+                elif k == pygame.K_MINUS:
+                    scale /= 1.25
+                elif k == pygame.K_LEFT:
+                    offset_x -= 40
+                elif k == pygame.K_RIGHT:
+                    offset_x += 40
+                elif k == pygame.K_UP:
+                    offset_y -= 40
+                elif k == pygame.K_DOWN:
+                    offset_y += 40
+                elif k == pygame.K_s:
+                    samples_per_frame = max(1, samples_per_frame // 2)
+                elif k == pygame.K_f:
+                    samples_per_frame = min(4096, samples_per_frame * 2)
+
+        if not paused and frame < len(rec) - 1:
+            frame = min(frame + samples_per_frame, len(rec) - 1)
+            rec.to_bodies(frame, bodies, record_trail=show_trails)
+
+        screen.fill(BACKGROUND)
+        if show_trails:
+            draw_trails(screen, bodies, scale, offset_x, offset_y)
+        draw_com(screen, bodies, scale, offset_x, offset_y)
+        draw_bodies(screen, bodies, scale, offset_x, offset_y, si_units)
+        draw_hud(screen, font, name, int(rec.steps[frame]),
+                 float(rec.times[frame]), paused, show_trails, si_units,
+                 dt, samples_per_frame * rec.record_every, 1.0,
+                 engine="replay")
+        pygame.display.flip()
+        clock.tick(60)
+
+    pygame.quit()
+
+
 # ── Main pygame loop ──────────────────────────────────────────────────────────
 
 
@@ -331,6 +476,8 @@ def main():
     scale           = cfg["scale"]
     si_units        = cfg["si_units"]
     softening       = cfg["softening"]
+    engine          = cfg.get("engine", "python")
+    system          = None     # NBodySystem while engine == "soa"
 
     step            = 0
     sim_time        = 0.0
@@ -355,7 +502,8 @@ def main():
                     running = False
 
                 # Scenario switch
-                elif k in (pygame.K_1, pygame.K_2, pygame.K_3, pygame.K_4):
+                elif k in (pygame.K_1, pygame.K_2, pygame.K_3, pygame.K_4,
+                           pygame.K_5):
                     scenario_id     = int(pygame.key.name(k))
                     cfg             = SCENARIOS[scenario_id]
                     bodies          = cfg["factory"]()
@@ -371,6 +519,8 @@ def main():
                     offset_x        = 0.0
                     offset_y        = 0.0
                     speed_mult      = 1.0
+                    engine          = cfg.get("engine", "python")
+                    system          = None
 
                 # Pause / resume
                 elif k == pygame.K_SPACE:
@@ -385,6 +535,12 @@ def main():
                     sim_time = 0.0
                     offset_x = 0.0
                     offset_y = 0.0
+                    system   = None
+
+                # Toggle engine (bodies are kept in sync every frame)
+                elif k == pygame.K_e:
+                    engine = "python" if engine == "soa" else "soa"
+                    system = None
 
                 # Toggle trails
                 elif k == pygame.K_t:
@@ -418,8 +574,15 @@ def main():
                     steps_per_frame = max(1, int(cfg["steps_per_frame"] * speed_mult))
 
         # ── Advance simulation ────────────────────────────────────────────────
-        if not paused:
-            integrator = leapfrog_step_dim if not si_units else leapfrog_step
+        if not paused and engine == "soa":
+            if system is None:
+                system = make_system(bodies, cfg)
+            for _ in range(steps_per_frame):
+                system.leapfrog_step(dt)
+                sim_time += dt
+                step     += 1
+            system.to_bodies(bodies, record_trail=show_trails)
+        elif not paused:
             for _ in range(steps_per_frame):
                 if si_units:
                     leapfrog_step(bodies, dt, softening)
@@ -435,10 +598,11 @@ def main():
             draw_trails(screen, bodies, scale, offset_x, offset_y)
 
         draw_com(screen, bodies, scale, offset_x, offset_y)
-        draw_bodies(screen, bodies, scale, offset_x, offset_y, si_units)
+        draw_bodies(screen, bodies, scale, offset_x, offset_y, si_units,
+                    radius=cfg.get("radius"))
         draw_hud(screen, font, cfg["name"], step, sim_time,
                  paused, show_trails, si_units, dt, steps_per_frame,
-                 speed_mult)
+                 speed_mult, engine)
 
         pygame.display.flip()
         clock.tick(60)   # cap at 60 fps
@@ -447,6 +611,13 @@ def main():
 
 
 if __name__ == "__main__":
+    if len(sys.argv) == 3 and sys.argv[1] == "--replay":
+        try:
+            replay(sys.argv[2])
+        except ImportError:
+            print("pygame is not installed. Run: pip install pygame")
+        sys.exit(0)
+
     print("=" * 65)
     print("GRAVITY SIMULATOR – PYGAME VISUALIZATION")
     print("=" * 65)
@@ -454,7 +625,8 @@ if __name__ == "__main__":
     for sid, cfg in SCENARIOS.items():
         print(f"  [{sid}] {cfg['name']}")
     print("\nControls:")
-    print("  1-4      Switch scenario")
+    print("  1-5      Switch scenario")
+    print("  E        Toggle engine (Body / NumPy SoA)")
     print("  SPACE    Pause / resume")
     print("  R        Reset current scenario")
     print("  T        Toggle trails")
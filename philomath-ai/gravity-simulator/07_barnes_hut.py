@@ -0,0 +1,405 @@
+"""
+Barnes–Hut Quadtree Force Solver
+================================
+
+The direct force sum is O(N²): every body feels every other body.  The
+Barnes–Hut algorithm (Barnes & Hut, 1986) groups distant bodies: a square
+cell of side *s* at distance *d* whose ratio  s / d < θ  is replaced by a
+single point mass at the cell's centre of mass.  With a quadtree this
+brings the cost down to O(N log N); θ trades accuracy for speed
+(θ = 0 opens every cell and reproduces the direct sum).
+
+Flat-array quadtree
+-------------------
+Instead of ``Node`` objects, the tree is rebuilt each step into flat NumPy
+arrays:
+
+1. Each body gets a **Morton code** – the bits of its quantized x and y
+   interleaved – and bodies are sorted by it.  Every quadtree cell is then
+   a *contiguous* range of the sorted bodies.
+2. Level by level, cells are split where the next two code bits change.
+   Per cell we store ``start, end`` (body range), ``mass``, centre of mass
+   ``cx, cy``, ``size``, and ``child_first, child_count`` (its children are
+   consecutive cells of the next level).  Cells with at most ``leaf_size``
+   bodies are leaves.
+3. Forces are evaluated for a block of target bodies at once: a frontier
+   of (body, cell) pairs is tested against the opening criterion; accepted
+   cells contribute a point-mass force, opened leaves contribute the exact
+   force of their bodies, and opened internal cells are replaced by their
+   children.  Every step is a NumPy array operation.
+
+``barnes_hut_accelerations`` has the same signature as
+``direct_accelerations`` in module 06, so it plugs into ``NBodySystem``,
+``leapfrog_step`` (module 03) and ``leapfrog_step_dim`` (module 04) via
+``solver="barnes-hut"``.
+
+Learning Objectives:
+- Understand how hierarchical approximation turns O(N²) into O(N log N)
+- Build a tree as flat arrays using space-filling-curve (Morton) order
+- Measure the accuracy / speed trade-off of the opening angle θ
+
+Requires: numpy
+"""
+
+import functools
+import os
+import sys
+import time
+
+import numpy as np
+
+_DIR = os.path.dirname(os.path.abspath(__file__))
+if _DIR not in sys.path:
+    sys.path.insert(0, _DIR)
+
+from importlib.util import spec_from_file_location, module_from_spec as _mfs
+
+
+def _load(name):
+    path = os.path.join(_DIR, name)
+    spec = spec_from_file_location(name[:-3], path)
+    mod  = _mfs(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+_nbody = _load("06_nbody_engine.py")
+
+Vector2D              = _nbody.Vector2D
+NBodySystem           = _nbody.NBodySystem
+direct_accelerations  = _nbody.direct_accelerations
+create_random_cluster = _nbody.create_random_cluster
+
+MORTON_BITS = 21      # bits per axis → 42-bit codes fit in int64
+
+
+# ── Morton codes ──────────────────────────────────────────────────────────────
+
+
+def morton_codes(positions, origin, size, bits=MORTON_BITS):
+    """Morton (Z-order) codes of *positions* inside the square (origin, size)."""
+    scale = (1 << bits) / size
+    q = np.floor((positions - origin) * scale).astype(np.int64)
+    np.clip(q, 0, (1 << bits) - 1, out=q)
+    q = q.astype(np.uint64)
+    return _part1by1(q[:, 0]) | (_part1by1(q[:, 1]) << np.uint64(1))
+
+
+def _part1by1(v):
+    """Insert a zero bit between each of the low 32 bits of *v* (uint64)."""
+    v = v & np.uint64(0x00000000FFFFFFFF)
+    v = (v | (v << np.uint64(16))) & np.uint64(0x0000FFFF0000FFFF)
+    v = (v | (v << np.uint64(8)))  & np.uint64(0x00FF00FF00FF00FF)
+    v = (v | (v << np.uint64(4)))  & np.uint64(0x0F0F0F0F0F0F0F0F)
+    v = (v | (v << np.uint64(2)))  & np.uint64(0x3333333333333333)
+    v = (v | (v << np.uint64(1)))  & np.uint64(0x5555555555555555)
+    return v
+
+
+def _expand(counts):
+    """
+    For segments of the given *counts*, return ``(owner, offset)`` arrays:
+    one entry per element, naming its segment and its position within it.
+    """
+    total = int(counts.sum())
+    owner = np.repeat(np.arange(len(counts)), counts)
+    starts = np.cumsum(counts) - counts
+    offset = np.arange(total) - np.repeat(starts, counts)
+    return owner, offset
+
+
+# ── Tree construction ─────────────────────────────────────────────────────────
+
+
+class QuadTree:
+    """
+    Flat-array quadtree over bodies sorted in Morton order.
+
+    Attributes (all NumPy arrays, one entry per cell; cell 0 is the root):
+        start, end        : body range ``[start, end)`` in sorted order
+        mass, cx, cy      : total mass and centre of mass
+        size              : side length of the cell's square
+        child_first       : index of the first child cell
+        child_count       : number of children (0 for leaves)
+
+    Also ``order`` (sorted → original body index) and the sorted
+    ``x, y, m`` arrays.
+    """
+
+    def __init__(self, positions, masses, leaf_size=8, max_depth=MORTON_BITS):
+        n = len(masses)
+        lo = positions.min(axis=0)
+        hi = positions.max(axis=0)
+        size = float(max(hi - lo)) or 1.0
+        size *= 1.0 + 1e-9
+        codes = morton_codes(positions, lo, size)
+
+        self.order = np.argsort(codes, kind="stable")
+        codes = codes[self.order]
+        self.x = positions[self.order, 0].copy()
+        self.y = positions[self.order, 1].copy()
+        self.m = masses[self.order].copy()
+        self.leaf_size = leaf_size
+
+        # Prefix sums make each cell's mass / moment an O(1) lookup.
+        zero = np.zeros(1)
+        cm  = np.concatenate([zero, np.cumsum(self.m)])
+        cmx = np.concatenate([zero, np.cumsum(self.m * self.x)])
+        cmy = np.concatenate([zero, np.cumsum(self.m * self.y)])
+
+        starts, ends, sizes = [np.array([0])], [np.array([n])], [np.array([size])]
+        child_first, child_count = [], []
+        level_start, level_end = np.array([0]), np.array([n])
+        n_cells = 1
+        depth = 0
+        while True:
+            split = (level_end - level_start > leaf_size) & (depth < max_depth)
+            first = np.full(len(level_start), -1)
+            count = np.zeros(len(level_start), dtype=np.int64)
+            if not split.any():
+                child_first.append(first)
+                child_count.append(count)
+                break
+            depth += 1
+            shift = np.uint64(2 * (MORTON_BITS - depth))
+            p_start, p_end = level_start[split], level_end[split]
+            owner, offset = _expand(p_end - p_start)
+            idx = p_start[owner] + offset
+            key = codes[idx] >> shift
+            # A new child begins at each parent start or where the key changes.
+            new = np.ones(len(idx), dtype=bool)
+            new[1:] = (key[1:] != key[:-1]) | (owner[1:] != owner[:-1])
+            c_start = idx[new]
+            c_owner = owner[new]
+            c_end = np.empty_like(c_start)
+            c_end[:-1] = idx[np.flatnonzero(new)[1:] - 1] + 1
+            c_end[-1] = idx[-1] + 1
+            per_parent = np.bincount(c_owner, minlength=len(p_start))
+            first[split] = n_cells + np.cumsum(per_parent) - per_parent
+            count[split] = per_parent
+            child_first.append(first)
+            child_count.append(count)
+            starts.append(c_start)
+            ends.append(c_end)
+            sizes.append(np.full(len(c_start), size / (1 << depth)))
+            n_cells += len(c_start)
+            level_start, level_end = c_start, c_end
+
+        self.start = np.concatenate(starts)
+        self.end = np.concatenate(ends)
+        self.size = np.concatenate(sizes)
+        self.child_first = np.concatenate(child_first)
+        self.child_count = np.concatenate(child_count)
+        self.mass = cm[self.end] - cm[self.start]
+        self.cx = (cmx[self.end] - cmx[self.start]) / self.mass
+        self.cy = (cmy[self.end] - cmy[self.start]) / self.mass
+
+    def __len__(self):
+        return len(self.start)
+
+
+# ── Force evaluation ──────────────────────────────────────────────────────────
+
+
+def barnes_hut_accelerations(positions, masses, G, softening, out=None,
+                             theta=0.5, leaf_size=8, block=4096):
+    """
+    Approximate gravitational accelerations with Barnes–Hut.
+
+    Args:
+        positions (ndarray): (N, 2) positions
+        masses    (ndarray): (N,) masses
+        G         (float)  : Gravitational constant
+        softening (float)  : Softening length ε (applied to every interaction)
+        out       (ndarray): Optional (N, 2) output array
+        theta     (float)  : Opening angle; a cell of side s at distance d
+                             is approximated when s < θ·d (0 = exact)
+        leaf_size (int)    : Maximum bodies per leaf cell
+        block     (int)    : Target bodies traversed together
+
+    Returns:
+        ndarray: (N, 2) accelerations (``out`` if given)
+    """
+    n = len(masses)
+    if out is None:
+        out = np.empty((n, 2))
+    if n == 0:
+        return out
+    tree = QuadTree(np.asarray(positions, dtype=np.float64),
+                    np.asarray(masses, dtype=np.float64), leaf_size=leaf_size)
+    x, y, m = tree.x, tree.y, tree.m
+    eps2 = softening * softening
+    theta2 = theta * theta
+    acc = np.empty((n, 2))
+
+    for t0 in range(0, n, block):
+        t1 = min(t0 + block, n)
+        nt = t1 - t0
+        ax = np.zeros(nt)
+        ay = np.zeros(nt)
+        body = np.arange(t0, t1)              # frontier: (body, cell) pairs
+        cell = np.zeros(nt, dtype=np.int64)
+        while len(body):
+            dx = tree.cx[cell] - x[body]
+            dy = tree.cy[cell] - y[body]
+            r2 = dx * dx + dy * dy
+            s = tree.size[cell]
+            # Open a cell when it is too close, or when it contains the body
+            # itself (never approximate a body by a cell it belongs to).
+            inside = (body >= tree.start[cell]) & (body < tree.end[cell])
+            opened = (s * s >= theta2 * r2) | inside
+
+            far = ~opened
+            if far.any():
+                d2 = r2[far] + eps2
+                w = G * tree.mass[cell[far]] / (d2 * np.sqrt(d2))
+                local = body[far] - t0
+                ax += np.bincount(local, w * dx[far], minlength=nt)
+                ay += np.bincount(local, w * dy[far], minlength=nt)
+
+            leaf = opened & (tree.child_count[cell] == 0)
+            if leaf.any():
+                lb, lc = body[leaf], cell[leaf]
+                owner, offset = _expand(tree.end[lc] - tree.start[lc])
+                b = lb[owner]
+                j = tree.start[lc][owner] + offset
+                keep = j != b
+                b, j = b[keep], j[keep]
+                ddx = x[j] - x[b]
+                ddy = y[j] - y[b]
+                d2 = ddx * ddx + ddy * ddy + eps2
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    w = G * m[j] / (d2 * np.sqrt(d2))
+                w[~np.isfinite(w)] = 0.0          # coincident, unsoftened
+                ax += np.bincount(b - t0, w * ddx, minlength=nt)
+                ay += np.bincount(b - t0, w * ddy, minlength=nt)
+
+            inner = opened & (tree.child_count[cell] > 0)
+            ib, ic = body[inner], cell[inner]
+            owner, offset = _expand(tree.child_count[ic])
+            body = ib[owner]
+            cell = tree.child_first[ic][owner] + offset
+
+        acc[t0:t1, 0] = ax
+        acc[t0:t1, 1] = ay
+
+    out[tree.order] = acc
+    return out
+
+
+def body_accelerations(bodies, G, softening, theta=0.5, leaf_size=8):
+    """
+    Barnes–Hut accelerations for a list of ``Body`` objects.
+
+    Returns:
+        list[Vector2D]: acceleration of each body (same order)
+    """
+    positions = np.array([(b.position.x, b.position.y) for b in bodies], dtype=np.float64)
+    masses = np.array([b.mass for b in bodies], dtype=np.float64)
+    acc = barnes_hut_accelerations(positions, masses, G, softening,
+                                   theta=theta, leaf_size=leaf_size)
+    return [Vector2D(ax, ay) for ax, ay in acc.tolist()]
+
+
+def barnes_hut_solver(theta=0.5, leaf_size=8):
+    """A ``solver`` for ``NBodySystem`` with the given opening angle."""
+    return functools.partial(barnes_hut_accelerations, theta=theta,
+                             leaf_size=leaf_size)
+
+
+# ── Accuracy vs speed ─────────────────────────────────────────────────────────
+
+
+def energy_drift_report(n=1000, steps=200, dt=1e-3, thetas=(0.3, 0.5, 0.8),
+                        softening=0.01, seed=0):
+    """
+    Run the same cluster with the exact solver and with Barnes–Hut at each
+    θ, and report accuracy against speed.
+
+    Returns:
+        list[dict]: one row per solver with keys ``'solver'``, ``'theta'``,
+        ``'ms_per_step'``, ``'energy_drift'`` (relative |ΔE / E₀| after
+        *steps*), ``'force_error'`` (median relative force error vs exact
+        at t = 0) and ``'position_error'`` (RMS distance from the exact run).
+    """
+    def run(solver):
+        system = create_random_cluster(n, seed=seed, softening=softening,
+                                       solver=solver)
+        acc0 = system.accelerations().copy()
+        e0 = system.total_energy()
+        start = time.perf_counter()
+        for _ in range(steps):
+            system.leapfrog_step(dt)
+        elapsed = time.perf_counter() - start
+        drift = abs(system.total_energy() - e0) / abs(e0)
+        return system, acc0, elapsed / steps, drift
+
+    exact, exact_acc, exact_t, exact_drift = run(None)
+    rows = [{"solver": "direct", "theta": 0.0, "ms_per_step": exact_t * 1e3,
+             "energy_drift": exact_drift, "force_error": 0.0,
+             "position_error": 0.0}]
+    norm = np.linalg.norm(exact_acc, axis=1)
+    for theta in thetas:
+        system, acc0, t, drift = run(barnes_hut_solver(theta))
+        force_err = float(np.median(np.linalg.norm(acc0 - exact_acc, axis=1) / norm))
+        pos_err = float(np.sqrt(np.mean(np.sum(
+            (system.positions - exact.positions) ** 2, axis=1))))
+        rows.append({"solver": "barnes-hut", "theta": theta,
+                     "ms_per_step": t * 1e3, "energy_drift": drift,
+                     "force_error": force_err, "position_error": pos_err})
+    return rows
+
+
+def benchmark(sizes=(1_000, 10_000, 100_000), theta=0.5):
+    """
+    Time one Barnes–Hut force evaluation per size (and the direct solver
+    where it is still affordable).
+
+    Returns:
+        list[tuple[int, float, float | None]]: (N, BH seconds, direct seconds)
+    """
+    results = []
+    for n in sizes:
+        system = create_random_cluster(n)
+        start = time.perf_counter()
+        barnes_hut_accelerations(system.positions, system.masses, 1.0,
+                                 system.softening, theta=theta)
+        bh = time.perf_counter() - start
+        direct = None
+        if n <= 10_000:
+            start = time.perf_counter()
+            direct_accelerations(system.positions, system.masses, 1.0,
+                                 system.softening, dtype=np.float32)
+            direct = time.perf_counter() - start
+        results.append((n, bh, direct))
+    return results
+
+
+# ── Demo ──────────────────────────────────────────────────────────────────────
+
+
+def _demo():
+    """Print the accuracy / speed table and a scaling benchmark."""
+    print("=" * 72)
+    print("BARNES–HUT QUADTREE SOLVER DEMO")
+    print("=" * 72)
+
+    print("\nAccuracy vs speed (1,000-star cluster, 200 leapfrog steps):\n")
+    print(f"  {'solver':<11}{'θ':>5}{'ms/step':>10}{'ΔE/E₀':>12}"
+          f"{'force err':>12}{'pos err':>12}")
+    for row in energy_drift_report():
+        print(f"  {row['solver']:<11}{row['theta']:>5.1f}{row['ms_per_step']:>10.1f}"
+              f"{row['energy_drift']:>12.2e}{row['force_error']:>12.2e}"
+              f"{row['position_error']:>12.2e}")
+
+    print("\nOne force evaluation (θ = 0.5):\n")
+    print(f"  {'N':>8}{'Barnes–Hut s':>15}{'direct (f32) s':>16}")
+    for n, bh, direct in benchmark():
+        d = f"{direct:>16.3f}" if direct is not None else f"{'—':>16}"
+        print(f"  {n:>8,}{bh:>15.3f}{d}")
+
+    print("\n✓ Barnes–Hut demo complete")
+
+
+if __name__ == "__main__":
+    _demo()
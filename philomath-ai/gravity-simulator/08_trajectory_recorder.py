@@ -0,0 +1,310 @@
+"""
+Trajectory Recorder
+===================
+
+``simulate`` and ``simulate_dim`` return a list of snapshot dicts, each
+holding freshly copied ``Vector2D`` lists and (in module 03) an O(N²)
+total energy.  That is convenient for a few hundred snapshots, but a
+million-step three-body run would build millions of small objects and
+spend most of its time in the energy sum.
+
+``TrajectoryRecorder`` stores the same information in arrays that are
+allocated once, before the run starts:
+
+    positions : (samples, N, 2) float array    – every *record_every* steps
+    steps     : (samples,)       int array
+    times     : (samples,)       float array
+    kinetic   : (energy samples,) float array  – every *energy_every* steps
+    potential : (energy samples,) float array
+
+Recording a sample writes one row in place, so the per-step cost does not
+grow with the length of the run.  Energy is sampled on its own (usually
+much sparser) schedule, since it is far more expensive than copying N
+positions.
+
+Given a *path*, ``positions`` is a ``np.memmap`` backed by
+``<path>/positions.npy``: the operating system pages it out to disk, so
+runs larger than RAM can be recorded, and ``TrajectoryRecorder.load``
+reopens the run later – ``05_pygame_visualization.py --replay <path>``
+plays it back without re-simulating.
+
+Learning Objectives:
+- Preallocate storage instead of growing lists inside a hot loop
+- Decouple cheap and expensive measurements (positions vs energy)
+- Use memory-mapped files for data sets larger than memory
+
+Requires: numpy
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+_DIR = os.path.dirname(os.path.abspath(__file__))
+if _DIR not in sys.path:
+    sys.path.insert(0, _DIR)
+
+from importlib.util import spec_from_file_location, module_from_spec as _mfs
+
+
+def _load(name):
+    path = os.path.join(_DIR, name)
+    spec = spec_from_file_location(name[:-3], path)
+    mod  = _mfs(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+_vm   = _load("01_vector_math.py")
+_body = _load("02_body.py")
+
+Vector2D = _vm.Vector2D
+Body     = _body.Body
+
+POSITIONS_FILE = "positions.npy"
+META_FILE      = "meta.npz"
+
+
+def _samples(num_steps, every):
+    """Number of steps in ``range(num_steps)`` divisible by *every*."""
+    return 0 if not every else -(-num_steps // every)
+
+
+# ── Recorder ──────────────────────────────────────────────────────────────────
+
+
+class TrajectoryRecorder:
+    """
+    Preallocated (optionally memory-mapped) record of a simulation run.
+
+    Args:
+        n_bodies     (int)  : Number of bodies
+        num_steps    (int)  : Steps the run will take (sizes the arrays)
+        record_every (int)  : Record positions every N steps
+        energy_every (int)  : Record energy every N steps (0 = never)
+        path         (str)  : Directory for a memory-mapped recording
+                              (None = keep everything in RAM)
+        dtype               : Position precision (float64 or float32)
+        names, masses, colors: Per-body metadata used for replay
+
+    Pass the recorder to ``simulate(..., recorder=rec)`` or
+    ``simulate_dim(..., recorder=rec)``, or call ``record`` /
+    ``record_bodies`` from your own loop.  Steps not due for a sample are
+    ignored, so the recorder can be called unconditionally every step.
+    """
+
+    def __init__(self, n_bodies, num_steps, record_every=1, energy_every=0,
+                 path=None, dtype=np.float64, names=None, masses=None,
+                 colors=None):
+        if record_every < 1:
+            raise ValueError("record_every must be >= 1")
+        if energy_every < 0:
+            raise ValueError("energy_every must be >= 0")
+        self.n_bodies     = n_bodies
+        self.record_every = record_every
+        self.energy_every = energy_every
+        self.path         = path
+
+        n_pos    = _samples(num_steps, record_every)
+        n_energy = _samples(num_steps, energy_every)
+        shape    = (n_pos, n_bodies, 2)
+        if path is None:
+            self.positions = np.zeros(shape, dtype=dtype)
+        else:
+            os.makedirs(path, exist_ok=True)
+            self.positions = np.lib.format.open_memmap(
+                os.path.join(path, POSITIONS_FILE), mode="w+",
+                dtype=dtype, shape=shape)
+        self.steps     = np.zeros(n_pos, dtype=np.int64)
+        self.times     = np.zeros(n_pos)
+        self.energy_steps = np.zeros(n_energy, dtype=np.int64)
+        self.kinetic   = np.zeros(n_energy)
+        self.potential = np.zeros(n_energy)
+        self.count        = 0
+        self.energy_count = 0
+
+        self.names  = list(names) if names is not None else [f"Body {i}" for i in range(n_bodies)]
+        self.masses = np.asarray(masses if masses is not None else np.ones(n_bodies), dtype=np.float64)
+        self.colors = np.asarray(colors if colors is not None else [(255, 255, 255)] * n_bodies,
+                                 dtype=np.uint8)
+
+    @classmethod
+    def for_bodies(cls, bodies, num_steps, record_every=1, energy_every=0,
+                   path=None, dtype=np.float64):
+        """Recorder sized for *bodies*, with their names, masses and colours."""
+        return cls(len(bodies), num_steps, record_every, energy_every, path,
+                   dtype=dtype,
+                   names=[b.name for b in bodies],
+                   masses=[b.mass for b in bodies],
+                   colors=[b.color for b in bodies])
+
+    # ── Recording ─────────────────────────────────────────────────────────────
+
+    def record(self, step, time_val, positions, energy=None):
+        """
+        Record *step* if a sample is due.
+
+        Args:
+            step      (int)     : Step index
+            time_val  (float)   : Simulation time at *step*
+            positions           : (N, 2) array-like of current positions
+            energy    (callable): Returns ``(kinetic, potential)``; called
+                                  only when an energy sample is due
+        """
+        if step % self.record_every == 0:
+            k = self.count
+            if k >= len(self.steps):
+                raise ValueError("TrajectoryRecorder is full "
+                                 f"({len(self.steps)} samples)")
+            self.positions[k] = positions
+            self.steps[k] = step
+            self.times[k] = time_val
+            self.count = k + 1
+        if energy is not None and self.energy_every and step % self.energy_every == 0:
+            k = self.energy_count
+            self.kinetic[k], self.potential[k] = energy()
+            self.energy_steps[k] = step
+            self.energy_count = k + 1
+
+    def record_bodies(self, step, time_val, bodies, energy=None):
+        """``record`` for a list of ``Body`` objects."""
+        if step % self.record_every == 0:
+            positions = [(b.position.x, b.position.y) for b in bodies]
+        else:
+            positions = None
+        self.record(step, time_val, positions, energy)
+
+    # ── Results ───────────────────────────────────────────────────────────────
+
+    def __len__(self):
+        return self.count
+
+    @property
+    def total_energy(self):
+        """Total energy of each energy sample recorded so far."""
+        n = self.energy_count
+        return self.kinetic[:n] + self.potential[:n]
+
+    def energy_drift(self):
+        """Maximum relative energy error max |E − E₀| / |E₀| (0 if unsampled)."""
+        energy = self.total_energy
+        if len(energy) == 0 or energy[0] == 0:
+            return 0.0
+        return float(np.max(np.abs(energy - energy[0])) / abs(energy[0]))
+
+    def position_vectors(self, index):
+        """Positions of sample *index* as a list of ``Vector2D``."""
+        return [Vector2D(x, y) for x, y in self.positions[index].tolist()]
+
+    def to_bodies(self, index, bodies, record_trail=True):
+        """
+        Move *bodies* to the positions of sample *index* (for replay).
+
+        When *record_trail* is set, each body's previous position is pushed
+        onto its trail, as ``Body.move`` does.
+        """
+        for body, (px, py) in zip(bodies, self.positions[index].tolist()):
+            if record_trail:
+                body.trail.append(body.position)
+            body.position = Vector2D(px, py)
+        return bodies
+
+    def make_bodies(self, index=0, max_trail=300):
+        """Fresh ``Body`` objects placed at sample *index*."""
+        return [
+            Body(name, mass=m, position=p, color=tuple(int(c) for c in color),
+                 max_trail=max_trail)
+            for name, m, color, p in zip(self.names, self.masses.tolist(),
+                                         self.colors.tolist(),
+                                         self.position_vectors(index))
+        ]
+
+    # ── Persistence ───────────────────────────────────────────────────────────
+
+    def flush(self):
+        """Write the memory-mapped positions and the metadata to *path*."""
+        if self.path is None:
+            raise ValueError("recorder has no path")
+        if isinstance(self.positions, np.memmap):
+            self.positions.flush()
+        np.savez(os.path.join(self.path, META_FILE),
+                 count=self.count, energy_count=self.energy_count,
+                 record_every=self.record_every,
+                 energy_every=self.energy_every,
+                 steps=self.steps, times=self.times,
+                 energy_steps=self.energy_steps,
+                 kinetic=self.kinetic, potential=self.potential,
+                 names=np.array(self.names, dtype=str),
+                 masses=self.masses, colors=self.colors)
+
+    close = flush
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """
+        Reopen a recording written with *path* (read-only).
+
+        With *mmap* set, positions stay on disk and are paged in on access.
+        """
+        rec = cls.__new__(cls)
+        with np.load(os.path.join(path, META_FILE)) as meta:
+            rec.count        = int(meta["count"])
+            rec.energy_count = int(meta["energy_count"])
+            rec.record_every = int(meta["record_every"])
+            rec.energy_every = int(meta["energy_every"])
+            for key in ("steps", "times", "energy_steps", "kinetic",
+                        "potential", "masses", "colors"):
+                setattr(rec, key, meta[key])
+            rec.names = meta["names"].tolist()
+        rec.positions = np.load(os.path.join(path, POSITIONS_FILE),
+                                mmap_mode="r" if mmap else None)
+        rec.n_bodies = rec.positions.shape[1]
+        rec.path     = path
+        return rec
+
+
+# ── Demo ──────────────────────────────────────────────────────────────────────
+
+
+def _demo():
+    """Record a long figure-8 run to disk and read it back."""
+    print("=" * 60)
+    print("TRAJECTORY RECORDER DEMO")
+    print("=" * 60)
+
+    _3body = _load("04_three_body_problem.py")
+    steps, dt = 200_000, 0.001
+
+    with tempfile.TemporaryDirectory() as tmp:
+        bodies = _3body.create_figure_eight(max_trail=0)
+        _3body.shift_to_com_frame(bodies)
+        rec = TrajectoryRecorder.for_bodies(bodies, steps, record_every=1,
+                                            energy_every=1000, path=tmp)
+        start = time.perf_counter()
+        _3body.simulate_dim(bodies, dt, steps, engine="soa", recorder=rec)
+        elapsed = time.perf_counter() - start
+        rec.close()
+        size_mb = os.path.getsize(os.path.join(tmp, POSITIONS_FILE)) / 1e6
+
+        print(f"\nFigure-8, {steps:,} steps (SoA engine): {elapsed:.1f} s "
+              f"({elapsed / steps * 1e6:.1f} µs / step)")
+        print(f"  {len(rec):,} position samples → {size_mb:.1f} MB memmap")
+        print(f"  {rec.energy_count:,} energy samples, "
+              f"max |ΔE/E₀| = {rec.energy_drift():.2e}")
+
+        replay = TrajectoryRecorder.load(tmp)
+        period = int(round(6.3259 / dt))
+        a = replay.positions[0]
+        b = replay.positions[period]
+        print(f"  Reloaded: {len(replay):,} samples; one period later the "
+              f"bodies are within {float(np.abs(a - b).max()):.1e} of the start")
+        del replay, rec
+
+    print("\n✓ Trajectory recorder demo complete")
+
+
+if __name__ == "__main__":
+    _demo()
@@ -7,6 +7,7 @@ Verifies:
   2. Body class (OOP, integration)
   3. Gravity simulation (forces, energy, two-body orbit)
   4. Three-body scenarios (figure-8, Lagrange, chaotic, Sun-Earth-Moon)
+  5. Structure-of-arrays N-body engine (NumPy)
 
 Run with:
     python test_all.py
@@ -190,9 +191,15 @@ def test_body():
     for _ in range(5):
         b6.move(dt=0.1)
     assert len(b6.trail) <= 3, "Trail exceeds max_trail"
+    assert [round(p.x, 9) for p in b6.trail] == [0.0, 0.0, 0.0]
+    b6.velocity = V(1.0, 0.0)
+    for _ in range(4):
+        b6.move(dt=1.0)
+    assert [p.x for p in b6.trail] == [1.0, 2.0, 3.0], "Ring buffer order wrong"
+    assert b6.trail[-1].x == 3.0 and b6.trail[0].x == 1.0, "Trail indexing wrong"
     b6.clear_trail()
     assert len(b6.trail) == 0, "clear_trail failed"
-    print("✓ Trail buffer (max_trail enforced, clear_trail)")
+    print("✓ Trail ring buffer (max_trail enforced, oldest first, clear_trail)")
 
     # Distance
     ba = Body("A", mass=1.0, position=V(0, 0))
@@ -376,6 +383,242 @@ def test_three_body_problem():
     return True
 
 
+# ── Test 5: Structure-of-arrays engine ───────────────────────────────────────
+
+
+def test_soa_engine():
+    """Test the NumPy SoA engine against the Body-based reference."""
+    print("\n" + "=" * 70)
+    print("TEST 5: Structure-of-Arrays N-Body Engine")
+    print("=" * 70)
+
+    try:
+        import numpy as np
+    except ImportError:
+        print("- numpy not installed, skipping")
+        return True
+
+    nb   = load_module("06_nbody_engine.py")
+    gsim = load_module("03_gravity_simulation.py")
+    tb   = load_module("04_three_body_problem.py")
+    vm   = load_module("01_vector_math.py")
+    V    = vm.Vector2D
+
+    # Accelerations match net_force_on / m for a random SI system
+    rng = np.random.default_rng(1)
+    bodies = [gsim.Body(f"B{i}", mass=float(m), position=V(*map(float, p)),
+                        velocity=V(*map(float, v)))
+              for i, (m, p, v) in enumerate(zip(rng.uniform(1e22, 1e26, 20),
+                                                 rng.uniform(-1e11, 1e11, (20, 2)),
+                                                 rng.uniform(-3e4, 3e4, (20, 2))))]
+    system = nb.NBodySystem.from_bodies(bodies, gsim.G, softening=1e6)
+    acc = system.accelerations()
+    for b, (ax, ay) in zip(bodies, acc):
+        ref = gsim.net_force_on(b, bodies, softening=1e6) / b.mass
+        assert _close(ax, ref.x, 1e-9) and _close(ay, ref.y, 1e-9), "acceleration mismatch"
+    print("✓ direct_accelerations matches net_force_on / m")
+
+    assert _close(system.kinetic_energy(), gsim.kinetic_energy(bodies), 1e-12)
+    assert _close(system.potential_energy(), gsim.potential_energy(bodies), 1e-12)
+    print("✓ Kinetic / potential energy match module 03")
+
+    # simulate(engine='soa') reproduces the Body engine, both integrators
+    for integrator in ("leapfrog", "euler"):
+        ref_bodies = gsim.create_sun_earth_system()
+        soa_bodies = gsim.create_sun_earth_system()
+        ref = gsim.simulate(ref_bodies, 3600.0, 200, integrator=integrator, record_every=50)
+        soa = gsim.simulate(soa_bodies, 3600.0, 200, integrator=integrator, record_every=50,
+                            engine="soa")
+        assert len(ref) == len(soa) == 4
+        for a, b in zip(ref, soa):
+            assert _close(a['total_energy'], b['total_energy'], 1e-9)
+        for a, b in zip(ref_bodies, soa_bodies):
+            assert _close(a.position.x, b.position.x, 1e-9)
+            assert _close(a.position.y, b.position.y, 1e-9)
+            assert _close(a.velocity.y, b.velocity.y, 1e-9)
+    print("✓ simulate(engine='soa') matches the Body engine (leapfrog & euler)")
+
+    ref_bodies = tb.create_figure_eight()
+    soa_bodies = tb.create_figure_eight()
+    tb.simulate_dim(ref_bodies, 0.001, 1000, record_every=1001)
+    tb.simulate_dim(soa_bodies, 0.001, 1000, record_every=1001, engine="soa")
+    for a, b in zip(ref_bodies, soa_bodies):
+        assert a.position.distance_to(b.position) < 1e-12, "figure-8 diverged"
+    assert len(soa_bodies[0].trail) == 1, "to_bodies should record one trail point"
+    print("✓ simulate_dim(engine='soa') matches leapfrog_step_dim")
+
+    # Large cluster: float32 kernel agrees with float64 to single precision
+    cluster = nb.create_random_cluster(500, seed=2)
+    a64 = nb.direct_accelerations(cluster.positions, cluster.masses, 1.0, 0.01)
+    a32 = nb.direct_accelerations(cluster.positions, cluster.masses, 1.0, 0.01,
+                                  dtype=np.float32)
+    assert np.allclose(a64, a32, rtol=1e-3, atol=1e-3 * np.abs(a64).max())
+    print("✓ float32 kernel agrees with float64")
+
+    print("✓ All SoA engine tests passed!")
+    return True
+
+
+def test_barnes_hut():
+    """Test the Barnes–Hut solver against the exact direct sum."""
+    print("\n" + "=" * 70)
+    print("TEST 6: Barnes–Hut Quadtree Solver")
+    print("=" * 70)
+
+    try:
+        import numpy as np
+    except ImportError:
+        print("- numpy not installed, skipping")
+        return True
+
+    bh   = load_module("07_barnes_hut.py")
+    gsim = load_module("03_gravity_simulation.py")
+    tb   = load_module("04_three_body_problem.py")
+
+    cluster = bh.create_random_cluster(2000, seed=3)
+    pos, m = cluster.positions, cluster.masses
+    exact = bh.direct_accelerations(pos, m, 1.0, 0.01)
+
+    # θ = 0 never approximates a cell: identical to the direct sum
+    a0 = bh.barnes_hut_accelerations(pos, m, 1.0, 0.01, theta=0.0)
+    assert np.allclose(a0, exact, rtol=1e-9, atol=1e-12 * np.abs(exact).max())
+    print("✓ θ = 0 reproduces the direct sum")
+
+    # Error grows with θ and stays small at the default
+    errors = []
+    for theta in (0.3, 0.5, 0.8):
+        a = bh.barnes_hut_accelerations(pos, m, 1.0, 0.01, theta=theta)
+        err = np.linalg.norm(a - exact, axis=1) / np.linalg.norm(exact, axis=1)
+        errors.append(float(np.median(err)))
+    assert errors[0] < errors[1] < errors[2], f"error not monotonic in θ: {errors}"
+    assert errors[1] < 0.05, f"θ=0.5 median error {errors[1]:.3f}"
+    print(f"✓ Median force error θ=0.3/0.5/0.8: "
+          f"{errors[0]:.1e} / {errors[1]:.1e} / {errors[2]:.1e}")
+
+    # Tree invariants: root holds all mass, leaves partition the bodies
+    tree = bh.QuadTree(pos, m, leaf_size=8)
+    assert _close(float(tree.mass[0]), float(m.sum()), 1e-12)
+    leaves = tree.child_count == 0
+    assert int((tree.end - tree.start)[leaves].sum()) == len(m)
+    assert sorted(tree.order.tolist()) == list(range(len(m)))
+    print("✓ Quadtree root carries the total mass; leaves partition the bodies")
+
+    # Plugged into the Body-based integrators (θ = 0 is exact)
+    ref_bodies = tb.create_sun_earth_moon()
+    bh_bodies  = tb.create_sun_earth_moon()
+    for _ in range(50):
+        gsim.leapfrog_step(ref_bodies, 3600.0)
+        gsim.leapfrog_step(bh_bodies, 3600.0, solver="barnes-hut", theta=0.0)
+    for a, b in zip(ref_bodies, bh_bodies):
+        assert a.position.distance_to(b.position) <= 1e-9 * a.position.magnitude() + 1.0
+    print("✓ leapfrog_step(solver='barnes-hut') matches the direct solver")
+
+    ref_bodies = tb.create_figure_eight()
+    bh_bodies  = tb.create_figure_eight()
+    tb.simulate_dim(ref_bodies, 0.001, 200, record_every=201)
+    tb.simulate_dim(bh_bodies, 0.001, 200, record_every=201, solver="barnes-hut", theta=0.0)
+    for a, b in zip(ref_bodies, bh_bodies):
+        assert a.position.distance_to(b.position) < 1e-12
+    soa_bodies = tb.create_figure_eight()
+    tb.simulate_dim(soa_bodies, 0.001, 200, record_every=201, engine="soa",
+                    solver="barnes-hut", theta=0.0)
+    for a, b in zip(ref_bodies, soa_bodies):
+        assert a.position.distance_to(b.position) < 1e-12
+    print("✓ simulate_dim(solver='barnes-hut') matches, both engines")
+
+    try:
+        gsim.leapfrog_step(ref_bodies, 1.0, solver="octree")
+        raise AssertionError("unknown solver should raise")
+    except ValueError:
+        pass
+    print("✓ Unknown solver rejected")
+
+    # Energy drift report
+    rows = bh.energy_drift_report(n=200, steps=20, thetas=(0.5,))
+    assert [r["solver"] for r in rows] == ["direct", "barnes-hut"]
+    assert rows[0]["force_error"] == 0.0
+    assert abs(rows[1]["energy_drift"] - rows[0]["energy_drift"]) < 0.01
+    print("✓ energy_drift_report compares against the exact solver")
+
+    print("✓ All Barnes–Hut tests passed!")
+    return True
+
+
+def test_trajectory_recorder():
+    """Test the preallocated / memory-mapped trajectory recorder."""
+    print("\n" + "=" * 70)
+    print("TEST 7: Trajectory Recorder")
+    print("=" * 70)
+
+    try:
+        import numpy as np
+    except ImportError:
+        print("- numpy not installed, skipping")
+        return True
+    import tempfile
+
+    tr   = load_module("08_trajectory_recorder.py")
+    gsim = load_module("03_gravity_simulation.py")
+    tb   = load_module("04_three_body_problem.py")
+
+    # Positions match the snapshot history; energy on its own schedule
+    ref_bodies = gsim.create_sun_earth_system()
+    rec_bodies = gsim.create_sun_earth_system()
+    history = gsim.simulate(ref_bodies, 3600.0, 100, record_every=10)
+    rec = tr.TrajectoryRecorder.for_bodies(rec_bodies, 100, record_every=10,
+                                           energy_every=25)
+    assert gsim.simulate(rec_bodies, 3600.0, 100, recorder=rec) is rec
+    assert rec.positions.shape == (10, 2, 2) and len(rec) == 10
+    for k, snap in enumerate(history):
+        assert rec.steps[k] == snap['step'] and rec.times[k] == snap['time']
+        for (x, y), p in zip(rec.positions[k].tolist(), snap['positions']):
+            assert x == p.x and y == p.y
+    assert rec.energy_steps.tolist() == [0, 25, 50, 75]
+    assert _close(float(rec.total_energy[0]), history[0]['total_energy'], 1e-12)
+    assert rec.energy_drift() < 1e-6
+    print("✓ simulate(recorder=...) matches the snapshot history")
+
+    # Both engines of simulate_dim; a full recorder refuses more samples
+    for engine in ("python", "soa"):
+        bodies = tb.create_figure_eight()
+        rec = tr.TrajectoryRecorder.for_bodies(bodies, 500, record_every=1,
+                                               energy_every=100)
+        tb.simulate_dim(bodies, 0.001, 500, engine=engine, recorder=rec)
+        assert len(rec) == 500 and rec.energy_count == 5
+        assert rec.energy_drift() < 1e-6, f"{engine}: energy drift"
+        last = rec.positions[-1].tolist()
+    try:
+        rec.record(500, 0.5, last)
+        raise AssertionError("full recorder should raise")
+    except ValueError:
+        pass
+    print("✓ simulate_dim(recorder=...) with both engines; energy is conserved")
+
+    # Memory-mapped recording round-trips through load()
+    with tempfile.TemporaryDirectory() as tmp:
+        bodies = tb.create_figure_eight()
+        rec = tr.TrajectoryRecorder.for_bodies(bodies, 300, record_every=3,
+                                               energy_every=50, path=tmp,
+                                               dtype=np.float32)
+        tb.simulate_dim(bodies, 0.001, 300, recorder=rec)
+        rec.close()
+        assert isinstance(rec.positions, np.memmap)
+        replay = tr.TrajectoryRecorder.load(tmp)
+        assert len(replay) == 100 and replay.names == rec.names
+        assert np.array_equal(replay.positions, rec.positions)
+        assert np.array_equal(replay.total_energy, rec.total_energy)
+        replay_bodies = replay.make_bodies(0, max_trail=10)
+        replay.to_bodies(99, replay_bodies)
+        for a, b in zip(replay_bodies, bodies):
+            assert a.position.distance_to(b.position) < 1e-2
+        assert len(replay_bodies[0].trail) == 1
+        del replay, rec
+    print("✓ Memory-mapped recording reloads for replay")
+
+    print("✓ All trajectory recorder tests passed!")
+    return True
+
+
 # ── Main ──────────────────────────────────────────────────────────────────────
 
 
@@ -390,6 +633,9 @@ def main():
         ("Body Class",           test_body),
         ("Gravity Simulation",   test_gravity_simulation),
         ("Three-Body Problem",   test_three_body_problem),
+        ("SoA N-Body Engine",    test_soa_engine),
+        ("Barnes–Hut Solver",    test_barnes_hut),
+        ("Trajectory Recorder",  test_trajectory_recorder),
     ]
 
     results = []
@@ -31,10 +31,14 @@ giving the house an edge of approximately 1.41%.
 import random
 
 
-def roll_two_dice():
+def roll_two_dice(rng=random):
     """
     Roll two standard six-sided dice and return their sum.
     
+    Args:
+        rng: Random number source (default: the global random module;
+             pass a random.Random instance for an independent stream)
+    
     Returns:
         Sum of two dice (2-12)
     
@@ -43,13 +47,16 @@ def roll_two_dice():
         >>> roll_two_dice()
         7
     """
-    return random.randint(1, 6) + random.randint(1, 6)
+    return rng.randint(1, 6) + rng.randint(1, 6)
 
 
-def play_craps_once():
+def play_craps_once(rng=random):
     """
     Play one complete game of Craps.
     
+    Args:
+        rng: Random number source (default: the global random module)
+    
     Returns:
         Dictionary containing:
         - outcome: 'win' or 'lose'
@@ -67,7 +74,7 @@ def play_craps_once():
     rolls = []
     
     # Come-out roll
-    come_out = roll_two_dice()
+    come_out = roll_two_dice(rng)
     rolls.append(come_out)
     
     # Check for immediate win
@@ -95,7 +102,7 @@ def play_craps_once():
     
     # Point phase: Keep rolling until we hit point or 7
     while True:
-        current_roll = roll_two_dice()
+        current_roll = roll_two_dice(rng)
         rolls.append(current_roll)
         
         if current_roll == point:
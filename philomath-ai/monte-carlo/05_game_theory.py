@@ -95,7 +95,8 @@ def kelly_criterion(win_prob, win_amount, loss_amount):
     return max(0, kelly_fraction)
 
 
-def simulate_flat_betting(initial_bankroll, bet_size, n_games, win_prob):
+def simulate_flat_betting(initial_bankroll, bet_size, n_games, win_prob,
+                          rng=random, record_history=True):
     """
     Simulate flat betting strategy (same bet every time).
     
@@ -104,12 +105,14 @@ def simulate_flat_betting(initial_bankroll, bet_size, n_games, win_prob):
         bet_size: Fixed bet amount
         n_games: Number of games to play
         win_prob: Probability of winning each game
+        rng: Random number source (default: the global random module)
+        record_history: Keep the bankroll after every game in 'history'
     
     Returns:
         Dictionary with simulation results
     """
     bankroll = initial_bankroll
-    history = [bankroll]
+    history = [bankroll] if record_history else None
     wins = 0
     losses = 0
     
@@ -117,21 +120,22 @@ def simulate_flat_betting(initial_bankroll, bet_size, n_games, win_prob):
         if bankroll < bet_size:
             break  # Bankrupt
         
-        if random.random() < win_prob:
+        if rng.random() < win_prob:
             bankroll += bet_size
             wins += 1
         else:
             bankroll -= bet_size
             losses += 1
         
-        history.append(bankroll)
+        if record_history:
+            history.append(bankroll)
     
     return {
         'strategy': 'Flat Betting',
         'initial_bankroll': initial_bankroll,
         'final_bankroll': bankroll,
         'profit': bankroll - initial_bankroll,
-        'games_played': len(history) - 1,
+        'games_played': wins + losses,
         'wins': wins,
         'losses': losses,
         'bankrupted': bankroll <= 0,
@@ -140,7 +144,8 @@ def simulate_flat_betting(initial_bankroll, bet_size, n_games, win_prob):
 
 
 def simulate_kelly_betting(initial_bankroll, win_prob, win_amount, loss_amount, 
-                          n_games, kelly_fraction=1.0):
+                          n_games, kelly_fraction=1.0, rng=random,
+                          record_history=True):
     """
     Simulate Kelly Criterion betting strategy.
     
@@ -151,6 +156,8 @@ def simulate_kelly_betting(initial_bankroll, win_prob, win_amount, loss_amount,
         loss_amount: Amount lost per unit bet
         n_games: Number of games to play
         kelly_fraction: Fraction of Kelly bet to use (1.0 = full Kelly)
+        rng: Random number source (default: the global random module)
+        record_history: Keep the bankroll after every game in 'history'
     
     Returns:
         Dictionary with simulation results
@@ -159,7 +166,7 @@ def simulate_kelly_betting(initial_bankroll, win_prob, win_amount, loss_amount,
     bet_fraction = optimal_fraction * kelly_fraction
     
     bankroll = initial_bankroll
-    history = [bankroll]
+    history = [bankroll] if record_history else None
     wins = 0
     losses = 0
     
@@ -169,21 +176,22 @@ def simulate_kelly_betting(initial_bankroll, win_prob, win_amount, loss_amount,
         
         bet_size = bankroll * bet_fraction
         
-        if random.random() < win_prob:
+        if rng.random() < win_prob:
             bankroll += bet_size * win_amount
             wins += 1
         else:
             bankroll -= bet_size * loss_amount
             losses += 1
         
-        history.append(bankroll)
+        if record_history:
+            history.append(bankroll)
     
     return {
         'strategy': f'Kelly ({kelly_fraction*100:.0f}%)',
         'initial_bankroll': initial_bankroll,
         'final_bankroll': bankroll,
         'profit': bankroll - initial_bankroll,
-        'games_played': len(history) - 1,
+        'games_played': wins + losses,
         'wins': wins,
         'losses': losses,
         'bankrupted': bankroll <= 0,
@@ -193,7 +201,8 @@ def simulate_kelly_betting(initial_bankroll, win_prob, win_amount, loss_amount,
     }
 
 
-def simulate_martingale(initial_bankroll, base_bet, n_games, win_prob):
+def simulate_martingale(initial_bankroll, base_bet, n_games, win_prob,
+                        rng=random, record_history=True):
     """
     Simulate Martingale betting system (double bet after each loss).
     
@@ -204,12 +213,14 @@ def simulate_martingale(initial_bankroll, base_bet, n_games, win_prob):
         base_bet: Initial bet size
         n_games: Number of games to play
         win_prob: Probability of winning each game
+        rng: Random number source (default: the global random module)
+        record_history: Keep the bankroll after every game in 'history'
     
     Returns:
         Dictionary with simulation results
     """
     bankroll = initial_bankroll
-    history = [bankroll]
+    history = [bankroll] if record_history else None
     current_bet = base_bet
     wins = 0
     losses = 0
@@ -218,7 +229,7 @@ def simulate_martingale(initial_bankroll, base_bet, n_games, win_prob):
         if bankroll < current_bet:
             break  # Can't afford next bet
         
-        if random.random() < win_prob:
+        if rng.random() < win_prob:
             bankroll += current_bet
             wins += 1
             current_bet = base_bet  # Reset to base bet
@@ -227,14 +238,15 @@ def simulate_martingale(initial_bankroll, base_bet, n_games, win_prob):
             losses += 1
             current_bet *= 2  # Double the bet
         
-        history.append(bankroll)
+        if record_history:
+            history.append(bankroll)
     
     return {
         'strategy': 'Martingale',
         'initial_bankroll': initial_bankroll,
         'final_bankroll': bankroll,
         'profit': bankroll - initial_bankroll,
-        'games_played': len(history) - 1,
+        'games_played': wins + losses,
         'wins': wins,
         'losses': losses,
         'bankrupted': bankroll <= 0,
@@ -289,10 +301,53 @@ def calculate_risk_of_ruin(initial_bankroll, bet_size, win_prob, target_bankroll
             return numerator / denominator
 
 
+def betting_strategies(initial_bankroll, win_prob):
+    """
+    The strategies compared by compare_betting_strategies().
+    
+    Args:
+        initial_bankroll: Starting bankroll
+        win_prob: Probability of winning
+    
+    Returns:
+        List of (name, play) pairs; play(n_games, **kwargs) runs one
+        simulation (kwargs such as rng / record_history are passed on)
+    """
+    strategies = [
+        # Flat betting (5% of bankroll)
+        ('Flat Betting (5%)',
+         lambda n_games, **kw: simulate_flat_betting(
+             initial_bankroll, initial_bankroll * 0.05, n_games, win_prob, **kw)),
+    ]
+    
+    # Kelly betting (even money) only makes sense with an edge
+    if win_prob > 0.5:
+        strategies.append(
+            ('Full Kelly',
+             lambda n_games, **kw: simulate_kelly_betting(
+                 initial_bankroll, win_prob, 1, 1, n_games, **kw)))
+        # Half Kelly (more conservative)
+        strategies.append(
+            ('Half Kelly',
+             lambda n_games, **kw: simulate_kelly_betting(
+                 initial_bankroll, win_prob, 1, 1, n_games, kelly_fraction=0.5, **kw)))
+    
+    # Martingale (DANGEROUS!)
+    strategies.append(
+        ('Martingale (1% base)',
+         lambda n_games, **kw: simulate_martingale(
+             initial_bankroll, initial_bankroll * 0.01, n_games, win_prob, **kw)))
+    
+    return strategies
+
+
 def compare_betting_strategies(initial_bankroll, n_games, win_prob, n_simulations=1000):
     """
     Compare different betting strategies over multiple simulations.
     
+    For millions of games, see parallel_compare_betting_strategies() in
+    06_parallel_runner.py.
+    
     Args:
         initial_bankroll: Starting bankroll
         n_games: Number of games per simulation
@@ -304,65 +359,19 @@ def compare_betting_strategies(initial_bankroll, n_games, win_prob, n_simulation
     """
     strategies = []
     
-    # Flat betting (5% of bankroll)
-    flat_results = []
-    for _ in range(n_simulations):
-        result = simulate_flat_betting(initial_bankroll, initial_bankroll * 0.05, 
-                                      n_games, win_prob)
-        flat_results.append(result['final_bankroll'])
-    
-    strategies.append({
-        'name': 'Flat Betting (5%)',
-        'final_bankrolls': flat_results,
-        'avg_final': sum(flat_results) / len(flat_results),
-        'bankruptcy_rate': sum(1 for x in flat_results if x <= 0) / len(flat_results),
-        'median': sorted(flat_results)[len(flat_results) // 2]
-    })
-    
-    # Kelly betting (assuming 55% win rate, even money)
-    if win_prob > 0.5:
-        kelly_results = []
+    for name, play in betting_strategies(initial_bankroll, win_prob):
+        final_bankrolls = []
         for _ in range(n_simulations):
-            result = simulate_kelly_betting(initial_bankroll, win_prob, 1, 1, n_games)
-            kelly_results.append(result['final_bankroll'])
+            result = play(n_games, record_history=False)
+            final_bankrolls.append(result['final_bankroll'])
         
         strategies.append({
-            'name': 'Full Kelly',
-            'final_bankrolls': kelly_results,
-            'avg_final': sum(kelly_results) / len(kelly_results),
-            'bankruptcy_rate': sum(1 for x in kelly_results if x <= 0) / len(kelly_results),
-            'median': sorted(kelly_results)[len(kelly_results) // 2]
+            'name': name,
+            'final_bankrolls': final_bankrolls,
+            'avg_final': sum(final_bankrolls) / len(final_bankrolls),
+            'bankruptcy_rate': sum(1 for x in final_bankrolls if x <= 0) / len(final_bankrolls),
+            'median': sorted(final_bankrolls)[len(final_bankrolls) // 2]
         })
-        
-        # Half Kelly (more conservative)
-        half_kelly_results = []
-        for _ in range(n_simulations):
-            result = simulate_kelly_betting(initial_bankroll, win_prob, 1, 1, 
-                                           n_games, kelly_fraction=0.5)
-            half_kelly_results.append(result['final_bankroll'])
-        
-        strategies.append({
-            'name': 'Half Kelly',
-            'final_bankrolls': half_kelly_results,
-            'avg_final': sum(half_kelly_results) / len(half_kelly_results),
-            'bankruptcy_rate': sum(1 for x in half_kelly_results if x <= 0) / len(half_kelly_results),
-            'median': sorted(half_kelly_results)[len(half_kelly_results) // 2]
-        })
-    
-    # Martingale (DANGEROUS!)
-    martingale_results = []
-    for _ in range(n_simulations):
-        result = simulate_martingale(initial_bankroll, initial_bankroll * 0.01, 
-                                     n_games, win_prob)
-        martingale_results.append(result['final_bankroll'])
-    
-    strategies.append({
-        'name': 'Martingale (1% base)',
-        'final_bankrolls': martingale_results,
-        'avg_final': sum(martingale_results) / len(martingale_results),
-        'bankruptcy_rate': sum(1 for x in martingale_results if x <= 0) / len(martingale_results),
-        'median': sorted(martingale_results)[len(martingale_results) // 2]
-    })
     
     return strategies
 
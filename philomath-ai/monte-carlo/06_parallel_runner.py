@@ -0,0 +1,467 @@
+"""
+Parallel, Reproducible Experiment Runner
+========================================
+
+The simulations in modules 03-05 play one game at a time with the global
+``random`` module on a single core.  That is perfect for learning, but ten
+million games take minutes, and the results depend on everything else that
+touched the global generator.
+
+This module runs Monte Carlo experiments the way larger studies do:
+
+1. **Chunks**: the N trials are split into fixed-size chunks.
+2. **Independent streams**: ``numpy.random.SeedSequence(seed).spawn()``
+   gives every chunk its own statistically independent random stream, so
+   no two chunks ever share random numbers.
+3. **Process pool**: chunks are spread across worker processes.
+4. **Online statistics**: each chunk returns a small ``Tally`` – counters,
+   running mean/variance (Welford's algorithm) and histograms – instead of
+   every raw sample.  Tallies are merged in chunk order.
+
+Because the chunking and the streams depend only on the seed and the
+chunk size – never on the number of workers – the same seed gives exactly
+the same results with 1 worker or 64.
+
+Learning Objectives:
+- Compute mean and variance in one pass (Welford) and merge partial results
+- Give parallel workers independent, reproducible random streams
+- Keep results independent of how the work is scheduled
+
+Requires: numpy (for SeedSequence)
+"""
+
+import math
+import multiprocessing
+import os
+import random
+import sys
+import time
+import importlib.util
+
+import numpy as np
+
+# Pool workers import this module by its file name, so its folder must be
+# on sys.path; spawned children start with a copy of the parent's.
+_DIR = os.path.dirname(os.path.abspath(__file__))
+if _DIR not in sys.path:
+    sys.path.append(_DIR)
+
+
+def _load(filename):
+    """Load a sibling module with a numeric prefix."""
+    path = os.path.join(_DIR, filename)
+    spec = importlib.util.spec_from_file_location(filename[:-3], path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+craps = _load('03_craps_simulation.py')
+stats = _load('04_advanced_statistics.py')
+game_theory = _load('05_game_theory.py')
+
+
+# ---------------------------------------------------------------------------
+# Online statistics
+# ---------------------------------------------------------------------------
+
+class RunningStats:
+    """
+    Count, mean, variance, min and max of a stream, in O(1) memory.
+
+    Uses Welford's update for each new value and Chan et al.'s formula to
+    merge two partial results, so batches computed separately combine into
+    the statistics of the whole stream.
+
+    Example:
+        >>> a, b = RunningStats(), RunningStats()
+        >>> for x in [1, 2, 3]:
+        ...     a.add(x)
+        >>> for x in [4, 5]:
+        ...     b.add(x)
+        >>> a.merge(b)
+        >>> a.mean, a.variance
+        (3.0, 2.0)
+    """
+
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0          # sum of squared deviations from the mean
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, x):
+        """Add one value."""
+        self.n += 1
+        delta = x - self.mean
+        self.mean += delta / self.n
+        self.m2 += delta * (x - self.mean)
+        if x < self.min:
+            self.min = x
+        if x > self.max:
+            self.max = x
+
+    def merge(self, other):
+        """Fold another RunningStats into this one."""
+        if other.n == 0:
+            return
+        if self.n == 0:
+            self.n, self.mean, self.m2 = other.n, other.mean, other.m2
+            self.min, self.max = other.min, other.max
+            return
+        n = self.n + other.n
+        delta = other.mean - self.mean
+        self.mean += delta * other.n / n
+        self.m2 += other.m2 + delta * delta * self.n * other.n / n
+        self.n = n
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    @property
+    def variance(self):
+        """Population variance (as calculate_variance_and_std in module 04)."""
+        return self.m2 / self.n if self.n else 0.0
+
+    @property
+    def sample_variance(self):
+        """Sample variance (divides by n - 1)."""
+        return self.m2 / (self.n - 1) if self.n > 1 else 0.0
+
+    @property
+    def std_dev(self):
+        return math.sqrt(self.variance)
+
+    def to_dict(self):
+        """Same keys as calculate_variance_and_std() in module 04."""
+        return {
+            'mean': self.mean,
+            'variance': self.variance,
+            'std_dev': self.std_dev,
+            'min': self.min,
+            'max': self.max,
+            'range': self.max - self.min,
+            'n': self.n
+        }
+
+
+class Histogram:
+    """
+    Counts of values in bins of a fixed width (bin k holds
+    [k * width, (k + 1) * width)).  Only occupied bins are stored.
+
+    Example:
+        >>> h = Histogram(width=10)
+        >>> for x in [1, 5, 12, 18, 19, 35]:
+        ...     h.add(x)
+        >>> h.counts
+        {0: 2, 1: 3, 3: 1}
+        >>> h.quantile(0.5)
+        15.0
+    """
+
+    def __init__(self, width=1.0):
+        self.width = width
+        self.counts = {}
+        self.total = 0
+
+    def add(self, x):
+        k = math.floor(x / self.width)
+        self.counts[k] = self.counts.get(k, 0) + 1
+        self.total += 1
+
+    def merge(self, other):
+        if other.width != self.width:
+            raise ValueError("cannot merge histograms with different bin widths")
+        for k, c in other.counts.items():
+            self.counts[k] = self.counts.get(k, 0) + c
+        self.total += other.total
+
+    def quantile(self, q):
+        """Approximate q-quantile (linear interpolation inside the bin)."""
+        if self.total == 0:
+            return math.nan
+        target = q * self.total
+        seen = 0
+        for k in sorted(self.counts):
+            c = self.counts[k]
+            if seen + c >= target:
+                return (k + (target - seen) / c) * self.width
+            seen += c
+        return (max(self.counts) + 1) * self.width
+
+    def to_dict(self):
+        """{bin start: count}, in order."""
+        return {k * self.width: self.counts[k] for k in sorted(self.counts)}
+
+
+class Tally:
+    """
+    Named results of a batch of trials: counters, running statistics and
+    histograms.  Tallies from different batches merge into one.
+    """
+
+    def __init__(self):
+        self.counts = {}
+        self.stats = {}
+        self.histograms = {}
+
+    def count(self, name, n=1):
+        """Increase counter *name* by *n*."""
+        self.counts[name] = self.counts.get(name, 0) + n
+
+    def observe(self, name, x, bin_width=None):
+        """Record value *x* of *name*; also histogram it if bin_width is set."""
+        running = self.stats.get(name)
+        if running is None:
+            running = self.stats[name] = RunningStats()
+        running.add(x)
+        if bin_width is not None:
+            hist = self.histograms.get(name)
+            if hist is None:
+                hist = self.histograms[name] = Histogram(bin_width)
+            hist.add(x)
+
+    def merge(self, other):
+        """Fold another Tally into this one."""
+        for name, n in other.counts.items():
+            self.count(name, n)
+        for name, running in other.stats.items():
+            self.stats.setdefault(name, RunningStats()).merge(running)
+        for name, hist in other.histograms.items():
+            if name in self.histograms:
+                self.histograms[name].merge(hist)
+            else:
+                self.histograms[name] = mine = Histogram(hist.width)
+                mine.merge(hist)
+
+
+# ---------------------------------------------------------------------------
+# Runner
+# ---------------------------------------------------------------------------
+
+def chunk_sizes(n_trials, chunk_size):
+    """Split n_trials into chunks of chunk_size (the last may be smaller)."""
+    full, rest = divmod(n_trials, chunk_size)
+    return [chunk_size] * full + ([rest] if rest else [])
+
+
+def _run_chunk(task):
+    trial_fn, seed_seq, n, args = task
+    state = seed_seq.generate_state(8)       # 256 bits of seed material
+    rng = random.Random(int.from_bytes(state.tobytes(), 'little'))
+    return trial_fn(rng, n, *args)
+
+
+def _by_name(function):
+    """
+    The copy of one of this module's functions that a pool worker finds.
+
+    Workers look functions up as module name + function name.  However
+    this file was loaded, importing it under its file name yields a module
+    every worker can import too.
+    """
+    if getattr(function, '__module__', None) != __name__:
+        return function
+    module = importlib.import_module(os.path.splitext(os.path.basename(__file__))[0])
+    return getattr(module, function.__name__)
+
+
+def run_experiment(trial_fn, n_trials, seed=0, workers=None, chunk_size=10_000,
+                   args=()):
+    """
+    Run trial_fn over n_trials trials in parallel and merge the tallies.
+
+    Args:
+        trial_fn: Module-level function trial_fn(rng, n, *args) -> Tally
+            that runs n trials drawing only from rng (a random.Random)
+        n_trials: Total number of trials
+        seed: Root seed (int or SeedSequence); the same seed and
+            chunk_size give identical results for any number of workers
+        workers: Number of processes (default: os.cpu_count(); 1 = no pool)
+        chunk_size: Trials per chunk (one independent stream per chunk)
+        args: Extra arguments passed to trial_fn
+
+    Returns:
+        Tally: merged results of all chunks
+    """
+    sizes = chunk_sizes(n_trials, chunk_size)
+    root = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+    streams = root.spawn(len(sizes))
+    tasks = [(trial_fn, stream, n, tuple(args)) for stream, n in zip(streams, sizes)]
+    workers = workers or os.cpu_count() or 1
+
+    total = Tally()
+    if workers == 1 or len(tasks) <= 1:
+        for task in tasks:
+            total.merge(_run_chunk(task))
+        return total
+
+    trial_fn = _by_name(trial_fn)
+    tasks = [(trial_fn,) + task[1:] for task in tasks]
+    with multiprocessing.Pool(min(workers, len(tasks))) as pool:
+        # imap keeps chunk order, so floating-point merges are identical
+        # no matter which worker finished first
+        for tally in pool.imap(_by_name(_run_chunk), tasks):
+            total.merge(tally)
+    return total
+
+
+# ---------------------------------------------------------------------------
+# Trial functions (module level so the pool can pickle them)
+# ---------------------------------------------------------------------------
+
+def craps_trials(rng, n):
+    """Play n games of Craps; tally wins and rolls per game."""
+    tally = Tally()
+    wins = 0
+    for _ in range(n):
+        result = craps.play_craps_once(rng)
+        if result['outcome'] == 'win':
+            wins += 1
+        tally.observe('rolls', result['n_rolls'], bin_width=1)
+    tally.count('games', n)
+    tally.count('wins', wins)
+    return tally
+
+
+def betting_trials(rng, n, strategy_index, initial_bankroll, n_games, win_prob):
+    """Run n simulations of one betting strategy; tally final bankrolls."""
+    name, play = game_theory.betting_strategies(initial_bankroll, win_prob)[strategy_index]
+    tally = Tally()
+    bin_width = initial_bankroll / 100
+    for _ in range(n):
+        result = play(n_games, rng=rng, record_history=False)
+        final = result['final_bankroll']
+        tally.observe('final_bankroll', final, bin_width=bin_width)
+        tally.count('games', result['games_played'])
+        if final <= 0:
+            tally.count('bankrupt')
+    return tally
+
+
+# ---------------------------------------------------------------------------
+# Parallel counterparts of modules 03-05
+# ---------------------------------------------------------------------------
+
+def parallel_craps_games(n_games, seed=0, workers=None, chunk_size=10_000):
+    """
+    Parallel simulate_craps_games() (module 03), without 'all_results'.
+
+    Returns:
+        Dictionary with n_games, wins, losses, win_rate, house_edge,
+        avg_rolls_per_game, rolls_per_game_stats and rolls_histogram
+    """
+    tally = run_experiment(craps_trials, n_games, seed, workers, chunk_size)
+    wins = tally.counts.get('wins', 0)
+    win_rate = wins / n_games
+    rolls = tally.stats['rolls']
+    return {
+        'n_games': n_games,
+        'wins': wins,
+        'losses': n_games - wins,
+        'win_rate': win_rate,
+        'house_edge': 1 - 2 * win_rate,
+        'avg_rolls_per_game': rolls.mean,
+        'rolls_per_game_stats': rolls.to_dict(),
+        'rolls_histogram': {int(k): c for k, c in tally.histograms['rolls'].to_dict().items()},
+    }
+
+
+def parallel_craps_with_statistics(n_games, seed=0, workers=None, chunk_size=10_000):
+    """Parallel simulate_craps_with_statistics() (module 04); same keys."""
+    tally = run_experiment(craps_trials, n_games, seed, workers, chunk_size)
+    wins = tally.counts.get('wins', 0)
+    win_rate = wins / n_games
+    theoretical = craps.calculate_theoretical_probabilities()['total_win_prob']
+    return {
+        'n_games': n_games,
+        'wins': wins,
+        'losses': n_games - wins,
+        'win_rate': win_rate,
+        'theoretical_win_rate': theoretical,
+        'error': abs(win_rate - theoretical),
+        'confidence_interval_95': stats.calculate_confidence_interval(wins, n_games, 0.95),
+        'confidence_interval_99': stats.calculate_confidence_interval(wins, n_games, 0.99),
+        'rolls_per_game_stats': tally.stats['rolls'].to_dict(),
+    }
+
+
+def parallel_compare_betting_strategies(initial_bankroll, n_games, win_prob,
+                                        n_simulations=1000, seed=0, workers=None,
+                                        chunk_size=1000):
+    """
+    Parallel compare_betting_strategies() (module 05).
+
+    Each strategy gets its own child seed.  Instead of every final bankroll,
+    each result holds 'std_final', 'total_games' and a 'median' estimated
+    from a histogram with bins of 1% of the initial bankroll.
+    """
+    strategies = game_theory.betting_strategies(initial_bankroll, win_prob)
+    seeds = np.random.SeedSequence(seed).spawn(len(strategies))
+    results = []
+    for index, ((name, _), strategy_seed) in enumerate(zip(strategies, seeds)):
+        tally = run_experiment(betting_trials, n_simulations, strategy_seed, workers,
+                               chunk_size,
+                               args=(index, initial_bankroll, n_games, win_prob))
+        final = tally.stats['final_bankroll']
+        results.append({
+            'name': name,
+            'avg_final': final.mean,
+            'std_final': final.std_dev,
+            'median': tally.histograms['final_bankroll'].quantile(0.5),
+            'bankruptcy_rate': tally.counts.get('bankrupt', 0) / n_simulations,
+            'total_games': tally.counts.get('games', 0),
+        })
+    return results
+
+
+def main():
+    """Demonstrate reproducible parallel runs."""
+    print("=" * 70)
+    print("PARALLEL, REPRODUCIBLE MONTE CARLO RUNNER")
+    print("=" * 70)
+
+    cpus = os.cpu_count() or 1
+
+    print("\n1. CRAPS: SAME SEED, DIFFERENT WORKER COUNTS")
+    print("-" * 70)
+    for workers in sorted({1, 2, cpus}):
+        start = time.perf_counter()
+        result = parallel_craps_games(200_000, seed=42, workers=workers)
+        elapsed = time.perf_counter() - start
+        print(f"  {workers:>2} worker(s): win rate {result['win_rate']:.6f}, "
+              f"rolls/game {result['avg_rolls_per_game']:.6f}  ({elapsed:.2f}s)")
+    print("  ✓ Identical results regardless of the number of workers")
+
+    print("\n2. CRAPS WITH CONFIDENCE INTERVALS (1,000,000 games)")
+    print("-" * 70)
+    result = parallel_craps_with_statistics(1_000_000, seed=7)
+    ci = result['confidence_interval_95']
+    print(f"  Win rate: {result['win_rate']:.5f} "
+          f"(95% CI {ci['lower_bound']:.5f} - {ci['upper_bound']:.5f})")
+    print(f"  Theory:   {result['theoretical_win_rate']:.5f}")
+    rolls = result['rolls_per_game_stats']
+    print(f"  Rolls per game: mean {rolls['mean']:.3f}, std {rolls['std_dev']:.3f}, "
+          f"max {rolls['max']}")
+
+    print("\n3. BETTING STRATEGIES (100 games x 20,000 bankrolls each)")
+    print("-" * 70)
+    start = time.perf_counter()
+    strategies = parallel_compare_betting_strategies(1000, 100, 0.55,
+                                                     n_simulations=20_000, seed=1)
+    elapsed = time.perf_counter() - start
+    print(f"  {'Strategy':<22} {'Avg Final':>12} {'Median':>10} {'Std':>10} {'Bankrupt':>9}")
+    for s in strategies:
+        print(f"  {s['name']:<22} {'$' + format(s['avg_final'], ',.2f'):>12} "
+              f"{'$' + format(s['median'], ',.0f'):>10} "
+              f"{'$' + format(s['std_final'], ',.0f'):>10} "
+              f"{s['bankruptcy_rate'] * 100:>8.2f}%")
+    print(f"  ({elapsed:.1f}s on {cpus} CPU(s))")
+
+    print("\n" + "=" * 70)
+
+
+if __name__ == "__main__":
+    main()
@@ -7,6 +7,7 @@ Run this to verify all modules are working correctly.
 import sys
 import os
 import importlib.util
+import multiprocessing
 import random
 
 
@@ -15,6 +16,7 @@ def load_module(filename):
     path = os.path.join(os.path.dirname(os.path.abspath(__file__)), filename)
     spec = importlib.util.spec_from_file_location(filename[:-3], path)
     module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
     spec.loader.exec_module(module)
     return module
 
@@ -274,6 +276,78 @@ def test_game_theory():
     return True
 
 
+def test_parallel_runner():
+    """Test the parallel runner module."""
+    print("\n" + "="*70)
+    print("TEST 6: Parallel Runner")
+    print("="*70)
+    
+    module = load_module('06_parallel_runner.py')
+    stats = load_module('04_advanced_statistics.py')
+    print(f"✓ Module loaded successfully")
+    
+    # Merged running statistics match a single pass over all the data
+    rng = random.Random(0)
+    data = [rng.gauss(10, 3) for _ in range(1000)]
+    merged = module.RunningStats()
+    for start in range(0, 1000, 300):
+        part = module.RunningStats()
+        for x in data[start:start + 300]:
+            part.add(x)
+        merged.merge(part)
+    expected = stats.calculate_variance_and_std(data)
+    assert merged.n == 1000
+    assert abs(merged.mean - expected['mean']) < 1e-9
+    assert abs(merged.variance - expected['variance']) < 1e-9
+    assert merged.min == expected['min'] and merged.max == expected['max']
+    print(f"✓ Merged Welford statistics match: mean {merged.mean:.4f}, "
+          f"variance {merged.variance:.4f}")
+    
+    # Same seed gives identical results for any number of workers
+    serial = module.parallel_craps_games(20000, seed=5, workers=1, chunk_size=2500)
+    pooled = module.parallel_craps_games(20000, seed=5, workers=2, chunk_size=2500)
+    assert serial == pooled
+    print(f"✓ 1 and 2 workers agree exactly: win rate {serial['win_rate']:.4f}")
+    
+    # Different seeds give different streams
+    other = module.parallel_craps_games(20000, seed=6, workers=1, chunk_size=2500)
+    assert other['wins'] != serial['wins'] or other['rolls_histogram'] != serial['rolls_histogram']
+    print(f"✓ Different seeds give different results")
+    
+    # Results agree with theory
+    result = module.parallel_craps_with_statistics(100000, seed=1, workers=2)
+    assert 0.48 < result['win_rate'] < 0.51
+    assert result['rolls_per_game_stats']['n'] == 100000
+    print(f"✓ Craps win rate: {result['win_rate']:.4f} "
+          f"(theory {result['theoretical_win_rate']:.4f})")
+    
+    # Betting strategies: reproducible and consistent with module 05
+    first = module.parallel_compare_betting_strategies(1000, 50, 0.55, 400,
+                                                       seed=2, workers=2, chunk_size=100)
+    second = module.parallel_compare_betting_strategies(1000, 50, 0.55, 400,
+                                                        seed=2, workers=1, chunk_size=100)
+    assert first == second
+    assert [r['name'] for r in first] == [name for name, _ in
+                                          load_module('05_game_theory.py').betting_strategies(1000, 0.55)]
+    for r in first:
+        assert 0 <= r['bankruptcy_rate'] <= 1
+        print(f"✓ {r['name']}: avg ${r['avg_final']:.2f}, median ${r['median']:.0f}")
+    
+    # Spawned workers, with the module loaded under another name and not
+    # registered in sys.modules, still find the trial functions
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '06_parallel_runner.py')
+    spec = importlib.util.spec_from_file_location('unregistered_runner', path)
+    unregistered = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(unregistered)
+    unregistered.multiprocessing = multiprocessing.get_context('spawn')
+    spawned = unregistered.parallel_craps_games(20000, seed=5, workers=2, chunk_size=2500)
+    assert spawned == serial
+    print(f"✓ Spawned workers agree with 1 worker")
+    
+    print("✓ All tests passed!")
+    return True
+
+
 def main():
     """Run all tests."""
     print("="*70)
@@ -313,6 +387,12 @@ def main():
         print(f"✗ Game Theory test failed: {e}")
         results.append(("Game Theory", False))
     
+    try:
+        results.append(("Parallel Runner", test_parallel_runner()))
+    except Exception as e:
+        print(f"✗ Parallel Runner test failed: {e}")
+        results.append(("Parallel Runner", False))
+    
     # Print summary
     print("\n" + "="*70)
     print("TEST SUMMARY")
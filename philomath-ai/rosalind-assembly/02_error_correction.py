@@ -50,9 +50,18 @@ Learning Objectives
 - Build a trusted-read dictionary to correct erroneous sequencing reads
 """
 
+import importlib
+import os
+import sys
 from collections import Counter
 
 
+_SEQUENCE_IO_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'sequence-io'))
+if _SEQUENCE_IO_DIR not in sys.path:
+    sys.path.append(_SEQUENCE_IO_DIR)
+sequence_io = importlib.import_module('01_sequence_io')
+
+
 def reverse_complement(dna: str) -> str:
     """
     Return the reverse complement of a DNA string.
@@ -224,22 +233,7 @@ def parse_fasta(text: str) -> list:
         >>> parse_fasta(fasta)
         ['ACGTAC']
     """
-    sequences = []
-    current = []
-
-    for line in text.strip().splitlines():
-        line = line.strip()
-        if line.startswith('>'):
-            if current:
-                sequences.append(''.join(current))
-            current = []
-        else:
-            current.append(line)
-
-    if current:
-        sequences.append(''.join(current))
-
-    return sequences
+    return [sequence for _, sequence in sequence_io.iter_fasta(text.splitlines()) if sequence]
 
 
 # ── Demo ──────────────────────────────────────────────────────────────────────
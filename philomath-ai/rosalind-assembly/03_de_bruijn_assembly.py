@@ -0,0 +1,463 @@
+"""
+De Bruijn Graph Assembly: Scaling Beyond the Greedy Superstring
+================================================================
+
+Related Rosalind Problems: https://rosalind.info/problems/ba3d/ (de Bruijn
+graph), https://rosalind.info/problems/ba3g/ (Eulerian path),
+https://rosalind.info/problems/ba3k/ (contigs)
+
+Background
+----------
+shortest_superstring (01) recomputes the overlap of every ordered pair of
+strings on every merge round: O(n³·L) work for n reads of length L.  That is
+fine for the Rosalind dataset (50 reads) but hopeless for a sequencing run
+with 10^5–10^6 reads.  Real assemblers avoid pairwise comparisons entirely.
+
+De Bruijn Graph
+---------------
+Break every read into its k-mers.  Each distinct k-mer is an **edge** from
+its prefix (k-1)-mer to its suffix (k-1)-mer.  Reads that overlap by at
+least k-1 bases share k-mers, so they are glued together automatically —
+no pair of reads is ever compared.
+
+  • A walk that uses every edge exactly once (an **Eulerian path**) spells a
+    string containing every k-mer: the assembled genome when it is unique.
+  • When repeats or errors make the graph branch, the unambiguous stretches
+    (maximal **non-branching paths**) are reported as **contigs**.
+
+K-mers are stored as integers (2 bits per base, A=0 C=1 G=2 T=3), so
+extracting, counting and deduplicating k-mers is a handful of NumPy array
+operations per batch of reads.
+
+Overlap Graph, Indexed
+----------------------
+The overlap-graph model of 01 is kept, but overlaps are found in one pass:
+every read's prefix of length min_overlap goes into a hash index, and each
+read looks up its own suffix windows in that index.  Only the candidates
+returned by the index are compared.  Overlaps are then merged greedily,
+longest first, as in 01.
+
+Error Correction
+----------------
+A sequencing error creates up to k false k-mers and branches the graph.
+The reads can first be corrected as in correct_errors (02), using the
+hash-indexed engine of 04 so the pre-pass scales with the reads too.
+
+Learning Objectives
+-------------------
+- Build a de Bruijn graph from integer-encoded k-mers
+- Find Eulerian paths with Hierholzer's algorithm
+- Extract contigs as maximal non-branching paths
+- Replace all-pairs comparison with a hash index of prefixes
+
+Requires: numpy
+"""
+
+import heapq
+import os
+import importlib.util
+from collections import defaultdict
+
+import numpy as np
+
+# Largest k whose codes fit in an int64 (2 bits per nucleotide)
+MAX_K = 31
+
+# Reads per batch when extracting k-mers (bounds temporary memory)
+BATCH_READS = 50_000
+
+_INVALID = 4
+_ENCODE = np.full(256, _INVALID, dtype=np.uint8)
+for _code, _base in enumerate('ACGT'):
+    _ENCODE[ord(_base)] = _code
+_DECODE = np.frombuffer(b'ACGT', dtype=np.uint8)
+
+
+def _decode(code: int, length: int) -> str:
+    digits = (int(code) >> (2 * np.arange(length - 1, -1, -1))) & 3
+    return _DECODE[digits].tobytes().decode('ascii')
+
+
+def _batch_codes(reads: list, k: int) -> np.ndarray:
+    """Integer codes of all k-mers of a batch of reads (none span two reads)."""
+    encoded = _ENCODE[np.frombuffer('N'.join(reads).encode('ascii'), dtype=np.uint8)]
+    n = len(encoded) - k + 1
+    if n <= 0:
+        return np.empty(0, dtype=np.int64)
+    codes = np.zeros(n, dtype=np.int64)
+    for j in range(k):
+        codes <<= 2
+        codes |= encoded[j:j + n] & 3
+    # Drop k-mers containing the separator or any non-ACGT character
+    bad = np.concatenate(([0], np.cumsum(encoded == _INVALID)))
+    return codes[bad[k:] - bad[:n] == 0]
+
+
+def kmer_table(reads, k: int, min_count: int = 1) -> tuple:
+    """
+    Count the distinct k-mers of a collection of reads.
+
+    Reads are processed BATCH_READS at a time, so only one batch of k-mer
+    codes is in memory at once.  K-mers seen fewer than min_count times
+    (typically sequencing errors) are dropped.
+
+    Args:
+        reads:     Iterable of DNA strings.
+        k:         k-mer length (2 to MAX_K).
+        min_count: Minimum number of occurrences to keep a k-mer.
+
+    Returns:
+        (codes, counts): sorted int64 k-mer codes and their counts.
+
+    Examples:
+        >>> codes, counts = kmer_table(["ACGTA", "CGTA"], 3)
+        >>> [(_decode(c, 3), int(n)) for c, n in zip(codes, counts)]
+        [('ACG', 1), ('CGT', 2), ('GTA', 2)]
+    """
+    if not 2 <= k <= MAX_K:
+        raise ValueError(f"k must be between 2 and {MAX_K}, got {k}")
+    tables = []
+    batch = []
+    for read in reads:
+        batch.append(read)
+        if len(batch) == BATCH_READS:
+            tables.append(np.unique(_batch_codes(batch, k), return_counts=True))
+            batch = []
+    tables.append(np.unique(_batch_codes(batch, k), return_counts=True))
+
+    codes, inverse = np.unique(np.concatenate([t[0] for t in tables]), return_inverse=True)
+    counts = np.bincount(inverse, weights=np.concatenate([t[1] for t in tables]),
+                         minlength=len(codes)).astype(np.int64)
+    keep = counts >= min_count
+    return codes[keep], counts[keep]
+
+
+class DeBruijnGraph:
+    """
+    De Bruijn graph whose edges are the distinct k-mers of a set of reads.
+
+    Nodes are (k-1)-mers numbered 0..len(nodes)-1 in sorted order.  Edges
+    are stored sorted by source node (CSR layout), so the outgoing edges of
+    node v are first_edge[v]:first_edge[v + 1].
+
+    Examples:
+        >>> graph = DeBruijnGraph(["ATTAGACCTG", "CCTGCCGGAA", "AGACCTGCCG", "GCCGGAATAC"], 8)
+        >>> graph.superstring()
+        'ATTAGACCTGCCGGAATAC'
+    """
+
+    def __init__(self, reads, k: int, min_count: int = 1):
+        self.k = k
+        self.edges, self.counts = kmer_table(reads, k, min_count)
+        mask = (1 << 2 * (k - 1)) - 1
+        prefixes = self.edges >> 2
+        suffixes = self.edges & mask
+        self.nodes = np.unique(np.concatenate((prefixes, suffixes)))
+        # Edge codes are sorted, so their prefixes (= sources) are sorted too
+        self.source = np.searchsorted(self.nodes, prefixes)
+        self.target = np.searchsorted(self.nodes, suffixes)
+        self.out_degree = np.bincount(self.source, minlength=len(self.nodes))
+        self.in_degree = np.bincount(self.target, minlength=len(self.nodes))
+        self.first_edge = np.concatenate(([0], np.cumsum(self.out_degree)))
+
+    def __len__(self):
+        return len(self.edges)
+
+    def _spell(self, path: list) -> str:
+        """String spelled by a walk given as a list of edge indices."""
+        first = _decode(self.edges[path[0]], self.k)
+        last_bases = _DECODE[self.edges[path[1:]] & 3].tobytes().decode('ascii')
+        return first + last_bases
+
+    def eulerian_path(self) -> list:
+        """
+        Edge indices of a walk using every edge once (Hierholzer's algorithm).
+
+        Raises:
+            ValueError: If the graph has no Eulerian path (unbalanced or
+                disconnected).
+        """
+        if len(self.edges) == 0:
+            return []
+        balance = self.out_degree - self.in_degree
+        starts = np.flatnonzero(balance == 1)
+        if len(starts) > 1 or (balance > 1).any() or (balance < -1).any():
+            raise ValueError("graph has no Eulerian path (unbalanced nodes)")
+        start = int(starts[0]) if len(starts) else int(self.source[0])
+
+        next_edge = self.first_edge[:-1].tolist()
+        end_edge = self.first_edge[1:].tolist()
+        target = self.target.tolist()
+        stack, path = [(start, -1)], []
+        while stack:
+            node, edge = stack[-1]
+            if next_edge[node] < end_edge[node]:
+                e = next_edge[node]
+                next_edge[node] += 1
+                stack.append((target[e], e))
+            else:
+                stack.pop()
+                if edge >= 0:
+                    path.append(edge)
+        if len(path) != len(self.edges):
+            raise ValueError("graph has no Eulerian path (disconnected)")
+        return path[::-1]
+
+    def superstring(self) -> str:
+        """Spell the Eulerian path: the assembly when the graph is one path."""
+        path = self.eulerian_path()
+        return self._spell(path) if path else ''
+
+    def contigs(self) -> list:
+        """
+        Maximal non-branching paths, spelled as strings.
+
+        A contig ends wherever a node has more than one way in or out, so
+        every contig is an unambiguous stretch of the genome.  Isolated
+        cycles are reported once, starting from their smallest edge.
+        """
+        through = ((self.in_degree == 1) & (self.out_degree == 1)).tolist()
+        first_edge = self.first_edge.tolist()
+        source = self.source.tolist()
+        target = self.target.tolist()
+        used = bytearray(len(self.edges))
+        contigs = []
+
+        for e in range(len(self.edges)):
+            if through[source[e]]:
+                continue
+            path = [e]
+            used[e] = 1
+            node = target[e]
+            while through[node]:
+                e = first_edge[node]
+                path.append(e)
+                used[e] = 1
+                node = target[e]
+            contigs.append(self._spell(path))
+
+        for e in range(len(self.edges)):
+            if used[e]:
+                continue
+            path = [e]
+            used[e] = 1
+            e = first_edge[target[e]]
+            while not used[e]:
+                path.append(e)
+                used[e] = 1
+                e = first_edge[target[e]]
+            contigs.append(self._spell(path))
+        return contigs
+
+
+# ── Overlap graph with a prefix index ────────────────────────────────────────
+
+def find_overlaps(reads: list, min_overlap: int) -> list:
+    """
+    All suffix/prefix overlaps of at least min_overlap bases, in one pass.
+
+    The first min_overlap bases of every read are put into a hash index.
+    For each read a and each position p, the window a[p:p + min_overlap] is
+    looked up; each hit b is a candidate overlap of len(a) - p, confirmed
+    by comparing a[p:] with the start of b.
+
+    Args:
+        reads:       List of DNA strings.
+        min_overlap: Shortest overlap to report (>= 1).
+
+    Returns:
+        List of (i, j, length) with reads[i][-length:] == reads[j][:length],
+        i != j and min_overlap <= length < len(reads[i]).
+
+    Examples:
+        >>> find_overlaps(["ATTAGACCTG", "AGACCTGCCG", "CCTGCCGGAA"], 4)
+        [(0, 1, 7), (0, 2, 4), (1, 2, 7)]
+    """
+    index = defaultdict(list)
+    for j, read in enumerate(reads):
+        if len(read) >= min_overlap:
+            index[read[:min_overlap]].append(j)
+
+    overlaps = []
+    for i, read in enumerate(reads):
+        # p >= 1: a read does not "overlap" another by its full length
+        for p in range(1, len(read) - min_overlap + 1):
+            hits = index.get(read[p:p + min_overlap])
+            if not hits:
+                continue
+            tail = read[p:]
+            for j in hits:
+                if j != i and reads[j].startswith(tail):
+                    overlaps.append((i, j, len(tail)))
+    return overlaps
+
+
+def greedy_overlap_assembly(reads: list, min_overlap: int = 1) -> list:
+    """
+    Merge reads along their longest overlaps, as shortest_superstring (01)
+    does, but with every overlap computed once by find_overlaps().
+
+    Overlaps are taken longest first; an overlap is used if its first read
+    has no successor yet, its second read no predecessor, and it would not
+    close a cycle.  Each resulting chain of reads is one contig.
+
+    Ties are broken as in 01, which scans its working list of strings for
+    the first (i, j) pair with the longest overlap and appends each merged
+    string at the end of that list.  Every chain gets a rank in the same
+    order (reads by position, merged chains after them, oldest first), and
+    equally long overlaps are taken in (rank of i, rank of j) order.  So for
+    substring-free reads that form one chain the result is [the string
+    shortest_superstring() returns].  Unlike 01, chains with no overlap of
+    at least min_overlap between them are not concatenated: each one is
+    returned as its own contig.
+
+    Args:
+        reads:       List of DNA strings (none a substring of another).
+        min_overlap: Shortest overlap allowed to join two reads.
+
+    Returns:
+        List of contigs; a single string when the reads form one chain.
+
+    Examples:
+        >>> greedy_overlap_assembly(["ATTAGACCTG", "CCTGCCGGAA", "AGACCTGCCG", "GCCGGAATAC"])
+        ['ATTAGACCTGCCGGAATAC']
+
+        >>> greedy_overlap_assembly(["AACG", "TTTT"])
+        ['AACG', 'TTTT']
+    """
+    reads = list(dict.fromkeys(reads))       # coverage duplicates add nothing
+    by_length = defaultdict(list)
+    for i, j, length in find_overlaps(reads, min_overlap):
+        by_length[length].append((i, j))
+
+    successor = [-1] * len(reads)
+    predecessor = [-1] * len(reads)
+    overlap_with_next = [0] * len(reads)
+    chain_end = list(range(len(reads)))      # valid for chain heads
+    chain_head = list(range(len(reads)))     # valid for chain tails
+    rank = list(range(len(reads)))           # valid for chain heads
+    next_rank = len(reads)
+
+    for length in sorted(by_length, reverse=True):
+        # Ranks only grow, so an entry whose ranks are out of date is
+        # pushed back with the current ones rather than used.
+        heap = [(rank[chain_head[i]], rank[j], i, j) for i, j in by_length[length]]
+        heapq.heapify(heap)
+        while heap:
+            rank_i, rank_j, i, j = heapq.heappop(heap)
+            if successor[i] != -1 or predecessor[j] != -1 or chain_head[i] == j:
+                continue
+            head = chain_head[i]
+            if (rank_i, rank_j) != (rank[head], rank[j]):
+                heapq.heappush(heap, (rank[head], rank[j], i, j))
+                continue
+            successor[i], predecessor[j], overlap_with_next[i] = j, i, length
+            tail = chain_end[j]
+            chain_end[head], chain_head[tail] = tail, head
+            rank[head] = next_rank
+            next_rank += 1
+
+    contigs = []
+    for start in range(len(reads)):
+        if predecessor[start] != -1:
+            continue
+        parts = [reads[start]]
+        node = start
+        while successor[node] != -1:
+            parts.append(reads[successor[node]][overlap_with_next[node]:])
+            node = successor[node]
+        contigs.append(''.join(parts))
+    return contigs
+
+
+# ── Full pipeline ────────────────────────────────────────────────────────────
+
+def _load_correction_engine():
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '04_correction_engine.py')
+    spec = importlib.util.spec_from_file_location('correction_engine', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def assemble(reads: list, k: int, correct: bool = False, min_count: int = 1) -> list:
+    """
+    Assemble reads into contigs with a de Bruijn graph.
+
+    Args:
+        reads:     List of DNA strings.
+        k:         k-mer length; reads must overlap by at least k - 1 bases
+                   to be joined, and repeats shorter than k are resolved.
+        correct:   Correct reads first (same corrections as correct_errors
+                   in 02, computed with the seed index of 04) and replace
+                   each erroneous read by its correction.
+        min_count: Drop k-mers seen fewer times (another way to remove errors).
+
+    Returns:
+        List of contigs, longest first.
+
+    Examples:
+        >>> assemble(["ATTAGACCTG", "CCTGCCGGAA", "AGACCTGCCG", "GCCGGAATAC"], 8)
+        ['ATTAGACCTGCCGGAATAC']
+    """
+    if correct:
+        corrections = dict(_load_correction_engine().correct_errors_indexed(reads))
+        reads = [corrections.get(read, read) for read in reads]
+    contigs = DeBruijnGraph(reads, k, min_count).contigs()
+    return sorted(contigs, key=lambda contig: (-len(contig), contig))
+
+
+# ── Demo ──────────────────────────────────────────────────────────────────────
+
+if __name__ == "__main__":
+    import time
+
+    print("=" * 70)
+    print("DE BRUIJN GRAPH ASSEMBLY")
+    print("=" * 70)
+
+    reads = ["ATTAGACCTG", "CCTGCCGGAA", "AGACCTGCCG", "GCCGGAATAC"]
+    graph = DeBruijnGraph(reads, 8)
+    print(f"\nRosalind LONG sample, k=8: {len(graph)} edges, {len(graph.nodes)} nodes")
+    print(f"  Eulerian superstring : {graph.superstring()}")
+    print(f"  Indexed overlap mode : {greedy_overlap_assembly(reads)[0]}")
+    print(f"  Expected             : ATTAGACCTGCCGGAATAC")
+
+    # A simulated sequencing run: 100 kb genome, 100,000 reads of 100 bp
+    rng = np.random.default_rng(3)
+    genome = _DECODE[rng.integers(0, 4, 100_000)].tobytes().decode('ascii')
+    starts = rng.integers(0, len(genome) - 100, 100_000)
+    reads = [genome[s:s + 100] for s in starts.tolist()]
+    # Anchor both ends so the whole genome is covered
+    reads += [genome[:100], genome[-100:]]
+    print(f"\nSimulated run: {len(genome):,} bp genome, {len(reads):,} reads of 100 bp")
+
+    start = time.perf_counter()
+    contigs = assemble(reads, k=31)
+    print(f"  de Bruijn (k=31):  {time.perf_counter() - start:.2f} s, {len(contigs)} contig(s), "
+          f"longest {len(contigs[0]):,} bp, genome recovered: {contigs[0] == genome}")
+
+    subset = [genome[s:s + 100] for s in range(0, len(genome) - 100, 40)] + [genome[-100:]]
+    start = time.perf_counter()
+    merged = greedy_overlap_assembly(subset, min_overlap=30)
+    print(f"  Overlap graph ({len(subset):,} reads): {time.perf_counter() - start:.2f} s, "
+          f"genome recovered: {merged == [genome]}")
+
+    # Sequencing errors: each one breaks the graph into extra contigs
+    noisy = list(reads[:20_000])
+    for i in range(0, len(noisy), 500):
+        pos = i % 100
+        base = 'A' if noisy[i][pos] != 'A' else 'C'
+        noisy[i] = noisy[i][:pos] + base + noisy[i][pos + 1:]
+    print(f"\nWith {len(noisy) // 500} substitution errors in 20,000 reads:")
+    print(f"  Contigs without correction:   {len(assemble(noisy, k=31))}")
+    print(f"  Contigs with min_count=2:     {len(assemble(noisy, k=31, min_count=2))}")
+
+    print("\n" + "=" * 70)
+    print("KEY TAKEAWAYS")
+    print("=" * 70)
+    print("✓ De Bruijn graph: k-mers are edges between (k-1)-mer nodes")
+    print("✓ Reads are never compared pairwise — shared k-mers glue them")
+    print("✓ Eulerian path (every edge once) spells the genome when unique")
+    print("✓ Contigs = maximal non-branching paths between repeats/errors")
+    print("✓ A prefix hash index finds every overlap in one pass over the reads")
@@ -0,0 +1,327 @@
+"""
+Correction Engine: Hash-Indexed Read Error Correction
+======================================================
+
+Rosalind Problem: https://rosalind.info/problems/corr/
+
+Background
+----------
+correct_errors (02) compares every erroneous read with every trusted read
+(and reverse complement) using a character-by-character Hamming distance:
+O(n²·L) for n reads of length L.  On the Rosalind dataset that is instant;
+on a sequencing run of a million reads it would take days.
+
+Pigeonhole Seeds
+----------------
+If two reads of length L differ in exactly one position, that mismatch
+falls in one half of the read — so the *other* half matches exactly.
+
+  erroneous  TGAAA|TCGTA          (split in two pieces)
+  trusted    GGAAA|TCGTA          ← second piece identical
+
+So every trusted read is stored in a hash index under both of its halves.
+To correct a read we look up its two halves (two O(L) hash lookups) and
+check only the handful of trusted reads found there, instead of all of
+them.  Reverse complements of trusted reads are indexed too, exactly as in
+find_correct_reads.
+
+Streaming Input
+---------------
+iter_fasta() (the shared reader in sequence-io/) is a generator that
+yields one record at a time, so a FASTA file is never loaded as a whole.
+correct_fasta() reads the file twice: once to count reads (memory grows
+with the number of *distinct* reads, not the file size) and once to emit
+corrections as they are found.
+
+Learning Objectives
+-------------------
+- Replace all-pairs comparison with a hash index (pigeonhole principle)
+- Process files larger than memory with generators
+- Measure an algorithm on realistic, simulated data
+"""
+
+import importlib.util
+import os
+import random
+import sys
+import time
+from collections import Counter, defaultdict
+from typing import Iterable, Iterator, Optional, Tuple
+
+
+_SEQUENCE_IO_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'sequence-io'))
+if _SEQUENCE_IO_DIR not in sys.path:
+    sys.path.append(_SEQUENCE_IO_DIR)
+sequence_io = importlib.import_module('01_sequence_io')
+
+
+_COMPLEMENT = str.maketrans('ACGTacgt', 'TGCAtgca')
+
+
+def reverse_complement(dna: str) -> str:
+    """
+    Reverse complement using str.translate (one C-level pass).
+
+    Examples:
+        >>> reverse_complement("AAAACCCGGT")
+        'ACCGGGTTTT'
+    """
+    return dna.translate(_COMPLEMENT)[::-1]
+
+
+# ── Streaming FASTA ───────────────────────────────────────────────────────────
+
+def iter_fasta(source) -> Iterator[Tuple[Optional[str], str]]:
+    """
+    Yield (header, sequence) records one at a time.
+
+    Delegates to the shared streaming reader in sequence-io/01_sequence_io.py.
+
+    Args:
+        source: A file path, an open text file, or any iterable of lines.
+
+    Yields:
+        (header without '>', sequence with line breaks removed)
+
+    Examples:
+        >>> list(iter_fasta([">r1", "TCA", "TC", ">r2", "TTCAT"]))
+        [('r1', 'TCATC'), ('r2', 'TTCAT')]
+    """
+    return sequence_io.iter_fasta(source)
+
+
+def iter_reads(source) -> Iterator[str]:
+    """Yield only the sequences of iter_fasta(source)."""
+    for _, sequence in iter_fasta(source):
+        yield sequence
+
+
+# ── Seed index ────────────────────────────────────────────────────────────────
+
+def trusted_reads(counts: Counter) -> set:
+    """
+    Same trusted set as find_correct_reads (02), from precomputed counts.
+
+    Examples:
+        >>> sorted(trusted_reads(Counter(["GCTA", "GCTA", "TTTT"])))
+        ['GCTA', 'TAGC']
+    """
+    trusted = set()
+    for read, count in counts.items():
+        rc = reverse_complement(read)
+        if count >= 2 or counts.get(rc, 0) >= 2:
+            trusted.add(read)
+            trusted.add(rc)
+    return trusted
+
+
+def _seeds(read: str):
+    half = len(read) // 2
+    return (len(read), 0, read[:half]), (len(read), 1, read[half:])
+
+
+def build_seed_index(trusted: Iterable[str]) -> dict:
+    """
+    Index trusted reads by their two halves (pigeonhole seeds).
+
+    Returns:
+        Dict mapping (read length, piece number, piece) to trusted reads.
+    """
+    index = defaultdict(list)
+    for read in sorted(trusted):
+        for seed in _seeds(read):
+            index[seed].append(read)
+    return index
+
+
+def find_correction(read: str, index: dict) -> Optional[str]:
+    """
+    The trusted read at Hamming distance exactly 1 from read, or None.
+
+    Only trusted reads sharing one of the read's halves are compared.
+
+    Examples:
+        >>> index = build_seed_index({"GGAAA", "TTTCC"})
+        >>> find_correction("TGAAA", index)
+        'GGAAA'
+        >>> find_correction("TGAAT", index) is None
+        True
+    """
+    for seed in _seeds(read):
+        for candidate in index.get(seed, ()):
+            if sum(a != b for a, b in zip(read, candidate)) == 1:
+                return candidate
+    return None
+
+
+# ── Correction ────────────────────────────────────────────────────────────────
+
+def correct_errors_indexed(sequences: list) -> list:
+    """
+    Drop-in replacement for correct_errors (02) using the seed index.
+
+    Time Complexity: O(n·L) plus the candidates sharing a seed
+    Space Complexity: O(distinct reads · L)
+
+    Args:
+        sequences: List of DNA read strings (duplicates allowed).
+
+    Returns:
+        List of (erroneous_read, corrected_read) tuples, one per distinct
+        erroneous read that can be corrected, in order of first appearance.
+
+    Examples:
+        >>> correct_errors_indexed(["TCATC", "TTCAT", "TCATC", "TGAAA", "GAGGT",
+        ...                         "TTTCC", "ATCAA", "TTGAT", "TTTCC"])
+        [('TGAAA', 'GGAAA')]
+    """
+    counts = Counter(sequences)
+    trusted = trusted_reads(counts)
+    index = build_seed_index(trusted)
+    corrections = []
+    for read in counts:                      # Counter keeps first-appearance order
+        if read in trusted:
+            continue
+        corrected = find_correction(read, index)
+        if corrected is not None:
+            corrections.append((read, corrected))
+    return corrections
+
+
+def correct_fasta(path) -> Iterator[Tuple[str, str]]:
+    """
+    Stream the corrections for a FASTA file of reads.
+
+    The file is read twice with iter_fasta(): the first pass counts reads
+    and builds the seed index, the second yields each (erroneous, corrected)
+    pair the first time the erroneous read is seen.
+
+    Args:
+        path: Path to a FASTA file (it must be readable twice).
+
+    Yields:
+        (erroneous_read, corrected_read) in order of first appearance.
+    """
+    counts = Counter(iter_reads(path))
+    trusted = trusted_reads(counts)
+    index = build_seed_index(trusted)
+    del counts
+
+    seen = set()
+    for read in iter_reads(path):
+        if read in trusted or read in seen:
+            continue
+        seen.add(read)
+        corrected = find_correction(read, index)
+        if corrected is not None:
+            yield read, corrected
+
+
+# ── Benchmark ─────────────────────────────────────────────────────────────────
+
+def simulate_reads(n_reads: int, read_length: int = 50, genome_length: int = 50_000,
+                   error_rate: float = 0.01, seed: int = 0) -> list:
+    """
+    Reads sampled from a random genome, from either strand.
+
+    A fraction error_rate of the reads carries one substitution.
+
+    Examples:
+        >>> reads = simulate_reads(100, read_length=20, genome_length=200, seed=1)
+        >>> len(reads), {len(r) for r in reads}
+        (100, {20})
+    """
+    rng = random.Random(seed)
+    genome = ''.join(rng.choice('ACGT') for _ in range(genome_length))
+    reads = []
+    for _ in range(n_reads):
+        start = rng.randrange(genome_length - read_length + 1)
+        read = genome[start:start + read_length]
+        if rng.random() < 0.5:
+            read = reverse_complement(read)
+        if rng.random() < error_rate:
+            pos = rng.randrange(read_length)
+            read = read[:pos] + rng.choice('ACGT'.replace(read[pos], '')) + read[pos + 1:]
+        reads.append(read)
+    return reads
+
+
+def benchmark(n_reads: int = 1_000_000, read_length: int = 50):
+    """Correct n_reads simulated reads streamed from a temporary FASTA file."""
+    import tempfile
+
+    print(f"\nBenchmark: {n_reads:,} simulated reads of {read_length} bp (1% with an error)")
+    start = time.perf_counter()
+    reads = simulate_reads(n_reads, read_length, seed=42)
+    print(f"  Simulate reads:        {time.perf_counter() - start:6.2f} s")
+
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, 'reads.fasta')
+        with open(path, 'w') as handle:
+            for i, read in enumerate(reads):
+                handle.write(f">read_{i}\n{read}\n")
+        print(f"  FASTA file:            {os.path.getsize(path) / 1e6:6.1f} MB")
+
+        start = time.perf_counter()
+        corrections = list(correct_fasta(path))
+        print(f"  correct_fasta:         {time.perf_counter() - start:6.2f} s "
+              f"({len(corrections):,} corrections)")
+
+    # The pairwise version on a small slice, for scale
+    module_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '02_error_correction.py')
+    spec = importlib.util.spec_from_file_location('error_correction', module_path)
+    corr_module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(corr_module)
+
+    sample = reads[:2_000]
+    start = time.perf_counter()
+    expected = corr_module.correct_errors(sample)
+    pairwise = time.perf_counter() - start
+    start = time.perf_counter()
+    indexed = correct_errors_indexed(sample)
+    fast = time.perf_counter() - start
+    print(f"  2,000 reads, pairwise (02): {pairwise:.2f} s, indexed: {fast:.3f} s, "
+          f"same result: {indexed == expected}")
+
+
+# ── Demo ──────────────────────────────────────────────────────────────────────
+
+if __name__ == "__main__":
+    print("=" * 70)
+    print("CORR: HASH-INDEXED ERROR CORRECTION")
+    print("=" * 70)
+
+    sample_fasta = """\
+>Rosalind_52
+TCATC
+>Rosalind_44
+TTCAT
+>Rosalind_68
+TCATC
+>Rosalind_28
+TGAAA
+>Rosalind_95
+GAGGT
+>Rosalind_75
+TTTCC
+>Rosalind_21
+ATCAA
+>Rosalind_54
+TTGAT
+>Rosalind_34
+TTTCC
+"""
+    reads = list(iter_reads(sample_fasta.splitlines()))
+    index = build_seed_index(trusted_reads(Counter(reads)))
+    print(f"\nSeed index: {len(index)} keys for {len(trusted_reads(Counter(reads)))} trusted reads")
+    for read, corrected in correct_errors_indexed(reads):
+        print(f"  {read}->{corrected}")
+
+    benchmark()
+
+    print("\n" + "=" * 70)
+    print("KEY TAKEAWAYS")
+    print("=" * 70)
+    print("✓ One mismatch → one half of the read still matches exactly (pigeonhole)")
+    print("✓ Index trusted reads by their halves; look up instead of comparing all pairs")
+    print("✓ Generators stream FASTA records, so file size is not limited by memory")
@@ -1,11 +1,13 @@
 #!/usr/bin/env python3
 """
 Test suite for the rosalind-assembly module.
-Run this file to verify both Rosalind problems are working correctly.
+Run this file to verify all assembly modules are working correctly.
 
 Problems covered:
   01  LONG – Genome Assembly as Shortest Superstring
   02  CORR – Error Correction in Reads
+  03  De Bruijn graph assembly (scales to 10^5–10^6 reads)
+  04  Hash-indexed error correction with streaming FASTA input
 """
 
 import sys
@@ -289,6 +291,130 @@ TTTCC
     return True
 
 
+# ─────────────────────────────────────────────────────────────────────────────
+# TEST 3: De Bruijn Graph Assembly
+# ─────────────────────────────────────────────────────────────────────────────
+
+def test_de_bruijn():
+    print("\n" + "=" * 70)
+    print("TEST 3: De Bruijn Graph Assembly")
+    print("=" * 70)
+
+    mod = load_module('03_de_bruijn_assembly.py')
+    long_mod = load_module('01_shortest_superstring.py')
+
+    # Rosalind LONG sample: both modes reproduce shortest_superstring
+    reads = ["ATTAGACCTG", "CCTGCCGGAA", "AGACCTGCCG", "GCCGGAATAC"]
+    expected = long_mod.shortest_superstring(reads)
+    assert mod.DeBruijnGraph(reads, 8).superstring() == expected
+    assert mod.assemble(reads, 8) == [expected]
+    assert mod.greedy_overlap_assembly(reads) == [expected]
+    print(f"✓ Sample reads assemble to {expected} (de Bruijn and overlap modes)")
+
+    # Indexed overlaps equal the all-pairs overlap() values
+    pairs = sorted((i, j, long_mod.overlap(a, b)) for i, a in enumerate(reads)
+                   for j, b in enumerate(reads) if i != j and long_mod.overlap(a, b) >= 3)
+    assert sorted(mod.find_overlaps(reads, 3)) == pairs
+    print(f"✓ find_overlaps finds the same {len(pairs)} overlaps as overlap()")
+
+    # K-mer counting across reads, none spanning two reads
+    codes, counts = mod.kmer_table(["ACGTA", "CGTA", "NNACG"], 3)
+    assert len(codes) == 3 and counts.tolist() == [2, 2, 2]
+    print("✓ kmer_table counts distinct 3-mers and skips non-ACGT characters")
+
+    # A branching graph splits into contigs at the repeat
+    graph = mod.DeBruijnGraph(["TTACGAAGG", "CCACGATT"], 4)
+    contigs = sorted(graph.contigs())
+    assert contigs == ["ACGA", "CCACG", "CGAAGG", "CGATT", "TTACG"], contigs
+    print(f"✓ Repeat ACG splits the graph into contigs: {contigs}")
+    try:
+        graph.eulerian_path()
+        assert False, "Should have raised ValueError"
+    except ValueError:
+        print("✓ ValueError raised when no Eulerian path exists")
+
+    # Simulated genome: every read twice, plus one read with a substitution
+    import random
+    rng = random.Random(5)
+    genome = "".join(rng.choice("ACGT") for _ in range(600))
+    reads = [genome[i:i + 40] for i in range(0, 561, 10)] * 2
+    bad = reads[7][:20] + ("A" if reads[7][20] != "A" else "C") + reads[7][21:]
+    assert mod.assemble(reads, 21) == [genome]
+    assert len(mod.assemble(reads + [bad], 21)) > 1
+    assert mod.assemble(reads + [bad], 21, correct=True) == [genome]
+    assert mod.greedy_overlap_assembly(reads, min_overlap=20) == [genome]
+    print("✓ 600 bp genome recovered; correct=True removes the erroneous read's branch")
+
+    # Ties between equally long overlaps are broken as shortest_superstring does
+    checked = 0
+    for _ in range(500):
+        genome = "".join(rng.choice("AC") for _ in range(rng.randint(10, 30)))
+        reads = list(dict.fromkeys(genome[i:i + rng.randint(3, 7)]
+                                   for i in range(0, len(genome) - 3, 2)))
+        reads = [r for r in reads if not any(r != o and r in o for o in reads)]
+        rng.shuffle(reads)
+        contigs = mod.greedy_overlap_assembly(reads)
+        if len(contigs) == 1:
+            assert contigs == [long_mod.shortest_superstring(reads)], reads
+            checked += 1
+    assert mod.greedy_overlap_assembly(["AACG", "TTTT"]) == ["AACG", "TTTT"]
+    print(f"✓ greedy_overlap_assembly equals shortest_superstring on {checked} tie-heavy read sets")
+
+    print("✓ All de Bruijn assembly tests passed!")
+    return True
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# TEST 4: Hash-Indexed Error Correction
+# ─────────────────────────────────────────────────────────────────────────────
+
+def test_correction_engine():
+    print("\n" + "=" * 70)
+    print("TEST 4: Hash-Indexed Error Correction")
+    print("=" * 70)
+
+    mod = load_module('04_correction_engine.py')
+    corr = load_module('02_error_correction.py')
+
+    # Streaming parser: multi-line records, blank lines
+    fasta = ">r1\nTCA\nTC\n\n>r2\nTTCAT\n>r3\nTCATC\n"
+    assert list(mod.iter_fasta(fasta.splitlines())) == [("r1", "TCATC"), ("r2", "TTCAT"), ("r3", "TCATC")]
+    assert list(mod.iter_reads(fasta.splitlines())) == corr.parse_fasta(fasta)
+    print("✓ iter_fasta streams the same sequences as parse_fasta")
+
+    # Same trusted set and corrections as the pairwise version
+    sample = ["TCATC", "TTCAT", "TCATC", "TGAAA", "GAGGT", "TTTCC", "ATCAA", "TTGAT", "TTTCC"]
+    from collections import Counter
+    assert mod.trusted_reads(Counter(sample)) == corr.find_correct_reads(sample)
+    assert mod.correct_errors_indexed(sample) == corr.correct_errors(sample) == [("TGAAA", "GGAAA")]
+    print("✓ Rosalind sample: TGAAA->GGAAA, same as correct_errors")
+
+    reads = mod.simulate_reads(3000, read_length=30, genome_length=2000, error_rate=0.05, seed=7)
+    expected = corr.correct_errors(reads)
+    assert mod.correct_errors_indexed(reads) == expected
+    print(f"✓ 3,000 simulated reads: same {len(expected)} corrections as correct_errors")
+
+    # Only reads sharing a half are candidates
+    index = mod.build_seed_index(corr.find_correct_reads(reads))
+    read, fixed = expected[0]
+    assert mod.find_correction(read, index) == fixed
+    assert mod.find_correction("A" * 30, index) is None
+    print(f"✓ Seed index: {len(index)} keys; {read} -> {fixed}")
+
+    # Two-pass streaming from a file gives the same corrections
+    import tempfile
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "reads.fasta")
+        with open(path, "w") as handle:
+            for i, read in enumerate(reads):
+                handle.write(f">read_{i}\n{read[:15]}\n{read[15:]}\n")
+        assert list(mod.correct_fasta(path)) == expected
+    print("✓ correct_fasta streams the same corrections from disk")
+
+    print("✓ All correction engine tests passed!")
+    return True
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # Main runner
 # ─────────────────────────────────────────────────────────────────────────────
@@ -297,9 +423,9 @@ def main():
     print("=" * 70)
     print("ROSALIND GENOME ASSEMBLY – TEST SUITE (Session 8)")
     print("=" * 70)
-    print("Testing LONG (shortest superstring) | CORR (error correction)\n")
+    print("Testing LONG (shortest superstring) | CORR (error correction) | de Bruijn assembly | indexed correction\n")
 
-    tests = [test_long, test_corr]
+    tests = [test_long, test_corr, test_de_bruijn, test_correction_engine]
     passed = 0
     failed = 0
 
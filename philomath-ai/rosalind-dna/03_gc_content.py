@@ -47,6 +47,16 @@ Learning Objectives
 - Understand GC content as a biologically meaningful sequence statistic
 """
 
+import importlib
+import os
+import sys
+
+
+_SEQUENCE_IO_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'sequence-io'))
+if _SEQUENCE_IO_DIR not in sys.path:
+    sys.path.append(_SEQUENCE_IO_DIR)
+sequence_io = importlib.import_module('01_sequence_io')
+
 
 def gc_content(dna: str) -> float:
     """
@@ -104,18 +114,9 @@ def parse_fasta(text: str) -> dict:
         >>> parse_fasta(">seq1\\nAC\\nGT\\nAC")
         {'seq1': 'ACGTAC'}
     """
-    sequences = {}
-    current_label = None
-    for line in text.strip().splitlines():
-        line = line.strip()
-        if not line:
-            continue
-        if line.startswith('>'):
-            current_label = line[1:].split()[0]
-            sequences[current_label] = ''
-        elif current_label is not None:
-            sequences[current_label] += line
-    return sequences
+    return {sequence_io.record_id(header): sequence
+            for header, sequence in sequence_io.iter_fasta(text.splitlines())
+            if header is not None}
 
 
 def highest_gc(fasta_text: str) -> tuple:
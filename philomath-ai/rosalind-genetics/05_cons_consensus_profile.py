@@ -40,6 +40,16 @@ Learning Objectives
 - Understand conservation and variability in biological sequences
 """
 
+import importlib
+import os
+import sys
+
+
+_SEQUENCE_IO_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'sequence-io'))
+if _SEQUENCE_IO_DIR not in sys.path:
+    sys.path.append(_SEQUENCE_IO_DIR)
+sequence_io = importlib.import_module('01_sequence_io')
+
 
 def parse_fasta(fasta_text: str) -> dict:
     """
@@ -58,24 +68,9 @@ def parse_fasta(fasta_text: str) -> dict:
         >>> parse_fasta(fa)
         {'seq1': 'ACGT', 'seq2': 'TGCA'}
     """
-    sequences = {}
-    current_label = None
-    current_seq = []
-
-    for line in fasta_text.strip().splitlines():
-        line = line.strip()
-        if line.startswith('>'):
-            if current_label is not None:
-                sequences[current_label] = ''.join(current_seq).upper()
-            current_label = line[1:].split()[0]  # take first word after '>'
-            current_seq = []
-        elif line:
-            current_seq.append(line)
-
-    if current_label is not None:
-        sequences[current_label] = ''.join(current_seq).upper()
-
-    return sequences
+    return {sequence_io.record_id(header): sequence.upper()
+            for header, sequence in sequence_io.iter_fasta(fasta_text.splitlines())
+            if header is not None}
 
 
 def build_profile(sequences: list) -> dict:
@@ -9,11 +9,14 @@ Problems covered:
   03  LIA  – Independent Alleles
   04  PROB – Introduction to Random Strings
   05  CONS – Consensus and Profile
+  06  Vectorized profile engine (thousands of aligned sequences)
 """
 
 import sys
 import os
+import random
 import importlib.util
+import multiprocessing
 
 
 def load_module(filename: str):
@@ -21,6 +24,16 @@ def load_module(filename: str):
     path = os.path.join(os.path.dirname(os.path.abspath(__file__)), filename)
     spec = importlib.util.spec_from_file_location(filename[:-3], path)
     module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def load_unregistered(filename: str):
+    """Load a numbered module under another name, without sys.modules."""
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), filename)
+    spec = importlib.util.spec_from_file_location('unregistered_' + filename[3:-3], path)
+    module = importlib.util.module_from_spec(spec)
     spec.loader.exec_module(module)
     return module
 
@@ -265,6 +278,69 @@ ATGGCACT
     return True
 
 
+# ─────────────────────────────────────────────────────────────────────────────
+# TEST 6: Vectorized profile engine
+# ─────────────────────────────────────────────────────────────────────────────
+
+def test_profile_engine():
+    print("\n" + "=" * 70)
+    print("TEST 6: Vectorized profile engine")
+    print("=" * 70)
+
+    mod = load_module('06_profile_engine.py')
+    cons = load_module('05_cons_consensus_profile.py')
+
+    # Rosalind sample: same consensus and profile as module 05
+    assert mod.consensus_and_profile_vectorized(cons.SAMPLE_FASTA) == \
+        cons.consensus_and_profile(cons.SAMPLE_FASTA)
+    print("✓ Rosalind sample: same consensus and profile as consensus_and_profile")
+
+    # Random inputs, including lower case and non-ACGT characters,
+    # with tiny chunks so the chunked (and pooled) path is exercised
+    chunk_cells = mod.CHUNK_CELLS
+    mod.CHUNK_CELLS = 40
+    try:
+        rng = random.Random(5)
+        for _ in range(100):
+            length = rng.randint(1, 30)
+            seqs = [''.join(rng.choices('ACGTacgtN-', k=length)) for _ in range(rng.randint(1, 20))]
+            workers = rng.choice([1, 2])
+            expected = cons.build_profile(seqs)
+            assert mod.build_profile_vectorized(seqs, workers=workers) == expected
+            fasta = ''.join(f">s{i}\n{s}\n" for i, s in enumerate(seqs))
+            counts = mod.profile_from_fasta(fasta.splitlines(), workers=workers)
+            assert mod.consensus_from_counts(counts) == cons.consensus_string(expected)
+    finally:
+        mod.CHUNK_CELLS = chunk_cells
+    print("✓ build_profile_vectorized / profile_from_fasta match build_profile on 100 random inputs")
+
+    # Spawned workers, with the module loaded under another name and not
+    # registered in sys.modules, still find _chunk_counts
+    unregistered = load_unregistered('06_profile_engine.py')
+    unregistered.multiprocessing = multiprocessing.get_context('spawn')
+    unregistered.CHUNK_CELLS = 40
+    seqs = [''.join(random.Random(i).choices('ACGT', k=30)) for i in range(20)]
+    assert unregistered.build_profile_vectorized(seqs, workers=2) == cons.build_profile(seqs)
+    print("✓ Spawned workers give the same profile")
+
+    # Tie-breaking follows A > C > G > T
+    assert mod.build_profile_vectorized(["AC", "CA"], workers=1) == cons.build_profile(["AC", "CA"])
+    assert mod.consensus_from_counts(mod.np.array([[1, 0], [1, 1], [0, 1], [0, 0]])) == 'AC'
+    print("✓ Ties are broken A > C > G > T")
+
+    # Unequal lengths and empty input are rejected
+    for bad in (["ACGT", "ACG"], []):
+        try:
+            mod.build_profile_vectorized(bad)
+            raise AssertionError(f"accepted {bad}")
+        except ValueError:
+            pass
+    print("✓ ValueError for unequal lengths and empty input")
+
+    print("✓ All profile engine tests passed!")
+    return True
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # Main runner
 # ─────────────────────────────────────────────────────────────────────────────
@@ -273,9 +349,9 @@ def main():
     print("=" * 70)
     print("ROSALIND GENETICS – TEST SUITE (Episode 4)")
     print("=" * 70)
-    print("Testing IPRB | IEV | LIA | PROB | CONS\n")
+    print("Testing IPRB | IEV | LIA | PROB | CONS | profile engine\n")
 
-    tests = [test_iprb, test_iev, test_lia, test_prob, test_cons]
+    tests = [test_iprb, test_iev, test_lia, test_prob, test_cons, test_profile_engine]
     passed = 0
     failed = 0
 
@@ -0,0 +1,369 @@
+"""
+FM-Index: Searching One Genome for Thousands of Motifs
+======================================================
+
+Related Rosalind Problems: https://rosalind.info/problems/ba9g/ (suffix array),
+https://rosalind.info/problems/ba9i/ (BWT), https://rosalind.info/problems/ba9m/
+(better BWMatching), https://rosalind.info/problems/ba9o/ (approximate matching)
+
+Background
+----------
+find_motif (03) rescans the whole DNA string for every motif it is asked
+about.  That is the right tool for one motif, but a typical workload is the
+opposite: one genome, thousands of motifs.  Then it pays to preprocess the
+genome once into an **index** that answers each query without looking at
+the genome again.
+
+1. **Suffix array**: the starting positions of all suffixes of text + "$",
+   in sorted order.  All occurrences of a pattern are the suffixes that
+   start with it, so they form one contiguous block of the array.  We build
+   it by **prefix doubling**: sort suffixes by their first 1, 2, 4, 8, ...
+   characters, each round ranking pairs (rank[i], rank[i + k]) with one
+   NumPy sort.
+
+2. **Burrows-Wheeler transform**: BWT[r] is the character just before the
+   r-th smallest suffix.  It is a permutation of the text that groups equal
+   characters together.
+
+3. **FM-index**: with C[c] (number of characters smaller than c) and
+   Occ(c, r) (number of c's in BWT[:r]) the block of suffixes starting with
+   c + P is computed from the block for P:
+
+       lo' = C[c] + Occ(c, lo),   hi' = C[c] + Occ(c, hi)
+
+   Reading the pattern backwards, one step per character, gives the block
+   of the whole pattern: **count** is hi - lo, **locate** reads SA[lo:hi].
+   Occ is stored at checkpoints every few rows; in between, the BWT is
+   counted directly.
+
+4. **Seed and extend**: a match with at most d mismatches must contain at
+   least one of d + 1 non-overlapping pieces of the pattern exactly
+   (pigeonhole principle).  The pieces are located with the index and each
+   candidate position is checked with one vectorized Hamming distance.
+
+Problem Statement
+-----------------
+Given:  A DNA string s and many patterns.
+
+Return: For each pattern, the number and positions of its occurrences in s,
+        exactly or with at most d mismatches.
+
+Learning Objectives
+-------------------
+- Build a suffix array in O(n log n) by prefix doubling
+- Derive the BWT from the suffix array and answer queries by backward search
+- Trade preprocessing time and disk space for much faster queries
+- Use the pigeonhole principle to turn approximate search into exact search
+
+Requires: numpy
+"""
+
+import os
+import time
+
+import numpy as np
+
+# Rows between stored Occ checkpoints (memory / query-time trade-off)
+DEFAULT_CHECKPOINT = 128
+
+
+def suffix_array(text: str) -> np.ndarray:
+    """
+    Build the suffix array of text + "$" by prefix doubling.
+
+    "$" is smaller than every character, so the first entry is always
+    len(text) (the suffix "$" alone).
+
+    Time Complexity: O(n log^2 n) worst case, a few NumPy sorts in practice
+    Space Complexity: O(n)
+
+    Args:
+        text: Any string of single-byte characters.
+
+    Returns:
+        int64 array of the len(text) + 1 suffix start positions, sorted.
+
+    Examples:
+        >>> suffix_array("PANAMABANANAS").tolist()
+        [13, 5, 3, 1, 7, 9, 11, 6, 4, 2, 8, 10, 0, 12]
+
+        >>> suffix_array("AAAA").tolist()
+        [4, 3, 2, 1, 0]
+    """
+    raw = np.frombuffer(text.encode('latin-1'), dtype=np.uint8)
+    n = len(raw) + 1
+    rank = np.zeros(n, dtype=np.int64)
+    rank[:-1] = raw.astype(np.int64) + 1        # "$" gets rank 0
+
+    k = 1
+    while True:
+        # Sort by (rank of first k characters, rank of the next k)
+        second = np.zeros(n, dtype=np.int64)
+        second[:n - k] = rank[k:] + 1
+        key = rank * (int(rank.max()) + 2) + second
+        sa = np.argsort(key)
+        sorted_key = key[sa]
+        rank = np.empty(n, dtype=np.int64)
+        rank[sa] = np.concatenate(([0], np.cumsum(sorted_key[1:] != sorted_key[:-1])))
+        if rank[sa[-1]] == n - 1 or k >= n:
+            return sa
+        k *= 2
+
+
+def bwt_from_suffix_array(text: str, sa: np.ndarray) -> str:
+    """
+    Burrows-Wheeler transform of text + "$" from its suffix array.
+
+    Examples:
+        >>> bwt_from_suffix_array("PANAMABANANAS", suffix_array("PANAMABANANAS"))
+        'SMNPBNNAAAAA$A'
+    """
+    text = text + '$'
+    return ''.join(text[i - 1] for i in sa.tolist())
+
+
+class FMIndex:
+    """
+    Suffix array + BWT/FM-index of one text, for count and locate queries.
+
+    Build once per genome, save() it, and load() it in later sessions.
+
+    Examples:
+        >>> index = FMIndex("GATATATGCATATACTT")
+        >>> index.count("ATAT")
+        3
+        >>> index.locate("ATAT")
+        [1, 3, 9]
+        >>> index.approximate_locate("ATAT", 1)
+        [1, 3, 9, 11]
+    """
+
+    def __init__(self, text: str, checkpoint: int = DEFAULT_CHECKPOINT):
+        self.checkpoint = checkpoint
+        self.text = np.frombuffer(text.encode('latin-1'), dtype=np.uint8).copy()
+        self.sa = suffix_array(text)
+        if len(self.sa) < 2 ** 31:
+            self.sa = self.sa.astype(np.int32)
+
+        # Alphabet: "$" is symbol 0, the text's characters 1..sigma in order
+        self.alphabet = np.unique(self.text)
+        symbols = np.zeros(256, dtype=np.uint8)
+        symbols[self.alphabet] = np.arange(1, len(self.alphabet) + 1)
+        encoded = np.append(symbols[self.text], np.uint8(0))
+        self.bwt = encoded[self.sa.astype(np.int64) - 1]
+
+        # occ[j, c] = number of symbol c in bwt[:j * checkpoint]
+        sigma = len(self.alphabet) + 1
+        counts = np.zeros((len(self.bwt) // checkpoint + 1, sigma), dtype=np.int64)
+        for c in range(sigma):
+            counts[1:, c] = np.cumsum(self.bwt == c)[checkpoint - 1::checkpoint]
+        self.occ = counts
+        self._prepare()
+
+    def _prepare(self):
+        """Set up the Python-side lookup structures used by every query."""
+        self._bwt_bytes = self.bwt.tobytes()
+        self._occ_rows = self.occ.tolist()
+        totals = np.bincount(self.bwt, minlength=len(self.alphabet) + 1)
+        self._c = np.concatenate(([0], np.cumsum(totals)[:-1])).tolist()
+        self._symbol = {chr(ch): s for s, ch in enumerate(self.alphabet.tolist(), 1)}
+        self._byte = [bytes([s]) for s in range(len(self.alphabet) + 1)]
+
+    def __len__(self):
+        return len(self.text)
+
+    # ── Persistence ──────────────────────────────────────────────────────────
+
+    def save(self, path: str):
+        """
+        Write the index in .npz format to exactly path.
+
+        The file is passed to np.savez open, so no ".npz" is appended and
+        load(path) finds it under the same name.
+        """
+        with open(path, 'wb') as handle:
+            np.savez(handle, text=self.text, sa=self.sa, bwt=self.bwt, occ=self.occ,
+                     alphabet=self.alphabet, checkpoint=self.checkpoint)
+
+    @classmethod
+    def load(cls, path: str) -> 'FMIndex':
+        """Read an index written by save()."""
+        index = cls.__new__(cls)
+        with np.load(path) as data:
+            index.text = data['text']
+            index.sa = data['sa']
+            index.bwt = data['bwt']
+            index.occ = data['occ']
+            index.alphabet = data['alphabet']
+            index.checkpoint = int(data['checkpoint'])
+        index._prepare()
+        return index
+
+    # ── Exact queries ────────────────────────────────────────────────────────
+
+    def _occ(self, symbol: int, row: int) -> int:
+        block = row // self.checkpoint
+        start = block * self.checkpoint
+        return self._occ_rows[block][symbol] + self._bwt_bytes.count(self._byte[symbol], start, row)
+
+    def interval(self, pattern: str) -> tuple:
+        """
+        Rows [lo, hi) of the suffix array whose suffixes start with pattern.
+
+        Backward search: O(len(pattern)) steps, independent of the text length.
+        """
+        lo, hi = 0, len(self.bwt)
+        for ch in reversed(pattern):
+            symbol = self._symbol.get(ch)
+            if symbol is None:
+                return 0, 0
+            lo = self._c[symbol] + self._occ(symbol, lo)
+            hi = self._c[symbol] + self._occ(symbol, hi)
+            if lo >= hi:
+                return 0, 0
+        return lo, hi
+
+    def count(self, pattern: str) -> int:
+        """Number of (overlapping) occurrences of pattern in the text."""
+        lo, hi = self.interval(pattern)
+        return hi - lo
+
+    def locate(self, pattern: str) -> list:
+        """Sorted 0-indexed start positions of pattern in the text."""
+        lo, hi = self.interval(pattern)
+        return np.sort(self.sa[lo:hi]).tolist()
+
+    # ── Approximate queries ──────────────────────────────────────────────────
+
+    def approximate_locate(self, pattern: str, d: int) -> list:
+        """
+        Sorted 0-indexed positions where pattern occurs with at most d
+        mismatches (Hamming distance), by seed and extend.
+        """
+        m, n = len(pattern), len(self.text)
+        if m > n:
+            return []
+        if d >= m:
+            return list(range(n - m + 1))
+        if d == 0:
+            return self.locate(pattern)
+
+        # Seeds: d + 1 pieces; every match contains one of them exactly
+        bounds = [m * j // (d + 1) for j in range(d + 2)]
+        candidates = []
+        for start, end in zip(bounds, bounds[1:]):
+            lo, hi = self.interval(pattern[start:end])
+            hits = self.sa[lo:hi].astype(np.int64) - start
+            candidates.append(hits[(hits >= 0) & (hits <= n - m)])
+        candidates = np.unique(np.concatenate(candidates))
+
+        # Extend: Hamming distance of every candidate window at once
+        query = np.frombuffer(pattern.encode('latin-1'), dtype=np.uint8)
+        offsets = np.arange(m)
+        matches = []
+        for chunk in np.array_split(candidates, max(1, len(candidates) * m // 4_000_000)):
+            windows = self.text[chunk[:, None] + offsets]
+            matches.append(chunk[(windows != query).sum(axis=1) <= d])
+        return np.concatenate(matches).tolist()
+
+
+# ── Drop-in versions of the string-scanning functions ───────────────────────
+
+def find_motif_indexed(index: FMIndex, motif: str) -> list:
+    """
+    Same result as find_motif (03): 1-indexed, overlapping positions.
+
+    Examples:
+        >>> find_motif_indexed(FMIndex("GATATATGCATATACTT"), "ATAT")
+        [2, 4, 10]
+    """
+    return [p + 1 for p in index.locate(motif)]
+
+
+def find_motifs(dna: str, motifs: list) -> dict:
+    """
+    Find many motifs in one DNA string, building the index only once.
+
+    Args:
+        dna:    The haystack DNA string.
+        motifs: The motifs to search for.
+
+    Returns:
+        Dict mapping each motif to its 1-indexed positions (as find_motif).
+
+    Examples:
+        >>> find_motifs("GATATATGCATATACTT", ["ATAT", "CAT", "GGG"])
+        {'ATAT': [2, 4, 10], 'CAT': [9], 'GGG': []}
+    """
+    index = FMIndex(dna)
+    return {motif: find_motif_indexed(index, motif) for motif in motifs}
+
+
+# ── Demo ──────────────────────────────────────────────────────────────────────
+
+if __name__ == "__main__":
+    import importlib.util
+    import tempfile
+
+    print("=" * 70)
+    print("FM-INDEX: ONE GENOME, MANY MOTIFS")
+    print("=" * 70)
+
+    text = "PANAMABANANAS"
+    sa = suffix_array(text)
+    print(f"\nSuffix array of {text}$:")
+    for row, start in enumerate(sa.tolist()):
+        print(f"  {row:2}: {start:2}  {(text + '$')[start:]}")
+    print(f"  BWT = {bwt_from_suffix_array(text, sa)}")
+
+    index = FMIndex("GATATATGCATATACTT")
+    print(f"\nRosalind SUBS sample: ATAT at {find_motif_indexed(index, 'ATAT')}  (expected 2 4 10)")
+    print(f"  With ≤ 1 mismatch (0-indexed): {index.approximate_locate('ATAT', 1)}")
+
+    # A bacterial-sized genome against thousands of motifs
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '03_finding_motif.py')
+    spec = importlib.util.spec_from_file_location('finding_motif', path)
+    motif_module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(motif_module)
+
+    rng = np.random.default_rng(7)
+    length = 2_000_000
+    genome = np.frombuffer(b'ACGT', dtype=np.uint8)[rng.integers(0, 4, length)].tobytes().decode()
+    starts = rng.integers(0, length - 12, 2000)
+    motifs = [genome[s:s + 12] for s in starts.tolist()]
+    print(f"\nRandom genome of {length:,} bp, {len(motifs):,} motifs of length 12")
+
+    start = time.perf_counter()
+    index = FMIndex(genome)
+    print(f"  Build index:        {time.perf_counter() - start:.2f} s")
+
+    with tempfile.TemporaryDirectory() as folder:
+        file = os.path.join(folder, 'genome_index.npz')
+        index.save(file)
+        start = time.perf_counter()
+        index = FMIndex.load(file)
+        print(f"  Load saved index:   {time.perf_counter() - start:.2f} s "
+              f"({os.path.getsize(file) / 1e6:.0f} MB)")
+
+    start = time.perf_counter()
+    indexed = [find_motif_indexed(index, motif) for motif in motifs]
+    indexed_time = time.perf_counter() - start
+    print(f"  Indexed queries:    {indexed_time:.3f} s")
+
+    start = time.perf_counter()
+    scanned = [motif_module.find_motif(genome, motif) for motif in motifs[:100]]
+    scan_time = (time.perf_counter() - start) * len(motifs) / 100
+    print(f"  find_motif (03):    {scan_time:.1f} s (estimated from 100 motifs)")
+    print(f"  Results match: {indexed[:100] == scanned}")
+
+    start = time.perf_counter()
+    approximate = [index.approximate_locate(motif, 2) for motif in motifs[:200]]
+    print(f"  ≤ 2 mismatches:     {(time.perf_counter() - start) * 1e3 / 200:.1f} ms per motif")
+
+    print("\n" + "=" * 70)
+    print("KEY TAKEAWAYS")
+    print("=" * 70)
+    print("✓ Occurrences of a pattern form one block of the suffix array")
+    print("✓ Backward search finds that block in len(pattern) steps")
+    print("✓ Build the index once, save it, and reuse it for every query")
+    print("✓ d mismatches → one of d + 1 pieces matches exactly (pigeonhole)")
@@ -7,6 +7,7 @@ Problems covered:
   01  HAMM – Counting Point Mutations
   02  KMER – k-mer Composition
   03  SUBS – Finding a Motif in DNA
+  04  FM-index – Many motifs against one genome
 """
 
 import sys
@@ -208,6 +209,67 @@ def test_subs():
     return True
 
 
+# ─────────────────────────────────────────────────────────────────────────────
+# TEST 4: FM-Index – Many Motifs, One Genome
+# ─────────────────────────────────────────────────────────────────────────────
+
+def test_fm_index():
+    print("\n" + "=" * 70)
+    print("TEST 4: FM-Index – Many Motifs, One Genome")
+    print("=" * 70)
+
+    mod = load_module('04_fm_index.py')
+    subs = load_module('03_finding_motif.py')
+    hamm = load_module('01_hamming_distance.py')
+
+    # Suffix array and BWT of the textbook example
+    sa = mod.suffix_array("PANAMABANANAS")
+    assert sa.tolist() == [13, 5, 3, 1, 7, 9, 11, 6, 4, 2, 8, 10, 0, 12]
+    assert mod.bwt_from_suffix_array("PANAMABANANAS", sa) == "SMNPBNNAAAAA$A"
+    print("✓ Suffix array and BWT of PANAMABANANAS")
+
+    # Same positions as find_motif for every test case of SUBS
+    cases = [("GATATATGCATATACTT", "ATAT"), ("AAAA", "AA"), ("ACGT", "TTTT"),
+             ("ACGT", "CG"), ("ACGT", "ACGT"), ("ACGTTT", "TT")]
+    for dna, motif in cases:
+        assert mod.find_motif_indexed(mod.FMIndex(dna), motif) == subs.find_motif(dna, motif)
+    print(f"✓ find_motif_indexed matches find_motif on {len(cases)} cases")
+
+    # Larger text: counts, locations and ≤ d mismatches against brute force
+    import random
+    rng = random.Random(4)
+    dna = "".join(rng.choice("ACGT") for _ in range(3000))
+    index = mod.FMIndex(dna, checkpoint=16)
+    motifs = [dna[i:i + 6] for i in range(0, 2900, 97)] + ["ACGTACGTAC", "N"]
+    found = mod.find_motifs(dna, motifs)
+    for motif in motifs:
+        assert found[motif] == subs.find_motif(dna, motif)
+        assert index.count(motif) == len(found[motif])
+    print(f"✓ {len(motifs)} motifs: counts and positions match find_motif")
+
+    for motif, d in [("ACGTAC", 1), ("GGATCA", 2), ("TTAGCATGCA", 3)]:
+        expected = [i for i in range(len(dna) - len(motif) + 1)
+                    if hamm.hamming_distance(dna[i:i + len(motif)], motif) <= d]
+        assert index.approximate_locate(motif, d) == expected
+        print(f"✓ {motif} with ≤ {d} mismatches: {len(expected)} positions")
+
+    # Saved index answers the same queries
+    import tempfile
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "index.npz")
+        index.save(path)
+        loaded = mod.FMIndex.load(path)
+        bare = os.path.join(folder, "genome_idx")     # no suffix added
+        index.save(bare)
+        assert mod.FMIndex.load(bare).locate(motifs[0]) == index.locate(motifs[0])
+    assert all(loaded.locate(m) == index.locate(m) for m in motifs)
+    assert loaded.approximate_locate("GGATCA", 2) == index.approximate_locate("GGATCA", 2)
+    print("✓ Saved and reloaded index gives identical results")
+
+    print("✓ All FM-index tests passed!")
+    return True
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # Main runner
 # ─────────────────────────────────────────────────────────────────────────────
@@ -216,9 +278,9 @@ def main():
     print("=" * 70)
     print("ROSALIND k-MERS & DISTANCE – TEST SUITE (Sessions 3–4)")
     print("=" * 70)
-    print("Testing HAMM | KMER | SUBS\n")
+    print("Testing HAMM | KMER | SUBS | FM-index\n")
 
-    tests = [test_hamm, test_kmer, test_subs]
+    tests = [test_hamm, test_kmer, test_subs, test_fm_index]
     passed = 0
     failed = 0
 
@@ -36,6 +36,16 @@ Learning Objectives
 - Lay the groundwork for UPGMA and Neighbour-Joining phylogenetics
 """
 
+import importlib
+import os
+import sys
+
+
+_SEQUENCE_IO_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'sequence-io'))
+if _SEQUENCE_IO_DIR not in sys.path:
+    sys.path.append(_SEQUENCE_IO_DIR)
+sequence_io = importlib.import_module('01_sequence_io')
+
 
 def p_distance(s: str, t: str) -> float:
     """
@@ -128,19 +138,7 @@ def parse_fasta(text: str) -> list:
         >>> parse_fasta(fasta)
         ['AACC', 'GGTT']
     """
-    sequences = []
-    current = []
-    for line in text.strip().splitlines():
-        line = line.strip()
-        if line.startswith('>'):
-            if current:
-                sequences.append(''.join(current))
-                current = []
-        else:
-            current.append(line)
-    if current:
-        sequences.append(''.join(current))
-    return sequences
+    return [sequence for _, sequence in sequence_io.iter_fasta(text.splitlines()) if sequence]
 
 
 def format_matrix(matrix: list) -> str:
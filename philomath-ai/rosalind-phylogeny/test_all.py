@@ -6,11 +6,14 @@ Run this file to verify all problems are working correctly.
 Problems covered:
   01  PDST – Creating a Distance Matrix
   02  INOD – Counting Internal Nodes of a Tree
+  03  Blocked, vectorized p-distance matrix
 """
 
 import sys
 import os
+import random
 import importlib.util
+import multiprocessing
 
 
 def load_module(filename: str):
@@ -18,6 +21,16 @@ def load_module(filename: str):
     path = os.path.join(os.path.dirname(os.path.abspath(__file__)), filename)
     spec = importlib.util.spec_from_file_location(filename[:-3], path)
     module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def load_unregistered(filename: str):
+    """Load a numbered module under another name, without sys.modules."""
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), filename)
+    spec = importlib.util.spec_from_file_location('unregistered_' + filename[3:-3], path)
+    module = importlib.util.module_from_spec(spec)
     spec.loader.exec_module(module)
     return module
 
@@ -208,6 +221,65 @@ def test_inod():
     return True
 
 
+# ─────────────────────────────────────────────────────────────────────────────
+# TEST 3: Blocked, vectorized p-distance matrix
+# ─────────────────────────────────────────────────────────────────────────────
+
+def test_distance_engine():
+    print("\n" + "=" * 70)
+    print("TEST 3: Blocked, vectorized p-distance matrix")
+    print("=" * 70)
+
+    mod = load_module('03_distance_engine.py')
+    pdst = load_module('01_distance_matrix.py')
+
+    sample = ["TTTCCATTTA", "GATTCATTTC", "TTTCCATTTT", "GTTCCATTTA"]
+    assert mod.distance_matrix_vectorized(sample) == pdst.distance_matrix(sample)
+    print("✓ Rosalind sample: identical to distance_matrix")
+
+    # Small position and row blocks so every blocking path is exercised
+    position_block = mod.POSITION_BLOCK
+    mod.POSITION_BLOCK = 7
+    try:
+        rng = random.Random(11)
+        for _ in range(60):
+            length = rng.randint(1, 40)
+            alphabet = rng.choice(['AC', 'ACGT', 'ACGTacgtN-'])
+            seqs = [''.join(rng.choices(alphabet, k=length)) for _ in range(rng.randint(1, 20))]
+            matrix = mod.sequence_io.sequence_matrix(seqs)
+            got = mod.p_distance_matrix(matrix, workers=rng.choice([1, 2]),
+                                        block_rows=rng.randint(1, 6))
+            assert got.tolist() == pdst.distance_matrix(seqs)
+    finally:
+        mod.POSITION_BLOCK = position_block
+    print("✓ p_distance_matrix equals distance_matrix exactly on 60 random inputs")
+
+    # Spawned workers, with the module loaded under another name and not
+    # registered in sys.modules, still get the matrix and block worker
+    unregistered = load_unregistered('03_distance_engine.py')
+    unregistered.multiprocessing = multiprocessing.get_context('spawn')
+    seqs = [''.join(random.Random(i).choices('ACGT', k=30)) for i in range(12)]
+    matrix = unregistered.sequence_io.sequence_matrix(seqs)
+    got = unregistered.p_distance_matrix(matrix, workers=2, block_rows=4)
+    assert got.tolist() == pdst.distance_matrix(seqs)
+    print("✓ Spawned workers give the same distances")
+
+    ids, distances = mod.distance_matrix_fasta([">a x", "ACGT", ">b", "AC", "GA"], workers=1)
+    assert ids == ['a', 'b'] and distances.tolist() == [[0.0, 0.25], [0.25, 0.0]]
+    print("✓ distance_matrix_fasta returns record ids and distances")
+
+    for bad in (["ACGT", "ACG"], ["", ""]):
+        try:
+            mod.distance_matrix_vectorized(bad)
+            raise AssertionError(f"accepted {bad}")
+        except ValueError:
+            pass
+    print("✓ ValueError for unequal lengths and empty strings")
+
+    print("✓ All distance engine tests passed!")
+    return True
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # Main runner
 # ─────────────────────────────────────────────────────────────────────────────
@@ -216,9 +288,9 @@ def main():
     print("=" * 70)
     print("ROSALIND PHYLOGENY – TEST SUITE (Session 8)")
     print("=" * 70)
-    print("Testing PDST | INOD\n")
+    print("Testing PDST | INOD | distance engine\n")
 
-    tests = [test_pdst, test_inod]
+    tests = [test_pdst, test_inod, test_distance_engine]
     passed = 0
     failed = 0
 
@@ -0,0 +1,435 @@
+"""
+Sequence I/O: Streaming FASTA/FASTQ and Indexed Random Access
+==============================================================
+
+Background
+----------
+Every Rosalind dataset arrives as FASTA, and each module used to carry its
+own parse_fasta() that reads the whole text and builds a list or dict of
+full strings.  That is fine for a 1 kbp sample, but a real genome or a
+sequencing run is gigabytes.  This module is the one place where sequence
+files are read, in three ways:
+
+1. **Streaming** — iter_fasta() / iter_fastq() are generators that yield
+   one record at a time, so memory holds one record, not the file.
+
+2. **Random access** — build_fai() scans a FASTA file once and writes a
+   samtools-style ".fai" index: for every record its name, length, byte
+   offset, bases per line and bytes per line.  FastaIndex memory-maps the
+   file and computes the byte position of any base in O(1):
+
+       byte = offset + (pos // line_bases) * line_width + pos % line_bases
+
+   so fetching chromosome 7, bases 1,000,000-1,000,100 reads 101 bytes
+   no matter how large the file is.
+
+3. **Arrays** — sequences can be returned as NumPy uint8 arrays (ASCII
+   codes) or 2-bit codes (A=0, C=1, G=2, T=3, anything else 4), the input
+   format of the vectorized engines in this project.
+
+Learning Objectives
+-------------------
+- Read files lazily with generators
+- Build an offset index once to make every later lookup O(1)
+- Use memory-mapped files to read only the bytes you need
+- Convert text to compact numeric arrays for vectorized processing
+
+Requires: Python standard library (NumPy only for the array functions)
+"""
+
+import mmap
+import os
+from typing import Dict, Iterator, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # only the array functions need numpy
+    np = None
+
+
+# ── Streaming ─────────────────────────────────────────────────────────────────
+
+def _lines(source):
+    """Lines of a path, an open text file, or an iterable of lines."""
+    if isinstance(source, (str, os.PathLike)):
+        with open(source) as handle:
+            yield from handle
+    else:
+        yield from source
+
+
+def iter_fasta(source) -> Iterator[Tuple[Optional[str], str]]:
+    """
+    Yield (header, sequence) for each FASTA record, one at a time.
+
+    Sequence lines are joined and blank lines ignored.  Lines before the
+    first header are yielded as one record with header None.
+
+    Args:
+        source: A file path, an open text file, or any iterable of lines
+                (for FASTA text already in memory, pass text.splitlines()).
+
+    Yields:
+        (header line without '>', sequence)
+
+    Examples:
+        >>> list(iter_fasta([">seq1 human", "AC", "GT", "", ">seq2", "TTTT"]))
+        [('seq1 human', 'ACGT'), ('seq2', 'TTTT')]
+    """
+    header, parts, started = None, [], False
+    for line in _lines(source):
+        line = line.strip()
+        if not line:
+            continue
+        if line.startswith('>'):
+            if started:
+                yield header, ''.join(parts)
+            header, parts, started = line[1:], [], True
+        else:
+            parts.append(line)
+            started = True
+    if started:
+        yield header, ''.join(parts)
+
+
+def iter_fastq(source) -> Iterator[Tuple[str, str, str]]:
+    """
+    Yield (header, sequence, quality) for each four-line FASTQ record.
+
+    Raises:
+        ValueError: If a record is truncated or malformed.
+
+    Examples:
+        >>> list(iter_fastq(["@read1", "ACGT", "+", "IIII", "@read2", "GG", "+", "#I"]))
+        [('read1', 'ACGT', 'IIII'), ('read2', 'GG', '#I')]
+    """
+    lines = (line.rstrip('\r\n') for line in _lines(source))
+    for header in lines:
+        if not header:
+            continue
+        if not header.startswith('@'):
+            raise ValueError(f"expected a FASTQ header starting with '@', got {header[:30]!r}")
+        try:
+            sequence, plus, quality = next(lines), next(lines), next(lines)
+        except StopIteration:
+            raise ValueError(f"truncated FASTQ record {header[1:]!r}") from None
+        if not plus.startswith('+') or len(quality) != len(sequence):
+            raise ValueError(f"malformed FASTQ record {header[1:]!r}")
+        yield header[1:], sequence, quality
+
+
+def record_id(header: Optional[str]) -> Optional[str]:
+    """
+    First word of a header, the usual record identifier.
+
+    Examples:
+        >>> record_id("Rosalind_6404 some description")
+        'Rosalind_6404'
+    """
+    if header is None:
+        return None
+    words = header.split()
+    return words[0] if words else ''
+
+
+# ── Arrays ────────────────────────────────────────────────────────────────────
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("numpy is required for array output (pip install numpy)")
+
+
+_CODE_INVALID = 4
+if np is not None:
+    _TWO_BIT = np.full(256, _CODE_INVALID, dtype=np.uint8)
+    for _code, _base in enumerate('ACGT'):
+        _TWO_BIT[ord(_base)] = _code
+        _TWO_BIT[ord(_base.lower())] = _code
+
+
+def as_array(sequence, encoding: str = 'uint8'):
+    """
+    Convert a sequence to a NumPy array.
+
+    Args:
+        sequence: A string, bytes, or uint8 array of ASCII codes.
+        encoding: 'uint8' for ASCII codes, '2bit' for A=0 C=1 G=2 T=3
+                  (any other character becomes 4).
+
+    Examples:
+        >>> as_array("ACGTN", '2bit').tolist()
+        [0, 1, 2, 3, 4]
+        >>> as_array("AC").tolist()
+        [65, 67]
+    """
+    _require_numpy()
+    if isinstance(sequence, str):
+        sequence = sequence.encode('ascii')
+    codes = np.frombuffer(sequence, dtype=np.uint8) if isinstance(sequence, bytes) else sequence
+    if encoding == 'uint8':
+        return codes
+    if encoding == '2bit':
+        return _TWO_BIT[codes]
+    raise ValueError(f"encoding must be 'uint8' or '2bit', got {encoding!r}")
+
+
+def iter_fasta_arrays(source, encoding: str = 'uint8') -> Iterator[Tuple[Optional[str], 'np.ndarray']]:
+    """
+    Stream FASTA records as (header, array) pairs.
+
+    Examples:
+        >>> [(h, a.tolist()) for h, a in iter_fasta_arrays([">s", "ACGT"], '2bit')]
+        [('s', [0, 1, 2, 3])]
+    """
+    for header, sequence in iter_fasta(source):
+        yield header, as_array(sequence, encoding)
+
+
+def sequence_matrix(sequences, encoding: str = 'uint8') -> 'np.ndarray':
+    """
+    Stack equal-length sequences into an (n_seqs × length) array.
+
+    One join and one frombuffer: no per-character Python work.
+
+    Raises:
+        ValueError: If the sequences differ in length.
+
+    Examples:
+        >>> sequence_matrix(["ACGT", "TTGA"], '2bit').tolist()
+        [[0, 1, 2, 3], [3, 3, 2, 0]]
+    """
+    _require_numpy()
+    sequences = list(sequences)
+    length = len(sequences[0]) if sequences else 0
+    if any(len(s) != length for s in sequences):
+        raise ValueError("All sequences must have the same length.")
+    codes = np.frombuffer(''.join(sequences).encode('ascii'), dtype=np.uint8)
+    return as_array(codes.reshape(len(sequences), length), encoding)
+
+
+# ── Indexed random access ─────────────────────────────────────────────────────
+
+FAI_COLUMNS = ('name', 'length', 'offset', 'line_bases', 'line_width')
+
+
+def build_fai(path, fai_path=None) -> List[tuple]:
+    """
+    Scan a FASTA file once and write its ".fai" index.
+
+    The format is samtools faidx's: one tab-separated line per record with
+    name, length, offset of the first base, bases per line, bytes per line
+    (including the newline).
+
+    Args:
+        path:     FASTA file.
+        fai_path: Where to write the index (default: path + '.fai').
+
+    Returns:
+        List of (name, length, offset, line_bases, line_width) tuples.
+
+    Raises:
+        ValueError: If a record's lines (other than its last) differ in
+                    length, which would make O(1) offsets impossible.
+    """
+    entries = []
+    record = None
+    offset = 0
+
+    def finish():
+        if record is not None:
+            entries.append((record['name'], record['length'], record['offset'],
+                            record['line_bases'], record['line_width']))
+
+    with open(path, 'rb') as handle:
+        for line in handle:
+            width = len(line)
+            if line.startswith(b'>'):
+                finish()
+                words = line[1:].split()
+                record = {'name': words[0].decode() if words else '', 'length': 0,
+                          'offset': offset + width, 'line_bases': 0, 'line_width': 0,
+                          'ragged': False}
+            elif record is not None:
+                bases = len(line.rstrip(b'\r\n'))
+                if bases == 0:
+                    record['ragged'] = True
+                elif record['line_bases'] == 0 and record['length'] == 0:
+                    record['line_bases'], record['line_width'] = bases, width
+                elif record['ragged'] or bases > record['line_bases']:
+                    raise ValueError(f"record {record['name']!r}: lines must all have "
+                                     f"the same length except the last")
+                elif bases < record['line_bases'] or width != record['line_width']:
+                    record['ragged'] = True
+                record['length'] += bases
+            offset += width
+    finish()
+
+    with open(fai_path or f"{os.fspath(path)}.fai", 'w') as handle:
+        for entry in entries:
+            handle.write('\t'.join(map(str, entry)) + '\n')
+    return entries
+
+
+def read_fai(fai_path) -> List[tuple]:
+    """Read the entries written by build_fai()."""
+    entries = []
+    with open(fai_path) as handle:
+        for line in handle:
+            name, *numbers = line.rstrip('\n').split('\t')
+            entries.append((name, *map(int, numbers[:4])))
+    return entries
+
+
+class FastaIndex:
+    """
+    Random access to the records of a FASTA file through a .fai index.
+
+    The file is memory-mapped: only the pages holding the requested bases
+    are read, so files larger than RAM are fine.  The index is built on
+    first use and reused afterwards (rebuilt if the FASTA is newer).
+
+    Examples (doctest-free; see test_all.py):
+        index = FastaIndex('genome.fa')
+        index.names                    # ['chr1', 'chr2', ...]
+        index.fetch('chr2', 100, 160)  # 60 bases as a string
+        index.fetch_array('chr2', encoding='2bit')
+    """
+
+    def __init__(self, path):
+        self.path = os.fspath(path)
+        fai_path = f"{self.path}.fai"
+        if (os.path.exists(fai_path)
+                and os.path.getmtime(fai_path) >= os.path.getmtime(self.path)):
+            entries = read_fai(fai_path)
+        else:
+            entries = build_fai(self.path, fai_path)
+        self.entries: Dict[str, tuple] = {entry[0]: entry for entry in entries}
+        self.names = [entry[0] for entry in entries]
+        self._handle = open(self.path, 'rb')
+        size = os.path.getsize(self.path)
+        self._map = mmap.mmap(self._handle.fileno(), 0, access=mmap.ACCESS_READ) if size else b''
+
+    def close(self):
+        if isinstance(self._map, mmap.mmap):
+            self._map.close()
+        self._handle.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return name in self.entries
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def length(self, name: str) -> int:
+        """Number of bases in record name."""
+        return self.entries[name][1]
+
+    def _byte(self, entry, position: int) -> int:
+        _, _, offset, line_bases, line_width = entry
+        if line_bases == 0:
+            return offset
+        return offset + (position // line_bases) * line_width + position % line_bases
+
+    def fetch_bytes(self, name: str, start: int = 0, end: Optional[int] = None) -> bytes:
+        """Bases start..end-1 of record name as bytes (0-based, end exclusive)."""
+        entry = self.entries[name]
+        length = entry[1]
+        end = length if end is None else min(end, length)
+        start = max(0, start)
+        if start >= end:
+            return b''
+        raw = self._map[self._byte(entry, start):self._byte(entry, end - 1) + 1]
+        return raw.replace(b'\n', b'').replace(b'\r', b'')
+
+    def fetch(self, name: str, start: int = 0, end: Optional[int] = None) -> str:
+        """Bases start..end-1 of record name as a string."""
+        return self.fetch_bytes(name, start, end).decode('ascii')
+
+    def __getitem__(self, name: str) -> str:
+        return self.fetch(name)
+
+    def fetch_array(self, name: str, start: int = 0, end: Optional[int] = None,
+                    encoding: str = 'uint8'):
+        """Bases start..end-1 of record name as a uint8 or 2-bit NumPy array."""
+        _require_numpy()
+        entry = self.entries[name]
+        length = entry[1]
+        end = length if end is None else min(end, length)
+        start = max(0, start)
+        if start >= end:
+            return np.empty(0, dtype=np.uint8)
+        first, last = self._byte(entry, start), self._byte(entry, end - 1) + 1
+        raw = np.frombuffer(self._map, dtype=np.uint8, count=last - first, offset=first)
+        codes = raw[(raw != ord('\n')) & (raw != ord('\r'))]
+        return as_array(codes, encoding)
+
+
+# ── Demo ──────────────────────────────────────────────────────────────────────
+
+if __name__ == "__main__":
+    import random
+    import tempfile
+    import time
+
+    print("=" * 70)
+    print("SEQUENCE I/O: STREAMING AND INDEXED ACCESS")
+    print("=" * 70)
+
+    sample = """\
+>Rosalind_6404
+CCTGCGGAAGATCGGCACTAGAATAGCCAGAACCGTTTCTCTGAGGCTTCCGGCCTTCCC
+TCCCACTAATAATTCTGAGG
+>Rosalind_5959
+CCATCGGTAGCGCATCCTTAGTCCAATTAAGTCCCTATCCAGGCGCTCCGCCGAAGGTCT
+ATATCCATTTGTCAGCAGACACGC
+"""
+    print("\nStreaming records:")
+    for header, sequence in iter_fasta(sample.splitlines()):
+        print(f"  {record_id(header)}: {len(sequence)} bp")
+
+    rng = random.Random(1)
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, 'genome.fa')
+        with open(path, 'w') as handle:
+            for chrom in range(1, 6):
+                sequence = ''.join(rng.choices('ACGT', k=2_000_000))
+                handle.write(f">chr{chrom}\n")
+                for i in range(0, len(sequence), 60):
+                    handle.write(sequence[i:i + 60] + '\n')
+        print(f"\nFASTA file: 5 records, {os.path.getsize(path) / 1e6:.1f} MB")
+
+        start = time.perf_counter()
+        build_fai(path)
+        print(f"  Build .fai index:  {time.perf_counter() - start:.2f} s")
+        with open(path + '.fai') as handle:
+            print("  " + handle.readline().strip())
+
+        with FastaIndex(path) as index:
+            start = time.perf_counter()
+            for _ in range(10_000):
+                position = rng.randrange(1_999_900)
+                index.fetch('chr4', position, position + 100)
+            elapsed = time.perf_counter() - start
+            print(f"  10,000 random 100 bp fetches: {elapsed:.3f} s")
+            print(f"  chr3[1,000,000:1,000,030] = {index.fetch('chr3', 1_000_000, 1_000_030)}")
+            if np is not None:
+                codes = index.fetch_array('chr5', encoding='2bit')
+                print(f"  chr5 as 2-bit array: {codes.shape[0]:,} codes, "
+                      f"base counts {np.bincount(codes, minlength=4)[:4].tolist()}")
+
+    print("\n" + "=" * 70)
+    print("KEY TAKEAWAYS")
+    print("=" * 70)
+    print("✓ Generators stream one record at a time — memory does not grow with file size")
+    print("✓ A .fai index stores each record's offset and line layout")
+    print("✓ With fixed-width lines, any base's byte position is O(1) arithmetic")
+    print("✓ mmap reads only the pages that are touched")
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Test suite for the sequence-io module.
+Run this file to verify the shared sequence readers are working correctly.
+
+Modules covered:
+  01  Streaming FASTA/FASTQ and .fai-indexed random access
+"""
+
+import sys
+import os
+import random
+import tempfile
+import importlib.util
+
+
+def load_module(filename: str):
+    """Load a Python module from a file path relative to this directory."""
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), filename)
+    spec = importlib.util.spec_from_file_location(filename[:-3], path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# TEST 1: Streaming FASTA/FASTQ and indexed random access
+# ─────────────────────────────────────────────────────────────────────────────
+
+def test_sequence_io():
+    print("\n" + "=" * 70)
+    print("TEST 1: Streaming FASTA/FASTQ and indexed random access")
+    print("=" * 70)
+
+    mod = load_module('01_sequence_io.py')
+
+    # --- iter_fasta() ---
+
+    sample = ">Rosalind_1 first\nACG\nTAC\n\n>Rosalind_2\nGGGG\n>empty\n"
+    records = list(mod.iter_fasta(sample.splitlines()))
+    assert records == [('Rosalind_1 first', 'ACGTAC'), ('Rosalind_2', 'GGGG'), ('empty', '')]
+    print("✓ iter_fasta joins multi-line records and keeps empty ones")
+
+    assert list(mod.iter_fasta(["ACGT", "TT", ">s", "A"])) == [(None, 'ACGTTT'), ('s', 'A')]
+    print("✓ iter_fasta yields headerless leading lines with header None")
+
+    assert mod.record_id('Rosalind_1 first') == 'Rosalind_1'
+    print("✓ record_id takes the first word of a header")
+
+    # --- iter_fastq() ---
+
+    fastq = ["@r1", "ACGT", "+", "IIII", "", "@r2 lane 2", "GG", "+r2", "#I"]
+    assert list(mod.iter_fastq(fastq)) == [('r1', 'ACGT', 'IIII'), ('r2 lane 2', 'GG', '#I')]
+    print("✓ iter_fastq reads four-line records")
+
+    for bad in (["@r1", "ACGT", "+"], ["@r1", "ACGT", "+", "III"], ["r1", "A", "+", "I"]):
+        try:
+            list(mod.iter_fastq(bad))
+            raise AssertionError(f"malformed FASTQ accepted: {bad}")
+        except ValueError:
+            pass
+    print("✓ iter_fastq rejects truncated and malformed records")
+
+    # --- .fai index and random access ---
+
+    rng = random.Random(7)
+    with tempfile.TemporaryDirectory() as folder:
+        for trial in range(40):
+            newline = rng.choice(['\n', '\r\n'])
+            expected = {}
+            lines = []
+            for i in range(rng.randint(1, 4)):
+                seq = ''.join(rng.choices('ACGTN', k=rng.randint(0, 250)))
+                width = rng.randint(1, 70)
+                expected[f'chr{i}'] = seq
+                lines.append(f'>chr{i} description{newline}')
+                lines.extend(seq[j:j + width] + newline for j in range(0, len(seq), width))
+            text = ''.join(lines)
+            if trial % 3 == 0:
+                text = text.rstrip('\r\n')
+            path = os.path.join(folder, f'genome{trial}.fa')
+            with open(path, 'w', newline='') as handle:
+                handle.write(text)
+
+            assert {mod.record_id(h): s for h, s in mod.iter_fasta(path)} == expected
+            with mod.FastaIndex(path) as index:
+                assert index.names == list(expected)
+                for name, seq in expected.items():
+                    assert index[name] == seq and index.length(name) == len(seq)
+                    for _ in range(10):
+                        start = rng.randint(-2, len(seq) + 2)
+                        end = rng.randint(max(start, 0), len(seq) + 5)
+                        assert index.fetch(name, start, end) == seq[max(start, 0):end]
+                        if mod.np is not None:
+                            codes = index.fetch_array(name, start, end)
+                            assert codes.tobytes() == seq[max(start, 0):end].encode()
+            assert os.path.exists(path + '.fai')
+            assert [entry[0] for entry in mod.read_fai(path + '.fai')] == list(expected)
+    print("✓ FastaIndex.fetch matches slicing on 40 random files (\\n and \\r\\n, any line width)")
+
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, 'sample.fa')
+        with open(path, 'w') as handle:
+            handle.write(">chr1\nACGTA\nCGTAC\nGT\n>chr2\nTTTT\n")
+        entries = mod.build_fai(path)
+        assert entries == [('chr1', 12, 6, 5, 6), ('chr2', 4, 27, 4, 5)]
+        with open(path + '.fai') as handle:
+            assert handle.readline() == "chr1\t12\t6\t5\t6\n"
+        print("✓ build_fai writes samtools-compatible columns")
+
+        with mod.FastaIndex(path) as index:
+            assert index.fetch('chr1', 3, 9) == 'TACGTA'
+            assert 'chr2' in index and len(index) == 2
+            if mod.np is not None:
+                assert index.fetch_array('chr1', 0, 6, encoding='2bit').tolist() == [0, 1, 2, 3, 0, 1]
+        print("✓ fetch crosses line breaks; fetch_array returns 2-bit codes")
+
+        ragged = os.path.join(folder, 'ragged.fa')
+        with open(ragged, 'w') as handle:
+            handle.write(">a\nACG\nAC\nACG\n")
+        try:
+            mod.build_fai(ragged)
+            raise AssertionError("ragged FASTA accepted")
+        except ValueError:
+            pass
+        print("✓ build_fai rejects records with uneven line lengths")
+
+    # --- arrays ---
+
+    if mod.np is not None:
+        assert mod.as_array("acgtN", '2bit').tolist() == [0, 1, 2, 3, 4]
+        arrays = list(mod.iter_fasta_arrays([">s", "AC", "GT"], '2bit'))
+        assert arrays[0][0] == 's' and arrays[0][1].tolist() == [0, 1, 2, 3]
+        print("✓ as_array / iter_fasta_arrays encode sequences as 2-bit codes")
+
+        matrix = mod.sequence_matrix(["ACGT", "acgN"])
+        assert matrix.shape == (2, 4) and matrix.tobytes() == b"ACGTacgN"
+        assert mod.sequence_matrix(["ACGT", "acgN"], '2bit').tolist() == [[0, 1, 2, 3], [0, 1, 2, 4]]
+        try:
+            mod.sequence_matrix(["ACGT", "ACG"])
+            raise AssertionError("unequal lengths accepted")
+        except ValueError:
+            pass
+        print("✓ sequence_matrix stacks equal-length sequences into an (n × L) array")
+
+    return True
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Main runner
+# ─────────────────────────────────────────────────────────────────────────────
+
+def main():
+    print("=" * 70)
+    print("SEQUENCE I/O – TEST SUITE")
+    print("=" * 70)
+    print("Testing streaming FASTA/FASTQ | .fai index | memory-mapped random access\n")
+
+    tests = [test_sequence_io]
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+        except Exception as exc:
+            import traceback
+            print(f"✗ Test failed: {exc}")
+            traceback.print_exc()
+            failed += 1
+
+    print("\n" + "=" * 70)
+    print("SUMMARY")
+    print("=" * 70)
+    print(f"Passed: {passed} / {len(tests)}")
+    if failed == 0:
+        print("\n🎉 All tests passed!")
+        return 0
+    else:
+        print(f"\n❌ {failed} test(s) failed.")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -61,6 +61,9 @@ class TreeNode:
                               The root's distance is typically 0.0.
     """
 
+    # No per-instance __dict__: a million-node tree needs far less memory
+    __slots__ = ("name", "left", "right", "distance")
+
     def __init__(
         self,
         name: str = "",
@@ -27,10 +27,34 @@ Examples:
   With branch lengths:      (A:0.1,B:0.2)root:0.0;
   Four-taxon tree:          ((A:0.1,B:0.1):0.05,(C:0.05,D:0.05):0.05);
 
+Large Trees
+-----------
+A Newick string mirrors the tree, so the natural reader and writer are
+recursive — and a caterpillar tree ((((A,B),C),D),...) with 50,000 taxa
+is 50,000 levels deep, far past Python's recursion limit.  Building each
+subtree's string and pasting it into its parent's also copies every
+character once per level above it.
+
+This module therefore works without recursion:
+
+  - tokenize_newick() reads a string or a file in chunks and yields
+    tokens: one of ( ) , : ; or the text between them.
+  - The parser keeps the open "(" nodes on an explicit stack.
+  - FlatTree stores a tree as parallel arrays indexed by node number
+    (parent, first child, next sibling, name, distance) instead of one
+    Python object per node.
+  - iter_newick() walks the tree with an explicit stack and yields the
+    text in chunks; write_newick() sends them straight to a file.
+
+A million-leaf tree round-trips through a file without the whole text
+ever being in memory.
+
 Learning Objectives
 -------------------
-- Convert a TreeNode tree to a Newick string recursively
+- Convert a TreeNode tree to a Newick string
 - Write a basic Newick parser to reconstruct a tree from a string
+- Replace recursion with an explicit stack for very deep trees
+- Stream text in chunks instead of building one huge string
 - Appreciate that Newick is the standard exchange format for trees
 """
 
@@ -39,6 +63,13 @@ import re
 import importlib.util
 import os
 import sys
+from array import array
+
+# Characters read / written per chunk
+CHUNK_SIZE = 1 << 16
+
+_PUNCTUATION = frozenset("(),:;")
+_TOKEN = re.compile(r"[(),:;]|[^(),:;]+")
 
 
 def _load_tree_node():
@@ -50,18 +81,211 @@ def _load_tree_node():
     return mod.TreeNode
 
 
+# ─────────────────────────────────────────────────────────────────────────────
+# Array-backed tree
+# ─────────────────────────────────────────────────────────────────────────────
+
+class FlatTree:
+    """
+    A tree stored as parallel arrays: node k is names[k], distances[k],
+    parent[k], first_child[k] and next_sibling[k] (-1 = none).
+
+    Node 0 is the root and every node is added after its parent, so
+    children always have larger numbers than their parent.  Nodes may have
+    any number of children.
+
+    Examples:
+        >>> tree = FlatTree()
+        >>> root = tree.add_node()
+        >>> a = tree.add_node(root, "A", 0.1)
+        >>> b = tree.add_node(root, "B", 0.2)
+        >>> tree.children(root), tree.count_leaves()
+        ([1, 2], 2)
+        >>> to_newick(tree)
+        '(A:0.10000,B:0.20000);'
+    """
+
+    __slots__ = ("names", "distances", "parent", "first_child", "next_sibling",
+                 "_last_child")
+
+    def __init__(self) -> None:
+        self.names        = []
+        self.distances    = array("d")
+        self.parent       = array("i")
+        self.first_child  = array("i")
+        self.next_sibling = array("i")
+        self._last_child  = array("i")
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def add_node(self, parent: int = -1, name: str = "", distance: float = 0.0) -> int:
+        """
+        Append a node as the last child of parent (-1 for the root).
+
+        Returns:
+            The new node's number.
+
+        Raises:
+            ValueError: if a second root is added.
+        """
+        k = len(self.names)
+        if parent < 0 and k:
+            raise ValueError("tree already has a root")
+        self.names.append(name)
+        self.distances.append(distance)
+        self.parent.append(parent)
+        self.first_child.append(-1)
+        self.next_sibling.append(-1)
+        self._last_child.append(-1)
+        if parent >= 0:
+            last = self._last_child[parent]
+            if last < 0:
+                self.first_child[parent] = k
+            else:
+                self.next_sibling[last] = k
+            self._last_child[parent] = k
+        return k
+
+    def children(self, k: int) -> list[int]:
+        """Child numbers of node k, in order."""
+        result = []
+        child = self.first_child[k]
+        while child >= 0:
+            result.append(child)
+            child = self.next_sibling[child]
+        return result
+
+    def is_leaf(self, k: int) -> bool:
+        return self.first_child[k] < 0
+
+    def count_leaves(self) -> int:
+        return self.first_child.count(-1)
+
+    def to_treenode(self):
+        """
+        Convert to linked TreeNode objects (first two children of each node,
+        as parse_newick has always done).  Built bottom-up, without recursion.
+        """
+        TreeNodeClass = _load_tree_node()
+        nodes = [None] * len(self)
+        for k in range(len(self) - 1, -1, -1):
+            kids = self.children(k)[:2] + [None, None]
+            nodes[k] = TreeNodeClass(
+                name=self.names[k],
+                left=nodes[kids[0]] if kids[0] is not None else None,
+                right=nodes[kids[1]] if kids[1] is not None else None,
+                distance=self.distances[k],
+            )
+        return nodes[0]
+
+    @classmethod
+    def from_treenode(cls, root) -> "FlatTree":
+        """Convert a TreeNode tree (preorder numbering, no recursion)."""
+        tree = cls()
+        stack = [(root, -1)]
+        while stack:
+            node, parent = stack.pop()
+            k = tree.add_node(parent, node.name, node.distance)
+            for child in (node.right, node.left):
+                if child is not None:
+                    stack.append((child, k))
+        return tree
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # Newick serialiser
 # ─────────────────────────────────────────────────────────────────────────────
 
+def _pieces(root, describe, include_root_distance: bool):
+    """
+    Yield the Newick text of a tree in small pieces (no semicolon).
+
+    describe(node) returns (name, distance, children).  Pending work sits
+    on an explicit stack: nodes still to write, and the "," and ")name:d"
+    text that goes between and after them.
+    """
+    name, distance, children = describe(root)
+    if not children:
+        yield f"{name}:{distance:.5f}"
+        return
+    close = f"){name}:{distance:.5f}" if include_root_distance else f"){name}"
+    stack = [close]
+    for child in reversed(children):
+        stack.append(child)
+        stack.append(",")
+    stack.pop()
+    yield "("
+
+    while stack:
+        item = stack.pop()
+        if item.__class__ is str:
+            yield item
+            continue
+        name, distance, children = describe(item)
+        if not children:
+            yield f"{name}:{distance:.5f}"
+            continue
+        stack.append(f"){name}:{distance:.5f}")
+        for child in reversed(children):
+            stack.append(child)
+            stack.append(",")
+        stack.pop()
+        yield "("
+
+
+def iter_newick(tree, include_root_distance: bool = False,
+                chunk_size: int = CHUNK_SIZE):
+    """
+    Yield the Newick text of a tree in chunks of about chunk_size characters.
+
+    Args:
+        tree:                  A FlatTree, or the root of a TreeNode tree.
+        include_root_distance: Append ":distance" for the root as well.
+        chunk_size:            Approximate characters per chunk.
+
+    Yields:
+        Strings whose concatenation is the Newick text, ending with ";".
+
+    Examples:
+        >>> tree = parse_newick("((A:1,B:2):3,C:4);")
+        >>> list(iter_newick(tree, chunk_size=12))
+        ['((A:1.00000,', 'B:2.00000):3.00000', ',C:4.00000);']
+    """
+    if isinstance(tree, FlatTree):
+        names, distances = tree.names, tree.distances
+        root = 0
+
+        def describe(k):
+            return names[k], distances[k], tree.children(k)
+    else:
+        root = tree
+
+        def describe(node):
+            children = [c for c in (node.left, node.right) if c is not None]
+            return node.name, node.distance, children
+
+    buffer, size = [], 0
+    for piece in _pieces(root, describe, include_root_distance):
+        buffer.append(piece)
+        size += len(piece)
+        if size >= chunk_size:
+            yield "".join(buffer)
+            buffer, size = [], 0
+    buffer.append(";")
+    yield "".join(buffer)
+
+
 def to_newick(node, include_root_distance: bool = False) -> str:
     """
-    Convert a TreeNode tree to a Newick format string.
+    Convert a TreeNode tree (or a FlatTree) to a Newick format string.
 
-    Recursion:
-      - Leaf:     return  "name:distance"
-      - Internal: return  "(left_newick,right_newick)name:distance"
+    Structure:
+      - Leaf:     "name:distance"
+      - Internal: "(left_newick,right_newick)name:distance"
     The root gets no trailing distance by default (include_root_distance=False).
+    The tree is walked with an explicit stack (see iter_newick), so any
+    depth works.
 
     Args:
         node:                    Root of the tree (or any subtree).
@@ -81,34 +305,135 @@ def to_newick(node, include_root_distance: bool = False) -> str:
         >>> to_newick(root)
         '(A:0.10000,B:0.10000)r;'
     """
-    body = _newick_subtree(node, is_root=True,
-                           include_root_distance=include_root_distance)
-    return body + ";"
+    return "".join(iter_newick(node, include_root_distance))
 
 
-def _newick_subtree(node, is_root: bool = False,
-                    include_root_distance: bool = False) -> str:
-    """Recursive helper — returns the Newick string for a subtree (no semicolon)."""
-    if node.is_leaf():
-        return f"{node.name}:{node.distance:.5f}"
-
-    children = []
-    if node.left is not None:
-        children.append(_newick_subtree(node.left))
-    if node.right is not None:
-        children.append(_newick_subtree(node.right))
+def write_newick(tree, destination, include_root_distance: bool = False,
+                 chunk_size: int = CHUNK_SIZE) -> int:
+    """
+    Write a tree's Newick text to a path or open text file, chunk by chunk.
 
-    inner = f"({','.join(children)}){node.name}"
+    Args:
+        tree:        A FlatTree or the root of a TreeNode tree.
+        destination: File path, or an object with a write() method.
 
-    if is_root and not include_root_distance:
-        return inner
-    return f"{inner}:{node.distance:.5f}"
+    Returns:
+        Number of characters written.
+    """
+    if not hasattr(destination, "write"):
+        with open(destination, "w", encoding="utf-8") as handle:
+            return write_newick(tree, handle, include_root_distance, chunk_size)
+    written = 0
+    for chunk in iter_newick(tree, include_root_distance, chunk_size):
+        destination.write(chunk)
+        written += len(chunk)
+    return written
 
 
 # ─────────────────────────────────────────────────────────────────────────────
-# Newick parser (basic)
+# Newick parser
 # ─────────────────────────────────────────────────────────────────────────────
 
+def tokenize_newick(source, chunk_size: int = CHUNK_SIZE):
+    """
+    Yield the tokens of Newick text: ( ) , : ; or the text between them.
+
+    Args:
+        source:     A Newick string, or an open text file (read in chunks
+                    of chunk_size characters).
+        chunk_size: Characters per read.
+
+    Examples:
+        >>> list(tokenize_newick("(A:0.1,B)x;"))
+        ['(', 'A', ':', '0.1', ',', 'B', ')', 'x', ';']
+    """
+    if isinstance(source, str):
+        chunks = [source]
+    else:
+        chunks = iter(lambda: source.read(chunk_size), "")
+
+    carry = ""
+    for chunk in chunks:
+        tokens = _TOKEN.findall(carry + chunk)
+        # Text at the very end may continue in the next chunk
+        carry = tokens.pop() if tokens and tokens[-1] not in _PUNCTUATION else ""
+        yield from tokens
+    if carry:
+        yield carry
+
+
+def _parse_tokens(tokens) -> FlatTree:
+    """
+    Build a FlatTree from Newick tokens with an explicit stack.
+
+    stack holds the open internal nodes; node is the node whose label or
+    distance the next text token belongs to (-1: none yet — text starts a
+    new leaf).
+    """
+    tree = FlatTree()
+    names, distances, add_node = tree.names, tree.distances, tree.add_node
+    stack = []
+    node = -1
+    field = "name"
+    finished = False
+
+    for token in tokens:
+        if finished:
+            if token.strip():
+                raise ValueError(f"unexpected {token!r} after the end of the tree")
+        elif token == "(":
+            if node >= 0:
+                raise ValueError("'(' must start a new node")
+            stack.append(add_node(stack[-1] if stack else -1))
+        elif token == "," or token == ")":
+            if not stack:
+                raise ValueError(f"unbalanced {token!r}")
+            if node < 0:
+                add_node(stack[-1])          # empty leaf, as in "(,A)"
+            node = stack.pop() if token == ")" else -1
+            field = "name"
+        elif token == ":":
+            if node < 0:
+                node = add_node(stack[-1] if stack else -1)
+            field = "distance"
+        elif token == ";":
+            finished = True
+        else:
+            text = token.strip()
+            if not text:
+                continue
+            if node < 0:
+                node = add_node(stack[-1] if stack else -1)
+                field = "name"
+            if field == "name":
+                names[node] = text
+            else:
+                distances[node] = float(text)
+
+    if stack:
+        raise ValueError(f"{len(stack)} unclosed '('")
+    if not len(tree):
+        add_node()
+    return tree
+
+
+def read_newick(source, chunk_size: int = CHUNK_SIZE) -> FlatTree:
+    """
+    Read one Newick tree from a path or open text file into a FlatTree.
+
+    The file is read chunk_size characters at a time; only the tree's
+    arrays grow with its size.
+
+    Raises:
+        ValueError: if the parentheses are unbalanced or text follows the
+        tree.
+    """
+    if not hasattr(source, "read"):
+        with open(source, "r", encoding="utf-8") as handle:
+            return read_newick(handle, chunk_size)
+    return _parse_tokens(tokenize_newick(source, chunk_size))
+
+
 def parse_newick(newick_str: str):
     """
     Parse a Newick format string and return the root TreeNode.
@@ -117,11 +442,13 @@ def parse_newick(newick_str: str):
       - Leaf nodes with optional names and distances:  A:0.1  or  A  or  :0.1
       - Internal nodes with optional labels:           (A,B)ancestor:0.5
       - Semicolon terminator (stripped automatically)
-      - Nested trees of arbitrary depth
+      - Nested trees of arbitrary depth (no recursion is used)
 
     Limitations:
       - Does not support quoted names with special characters
       - Does not support comments ([ ... ])
+      - TreeNode is binary: only the first two children of a node are kept
+        (read_newick keeps them all)
 
     Args:
         newick_str: A valid Newick string, optionally ending with ";".
@@ -129,6 +456,9 @@ def parse_newick(newick_str: str):
     Returns:
         Root TreeNode reconstructed from the Newick string.
 
+    Raises:
+        ValueError: if the parentheses are unbalanced.
+
     Examples:
         >>> root = parse_newick("(A:0.1,B:0.1)root;")
         >>> root.name
@@ -136,78 +466,39 @@ def parse_newick(newick_str: str):
         >>> root.count_leaves()
         2
     """
-    TreeNodeClass = _load_tree_node()
+    return _parse_tokens(tokenize_newick(newick_str.strip())).to_treenode()
 
-    s = newick_str.strip()
-    if s.endswith(";"):
-        s = s[:-1]
-
-    node, pos = _parse_node(s, 0, TreeNodeClass)
-    return node
 
+# ─────────────────────────────────────────────────────────────────────────────
+# Benchmark helpers
+# ─────────────────────────────────────────────────────────────────────────────
 
-def _parse_node(s: str, pos: int, TreeNodeClass):
+def random_flat_tree(n_leaves: int, seed: int = 0) -> FlatTree:
     """
-    Recursively parse one node (subtree) starting at position pos.
+    Random rooted binary FlatTree with leaves t0 … t{n-1} and random
+    branch lengths in [0, 1).
 
-    Returns (TreeNode, new_pos).
+    Examples:
+        >>> random_flat_tree(1000, seed=1).count_leaves()
+        1000
     """
-    if pos < len(s) and s[pos] == "(":
-        # Internal node: parse children
-        pos += 1  # skip '('
-        children = []
-        while True:
-            child, pos = _parse_node(s, pos, TreeNodeClass)
-            children.append(child)
-            if pos >= len(s):
-                break
-            if s[pos] == ",":
-                pos += 1  # skip ','
-            elif s[pos] == ")":
-                pos += 1  # skip ')'
-                break
-            else:
-                break
-
-        # Optional internal-node label and distance
-        label, dist, pos = _parse_label_dist(s, pos)
-        node = TreeNodeClass(
-            name=label,
-            left=children[0] if len(children) > 0 else None,
-            right=children[1] if len(children) > 1 else None,
-            distance=dist,
-        )
-        return node, pos
-    else:
-        # Leaf node
-        label, dist, pos = _parse_label_dist(s, pos)
-        node = TreeNodeClass(name=label, distance=dist)
-        return node, pos
-
-
-def _parse_label_dist(s: str, pos: int) -> tuple[str, float, int]:
-    """Parse an optional 'name:distance' fragment starting at pos."""
-    # Collect characters until we hit ')', ',', or end of string
-    name_chars = []
-    while pos < len(s) and s[pos] not in (")", ",", ";"):
-        if s[pos] == ":":
-            pos += 1
-            break
-        name_chars.append(s[pos])
-        pos += 1
-
-    label = "".join(name_chars).strip()
-
-    # Try to parse a distance after ':'
-    dist_chars = []
-    while pos < len(s) and s[pos] not in (")", ",", "(", ";"):
-        dist_chars.append(s[pos])
-        pos += 1
-
-    dist_str = "".join(dist_chars).strip()
-    dist = float(dist_str) if dist_str else 0.0
-
-    return label, dist, pos
+    import collections
+    import random
+
+    rng = random.Random(seed)
+    tree = FlatTree()
+    pending = collections.deque([(tree.add_node(), n_leaves)])
+    leaf = 0
+    while pending:
+        k, size = pending.popleft()
+        if size == 1:
+            tree.names[k] = f"t{leaf}"
+            leaf += 1
+            continue
+        left = rng.randint(1, size - 1)
+        pending.append((tree.add_node(k, "", rng.random()), left))
+        pending.append((tree.add_node(k, "", rng.random()), size - left))
+    return tree
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -283,6 +574,38 @@ if __name__ == "__main__":
     print(f"\nIndented tree:")
     print(apes_root)
 
+    # Deep and large trees
+    import tempfile
+    import time
+
+    print("\n── Caterpillar tree: 50,000 taxa, 50,000 levels deep ──")
+    n = 50_000
+    deep = ("(" * (n - 1) + "t0:1.00000"
+            + "".join(f",t{k}:1.00000):1.00000" for k in range(1, n - 1))
+            + f",t{n - 1}:1.00000);")
+    start = time.perf_counter()
+    same = to_newick(parse_newick(deep)) == deep
+    print(f"  parse_newick + to_newick: {time.perf_counter() - start:.2f} s, "
+          f"round-trip matches: {same}")
+
+    n = 1_000_000
+    print(f"\n── {n:,}-leaf tree through a file ──")
+    tree = random_flat_tree(n)
+    with tempfile.TemporaryDirectory() as folder:
+        first, second = (os.path.join(folder, name) for name in ("a.nwk", "b.nwk"))
+        start = time.perf_counter()
+        size = write_newick(tree, first)
+        print(f"  write_newick: {time.perf_counter() - start:5.2f} s ({size / 1e6:.1f} MB)")
+        start = time.perf_counter()
+        tree = read_newick(first)
+        print(f"  read_newick:  {time.perf_counter() - start:5.2f} s "
+              f"({tree.count_leaves():,} leaves)")
+        write_newick(tree, second)
+        with open(first) as a, open(second) as b:
+            same = all(x == y for x, y in zip(iter(lambda: a.read(CHUNK_SIZE), ""),
+                                              iter(lambda: b.read(CHUNK_SIZE), "")))
+        print(f"  Rewritten file identical: {same}")
+
     print("\n" + "=" * 70)
     print("KEY TAKEAWAYS")
     print("=" * 70)
@@ -290,3 +613,5 @@ if __name__ == "__main__":
     print("✓ Branch lengths follow a colon: name:distance")
     print("✓ Semicolon terminates the entire tree string")
     print("✓ Virtually all phylogenetics software supports Newick")
+    print("✓ An explicit stack handles trees of any depth")
+    print("✓ Chunked reading and writing never holds the whole text")
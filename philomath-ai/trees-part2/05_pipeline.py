@@ -35,6 +35,14 @@ Learning Objectives
 - Apply UPGMA to multiple real biological datasets
 - Interpret phylogenetic trees in evolutionary context
 - Understand where UPGMA succeeds and where it can fail
+
+Engines
+-------
+run_pipeline builds the tree with one of three engines:
+
+    "classic"  upgma (03) — the readable O(n³) version (default)
+    "fast"     upgma_fast (08) — same tree, O(n²) in-place matrix
+    "nj"       neighbor_joining (08) — no molecular-clock assumption
 """
 
 from __future__ import annotations
@@ -203,6 +211,41 @@ def load_csv(filepath: str) -> dict:
     return {"labels": labels, "matrix": rows}
 
 
+# ─────────────────────────────────────────────────────────────────────────────
+# Tree-building engines
+# ─────────────────────────────────────────────────────────────────────────────
+
+ENGINES = ("classic", "fast", "nj")
+
+# Larger inputs skip printing the matrix and the ASCII tree
+MAX_DISPLAY_TAXA = 30
+
+
+def build_tree(distance_matrix, labels: list[str], engine: str = "classic"):
+    """
+    Build a tree with the chosen engine (see ENGINES).
+
+    Args:
+        distance_matrix: Symmetric n×n pairwise distance matrix.
+        labels:          Taxon names (length n).
+        engine:          "classic" (03 upgma), "fast" (08 upgma_fast)
+                         or "nj" (08 neighbor_joining).
+
+    Returns:
+        Root TreeNode.
+
+    Raises:
+        ValueError: if engine is unknown.
+    """
+    if engine == "classic":
+        return _load("03_upgma.py").upgma(distance_matrix, labels)
+    if engine == "fast":
+        return _load("08_cluster_engine.py").upgma_fast(distance_matrix, labels)
+    if engine == "nj":
+        return _load("08_cluster_engine.py").neighbor_joining(distance_matrix, labels)
+    raise ValueError(f"engine must be one of {', '.join(ENGINES)}, got {engine!r}")
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # Pipeline runner
 # ─────────────────────────────────────────────────────────────────────────────
@@ -212,20 +255,25 @@ def run_pipeline(
     labels: list[str],
     dataset_name: str = "",
     description: str = "",
+    engine: str = "classic",
 ) -> dict:
     """
     Run the complete UPGMA phylogenetics pipeline on a distance matrix.
 
     Steps:
-      1. Run UPGMA to build the TreeNode tree
+      1. Build the TreeNode tree with the chosen engine
       2. Convert to Newick string
       3. Display ASCII tree and Newick output
 
+    The matrix and the ASCII tree are only printed for up to
+    MAX_DISPLAY_TAXA taxa.
+
     Args:
         distance_matrix: Symmetric n×n pairwise distance matrix.
         labels:          Taxon names (length n).
         dataset_name:    Human-readable name for display (optional).
         description:     Background text to print (optional).
+        engine:          "classic", "fast" or "nj" (see build_tree).
 
     Returns:
         dict with keys:
@@ -233,7 +281,6 @@ def run_pipeline(
           "newick" — Newick format string
           "leaves" — number of leaf nodes
     """
-    upgma_mod  = _load("03_upgma.py")
     newick_mod = _load("04_newick.py")
 
     n = len(labels)
@@ -245,21 +292,25 @@ def run_pipeline(
         print(f"\n{description}\n")
 
     # Print distance matrix
-    col_w = max(len(lb) for lb in labels) + 2
-    header = " " * col_w + "".join(f"{lb:>{col_w}}" for lb in labels)
-    print(header)
-    for i, row in enumerate(distance_matrix):
-        cells = "".join(f"{v:>{col_w}.4f}" for v in row)
-        print(f"{labels[i]:<{col_w}}{cells}")
-
-    # Run UPGMA
-    root = upgma_mod.upgma(distance_matrix, labels)
+    if n <= MAX_DISPLAY_TAXA:
+        col_w = max(len(lb) for lb in labels) + 2
+        header = " " * col_w + "".join(f"{lb:>{col_w}}" for lb in labels)
+        print(header)
+        for i, row in enumerate(distance_matrix):
+            cells = "".join(f"{v:>{col_w}.4f}" for v in row)
+            print(f"{labels[i]:<{col_w}}{cells}")
+    else:
+        print(f"{n} taxa (matrix not shown)")
+
+    # Build the tree
+    root = build_tree(distance_matrix, labels, engine)
 
     # Newick
     newick = newick_mod.to_newick(root)
 
-    print(f"\n── ASCII Tree ──")
-    print(root)
+    if n <= MAX_DISPLAY_TAXA:
+        print(f"\n── ASCII Tree ({engine}) ──")
+        print(root)
 
     print(f"\n── Newick ──")
     print(f"  {newick}")
@@ -15,7 +15,10 @@ Usage
     python 06_cli.py upgma --dataset sars_cov2
     python 06_cli.py upgma --dataset mtdna_haplogroups
     python 06_cli.py upgma --file mydata.csv
+    python 06_cli.py upgma --file mydata.csv --engine fast
+    python 06_cli.py upgma --dataset hiv_subtypes --engine nj
     python 06_cli.py newick --dataset great_apes
+    python 06_cli.py newick --dataset great_apes --engine nj
     python 06_cli.py all
 
 Learning Objectives
@@ -94,6 +97,7 @@ def cmd_upgma(args) -> None:
             distance_matrix=data["matrix"],
             labels=data["labels"],
             dataset_name=os.path.basename(args.file),
+            engine=args.engine,
         )
     else:
         dataset_name = args.dataset or "great_apes"
@@ -107,6 +111,7 @@ def cmd_upgma(args) -> None:
             labels=ds["labels"],
             dataset_name=dataset_name,
             description=ds.get("description", ""),
+            engine=args.engine,
         )
 
 
@@ -114,7 +119,6 @@ def cmd_newick(args) -> None:
     """Output Newick format for a dataset."""
     pipeline   = _load("05_pipeline.py")
     newick_mod = _load("04_newick.py")
-    upgma_mod  = _load("03_upgma.py")
 
     dataset_name = args.dataset or "great_apes"
     if dataset_name not in pipeline.ALL_DATASETS:
@@ -123,7 +127,7 @@ def cmd_newick(args) -> None:
         sys.exit(1)
 
     ds   = pipeline.ALL_DATASETS[dataset_name]
-    root = upgma_mod.upgma(ds["matrix"], ds["labels"])
+    root = pipeline.build_tree(ds["matrix"], ds["labels"], args.engine)
     nwk  = newick_mod.to_newick(root)
 
     print("=" * 70)
@@ -183,6 +187,13 @@ def build_parser() -> argparse.ArgumentParser:
         metavar="CSV",
         help="Path to a CSV distance matrix file",
     )
+    upgma_p.add_argument(
+        "--engine", "-e",
+        choices=["classic", "fast", "nj"],
+        default="classic",
+        help="classic: readable O(n³) UPGMA; fast: O(n²) UPGMA; "
+             "nj: neighbor joining (default: classic)",
+    )
 
     # newick
     newick_p = subparsers.add_parser("newick", help="Output Newick format")
@@ -192,6 +203,12 @@ def build_parser() -> argparse.ArgumentParser:
         metavar="NAME",
         help="Dataset name (default: great_apes)",
     )
+    newick_p.add_argument(
+        "--engine", "-e",
+        choices=["classic", "fast", "nj"],
+        default="classic",
+        help="Tree-building engine (default: classic)",
+    )
 
     # all
     subparsers.add_parser("all", help="Run all demos")
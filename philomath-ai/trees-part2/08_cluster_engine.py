@@ -0,0 +1,540 @@
+"""
+Cluster Engine: O(n²) UPGMA and Neighbor Joining
+=================================================
+
+Chapter 5 of "Programming for Lovers in Python" — Trees Part 2
+by Phillip Compeau (Carnegie Mellon University).
+
+Background
+----------
+upgma (03) is written for clarity.  Each of its n − 1 merges calls
+find_min_distance, a full O(n²) scan, and update_distances, which copies
+the whole matrix without row j.  That is O(n³) time and a fresh n² list
+of lists on every step: fine for the 5–7 taxa of the built-in datasets,
+far too slow for a few thousand sequences.
+
+Engine Design
+-------------
+1. **Condensed matrix** — only the upper triangle D[i][j], i < j, is stored,
+   in one flat NumPy array (half the memory of a square matrix).  Row i's
+   entries to the right of the diagonal are one contiguous slice.
+
+2. **In place** — a merged cluster reuses the slot of its first member;
+   the second member's slot is marked inactive and its row and column are
+   overwritten with +inf, so it can never be chosen again.  Nothing is
+   copied or shrunk.
+
+3. **Row-minimum cache** — for every slot i we keep the smallest entry
+   of its row slice and its column.  The closest pair is then the
+   minimum of n cached values instead of n²/2 entries.  A merge changes
+   only row i and column j, so only the caches that pointed at i or j
+   are recomputed.
+
+Scanning the cache row by row picks the same pair as find_min_distance
+(the first minimum in row order), so upgma_fast builds exactly the tree
+that upgma builds.
+
+Neighbor Joining
+----------------
+Neighbor joining drops the molecular clock.  With m active clusters and
+row sums r_i it joins the pair that minimises
+
+    Q(i, j) = (m − 2)·D(i, j) − r_i − r_j
+
+Q changes everywhere whenever r changes, so it cannot be cached.  Instead
+each row keeps its 8 smallest entries, sorted (a "prefix"), and the
+smallest value c_i of the entries not in it.  Every entry outside the
+prefix then has
+
+    Q(i, j) ≥ (m − 2)·c_i − r_i − max_{j>i} r_j
+
+Q is evaluated on the prefixes only (an n × 8 array), and a row is
+scanned in full only when this bound does not exceed the best Q found.
+A row scanned in full gets a deeper prefix of 64 entries for later steps.
+The joined node u gets branch lengths
+
+    δ_i = D(i, j)/2 + (r_i − r_j) / (2(m − 2)),   δ_j = D(i, j) − δ_i
+    D(u, k) = (D(i, k) + D(j, k) − D(i, j)) / 2
+
+and the final pair is joined under a root at the midpoint of their edge.
+
+Learning Objectives
+-------------------
+- Store a symmetric matrix as a condensed upper triangle
+- Replace "delete row, copy matrix" with an active mask and in-place updates
+- Cache per-row minima so each step avoids a full O(n²) scan
+- Prune a search with a lower bound (neighbor joining)
+
+Requires: numpy
+"""
+
+from __future__ import annotations
+import importlib.util
+import os
+import time
+
+import numpy as np
+
+
+def _load_tree_node():
+    """Load TreeNode from 02_tree_node.py using importlib."""
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "02_tree_node.py")
+    spec = importlib.util.spec_from_file_location("tree_node", path)
+    mod  = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod.TreeNode
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Condensed distance matrix with row-minimum caches
+# ─────────────────────────────────────────────────────────────────────────────
+
+class CondensedMatrix:
+    """
+    Symmetric distance matrix stored as its upper triangle, with an active
+    mask and a cached minimum for every row.
+
+    Entry (i, j), i < j, lives at starts[i] + j − i − 1, so row i's entries
+    to the right of the diagonal are the slice starts[i] : starts[i+1].
+    Inactive slots hold +inf in their row and column.
+
+    Examples:
+        >>> cm = CondensedMatrix([[0, 5, 9], [5, 0, 3], [9, 3, 0]])
+        >>> cm.closest_pair()
+        (1, 2, 3.0)
+        >>> cm.row(1).tolist()
+        [5.0, inf, 3.0]
+    """
+
+    def __init__(self, distance_matrix) -> None:
+        matrix = np.asarray(distance_matrix, dtype=np.float64)
+        n = matrix.shape[0]
+        if matrix.shape != (n, n):
+            raise ValueError(f"distance matrix must be square, got shape {matrix.shape}")
+        self.n = n
+        slots = np.arange(n + 1, dtype=np.int64)
+        self.starts = slots * n - slots * (slots + 1) // 2
+        # One spare cell at the end stands in for the diagonal in row()
+        self.values = np.empty(self.starts[n] + 1, dtype=np.float64)
+        for i in range(n):
+            self.values[self.starts[i]:self.starts[i + 1]] = matrix[i, i + 1:]
+        self.active = np.ones(n, dtype=bool)
+        self.count = n
+        self.row_min = np.full(n, np.inf)
+        self.row_arg = np.full(n, -1, dtype=np.int64)
+        for i in range(n):
+            self._refresh(i)
+
+    def _row_index(self, i: int) -> np.ndarray:
+        """Condensed positions of D[i][k] for k = 0..n-1 (k = i → spare cell)."""
+        k = np.arange(self.n, dtype=np.int64)
+        index = np.empty(self.n, dtype=np.int64)
+        index[:i] = self.starts[:i] + i - k[:i] - 1
+        index[i] = self.starts[self.n]
+        index[i + 1:] = self.starts[i] + k[i + 1:] - i - 1
+        return index
+
+    def row(self, i: int) -> np.ndarray:
+        """Copy of row i (inf on the diagonal and for inactive slots)."""
+        values = self.values[self._row_index(i)]
+        values[i] = np.inf
+        return values
+
+    def _refresh(self, i: int) -> None:
+        """Recompute the cached minimum of row i's upper slice."""
+        segment = self.values[self.starts[i]:self.starts[i + 1]]
+        if segment.size:
+            j = int(segment.argmin())
+            self.row_min[i], self.row_arg[i] = segment[j], i + 1 + j
+        else:
+            self.row_min[i], self.row_arg[i] = np.inf, -1
+
+    def closest_pair(self) -> tuple[int, int, float]:
+        """First minimum (i, j, D[i][j]) in row order, with i < j."""
+        i = int(self.row_min.argmin())
+        return i, int(self.row_arg[i]), float(self.row_min[i])
+
+    def merge(self, i: int, j: int, new_row: np.ndarray) -> None:
+        """
+        Replace cluster i by the merged cluster, whose distances to every
+        slot are new_row, and deactivate cluster j (i < j).
+        """
+        new_row = np.where(self.active, new_row, np.inf)
+        new_row[i] = new_row[j] = np.inf
+        self.values[self._row_index(i)] = new_row
+        self.values[self._row_index(j)] = np.inf
+        self.active[j] = False
+        self.count -= 1
+
+        # Rows that pointed at i or j must be rescanned; the others (all
+        # above row i) only need to compare against their new entry at i.
+        stale = np.flatnonzero((self.row_arg == i) | (self.row_arg == j))
+        above = new_row[:i]
+        better = (above < self.row_min[:i]) | ((above == self.row_min[:i]) & (i < self.row_arg[:i]))
+        self.row_min[:i] = np.where(better, above, self.row_min[:i])
+        self.row_arg[:i] = np.where(better, i, self.row_arg[:i])
+        self.row_min[j], self.row_arg[j] = np.inf, -1
+        for k in stale.tolist():
+            if self.active[k]:
+                self._refresh(k)
+        self._refresh(i)
+
+
+def _check_input(distance_matrix, labels) -> int:
+    n = len(labels)
+    if len(distance_matrix) != n:
+        raise ValueError(
+            f"distance_matrix has {len(distance_matrix)} rows but "
+            f"labels has {n} entries"
+        )
+    if n == 0:
+        raise ValueError("need at least one taxon")
+    return n
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# UPGMA
+# ─────────────────────────────────────────────────────────────────────────────
+
+def upgma_fast(distance_matrix, labels: list[str]) -> "TreeNode":
+    """
+    UPGMA with a condensed in-place matrix and row-minimum caches.
+
+    Builds the same tree as upgma (03) — same merges, heights and branch
+    lengths — except that internal nodes are left unnamed instead of being
+    labelled with the Newick text of their subtree (which grows to O(n²)
+    characters for large trees).
+
+    Args:
+        distance_matrix: Symmetric n×n matrix (list of lists or NumPy
+                         array).  It is not modified.
+        labels:          List of n taxon names.
+
+    Returns:
+        Root TreeNode of the binary tree.
+
+    Raises:
+        ValueError: if distance_matrix and labels have inconsistent sizes.
+
+    Examples:
+        >>> dm = [[0,1,5,5],[1,0,5,5],[5,5,0,2],[5,5,2,0]]
+        >>> root = upgma_fast(dm, ['A','B','C','D'])
+        >>> root.count_leaves(), root.left.left.name, root.left.left.distance
+        (4, 'A', 0.5)
+    """
+    n = _check_input(distance_matrix, labels)
+    TreeNodeClass = _load_tree_node()
+
+    cm = CondensedMatrix(distance_matrix)
+    sizes   = np.ones(n, dtype=np.float64)
+    nodes   = [TreeNodeClass(name=name) for name in labels]
+    heights = [0.0] * n
+
+    while cm.count > 1:
+        i, j, d = cm.closest_pair()
+        new_height = d / 2.0
+        nodes[i].distance = max(new_height - heights[i], 0.0)
+        nodes[j].distance = max(new_height - heights[j], 0.0)
+
+        new_size = sizes[i] + sizes[j]
+        cm.merge(i, j, (cm.row(i) * sizes[i] + cm.row(j) * sizes[j]) / new_size)
+
+        nodes[i] = TreeNodeClass(name="", left=nodes[i], right=nodes[j], distance=0.0)
+        nodes[j] = None
+        heights[i] = new_height
+        sizes[i] = new_size
+
+    return nodes[0]
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Neighbor joining
+# ─────────────────────────────────────────────────────────────────────────────
+
+class _RowPrefixes:
+    """
+    The smallest entries of every row slice, sorted, for the NJ search.
+
+    Every row keeps a short prefix of SHORT entries; rows whose short
+    prefix cannot rule out the rest of the row also get a DEEP prefix.
+    cut[i] / deep_cut[i] is a lower bound for every entry of row i that is
+    not in the prefix.  Prefix entries are only ever invalidated (set to
+    +inf), never silently changed, so the bounds stay valid.
+    """
+
+    SHORT = 8
+    DEEP  = 64
+
+    def __init__(self, cm: CondensedMatrix) -> None:
+        self.cm = cm
+        self.values      = np.full((cm.n, self.SHORT), np.inf)
+        self.columns     = np.zeros((cm.n, self.SHORT), dtype=np.int64)
+        self.cut         = np.full(cm.n, np.inf)
+        self.deep_values  = np.full((cm.n, self.DEEP), np.inf)
+        self.deep_columns = np.zeros((cm.n, self.DEEP), dtype=np.int64)
+        self.deep_cut     = np.full(cm.n, np.inf)
+        self.is_deep      = np.zeros(cm.n, dtype=bool)
+        for i in range(cm.n):
+            self.refresh(i)
+
+    def _smallest(self, i: int, k: int) -> tuple[np.ndarray, np.ndarray, float]:
+        """Sorted k smallest (values, columns) of row i and the cut after them."""
+        cm = self.cm
+        segment = cm.values[cm.starts[i]:cm.starts[i + 1]]
+        if segment.size > k:
+            part = np.argpartition(segment, k)
+            cut = segment[part[k]]
+            part = part[:k]
+        else:
+            cut = np.inf
+            part = np.arange(segment.size)
+        part = part[np.argsort(segment[part], kind="stable")]
+        values = np.full(k, np.inf)
+        columns = np.zeros(k, dtype=np.int64)
+        values[:part.size], columns[:part.size] = segment[part], i + 1 + part
+        return values, columns, cut
+
+    def refresh(self, i: int) -> None:
+        """Rebuild the short prefix of row i from its slice."""
+        self.values[i], self.columns[i], self.cut[i] = self._smallest(i, self.SHORT)
+        self.is_deep[i] = False
+
+    def deepen(self, i: int) -> None:
+        """Give row i a deep prefix."""
+        self.deep_values[i], self.deep_columns[i], self.deep_cut[i] = self._smallest(i, self.DEEP)
+        self.is_deep[i] = True
+
+    def merged(self, i: int, j: int, new_row: np.ndarray) -> None:
+        """Update after cm.merge(i, j, new_row)."""
+        self.values[(self.columns == i) | (self.columns == j)] = np.inf
+        deep = np.flatnonzero(self.is_deep)
+        values = self.deep_values[deep]
+        columns = self.deep_columns[deep]
+        values[(columns == i) | (columns == j)] = np.inf
+        self.deep_values[deep] = values
+
+        # Rows above i gained a new entry D[k][i]; below a cut it must
+        # join that prefix
+        self.is_deep[:i] &= ~(new_row[:i] < self.deep_cut[:i])
+        self.values[j], self.cut[j], self.is_deep[j] = np.inf, np.inf, False
+        for k in np.flatnonzero(new_row[:i] < self.cut[:i]).tolist():
+            if self.cm.active[k]:
+                self.refresh(k)
+        self.refresh(i)
+
+    def search(self, r: np.ndarray) -> tuple[int, int]:
+        """The pair (i, j), i < j, minimising Q; ties go to the first in row order."""
+        cm = self.cm
+        m = cm.count
+        q = (m - 2) * self.values - r[:, None] - r[self.columns]
+        best_q = q.min()
+
+        # Largest r among active slots to the right of each row
+        r_right = np.where(cm.active, r, -np.inf)
+        r_right = np.append(np.maximum.accumulate(r_right[::-1])[::-1][1:], -np.inf)
+        open_rows = np.flatnonzero((m - 2) * self.cut - r - r_right <= best_q)
+
+        # Rows the short prefix cannot close: try their deep prefix first
+        deep = open_rows[self.is_deep[open_rows]]
+        deep_q = ((m - 2) * self.deep_values[deep] - r[deep, None]
+                  - r[self.deep_columns[deep]])
+        if deep.size:
+            best_q = min(best_q, deep_q.min())
+        deep_bound = np.where(self.is_deep, (m - 2) * self.deep_cut - r - r_right, -np.inf)
+
+        candidates = []
+        for i in open_rows[deep_bound[open_rows] <= best_q].tolist():
+            # Neither prefix rules out the rest of this row: scan it all
+            segment = cm.values[cm.starts[i]:cm.starts[i + 1]]
+            row_q = (m - 2) * segment - r[i] - r[i + 1:]
+            k = int(row_q.argmin())
+            candidates.append((row_q[k], i, i + 1 + k))
+            self.deepen(i)
+        best_q = min([best_q] + [c[0] for c in candidates])
+
+        rows, slots = np.nonzero(q == best_q)
+        candidates.extend(zip(q[rows, slots], rows.tolist(), self.columns[rows, slots].tolist()))
+        rows, slots = np.nonzero(deep_q == best_q)
+        candidates.extend(zip(deep_q[rows, slots], deep[rows].tolist(),
+                              self.deep_columns[deep[rows], slots].tolist()))
+        _, i, j = min(c for c in candidates if c[0] == best_q)
+        return i, j
+
+
+def neighbor_joining(distance_matrix, labels: list[str]) -> "TreeNode":
+    """
+    Neighbor joining on the condensed in-place matrix.
+
+    NJ builds an unrooted tree; it is returned rooted at the midpoint of
+    the last edge joined.  Negative branch-length estimates are clamped to
+    0.0 (as in upgma).  Internal nodes are unnamed.
+
+    Args:
+        distance_matrix: Symmetric n×n matrix (list of lists or NumPy array).
+        labels:          List of n taxon names.
+
+    Returns:
+        Root TreeNode of the binary tree.
+
+    Raises:
+        ValueError: if distance_matrix and labels have inconsistent sizes.
+
+    Examples:
+        >>> dm = [[0, 5, 9, 9, 8], [5, 0, 10, 10, 9], [9, 10, 0, 8, 7],
+        ...       [9, 10, 8, 0, 3], [8, 9, 7, 3, 0]]
+        >>> root = neighbor_joining(dm, ['a', 'b', 'c', 'd', 'e'])
+        >>> ab = root.left.left.left
+        >>> [(leaf.name, leaf.distance) for leaf in (ab.left, ab.right)]
+        [('a', 2.0), ('b', 3.0)]
+    """
+    n = _check_input(distance_matrix, labels)
+    TreeNodeClass = _load_tree_node()
+    nodes = [TreeNodeClass(name=name) for name in labels]
+    if n == 1:
+        return nodes[0]
+
+    cm = CondensedMatrix(distance_matrix)
+    prefixes = _RowPrefixes(cm)
+    r = np.asarray(distance_matrix, dtype=np.float64).sum(axis=1)
+
+    while cm.count > 2:
+        m = cm.count
+        i, j = prefixes.search(r)
+        row_i, row_j = cm.row(i), cm.row(j)
+        d = float(row_i[j])
+        delta_i = d / 2 + float(r[i] - r[j]) / (2 * (m - 2))
+        nodes[i].distance = max(delta_i, 0.0)
+        nodes[j].distance = max(d - delta_i, 0.0)
+
+        new_row = (row_i + row_j - d) / 2
+        others = cm.active.copy()
+        others[[i, j]] = False
+        r[others] += new_row[others] - row_i[others] - row_j[others]
+        r[i] = new_row[others].sum()
+        r[j] = 0.0
+        cm.merge(i, j, new_row)
+        prefixes.merged(i, j, new_row)
+
+        nodes[i] = TreeNodeClass(name="", left=nodes[i], right=nodes[j], distance=0.0)
+        nodes[j] = None
+
+    a, b = np.flatnonzero(cm.active).tolist()
+    half = max(float(cm.row(a)[b]) / 2, 0.0)
+    nodes[a].distance = nodes[b].distance = half
+    return TreeNodeClass(name="", left=nodes[a], right=nodes[b], distance=0.0)
+
+
+ENGINES = {
+    "upgma": upgma_fast,
+    "nj":    neighbor_joining,
+}
+
+
+def cluster(distance_matrix, labels: list[str], method: str = "upgma") -> "TreeNode":
+    """
+    Build a tree with the given method: 'upgma' or 'nj'.
+
+    Examples:
+        >>> cluster([[0, 2], [2, 0]], ['x', 'y'], method='nj').left.distance
+        1.0
+    """
+    if method not in ENGINES:
+        raise ValueError(f"method must be one of {sorted(ENGINES)}, got {method!r}")
+    return ENGINES[method](distance_matrix, labels)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Benchmark helpers
+# ─────────────────────────────────────────────────────────────────────────────
+
+def random_tree_distances(n: int, seed: int = 0, clock: bool = True) -> np.ndarray:
+    """
+    Leaf-to-leaf path lengths of a random binary tree with n leaves.
+
+    With clock=True the tree is ultrametric (UPGMA recovers it); otherwise
+    branch lengths vary freely and the matrix is additive (NJ recovers it).
+
+    Examples:
+        >>> d = random_tree_distances(6, seed=1)
+        >>> d.shape, bool((d == d.T).all()), float(d.trace())
+        ((6, 6), True, 0.0)
+    """
+    rng = np.random.default_rng(seed)
+    matrix = np.zeros((n, n))
+    members = [[i] for i in range(n)]
+    # depth[i]: distance from leaf i up to the root of its current cluster
+    depth = np.zeros(n)
+    height = [0.0] * n
+    while len(members) > 1:
+        a, b = sorted(rng.choice(len(members), 2, replace=False).tolist())
+        left, right = members[a], members[b]
+        if clock:
+            top = max(height[a], height[b]) + rng.exponential(1.0)
+            up_a, up_b = top - height[a], top - height[b]
+        else:
+            top = 0.0
+            up_a, up_b = rng.exponential(1.0, 2)
+        depth[left] += up_a
+        depth[right] += up_b
+        matrix[np.ix_(left, right)] = depth[left][:, None] + depth[right][None, :]
+        matrix[np.ix_(right, left)] = matrix[np.ix_(left, right)].T
+        members[a] = left + right
+        height[a] = top
+        members.pop(b)
+        height.pop(b)
+    return matrix
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Demo
+# ─────────────────────────────────────────────────────────────────────────────
+
+if __name__ == "__main__":
+    print("=" * 70)
+    print("CLUSTER ENGINE: O(n²) UPGMA AND NEIGHBOR JOINING")
+    print("=" * 70)
+
+    def _load(filename):
+        path = os.path.join(os.path.dirname(os.path.abspath(__file__)), filename)
+        spec = importlib.util.spec_from_file_location(filename[:-3], path)
+        mod  = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(mod)
+        return mod
+
+    upgma_mod  = _load("03_upgma.py")
+    newick_mod = _load("04_newick.py")
+    pipeline   = _load("05_pipeline.py")
+
+    apes = pipeline.GREAT_APES
+    print("\n── Great apes ──")
+    print(f"  UPGMA: {newick_mod.to_newick(upgma_fast(apes['matrix'], apes['labels']))}")
+    print(f"  NJ:    {newick_mod.to_newick(neighbor_joining(apes['matrix'], apes['labels']))}")
+
+    n = 5_000
+    print(f"\n── Benchmark: {n:,} taxa ──")
+    for method, clock in (("upgma", True), ("nj", False)):
+        dm = random_tree_distances(n, seed=1, clock=clock)
+        labels = [f"t{i}" for i in range(n)]
+        start = time.perf_counter()
+        cluster(dm, labels, method)
+        print(f"  {method:5s}: {time.perf_counter() - start:6.2f} s")
+
+    small = 150
+    dm = random_tree_distances(small, seed=2).tolist()
+    labels = [f"t{i}" for i in range(small)]
+    start = time.perf_counter()
+    upgma_mod.upgma(dm, labels)
+    classic = time.perf_counter() - start
+    start = time.perf_counter()
+    upgma_fast(dm, labels)
+    fast = time.perf_counter() - start
+    print(f"\n  {small} taxa: upgma (03) {classic:.2f} s, upgma_fast {fast:.3f} s "
+          f"(03 is O(n³): ≈{classic * (n / small) ** 3 / 3600:,.0f} h for {n:,})")
+
+    print("\n" + "=" * 70)
+    print("KEY TAKEAWAYS")
+    print("=" * 70)
+    print("✓ A condensed upper triangle halves the memory of a symmetric matrix")
+    print("✓ Inactive slots are set to +inf instead of deleting rows")
+    print("✓ Cached row minima turn each O(n²) search into O(n)")
+    print("✓ Neighbor joining: sorted row prefixes bound Q, so most rows are never scanned")
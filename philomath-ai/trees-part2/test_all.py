@@ -11,8 +11,9 @@ Modules covered:
   01  Recursion      — factorial, fibonacci (naive, memo, iterative)
   02  TreeNode       — is_leaf, count_leaves, build_sample_tree
   03  UPGMA          — upgma algorithm, find_min_distance, update_distances
-  04  Newick         — to_newick, parse_newick round-trip
+  04  Newick         — to_newick, parse_newick round-trip, streaming FlatTree I/O
   05  Pipeline       — run_pipeline, load_csv, dataset constants
+  08  Cluster engine — upgma_fast, neighbor_joining, pipeline engines
 """
 
 import os
@@ -284,6 +285,65 @@ def test_newick():
     assert root_parsed.count_leaves() == 2
     print("✓ parse_newick('(A:0.1,B:0.2)root;') — name='root', 2 leaves")
 
+    # Edge cases keep their old meaning
+    cases = {
+        "(,);":          "(:0.00000,:0.00000);",
+        "(A,B,C)x:1;":   "(A:0.00000,B:0.00000)x;",
+        " ( A : 1 , B ) ; \n": "(A:1.00000,B:0.00000);",
+        "A;":            "A:0.00000;",
+        "":              ":0.00000;",
+    }
+    for text, expected in cases.items():
+        assert newick_mod.to_newick(newick_mod.parse_newick(text)) == expected, text
+    for bad in ("((A,B);", "A,B;", "(A));", "(A)B(C);", "(A);x"):
+        try:
+            newick_mod.parse_newick(bad)
+            raise AssertionError(f"malformed Newick accepted: {bad}")
+        except ValueError:
+            pass
+    print("✓ Empty names, extra children, whitespace; ValueError on unbalanced input")
+
+    # Deep caterpillar tree: no recursion anywhere
+    n = 20_000
+    deep = ("(" * (n - 1) + "t0:1.00000"
+            + "".join(f",t{k}:1.00000):1.00000" for k in range(1, n - 1))
+            + f",t{n - 1}:1.00000);")
+    assert newick_mod.to_newick(newick_mod.parse_newick(deep)) == deep
+    print(f"✓ {n:,}-level caterpillar tree round-trips")
+
+    # Streaming: tiny chunks on both sides, multifurcating FlatTree
+    import io
+    import random
+    rng = random.Random(5)
+    for trial in range(30):
+        tree = newick_mod.FlatTree()
+        tree.add_node(name=f"root{trial}")
+        for k in range(1, rng.randint(1, 300)):
+            tree.add_node(rng.randrange(k), rng.choice(["", f"n{k}"]), rng.random())
+        text = newick_mod.to_newick(tree, include_root_distance=True)
+        chunk = rng.randint(1, 40)
+        assert "".join(newick_mod.iter_newick(tree, True, chunk_size=chunk)) == text
+        buffer = io.StringIO()
+        assert newick_mod.write_newick(tree, buffer, True, chunk_size=chunk) == len(text)
+        buffer.seek(0)
+        back = newick_mod.read_newick(buffer, chunk_size=chunk)
+        assert len(back) == len(tree) and back.count_leaves() == tree.count_leaves()
+        assert newick_mod.to_newick(back, include_root_distance=True) == text
+    print("✓ write_newick → read_newick with 1–40 character chunks (30 random trees)")
+
+    flat = newick_mod.FlatTree.from_treenode(tn_mod.build_sample_tree())
+    assert flat.count_leaves() == 5 and flat.names[0] == "root"
+    assert newick_mod.to_newick(flat) == newick_mod.to_newick(flat.to_treenode())
+    big = newick_mod.random_flat_tree(10_000, seed=2)
+    nwk_path = os.path.join(_DIR, "_test_tree_tmp.nwk")
+    try:
+        newick_mod.write_newick(big, nwk_path)
+        assert newick_mod.to_newick(newick_mod.read_newick(nwk_path)) == newick_mod.to_newick(big)
+    finally:
+        if os.path.exists(nwk_path):
+            os.remove(nwk_path)
+    print("✓ FlatTree ↔ TreeNode conversion; 10,000-leaf file round-trip")
+
     print("✓ All Newick tests passed!")
     return True
 
@@ -366,6 +426,123 @@ def test_pipeline():
     return True
 
 
+# ─────────────────────────────────────────────────────────────────────────────
+# TEST 6: Cluster engine
+# ─────────────────────────────────────────────────────────────────────────────
+
+def test_cluster_engine():
+    print("\n" + "=" * 70)
+    print("TEST 6: Cluster engine")
+    print("=" * 70)
+
+    import io
+    import numpy as np
+
+    engine   = load_module("08_cluster_engine.py")
+    upgma    = load_module("03_upgma.py")
+    pipeline = load_module("05_pipeline.py")
+
+    def shape(node):
+        """Tree as nested tuples; internal names are ignored."""
+        if node.is_leaf():
+            return (node.name, round(node.distance, 9))
+        return (shape(node.left), shape(node.right), round(node.distance, 9))
+
+    def path_lengths(root, labels):
+        """Leaf-to-leaf distances along the tree."""
+        index = {name: k for k, name in enumerate(labels)}
+        result = np.zeros((len(labels), len(labels)))
+
+        def depths(node):
+            if node.is_leaf():
+                return {index[node.name]: 0.0}
+            left, right = depths(node.left), depths(node.right)
+            for a, da in left.items():
+                for b, db in right.items():
+                    d = da + node.left.distance + db + node.right.distance
+                    result[a, b] = result[b, a] = d
+            merged = {k: v + node.left.distance for k, v in left.items()}
+            merged.update({k: v + node.right.distance for k, v in right.items()})
+            return merged
+
+        depths(root)
+        return result
+
+    # upgma_fast builds the same tree as upgma, ties included
+    rng = np.random.default_rng(0)
+    for trial in range(60):
+        n = int(rng.integers(1, 25))
+        if trial % 2:
+            dm = rng.integers(1, 5, (n, n)).astype(float)
+        else:
+            dm = rng.random((n, n))
+        dm = np.triu(dm, 1) + np.triu(dm, 1).T
+        labels = [f"t{k}" for k in range(n)]
+        expected = upgma.upgma(dm.tolist(), labels)
+        assert shape(engine.upgma_fast(dm, labels)) == shape(expected), trial
+    print("✓ upgma_fast == upgma on 60 random matrices (with ties)")
+
+    # Ultrametric input: UPGMA reproduces the distances
+    dm = engine.random_tree_distances(200, seed=4)
+    labels = [f"t{k}" for k in range(200)]
+    assert np.allclose(path_lengths(engine.upgma_fast(dm, labels), labels), dm)
+    print("✓ upgma_fast recovers a 200-taxon ultrametric tree")
+
+    # Neighbor joining: Wikipedia example and additive trees
+    wiki = [[0, 5, 9, 9, 8], [5, 0, 10, 10, 9], [9, 10, 0, 8, 7],
+            [9, 10, 8, 0, 3], [8, 9, 7, 3, 0]]
+    names = ["a", "b", "c", "d", "e"]
+    assert np.allclose(path_lengths(engine.neighbor_joining(wiki, names), names), wiki)
+    print("✓ neighbor_joining reproduces the 5-taxon textbook example")
+
+    for seed in range(5):
+        n = 50 + 50 * seed
+        dm = engine.random_tree_distances(n, seed=seed, clock=False)
+        labels = [f"t{k}" for k in range(n)]
+        root = engine.neighbor_joining(dm, labels)
+        assert root.count_leaves() == n
+        assert np.allclose(path_lengths(root, labels), dm)
+    print("✓ neighbor_joining recovers additive trees (50–250 taxa)")
+
+    one = engine.cluster([[0.0]], ["x"], method="nj")
+    assert one.is_leaf() and one.name == "x"
+    two = engine.cluster([[0, 2], [2, 0]], ["x", "y"], method="nj")
+    assert (two.left.distance, two.right.distance) == (1.0, 1.0)
+    print("✓ 1- and 2-taxon inputs")
+
+    for bad in (lambda: engine.upgma_fast([[0, 1], [1, 0]], ["a"]),
+                lambda: engine.neighbor_joining([], []),
+                lambda: engine.cluster([[0]], ["a"], method="wpgma"),
+                lambda: pipeline.build_tree([[0]], ["a"], engine="bogus")):
+        try:
+            bad()
+            raise AssertionError("bad input accepted")
+        except ValueError:
+            pass
+    print("✓ ValueError on inconsistent sizes and unknown methods")
+
+    # Pipeline engines
+    ds = pipeline.HIV_SUBTYPES
+    old_stdout = sys.stdout
+    sys.stdout = io.StringIO()
+    try:
+        classic = pipeline.run_pipeline(ds["matrix"], ds["labels"])
+        fast = pipeline.run_pipeline(ds["matrix"], ds["labels"], engine="fast")
+        nj = pipeline.run_pipeline(ds["matrix"], ds["labels"], engine="nj")
+        big = engine.random_tree_distances(300, seed=9, clock=False)
+        large = pipeline.run_pipeline(big, [f"t{k}" for k in range(300)], engine="nj")
+        printed = sys.stdout.getvalue()
+    finally:
+        sys.stdout = old_stdout
+    assert shape(fast["root"]) == shape(classic["root"])
+    assert nj["leaves"] == 6 and nj["newick"].endswith(";")
+    assert large["leaves"] == 300 and "300 taxa (matrix not shown)" in printed
+    print("✓ run_pipeline engines: classic, fast, nj")
+
+    print("✓ All Cluster engine tests passed!")
+    return True
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # Main runner
 # ─────────────────────────────────────────────────────────────────────────────
@@ -381,6 +558,7 @@ def main():
         ("UPGMA",     test_upgma),
         ("Newick",    test_newick),
         ("Pipeline",  test_pipeline),
+        ("Cluster engine", test_cluster_engine),
     ]
 
     passed = 0